@@ -0,0 +1,498 @@
+# ---------------------------------------------------------------------------
+# AdaptiveExecutor.py
+#
+# Runs a function (typically a call to a GP tool) once for each item in a
+# series of items (ex: job IDs), with as many calls in progress at once as
+# the Workflow Manager database can comfortably handle.
+#
+# The number of concurrent calls is adjusted as the run progresses, in the
+# same additive-increase/multiplicative-decrease manner as TCP congestion
+# control.  The calls are measured in windows of a few calls per worker; at
+# the end of each window, the number of concurrent calls is:
+#   - halved, if any call failed because of a lock or timeout in the
+#     database, if too many calls failed for any other reason, or if the
+#     calls took much longer on average than the fastest window seen so far
+#   - otherwise, increased by one, up to the maximum allowed
+# Calls that fail because of a lock or timeout are retried after a delay that
+# doubles with each attempt, unless retries were turned off (as they should
+# be for calls that aren't safe to repeat, such as creating a job or sending
+# a notification, since a call that timed out may still have succeeded).
+#
+# arcpy can't be used from several threads at once, so the calls are made
+# in worker processes, each with its own geoprocessor, license, and copy of
+# the Workflow Manager toolbox.  The function and the items are handed to
+# the workers (and the values returned by the function handed back) by
+# pickling, so the function must be defined at the top level of a module;
+# the ToolCall class below wraps a call to one of the Workflow Manager
+# Administration Utilities tools, and returns its outputs and messages in a
+# form that can be pickled.  The results are always handed back on the
+# calling thread (in the order the calls finish), so the caller can report
+# progress, write to a journal, etc. without any locking.  With a maximum of
+# one concurrent call, no worker processes are started at all and the items
+# are processed in order, in the calling process, exactly as a simple loop
+# would.
+#
+# NOTE: When a script using more than one concurrent call is run as a script
+# tool, it must be run out of process ("Run Python script in process"
+# unchecked), since the worker processes cannot be started from within
+# ArcMap itself.
+# ---------------------------------------------------------------------------
+
+import multiprocessing
+import os
+import pickle
+import signal
+import sys
+import time
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+
+C_DEFAULT_MAX_WORKERS = 1
+C_MIN_WINDOW_CALLS = 8
+C_WINDOW_CALLS_PER_WORKER = 4
+C_MAX_WINDOW_SECONDS = 5.0
+C_LATENCY_TOLERANCE = 1.5
+C_BASELINE_DRIFT = 1.02
+C_MAX_ERROR_RATE = 0.1
+C_DECREASE_FACTOR = 0.5
+C_MAX_RETRIES = 5
+C_INITIAL_RETRY_DELAY = 0.5
+C_POLL_INTERVAL = 0.25
+
+# Placeholder for the item in the arguments given to a ToolCall
+C_ITEM = "{item}"
+
+# Text found in the messages of errors caused by an overloaded database
+# (ex: "Lock request time out period exceeded", "ORA-00054: resource busy")
+C_BUSY_ERROR_PATTERNS = [
+    "lock request",
+    "lock timeout",
+    "deadlock",
+    "timed out",
+    "timeout",
+    "time out",
+    "resource busy",
+    "ora-00054",
+    "ora-00060",
+    "database is locked",
+    "too many connections",
+]
+
+
+# Function to determine whether an error was caused by the database being
+# too busy, in which case the call is worth retrying
+def isBusyError(ex):
+    text = str(ex).lower()
+    for pattern in C_BUSY_ERROR_PATTERNS:
+        if pattern in text:
+            return True
+    return False
+
+
+# Function used to convert a user-supplied maximum number of concurrent calls
+# (which may be empty) into a number
+def parseMaxWorkers(text):
+    if text == None or len(str(text).strip()) == 0:
+        return C_DEFAULT_MAX_WORKERS
+    maxWorkers = int(text)
+    if maxWorkers < 1:
+        raise ValueError("The maximum number of concurrent calls must be at least 1")
+    return maxWorkers
+
+
+# The statistics for a run, as seen at the end of the most recent window
+class ExecutorStats(object):
+
+    def __init__(self, workers):
+        self.startTime = time.time()
+        self.succeeded = 0
+        self.failed = 0
+        self.retries = 0
+        self.busyErrors = 0
+        self.workers = workers
+        self.minWorkersUsed = workers
+        self.maxWorkersUsed = workers
+        self.throughput = 0.0
+        self.latency = 0.0
+
+    # Returns the number of seconds since the run started
+    def getElapsed(self):
+        return time.time() - self.startTime
+
+    # Returns the number of items finished per second, over the whole run
+    def getOverallThroughput(self):
+        elapsed = self.getElapsed()
+        if elapsed <= 0:
+            return 0.0
+        return (self.succeeded + self.failed) / elapsed
+
+    # Returns a short description of the current state of the run, suitable
+    # for a progressor label
+    def describe(self):
+        return "%d done, %.1f/sec, %d concurrent call(s), %.2f sec/call" % (
+            self.succeeded + self.failed, self.throughput, self.workers, self.latency)
+
+    # Returns a description of the whole run
+    def summarize(self):
+        summary = "%d item(s) in %.1f seconds (%.1f/sec); %d to %d concurrent call(s)" % (
+            self.succeeded + self.failed, self.getElapsed(), self.getOverallThroughput(),
+            self.minWorkersUsed, self.maxWorkersUsed)
+        if self.retries > 0:
+            summary += "; " + str(self.retries) + " call(s) retried after " + str(self.busyErrors) + " lock/timeout error(s)"
+        return summary
+
+
+# Raised in place of an error from a call made in a worker process; only the
+# message of the original error is passed back
+class CallError(Exception):
+    pass
+
+
+# The outputs and messages of a GP tool, copied from its result object so
+# that they can be passed back from a worker process.  Has the same members
+# as a geoprocessing result that the scripts use.
+class ToolResult(object):
+
+    def __init__(self, result):
+        self.outputs = [str(result.getOutput(i)) for i in range(result.outputCount)]
+        self.messages = [(result.getSeverity(i), result.getMessage(i)) for i in range(result.messageCount)]
+
+    @property
+    def outputCount(self):
+        return len(self.outputs)
+
+    @property
+    def messageCount(self):
+        return len(self.messages)
+
+    def getOutput(self, index):
+        return self.outputs[index]
+
+    def getMessage(self, index):
+        return self.messages[index][1]
+
+    def getSeverity(self, index):
+        return self.messages[index][0]
+
+
+# Calls one of the Workflow Manager Administration Utilities tools for an
+# item; "toolArgs" are the tool's arguments, in which C_ITEM is replaced with
+# the item.  Only holds strings, so that it can be handed to the worker
+# processes; subclasses may override getArgs() and setUp().
+class ToolCall(object):
+
+    def __init__(self, wmxToolbox, toolName, toolArgs):
+        self.wmxToolbox = wmxToolbox
+        self.toolName = toolName
+        self.toolArgs = list(toolArgs)
+
+    # Called once in each worker process, before any items are handed to it
+    def setUp(self):
+        import arcpy
+        if arcpy.CheckOutExtension("JTX") != "CheckedOut":
+            raise CallError("Could not get extension: JTX")
+        arcpy.ImportToolbox(self.wmxToolbox, "WMXAdminUtils")
+
+    # Returns the tool's arguments for an item
+    def getArgs(self, item):
+        return [item if arg == C_ITEM else arg for arg in self.toolArgs]
+
+    def __call__(self, item):
+        import arcpy
+        return ToolResult(getattr(arcpy, self.toolName + "_WMXAdminUtils")(*self.getArgs(item)))
+
+
+# Decides how many calls should be in progress at once, based on how long
+# the calls are taking and how many are failing
+class ConcurrencyController(object):
+
+    def __init__(self, minWorkers, maxWorkers):
+        self.minWorkers = minWorkers
+        self.maxWorkers = maxWorkers
+        self.stats = ExecutorStats(minWorkers)
+        self.active = 0
+        self.baselineLatency = None
+        self.windowCount = 0
+        self._startWindow()
+
+    def _startWindow(self):
+        self.windowStart = time.time()
+        self.windowCalls = 0
+        self.windowLatency = 0.0
+        self.windowBusy = 0
+        self.windowFailed = 0
+
+    # Returns True if another call may be started
+    def canStart(self):
+        return self.active < self.stats.workers
+
+    # Records that a call has been started
+    def started(self):
+        self.active += 1
+
+    # Records the outcome of a single call, adjusting the number of
+    # concurrent calls at the end of each window
+    def finished(self, seconds, failed, busy):
+        self.active -= 1
+        self.windowCalls += 1
+        self.windowLatency += seconds
+        if busy:
+            self.windowBusy += 1
+            self.stats.busyErrors += 1
+        elif failed:
+            self.windowFailed += 1
+
+        windowSeconds = time.time() - self.windowStart
+        if self.windowCalls >= max(C_MIN_WINDOW_CALLS, C_WINDOW_CALLS_PER_WORKER * self.stats.workers) or \
+                windowSeconds >= C_MAX_WINDOW_SECONDS:
+            self._adjust(windowSeconds)
+
+    def _adjust(self, windowSeconds):
+        stats = self.stats
+        meanLatency = self.windowLatency / self.windowCalls
+        if windowSeconds > 0:
+            stats.throughput = self.windowCalls / windowSeconds
+        stats.latency = meanLatency
+
+        # The fastest window seen so far is taken as the latency of an idle
+        # database; it drifts upwards slowly, in case the database itself has
+        # become slower since then
+        if self.baselineLatency == None or meanLatency < self.baselineLatency:
+            self.baselineLatency = meanLatency
+        else:
+            self.baselineLatency *= C_BASELINE_DRIFT
+
+        overloaded = self.windowBusy > 0 or \
+            float(self.windowFailed) / self.windowCalls > C_MAX_ERROR_RATE or \
+            meanLatency > self.baselineLatency * C_LATENCY_TOLERANCE
+        if overloaded:
+            stats.workers = max(self.minWorkers, int(stats.workers * C_DECREASE_FACTOR))
+        elif stats.workers < self.maxWorkers:
+            stats.workers += 1
+        stats.minWorkersUsed = min(stats.minWorkersUsed, stats.workers)
+        stats.maxWorkersUsed = max(stats.maxWorkersUsed, stats.workers)
+
+        self.windowCount += 1
+        self._startWindow()
+
+
+# Runs the function for a single item; returns (value, error message, whether
+# the error was caused by the database being too busy, seconds taken)
+def _callFunction(function, item):
+    startTime = time.time()
+    try:
+        value = function(item)
+        return (value, None, False, time.time() - startTime)
+    except Exception as ex:
+        return (None, str(ex), isBusyError(ex), time.time() - startTime)
+
+
+# Main function for each worker process; sets up the function, then calls it
+# for each item handed to it until it's handed None
+def _workerMain(function, workQueue, resultQueue):
+    # Leave it to the calling process to decide what to do when the user
+    # presses Ctrl+C, so that no call is interrupted partway through
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    try:
+        if hasattr(function, "setUp"):
+            function.setUp()
+    except Exception as ex:
+        resultQueue.put((None, None, "Could not start worker process: " + str(ex), False, 0.0))
+        return
+
+    while True:
+        task = workQueue.get()
+        if task == None:
+            break
+        (callId, item) = task
+        (value, error, busy, seconds) = _callFunction(function, item)
+
+        # Make sure the value can be passed back, so that the call isn't lost
+        if error == None:
+            try:
+                pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            except Exception as ex:
+                (value, error) = (None, "Could not return the result of the call: " + str(ex))
+        resultQueue.put((callId, value, error, busy, seconds))
+
+
+class AdaptiveExecutor(object):
+
+    # "maxWorkers" is the largest number of calls that may be in progress at
+    # once; the run starts with "minWorkers" calls at a time.  Calls that
+    # fail because of a lock or timeout are only retried if "retryBusyCalls"
+    # is True.
+    def __init__(self, maxWorkers=C_DEFAULT_MAX_WORKERS, minWorkers=1, retryBusyCalls=True):
+        self.maxWorkers = max(1, maxWorkers)
+        self.minWorkers = max(1, min(minWorkers, self.maxWorkers))
+        self.retryBusyCalls = retryBusyCalls
+        self.controller = ConcurrencyController(self.minWorkers, self.maxWorkers)
+
+    # Returns the statistics for the current (or last) run
+    def getStats(self):
+        return self.controller.stats
+
+    # Calls "function(item)" for each item, then "onResult(item, value, error)"
+    # on this thread once each call finishes; "error" is None if the call
+    # succeeded.  "onProgress(stats)" is called at the end of each window,
+    # and "isCancelled()" is checked regularly; once it returns True, no
+    # more calls are started.
+    #
+    # If "onResult" raises an exception, no more calls are started; the
+    # results of the calls already in progress are still handed to
+    # "onResult" (so that they can be recorded), and then the first exception
+    # is raised again.
+    def run(self, items, function, onResult, onProgress=None, isCancelled=None):
+        self.controller = ConcurrencyController(self.minWorkers, self.maxWorkers)
+        if self.maxWorkers <= 1:
+            self._runInline(items, function, onResult, onProgress, isCancelled)
+        else:
+            self._runInWorkers(items, function, onResult, onProgress, isCancelled)
+
+    # Returns True if a failed call should be tried again
+    def _shouldRetry(self, busy, attempt):
+        return busy and self.retryBusyCalls and attempt < C_MAX_RETRIES
+
+    def _recordResult(self, error):
+        if error == None:
+            self.controller.stats.succeeded += 1
+        else:
+            self.controller.stats.failed += 1
+
+    def _runInline(self, items, function, onResult, onProgress, isCancelled):
+        lastWindow = 0
+        for item in items:
+            if isCancelled != None and isCancelled():
+                break
+
+            delay = C_INITIAL_RETRY_DELAY
+            attempt = 0
+            while True:
+                self.controller.started()
+                (value, error, busy, seconds) = _callFunction(function, item)
+                self.controller.finished(seconds, error != None, busy)
+                if error == None or not self._shouldRetry(busy, attempt):
+                    break
+                attempt += 1
+                self.controller.stats.retries += 1
+                time.sleep(delay)
+                delay *= 2
+
+            if error != None:
+                error = CallError(error)
+            self._recordResult(error)
+            onResult(item, value, error)
+            if onProgress != None and self.controller.windowCount != lastWindow:
+                lastWindow = self.controller.windowCount
+                onProgress(self.controller.stats)
+
+    def _runInWorkers(self, items, function, onResult, onProgress, isCancelled):
+        # If this script is being run by another application (ex: ArcGIS),
+        # make sure that the workers are started with the Python interpreter
+        # instead
+        if not os.path.basename(sys.executable).lower().startswith("python"):
+            multiprocessing.set_executable(os.path.join(sys.exec_prefix, "pythonw.exe"))
+
+        workQueue = multiprocessing.Queue()
+        resultQueue = multiprocessing.Queue()
+        workers = []
+        for i in range(self.maxWorkers):
+            worker = multiprocessing.Process(target=_workerMain, args=(function, workQueue, resultQueue))
+            worker.daemon = True
+            worker.start()
+            workers.append(worker)
+
+        # Each call in progress is tracked by an ID, along with its item, the
+        # number of times it has been retried, and the delay before the next
+        # retry; calls waiting to be retried are kept with the time at which
+        # they may be retried
+        controller = self.controller
+        calls = {}
+        retries = []
+        nextCallId = 0
+        firstError = None
+        lastWindow = 0
+        itemIter = iter(items)
+        exhausted = False
+        stopping = False
+        try:
+            while True:
+                # Start as many calls as the database can currently handle,
+                # retrying those that are due before starting on new items
+                while not stopping and controller.canStart():
+                    now = time.time()
+                    if len(retries) > 0 and retries[0][0] <= now:
+                        (unused, callId, item, attempt, delay) = retries.pop(0)
+                    elif not exhausted:
+                        try:
+                            item = next(itemIter)
+                        except StopIteration:
+                            exhausted = True
+                            continue
+                        callId = nextCallId
+                        nextCallId += 1
+                        (attempt, delay) = (0, C_INITIAL_RETRY_DELAY)
+                    else:
+                        break
+                    calls[callId] = (item, attempt, delay)
+                    controller.started()
+                    workQueue.put((callId, item))
+
+                if len(calls) == 0 and (stopping or (exhausted and len(retries) == 0)):
+                    break
+
+                try:
+                    (callId, value, error, busy, seconds) = resultQueue.get(True, C_POLL_INTERVAL)
+                except queue.Empty:
+                    # Watch for any workers that died without saying so; the
+                    # calls they were making can't be accounted for
+                    if len(calls) > 0 and not all([worker.is_alive() for worker in workers]):
+                        raise CallError("A worker process exited unexpectedly")
+                    (callId, value, error, busy, seconds) = (None, None, None, False, 0.0)
+
+                if callId == None and error != None:
+                    # A worker couldn't be started
+                    raise CallError(error)
+
+                if callId != None:
+                    (item, attempt, delay) = calls.pop(callId)
+                    controller.finished(seconds, error != None, busy)
+                    if error != None and not stopping and self._shouldRetry(busy, attempt):
+                        controller.stats.retries += 1
+                        retries.append((time.time() + delay, callId, item, attempt + 1, delay * 2))
+                        retries.sort()
+                    else:
+                        if error != None:
+                            error = CallError(error)
+                        self._recordResult(error)
+                        try:
+                            onResult(item, value, error)
+                        except Exception as ex:
+                            if firstError == None:
+                                firstError = ex
+
+                if onProgress != None and controller.windowCount != lastWindow:
+                    lastWindow = controller.windowCount
+                    onProgress(controller.stats)
+
+                # Once cancelled (or failed), don't start any more calls, and
+                # wait for those in progress to finish
+                if not stopping and (firstError != None or (isCancelled != None and isCancelled())):
+                    stopping = True
+                    del retries[:]
+
+        finally:
+            for worker in workers:
+                workQueue.put(None)
+            for worker in workers:
+                worker.join(C_POLL_INTERVAL)
+                if worker.is_alive():
+                    worker.terminate()
+
+        if firstError != None:
+            raise firstError
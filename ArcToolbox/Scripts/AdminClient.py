@@ -0,0 +1,244 @@
+# ---------------------------------------------------------------------------
+# AdminClient.py
+#
+# Sends requests to a running AdminDaemon.py, which runs the Workflow
+# Manager Administration Utilities tools and scripts without the start-up
+# cost of importing arcpy, checking out licenses and connecting to the
+# Workflow Manager database each time.  Doesn't import arcpy itself, so it
+# starts in a fraction of a second; use it in place of running a script
+# directly (ex: from a scheduled task).
+#
+# May also be imported, in which case the toolbox's tools can be called on
+# an AdminClient object just as they would be on arcpy:
+#
+#   client = AdminClient.AdminClient()
+#   result = client.ListJobs_WMXAdminUtils("JTX_JOBS", "STATUS = 5", "")
+#   jobIds = result.getOutput(0)
+# ---------------------------------------------------------------------------
+
+import json
+import os
+import socket
+import sys
+
+from AdminDaemon import C_HOST, C_TOOLBOX_ALIAS, getDefaultInfoFile
+
+C_CONNECT_TIMEOUT = 5.0
+
+C_SEVERITY_MESSAGE = 0
+C_SEVERITY_WARNING = 1
+C_SEVERITY_ERROR = 2
+
+
+# Define a basic class used to call out problems reaching the daemon
+class DaemonUnavailableError(Exception):
+    pass
+
+
+# Define a basic class used to call out failed requests; mirrors
+# arcpy.ExecuteError
+class DaemonError(Exception):
+    def __init__(self, message, result):
+        Exception.__init__(self, message)
+        self.result = result
+
+
+# The outcome of a request, with the same accessors as an arcpy Result
+class DaemonResult(object):
+    def __init__(self, response):
+        self.ok = response.get("ok", False)
+        self.outputs = response.get("outputs") or []
+        self.messages = response.get("messages") or []
+        self.error = response.get("error")
+        self.seconds = response.get("seconds", 0.0)
+
+    @property
+    def outputCount(self):
+        return len(self.outputs)
+
+    def getOutput(self, index):
+        return self.outputs[index]
+
+    def getMessageCount(self):
+        return len(self.messages)
+
+    def getMessage(self, index):
+        return self.messages[index][1]
+
+    def getSeverity(self, index):
+        return self.messages[index][0]
+
+    def getMessages(self, severity=0):
+        return "\n".join([m[1] for m in self.messages if m[0] >= severity])
+
+
+class AdminClient(object):
+
+    # Creates a client for the daemon whose port and token are recorded in
+    # the given info file.  "timeout" limits how long (in seconds) to wait
+    # for a request to complete; by default, there is no limit.
+    def __init__(self, infoFile=None, timeout=None):
+        self.infoFile = infoFile or getDefaultInfoFile()
+        self.timeout = timeout
+        self.port = None
+        self.token = None
+
+    # Reads the daemon's port and token
+    def _readInfoFile(self):
+        try:
+            f = open(self.infoFile, "r")
+            try:
+                info = json.load(f)
+            finally:
+                f.close()
+            self.port = int(info["port"])
+            self.token = info["token"]
+        except (IOError, OSError, ValueError, KeyError) as ex:
+            raise DaemonUnavailableError("Daemon is not running (" + self.infoFile + ": " + str(ex) + ")")
+
+    # Sends a request to the daemon and returns the response
+    def send(self, request):
+        if self.port == None:
+            self._readInfoFile()
+        request = dict(request)
+        request["token"] = self.token
+
+        try:
+            conn = socket.create_connection((C_HOST, self.port), C_CONNECT_TIMEOUT)
+        except socket.error as ex:
+            raise DaemonUnavailableError("Could not connect to daemon on port " + str(self.port) + ": " + str(ex))
+
+        try:
+            conn.settimeout(self.timeout)
+            conn.sendall((json.dumps(request) + "\n").encode("utf-8"))
+            data = b""
+            while not data.endswith(b"\n"):
+                chunk = conn.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+        except socket.error as ex:
+            raise DaemonUnavailableError("Lost connection to daemon: " + str(ex))
+        finally:
+            conn.close()
+
+        try:
+            return json.loads(data.decode("utf-8"))
+        except ValueError:
+            raise DaemonUnavailableError("Daemon closed the connection without responding")
+
+    # Sends a request, returning the result; raises DaemonError if the
+    # request fails
+    def _call(self, request):
+        result = DaemonResult(self.send(request))
+        if not result.ok:
+            message = result.error or result.getMessages(C_SEVERITY_ERROR) or "Request failed"
+            raise DaemonError(message, result)
+        return result
+
+    # Runs a tool from the Workflow Manager Administration Utilities toolbox
+    # (ex: runTool("DeleteJob", ["42", ""]))
+    def runTool(self, name, args):
+        return self._call({"command": "tool", "name": name, "args": list(args)})
+
+    # Runs one of the utility scripts (ex: "DeleteJobsMatchingCriteria"),
+    # with its parameters in the order used by the script tool
+    def runScript(self, name, args):
+        return self._call({"command": "script", "name": name, "args": list(args)})
+
+    # Returns the daemon's port, process ID, uptime (in seconds) and the
+    # number of requests it has handled
+    def ping(self):
+        return self._call({"command": "ping"})
+
+    def shutdown(self):
+        return self._call({"command": "shutdown"})
+
+    # Makes the toolbox's tools available as "<ToolName>_WMXAdminUtils"
+    # methods, as arcpy does
+    def __getattr__(self, name):
+        suffix = "_" + C_TOOLBOX_ALIAS
+        if not name.endswith(suffix):
+            raise AttributeError(name)
+        toolName = name[:-len(suffix)]
+
+        def runTool(*args):
+            return self.runTool(toolName, args)
+        return runTool
+
+
+# Function that prints an explanation of how to use this script
+def printUsage():
+    print("""
+Runs a Workflow Manager Administration Utilities tool or script through a
+running AdminDaemon.py.
+
+Usage:
+  AdminClient.py [-i infoFile] tool toolName [arg ...]
+  AdminClient.py [-i infoFile] script scriptName [arg ...]
+  AdminClient.py [-i infoFile] ping
+  AdminClient.py [-i infoFile] shutdown
+
+Arguments are given in the same order as in the tool or script tool's
+dialog; use "" for an optional argument that is to be left empty.  The
+exit code is 0 if the request succeeded, 1 if it failed and 2 if the daemon
+could not be reached.
+""")
+
+
+# Prints the messages and outputs from a request
+def printResult(result):
+    for (severity, message) in result.messages:
+        if severity == C_SEVERITY_WARNING:
+            message = "WARNING: " + message
+        elif severity == C_SEVERITY_ERROR:
+            message = "ERROR: " + message
+        print(message)
+    for i in range(result.outputCount):
+        print("Output " + str(i) + ": " + str(result.getOutput(i)))
+
+
+# Script entry point
+def main():
+    args = sys.argv[1:]
+    infoFile = None
+    if len(args) >= 2 and args[0] in ("-i", "--info-file"):
+        infoFile = args[1]
+        args = args[2:]
+
+    if len(args) < 1 or args[0] in ("-h", "--help") or \
+            (args[0] in ("tool", "script") and len(args) < 2) or \
+            args[0] not in ("tool", "script", "ping", "shutdown"):
+        printUsage()
+        return 1
+
+    client = AdminClient(infoFile)
+    try:
+        if args[0] == "tool":
+            result = client.runTool(args[1], args[2:])
+        elif args[0] == "script":
+            result = client.runScript(args[1], args[2:])
+        elif args[0] == "ping":
+            result = client.ping()
+            (port, pid, uptime, numRequests) = result.outputs
+            print("Daemon (process " + str(pid) + ") listening on port " + str(port) + "; up " +
+                  str(uptime) + " second(s), " + str(numRequests) + " request(s) handled")
+            return 0
+        else:
+            result = client.shutdown()
+    except DaemonUnavailableError as ex:
+        sys.stderr.write(str(ex) + "\n")
+        return 2
+    except DaemonError as ex:
+        printResult(ex.result)
+        if ex.result.error:
+            sys.stderr.write(ex.result.error + "\n")
+        return 1
+
+    printResult(result)
+    return 0
+
+
+# Entry point for the script
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,460 @@
+# ---------------------------------------------------------------------------
+# AdminDaemon.py
+#
+# A long-running process that keeps arcpy imported, the Workflow Manager
+# extension checked out, the Workflow Manager Administration Tools toolbox
+# imported and the Workflow Manager database connections open, and runs
+# tools and scripts on behalf of clients (see AdminClient.py) that connect
+# to it over a local socket.  A scheduled admin action run through the
+# daemon doesn't pay for any of this start-up work, so it typically
+# completes in well under a second rather than tens of seconds.
+#
+# Each client connection carries a single request and a single response,
+# each a JSON object on one line:
+#
+#   {"token": "...", "command": "tool", "name": "DeleteJob", "args": ["42", ""]}
+#   {"token": "...", "command": "script", "name": "DeleteJobsMatchingCriteria", "args": [...]}
+#   {"token": "...", "command": "ping"}
+#   {"token": "...", "command": "shutdown"}
+#
+#   {"ok": true, "outputs": [...], "messages": [[0, "..."], ...],
+#    "error": null, "seconds": 0.12}
+#
+# The daemon only listens on the loopback interface.  When it starts, it
+# writes its port and a random token to a file in the current user's local
+# application data folder; a request without that token is refused.
+#
+# Requests are handled one at a time, in the order in which they arrive,
+# since arcpy itself is not thread-safe.
+# ---------------------------------------------------------------------------
+
+import binascii
+import json
+import optparse
+import os
+import socket
+import sys
+import time
+
+
+C_TOOLBOX_ALIAS = "WMXAdminUtils"
+C_HOST = "127.0.0.1"
+C_DEFAULT_PORT = 0
+C_DEFAULT_CACHE_AGE = 300
+C_INFO_DIR = "WorkflowManagerAdministrationUtilities"
+C_INFO_FILE = "AdminDaemon.json"
+
+# Set so that the Workflow Manager database connections (and configuration
+# cache) are shared between tool runs; see WmauAbstractGpFunction.cs
+C_ENV_VAR_SHARE_DB_CONNECTIONS = "WMAU_SHARE_DB_CONNECTIONS"
+
+C_MAX_REQUEST_SIZE = 1024 * 1024
+C_READ_TIMEOUT = 30.0
+C_ACCEPT_TIMEOUT = 1.0
+
+C_SEVERITY_MESSAGE = 0
+C_SEVERITY_WARNING = 1
+C_SEVERITY_ERROR = 2
+
+# The scripts that may be run through the daemon
+C_SCRIPTS = [
+    "CreateJobsBasedOnFC",
+    "DeleteJobsMatchingCriteria",
+    "SendNotificationForJobsInQuery",
+    "UploadAllTaskAssistantWorkbooks",
+]
+
+
+# Define a basic class used to call out license errors
+class LicenseError(Exception):
+    pass
+
+
+# Define a basic class used to call out core installation errors
+class InstallationError(Exception):
+    pass
+
+
+# Define a basic class used to call out invalid requests
+class RequestError(Exception):
+    pass
+
+
+# Returns the default location of the file in which the daemon's port and
+# token are recorded
+def getDefaultInfoFile():
+    baseDir = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    return os.path.join(baseDir, C_INFO_DIR, C_INFO_FILE)
+
+
+# Function to retrieve the licenses needed by this utility
+def checkOutLicenses(arcpy, licenseType, extensionList):
+    # Check out all necessary licenses
+    if licenseType != None and len(licenseType) > 0:
+        retVal = arcpy.SetProduct(licenseType)
+        if retVal != "CheckedOut" and retVal != "AlreadyInitialized":
+            raise LicenseError("Could not get license '" + licenseType + "'; return code: " + retVal)
+
+    for extension in extensionList:
+        if arcpy.CheckExtension(extension) != "Available":
+            raise LicenseError("Extension not available: " + extension)
+        retVal = arcpy.CheckOutExtension(extension)
+        if retVal != "CheckedOut":
+            raise LicenseError("Could not get extension: " + extension + "; return code: " + retVal)
+
+
+# Function to determine the install location of the workflow manager toolbox
+def getWorkflowManagerToolboxLocation(arcpy):
+    # Import the workflow manager toolbox
+    wmxToolbox = None
+
+    installations = arcpy.ListInstallations()
+    for installation in installations:
+        installInfo = arcpy.GetInstallInfo(installation)
+        if installInfo != None:
+            tbx = installInfo["InstallDir"] + os.sep + "ArcToolbox" + os.sep + "Toolboxes" + os.sep + "Workflow Manager Administration Tools.tbx"
+            tbx = os.path.normpath(tbx)
+            if os.path.exists(tbx):
+                wmxToolbox = tbx
+                break
+
+    if wmxToolbox == None:
+        raise InstallationError("Workflow Manager Administration Tools toolbox not found")
+
+    return wmxToolbox
+
+
+# Converts a tool output into a value that can be written as JSON
+def toJsonValue(value):
+    if value == None or isinstance(value, (bool, int, float)):
+        return value
+    try:
+        return unicode(value)
+    except NameError:
+        return str(value)
+
+
+# Stands in for the arcpy functions that a script uses to get its
+# parameters and report messages, while the script is run by the daemon
+class ScriptContext(object):
+
+    C_PATCHED_FUNCTIONS = [
+        "GetArgumentCount", "GetParameterAsText", "GetParameter",
+        "SetParameterAsText", "SetParameter",
+        "AddMessage", "AddWarning", "AddError", "AddReturnMessage",
+        "ImportToolbox",
+    ]
+
+    def __init__(self, daemon, args):
+        self.daemon = daemon
+        self.args = args
+        self.outputs = {}
+        self.messages = []
+        self.originals = {}
+
+    def GetArgumentCount(self):
+        return len(self.args)
+
+    def GetParameterAsText(self, index):
+        if index < len(self.args) and self.args[index] != None:
+            return self.args[index]
+        return ""
+
+    def GetParameter(self, index):
+        return self.GetParameterAsText(index)
+
+    def SetParameterAsText(self, index, text):
+        self.outputs[index] = text
+
+    def SetParameter(self, index, value):
+        self.outputs[index] = value
+
+    def AddMessage(self, message):
+        self.messages.append([C_SEVERITY_MESSAGE, toJsonValue(message)])
+
+    def AddWarning(self, message):
+        self.messages.append([C_SEVERITY_WARNING, toJsonValue(message)])
+
+    def AddError(self, message):
+        self.messages.append([C_SEVERITY_ERROR, toJsonValue(message)])
+
+    def AddReturnMessage(self, index):
+        arcpy = self.daemon.arcpy
+        self.messages.append([arcpy.GetSeverity(index), toJsonValue(arcpy.GetMessage(index))])
+
+    # The toolbox was imported when the daemon started, so there's no need
+    # to import it again for each script run
+    def ImportToolbox(self, input_file, module_name=None):
+        if module_name == C_TOOLBOX_ALIAS and \
+                os.path.normcase(str(input_file)) == os.path.normcase(self.daemon.wmxToolbox):
+            return self.daemon.arcpy
+        return self.originals["ImportToolbox"](input_file, module_name)
+
+    def __enter__(self):
+        arcpy = self.daemon.arcpy
+        for name in ScriptContext.C_PATCHED_FUNCTIONS:
+            self.originals[name] = getattr(arcpy, name)
+            setattr(arcpy, name, getattr(self, name))
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        arcpy = self.daemon.arcpy
+        for (name, function) in self.originals.items():
+            setattr(arcpy, name, function)
+        return False
+
+    # Returns the script's outputs as a list, in parameter order
+    def getOutputs(self):
+        outputs = []
+        if len(self.outputs) > 0:
+            outputs = [None] * (max(self.outputs.keys()) + 1)
+            for (index, value) in self.outputs.items():
+                outputs[index] = toJsonValue(value)
+        return outputs
+
+
+class AdminDaemon(object):
+
+    # Creates the daemon.  "maxCacheAge" is the number of seconds for which
+    # a Workflow Manager database's configuration may be reused before it
+    # is reloaded.
+    def __init__(self, port=C_DEFAULT_PORT, infoFile=None, maxCacheAge=C_DEFAULT_CACHE_AGE):
+        self.port = port
+        self.infoFile = infoFile or getDefaultInfoFile()
+        self.maxCacheAge = maxCacheAge
+        self.token = binascii.hexlify(os.urandom(16)).decode("ascii")
+        self.arcpy = None
+        self.wmxToolbox = None
+        self.scripts = {}
+        self.server = None
+        self.running = False
+        self.startTime = None
+        self.numRequests = 0
+
+    # Does all of the work that would otherwise be repeated for every
+    # script run: imports arcpy, checks out the Workflow Manager extension
+    # and imports the toolbox.  The database connections are opened (and
+    # kept open) by the first tool run against each database.
+    def initialize(self):
+        os.environ[C_ENV_VAR_SHARE_DB_CONNECTIONS] = str(self.maxCacheAge)
+        import arcpy
+        self.arcpy = arcpy
+        checkOutLicenses(arcpy, "", ["JTX"])
+        self.wmxToolbox = getWorkflowManagerToolboxLocation(arcpy)
+        arcpy.ImportToolbox(self.wmxToolbox, C_TOOLBOX_ALIAS)
+        self.startTime = time.time()
+
+    # Starts listening for requests, and records the port and token so that
+    # clients can find the daemon
+    def start(self):
+        if self.arcpy == None:
+            self.initialize()
+
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind((C_HOST, self.port))
+        self.server.listen(16)
+        self.server.settimeout(C_ACCEPT_TIMEOUT)
+        self.port = self.server.getsockname()[1]
+
+        infoDir = os.path.dirname(self.infoFile)
+        if infoDir and not os.path.isdir(infoDir):
+            os.makedirs(infoDir)
+        f = open(self.infoFile, "w")
+        try:
+            json.dump({"port": self.port, "token": self.token, "pid": os.getpid()}, f)
+        finally:
+            f.close()
+        self.running = True
+
+    # Stops listening, and removes the info file (unless another daemon has
+    # since replaced it)
+    def stop(self):
+        self.running = False
+        if self.server != None:
+            self.server.close()
+            self.server = None
+        try:
+            f = open(self.infoFile, "r")
+            try:
+                info = json.load(f)
+            finally:
+                f.close()
+            if info.get("token") == self.token:
+                os.remove(self.infoFile)
+        except (IOError, OSError, ValueError):
+            pass
+
+    # Handles requests until a "shutdown" request is received
+    def serveForever(self):
+        while self.running:
+            try:
+                (conn, address) = self.server.accept()
+            except socket.timeout:
+                continue
+            try:
+                self.handleConnection(conn)
+            finally:
+                conn.close()
+
+    # Reads a request from a client connection and writes back the response
+    def handleConnection(self, conn):
+        conn.settimeout(C_READ_TIMEOUT)
+        data = b""
+        try:
+            while not data.endswith(b"\n"):
+                chunk = conn.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+                if len(data) > C_MAX_REQUEST_SIZE:
+                    raise RequestError("Request is too large")
+            request = json.loads(data.decode("utf-8"))
+            response = self.handleRequest(request)
+        except socket.error:
+            return
+        except (RequestError, ValueError) as ex:
+            response = {"ok": False, "outputs": [], "messages": [], "error": str(ex), "seconds": 0.0}
+
+        try:
+            conn.sendall((json.dumps(response) + "\n").encode("utf-8"))
+        except socket.error:
+            pass
+
+    # Handles a single request, returning the response
+    def handleRequest(self, request):
+        if not isinstance(request, dict) or request.get("token") != self.token:
+            raise RequestError("Request refused; the token is missing or incorrect")
+
+        startTime = time.time()
+        command = request.get("command")
+        args = request.get("args") or []
+        if not isinstance(args, list):
+            raise RequestError("Request arguments must be a list")
+
+        self.numRequests += 1
+        if command == "tool":
+            response = self.runTool(request.get("name"), args)
+        elif command == "script":
+            response = self.runScript(request.get("name"), args)
+        elif command == "ping":
+            response = self.makeResponse(True, [self.port, os.getpid(), int(time.time() - self.startTime), self.numRequests], [], None)
+        elif command == "shutdown":
+            self.running = False
+            response = self.makeResponse(True, [], [[C_SEVERITY_MESSAGE, "Shutting down"]], None)
+        else:
+            raise RequestError("Unknown command: " + str(command))
+
+        response["seconds"] = round(time.time() - startTime, 3)
+        return response
+
+    def makeResponse(self, ok, outputs, messages, error):
+        return {"ok": ok, "outputs": outputs, "messages": messages, "error": error, "seconds": 0.0}
+
+    # Returns the messages from the last tool run
+    def getToolMessages(self):
+        arcpy = self.arcpy
+        messages = []
+        for i in range(arcpy.GetMessageCount()):
+            messages.append([arcpy.GetSeverity(i), toJsonValue(arcpy.GetMessage(i))])
+        return messages
+
+    # Runs a tool from the Workflow Manager Administration Utilities toolbox
+    def runTool(self, name, args):
+        toolFunction = getattr(self.arcpy, str(name) + "_" + C_TOOLBOX_ALIAS, None)
+        if name == None or toolFunction == None:
+            raise RequestError("Unknown tool: " + str(name))
+
+        try:
+            result = toolFunction(*args)
+        except Exception as ex:
+            return self.makeResponse(False, [], self.getToolMessages(), str(ex))
+
+        outputs = []
+        for i in range(result.outputCount):
+            outputs.append(toJsonValue(result.getOutput(i)))
+        return self.makeResponse(True, outputs, self.getToolMessages(), None)
+
+    # Runs one of the utility scripts, which is imported the first time it's
+    # run and kept loaded afterward.  As with a script tool, the script reports
+    # its errors as error messages rather than exceptions.
+    def runScript(self, name, args):
+        if name not in C_SCRIPTS:
+            raise RequestError("Unknown script: " + str(name))
+
+        context = ScriptContext(self, args)
+        with context:
+            try:
+                if name not in self.scripts:
+                    self.scripts[name] = __import__(name)
+                self.scripts[name].main()
+            except Exception as ex:
+                context.AddError("Caught exception: " + str(ex))
+
+        ok = True
+        for (severity, message) in context.messages:
+            if severity == C_SEVERITY_ERROR:
+                ok = False
+        return self.makeResponse(ok, context.getOutputs(), context.messages, None)
+
+
+# Function that prints an explanation of how to use this script
+def printUsage():
+    print("""
+Runs the Workflow Manager Administration Utilities on behalf of clients
+(AdminClient.py) on this machine, keeping arcpy, the Workflow Manager
+toolbox and the Workflow Manager database connections loaded between runs.
+
+Usage:
+  AdminDaemon.py [options]
+
+Options:
+  -p PORT, --port=PORT      Port on which to listen (default: any free port)
+  -i FILE, --info-file=FILE File in which to record the port and token used
+                            by clients (default:
+                            %LOCALAPPDATA%\\""" + C_INFO_DIR + "\\" + C_INFO_FILE + """)
+  -c SECS, --cache-age=SECS Number of seconds for which a Workflow Manager
+                            database's configuration is reused before it is
+                            reloaded (default: """ + str(C_DEFAULT_CACHE_AGE) + """)
+""")
+
+
+# Script entry point
+def main():
+    parser = optparse.OptionParser(add_help_option=False)
+    parser.add_option("-p", "--port", dest="port", type="int", default=C_DEFAULT_PORT)
+    parser.add_option("-i", "--info-file", dest="infoFile", default=None)
+    parser.add_option("-c", "--cache-age", dest="cacheAge", type="int", default=C_DEFAULT_CACHE_AGE)
+    parser.add_option("-h", "--help", dest="help", action="store_true", default=False)
+    (options, args) = parser.parse_args()
+
+    if options.help or len(args) > 0:
+        printUsage()
+        return 1
+
+    # Make the scripts run by the daemon importable
+    scriptDir = os.path.dirname(os.path.abspath(__file__))
+    if scriptDir not in sys.path:
+        sys.path.insert(0, scriptDir)
+
+    daemon = AdminDaemon(options.port, options.infoFile, max(0, options.cacheAge))
+    try:
+        daemon.initialize()
+        daemon.start()
+    except (LicenseError, InstallationError, socket.error) as ex:
+        sys.stderr.write("Could not start: " + str(ex) + "\n")
+        return 1
+
+    print("Listening on " + C_HOST + ":" + str(daemon.port) + " (info file: " + daemon.infoFile + ")")
+    try:
+        daemon.serveForever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.stop()
+    print("Stopped after " + str(daemon.numRequests) + " request(s)")
+    return 0
+
+
+# Entry point for the script
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+# ---------------------------------------------------------------------------
+# AoiIndex.py
+#
+# An in-memory index of the areas of interest (AOIs) of existing jobs, used
+# to find the jobs that already cover a feature without running a spatial
+# query for each feature.  The index is built with a single read of the
+# Workflow Manager AOI feature class (JTX_JOBS_AOI).
+#
+# Exact duplicates are found by a hash of each AOI's vertex count and
+# extent, and confirmed by comparing the geometries.  If a tolerance is
+# given, near-duplicates (AOIs whose extents are within the tolerance of
+# the feature's extent on every side) are also found, using a grid of
+# bounding boxes.
+# ---------------------------------------------------------------------------
+
+
+C_FIELD_JOB_ID = "JOB_ID"
+
+# Number of decimal places to which extents are rounded when hashed
+C_HASH_DIGITS = 6
+
+# AOIs that would cover more grid cells than this are kept in a separate
+# list, which is checked for every feature
+C_MAX_CELLS_PER_AOI = 256
+
+# Kinds of matches returned by findDuplicates()
+C_MATCH_EXACT = "exact"
+C_MATCH_NEAR = "near"
+
+
+class AoiIndex(object):
+
+    # Creates an empty index.  "tolerance" is the distance (in the units of
+    # the AOIs' coordinate system) within which two extents are considered
+    # to be near-duplicates; if 0, only exact duplicates are found.
+    def __init__(self, tolerance=0.0):
+        self.tolerance = max(0.0, float(tolerance or 0.0))
+        self.exact = {}
+        self.entries = []
+        self.grid = None
+        self.largeEntries = []
+        self.cellSize = None
+
+    # Returns the key under which a geometry is hashed
+    def _hashKey(self, geometry):
+        e = geometry.extent
+        return (geometry.pointCount,
+                round(e.XMin, C_HASH_DIGITS), round(e.YMin, C_HASH_DIGITS),
+                round(e.XMax, C_HASH_DIGITS), round(e.YMax, C_HASH_DIGITS))
+
+    # Returns the range of grid cells that an extent (grown by the tolerance)
+    # covers, as (x0, y0, x1, y1)
+    def _cellRange(self, xMin, yMin, xMax, yMax):
+        t = self.tolerance
+        return (int((xMin - t) // self.cellSize), int((yMin - t) // self.cellSize),
+                int((xMax + t) // self.cellSize), int((yMax + t) // self.cellSize))
+
+    # Adds an entry to the grid of bounding boxes
+    def _addToGrid(self, entry):
+        (jobId, xMin, yMin, xMax, yMax) = entry
+        (x0, y0, x1, y1) = self._cellRange(xMin, yMin, xMax, yMax)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > C_MAX_CELLS_PER_AOI:
+            self.largeEntries.append(entry)
+            return
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                self.grid.setdefault((x, y), []).append(entry)
+
+    # Builds the grid of bounding boxes once all of the AOIs have been read.
+    # The cells are sized to match the average AOI, so that each AOI falls in
+    # only a few cells.
+    def _buildGrid(self):
+        self.grid = {}
+        self.largeEntries = []
+        if len(self.entries) == 0:
+            self.cellSize = None
+            return
+        totalSize = 0.0
+        for (jobId, xMin, yMin, xMax, yMax) in self.entries:
+            totalSize += max(xMax - xMin, yMax - yMin)
+        self.cellSize = max(totalSize / len(self.entries), self.tolerance, 1e-9)
+        for entry in self.entries:
+            self._addToGrid(entry)
+
+    # Adds a job's AOI to the index (ex: after a job has been created, so
+    # that a duplicate feature later in the same input is also found)
+    def add(self, jobId, geometry):
+        if geometry == None:
+            return
+        self.exact.setdefault(self._hashKey(geometry), []).append((jobId, geometry))
+        if self.tolerance > 0:
+            e = geometry.extent
+            entry = (jobId, e.XMin, e.YMin, e.XMax, e.YMax)
+            self.entries.append(entry)
+            if self.grid != None:
+                if self.cellSize == None:
+                    self._buildGrid()
+                else:
+                    self._addToGrid(entry)
+
+    # Reads every AOI from the AOI feature class (or layer), optionally
+    # limited by a where clause (ex: to the jobs of a particular type), and
+    # projected into the given spatial reference.  Returns the number of AOIs
+    # read.
+    def build(self, aoiFeatures, whereClause="", spatialReference=None):
+        import arcpy
+
+        shapeField = arcpy.Describe(aoiFeatures).shapeFieldName
+        count = 0
+        rows = arcpy.SearchCursor(aoiFeatures, whereClause, spatialReference, C_FIELD_JOB_ID + ";" + shapeField)
+        try:
+            for row in rows:
+                self.add(row.getValue(C_FIELD_JOB_ID), row.getValue(shapeField))
+                count += 1
+        finally:
+            del rows
+
+        if self.tolerance > 0:
+            self._buildGrid()
+        return count
+
+    # Returns the jobs whose AOIs duplicate a geometry, as a list of
+    # (job ID, match kind) tuples
+    def findDuplicates(self, geometry):
+        if geometry == None:
+            return []
+
+        matches = []
+        found = set()
+        for (jobId, aoi) in self.exact.get(self._hashKey(geometry), []):
+            if jobId not in found and geometry.equals(aoi):
+                matches.append((jobId, C_MATCH_EXACT))
+                found.add(jobId)
+
+        if self.tolerance > 0 and self.cellSize != None:
+            # A near-duplicate's extent lies within the tolerance of the
+            # geometry's extent, so it must be in the cell containing the
+            # geometry's lower-left corner (or in the list of large AOIs)
+            e = geometry.extent
+            t = self.tolerance
+            cell = (int(e.XMin // self.cellSize), int(e.YMin // self.cellSize))
+            candidates = self.largeEntries + self.grid.get(cell, [])
+            for (jobId, xMin, yMin, xMax, yMax) in candidates:
+                if jobId not in found and \
+                        abs(xMin - e.XMin) <= t and abs(yMin - e.YMin) <= t and \
+                        abs(xMax - e.XMax) <= t and abs(yMax - e.YMax) <= t:
+                    matches.append((jobId, C_MATCH_NEAR))
+                    found.add(jobId)
+
+        return matches
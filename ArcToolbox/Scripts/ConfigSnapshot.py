@@ -0,0 +1,306 @@
+# ---------------------------------------------------------------------------
+# ConfigSnapshot.py
+#
+# Reads a snapshot of a Workflow Manager database's configuration, written by
+# the "Export Configuration Snapshot" tool, so that scripts can look up users,
+# groups, privileges, job types, data workspaces, map documents, and Task
+# Assistant workbooks without querying the database each time.
+#
+# The snapshot is read into memory once; every lookup after that is a
+# dictionary or set lookup.  Names are compared without regard to case, as
+# they are in the Workflow Manager database, but are always returned as they
+# appear in the snapshot.
+#
+# Reading a snapshot does not require arcpy; refreshing one does.  Run this
+# script from the command line to summarize the contents of a snapshot.
+# ---------------------------------------------------------------------------
+
+import datetime
+import os
+import sys
+import time
+
+
+C_FILE_HEADER = "WMAU_CONFIG_SNAPSHOT"
+C_FILE_VERSION = "1"
+C_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+C_SEPARATOR = "\t"
+
+C_LINE_DATABASE = "DATABASE"
+C_LINE_STAMP = "STAMP"
+C_LINE_CREATED = "CREATED"
+C_LINE_USER = "USER"
+C_LINE_GROUP = "GROUP"
+C_LINE_MEMBER = "MEMBER"
+C_LINE_PRIVILEGE = "PRIVILEGE"
+C_LINE_GRANT = "GRANT"
+C_LINE_JOB_TYPE = "JOB_TYPE"
+C_LINE_WORKSPACE = "WORKSPACE"
+C_LINE_MAP_DOCUMENT = "MAP_DOCUMENT"
+C_LINE_TAM_WORKBOOK = "TAM_WORKBOOK"
+
+C_OPT_ONLY_IF_CHANGED = "ONLY_IF_CHANGED"
+
+
+class SnapshotError(Exception):
+    pass
+
+
+# Function that prints an explanation of how to use this script
+def printUsage():
+    print("""
+Summarizes a snapshot written by the "Export Configuration Snapshot" tool.
+
+Usage:
+  ConfigSnapshot.py <snapshot file> [user name]
+
+If a user name is given, the user's groups and privileges are listed.
+""")
+
+
+def _key(name):
+    return name.lower()
+
+
+# The contents of a configuration snapshot
+class ConfigSnapshot(object):
+
+    def __init__(self):
+        self.databaseAlias = ""
+        self.stamp = ""
+        self.created = None
+
+        # Each of these maps a lower-case name to the name (or, for users, a
+        # tuple of the name, full name, and e-mail address) in the snapshot
+        self.users = {}
+        self.groups = {}
+        self.privileges = {}
+        self.workbooks = {}
+
+        # Each of these maps a lower-case name to a tuple of the name and a
+        # single property (job type state, database ID, or category)
+        self.jobTypes = {}
+        self.workspaces = {}
+        self.mapDocuments = {}
+
+        # Group membership and privileges, keyed by lower-case names
+        self.groupMembers = {}
+        self.userGroups = {}
+        self.groupPrivileges = {}
+
+    # Reads a snapshot from a file
+    def read(self, path):
+        f = open(path, "rb")
+        try:
+            lines = f.read().decode("utf-8").split("\n")
+        finally:
+            f.close()
+
+        header = lines[0].rstrip("\r").split(C_SEPARATOR)
+        if len(header) < 2 or header[0] != C_FILE_HEADER:
+            raise SnapshotError(path + " is not a configuration snapshot")
+        if header[1] != C_FILE_VERSION:
+            raise SnapshotError(path + " is a version " + header[1] + " snapshot; only version " + C_FILE_VERSION + " is supported")
+
+        for line in lines[1:]:
+            line = line.rstrip("\r")
+            if len(line) == 0:
+                continue
+            values = line.split(C_SEPARATOR)
+            lineType = values[0]
+            values = values[1:] + [""] * 3
+
+            if lineType == C_LINE_DATABASE:
+                self.databaseAlias = values[0]
+            elif lineType == C_LINE_STAMP:
+                self.stamp = values[0]
+            elif lineType == C_LINE_CREATED:
+                self.created = datetime.datetime.strptime(values[0], C_DATE_FORMAT)
+            elif lineType == C_LINE_USER:
+                self.users[_key(values[0])] = (values[0], values[1], values[2])
+            elif lineType == C_LINE_GROUP:
+                self.groups[_key(values[0])] = values[0]
+            elif lineType == C_LINE_MEMBER:
+                self.groupMembers.setdefault(_key(values[0]), set()).add(_key(values[1]))
+                self.userGroups.setdefault(_key(values[1]), set()).add(_key(values[0]))
+            elif lineType == C_LINE_PRIVILEGE:
+                self.privileges[_key(values[0])] = values[0]
+            elif lineType == C_LINE_GRANT:
+                self.groupPrivileges.setdefault(_key(values[0]), set()).add(_key(values[1]))
+            elif lineType == C_LINE_JOB_TYPE:
+                self.jobTypes[_key(values[0])] = (values[0], values[1])
+            elif lineType == C_LINE_WORKSPACE:
+                self.workspaces[_key(values[0])] = (values[0], values[1])
+            elif lineType == C_LINE_MAP_DOCUMENT:
+                self.mapDocuments[_key(values[0])] = (values[0], values[1])
+            elif lineType == C_LINE_TAM_WORKBOOK:
+                self.workbooks[_key(values[0])] = values[0]
+            # Lines of any other type were added by a later version of the
+            # tool, and are skipped
+
+    # Returns the number of seconds since the snapshot was exported
+    def getAge(self):
+        if self.created == None:
+            return None
+        return time.time() - time.mktime(self.created.timetuple())
+
+    def userExists(self, userName):
+        return _key(userName) in self.users
+
+    def groupExists(self, groupName):
+        return _key(groupName) in self.groups
+
+    def privilegeExists(self, privilegeName):
+        return _key(privilegeName) in self.privileges
+
+    def jobTypeExists(self, jobTypeName):
+        return _key(jobTypeName) in self.jobTypes
+
+    def workspaceExists(self, workspaceName):
+        return _key(workspaceName) in self.workspaces
+
+    def mapDocumentExists(self, mapName):
+        return _key(mapName) in self.mapDocuments
+
+    def workbookExists(self, workbookAlias):
+        return _key(workbookAlias) in self.workbooks
+
+    def isMember(self, userName, groupName):
+        return _key(groupName) in self.userGroups.get(_key(userName), ())
+
+    def groupHasPrivilege(self, groupName, privilegeName):
+        return _key(privilegeName) in self.groupPrivileges.get(_key(groupName), ())
+
+    # A user holds a privilege if any of the groups to which it belongs does
+    def userHasPrivilege(self, userName, privilegeName):
+        privilege = _key(privilegeName)
+        for group in self.userGroups.get(_key(userName), ()):
+            if privilege in self.groupPrivileges.get(group, ()):
+                return True
+        return False
+
+    # Returns the full name and e-mail address of a user, or None if the user
+    # isn't in the snapshot
+    def getUserInfo(self, userName):
+        user = self.users.get(_key(userName))
+        if user == None:
+            return None
+        return (user[1], user[2])
+
+    # Returns the state ("ACTIVE", etc.) of a job type, or None
+    def getJobTypeState(self, jobTypeName):
+        jobType = self.jobTypes.get(_key(jobTypeName))
+        if jobType == None:
+            return None
+        return jobType[1]
+
+    # Returns the database ID of a data workspace, or None
+    def getWorkspaceId(self, workspaceName):
+        workspace = self.workspaces.get(_key(workspaceName))
+        if workspace == None:
+            return None
+        return workspace[1]
+
+    # Returns the category of a map document, or None
+    def getMapDocumentCategory(self, mapName):
+        mapDocument = self.mapDocuments.get(_key(mapName))
+        if mapDocument == None:
+            return None
+        return mapDocument[1]
+
+    def getGroupsForUser(self, userName):
+        return sorted([self.groups.get(g, g) for g in self.userGroups.get(_key(userName), ())])
+
+    def getUsersInGroup(self, groupName):
+        return sorted([self._userName(u) for u in self.groupMembers.get(_key(groupName), ())])
+
+    def getPrivilegesForGroup(self, groupName):
+        return sorted([self.privileges.get(p, p) for p in self.groupPrivileges.get(_key(groupName), ())])
+
+    def getPrivilegesForUser(self, userName):
+        privileges = set()
+        for group in self.userGroups.get(_key(userName), ()):
+            privileges.update(self.groupPrivileges.get(group, ()))
+        return sorted([self.privileges.get(p, p) for p in privileges])
+
+    def _userName(self, key):
+        user = self.users.get(key)
+        if user == None:
+            return key
+        return user[0]
+
+    def listUsers(self):
+        return sorted([u[0] for u in self.users.values()])
+
+    def listGroups(self):
+        return sorted(self.groups.values())
+
+    def listPrivileges(self):
+        return sorted(self.privileges.values())
+
+    def listJobTypes(self):
+        return sorted([j[0] for j in self.jobTypes.values()])
+
+    def listWorkspaces(self):
+        return sorted([w[0] for w in self.workspaces.values()])
+
+    def listMapDocuments(self):
+        return sorted([m[0] for m in self.mapDocuments.values()])
+
+    def listWorkbooks(self):
+        return sorted(self.workbooks.values())
+
+
+# Reads a snapshot from a file
+def load(path):
+    snapshot = ConfigSnapshot()
+    snapshot.read(path)
+    return snapshot
+
+
+# Brings a snapshot up to date with the Workflow Manager database (the file is
+# only rewritten if the configuration has changed) and reads it
+def refresh(path, wmxDbAlias=""):
+    import arcpy
+    arcpy.ExportConfigurationSnapshot_WMXAdminUtils(path, C_OPT_ONLY_IF_CHANGED, wmxDbAlias)
+    return load(path)
+
+
+# Summarizes the contents of a snapshot
+def main():
+    if len(sys.argv) < 2 or len(sys.argv) > 3 or sys.argv[1] in ("-h", "--help"):
+        printUsage()
+        return 1
+    if not os.path.exists(sys.argv[1]):
+        sys.stderr.write("Snapshot " + sys.argv[1] + " does not exist\n")
+        return 1
+
+    try:
+        snapshot = load(sys.argv[1])
+    except (SnapshotError, ValueError) as ex:
+        sys.stderr.write(str(ex) + "\n")
+        return 1
+
+    if len(sys.argv) > 2:
+        userName = sys.argv[2]
+        if not snapshot.userExists(userName):
+            sys.stderr.write("User " + userName + " is not in the snapshot\n")
+            return 1
+        print("Groups: " + ", ".join(snapshot.getGroupsForUser(userName)))
+        print("Privileges: " + ", ".join(snapshot.getPrivilegesForUser(userName)))
+        return 0
+
+    age = snapshot.getAge()
+    print("Database: " + snapshot.databaseAlias)
+    if age != None:
+        print("Exported %.0f second(s) ago" % age)
+    print("%d user(s), %d group(s), %d privilege(s), %d job type(s)" % (
+        len(snapshot.users), len(snapshot.groups), len(snapshot.privileges), len(snapshot.jobTypes)))
+    print("%d data workspace(s), %d map document(s), %d Task Assistant workbook(s)" % (
+        len(snapshot.workspaces), len(snapshot.mapDocuments), len(snapshot.workbooks)))
+    return 0
+
+
+# Entry point for the script
+if __name__ == "__main__":
+    sys.exit(main())
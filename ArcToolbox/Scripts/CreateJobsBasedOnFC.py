@@ -5,6 +5,9 @@
 # Import arcpy module
 import arcpy
 import os
+import AdaptiveExecutor
+import AoiIndex
+import JobJournal
 
 
 # Define a basic class used to call out core installation errors
@@ -48,11 +51,76 @@ def logPreviousToolMessages():
         i += 1
 
 
+# Function to log the messages from a tool that may have been run in another
+# process, where the geoprocessor's own messages may belong to a different tool
+def logToolResultMessages(result):
+    for i in range(result.messageCount):
+        severity = result.getSeverity(i)
+        if severity == 2:
+            arcpy.AddError(result.getMessage(i))
+        elif severity == 1:
+            arcpy.AddWarning(result.getMessage(i))
+        else:
+            arcpy.AddMessage(result.getMessage(i))
+
+
+# Function to determine whether the user has asked for the script to stop
+def isCancelled():
+    return getattr(arcpy.env, "isCancelled", False)
+
+
+# Function to read an optional parameter that the script tool may not define
+# (ex: a parameter added to this script after the tool was added to a
+# toolbox); returns the default value if the tool doesn't define it
+def getOptionalParameterAsText(index, default=""):
+    if index >= arcpy.GetArgumentCount():
+        return default
+    return arcpy.GetParameterAsText(index)
+
+
+# Function to describe the existing jobs that duplicate a feature.  Jobs
+# still being created by this run are identified by a ("feature", object ID)
+# tuple, rather than by a job ID.
+def describeDuplicates(duplicates):
+    descs = []
+    for (jobId, matchKind) in duplicates:
+        if isinstance(jobId, tuple):
+            descs.append("the job for feature " + str(jobId[1]) + " (" + matchKind + " match)")
+        else:
+            descs.append("job " + str(jobId) + " (" + matchKind + " match)")
+    return ", ".join(descs)
+
+
+# Creates a job for a single feature.  Each job's AOI is taken from the
+# selected feature in a layer, so each worker process makes a layer of its
+# own (the calling process uses the layer it has already made).
+class CreateJobCall(AdaptiveExecutor.ToolCall):
+
+    def __init__(self, wmxToolbox, fc, fcExpression, layer, toolArgs):
+        AdaptiveExecutor.ToolCall.__init__(self, wmxToolbox, "CreateJob", toolArgs)
+        self.fc = fc
+        self.fcExpression = fcExpression
+        self.layer = layer
+
+    def setUp(self):
+        AdaptiveExecutor.ToolCall.setUp(self)
+        if not arcpy.Exists(self.layer):
+            arcpy.MakeFeatureLayer_management(self.fc, self.layer, self.fcExpression)
+
+    def __call__(self, objId):
+        selExp = "OBJECTID = " + str(objId)
+        arcpy.SelectLayerByAttribute_management(self.layer, "NEW_SELECTION", selExp)
+
+        # Create a job based on these parameters
+        return AdaptiveExecutor.ToolCall.__call__(self, self.layer)
+
+
 # Main function
 def main():
 
     row = None
     rows = None
+    journal = None
     specifiedFeatures = "SpecifiedFeatures_layer"
 
     try:
@@ -84,6 +152,41 @@ def main():
         paramIndex += 1
         wmxDbAlias = arcpy.GetParameterAsText(paramIndex)
         paramIndex += 1
+        outputParamIndex = paramIndex
+        paramIndex += 1
+        journalFile = getOptionalParameterAsText(paramIndex)
+        paramIndex += 1
+        resume = getOptionalParameterAsText(paramIndex).lower() == "true"
+        paramIndex += 1
+        existingAoiFeatures = getOptionalParameterAsText(paramIndex)
+        paramIndex += 1
+        existingJobsQuery = getOptionalParameterAsText(paramIndex)
+        paramIndex += 1
+        duplicateTolerance = getOptionalParameterAsText(paramIndex)
+        paramIndex += 1
+        flagDuplicates = getOptionalParameterAsText(paramIndex).upper() == "FLAG_DUPLICATES"
+        paramIndex += 1
+        maxConcurrentCalls = getOptionalParameterAsText(paramIndex)
+        paramIndex += 1
+
+        try:
+            duplicateTolerance = float(duplicateTolerance or 0)
+        except ValueError:
+            raise InvalidArgumentError("Duplicate tolerance must be a number")
+        try:
+            maxConcurrentCalls = AdaptiveExecutor.parseMaxWorkers(maxConcurrentCalls)
+        except ValueError:
+            raise InvalidArgumentError("Maximum concurrent calls must be a whole number of at least 1")
+
+        # Open the journal of features for which jobs have been created, if
+        # one was specified.  The journal is keyed by object ID, and records
+        # the ID of the job created for each feature.
+        if journalFile:
+            journal = JobJournal.JobJournal(
+                journalFile, "CreateJobsBasedOnFC|" + fc + "|" + fcExpression + "|" + jobType + "|" + wmxDbAlias, resume)
+            if journal.getCompletedCount() > 0:
+                arcpy.AddMessage("Resuming; jobs were created previously for " +
+                                 str(journal.getCompletedCount()) + " feature(s)")
 
         # Import the Workflow Manager toolbox
         wmxToolbox = getWorkflowManagerToolboxLocation()
@@ -96,26 +199,80 @@ def main():
         result = arcpy.GetCount_management(specifiedFeatures)
         numNewJobs = int(result.getOutput(0))
 
-        # Create a new job for each one of these specified features
+        # Index the AOIs of the existing jobs, if they were specified, so that
+        # features that already have jobs can be found without a spatial query
+        # for each feature
+        aoiIndex = None
+        shapeField = None
+        if existingAoiFeatures:
+            arcpy.SetProgressorLabel("Reading existing job AOIs...")
+            fcDesc = arcpy.Describe(fc)
+            shapeField = fcDesc.shapeFieldName
+            aoiIndex = AoiIndex.AoiIndex(duplicateTolerance)
+            numAois = aoiIndex.build(existingAoiFeatures, existingJobsQuery, fcDesc.spatialReference)
+            arcpy.AddMessage("Read the AOIs of " + str(numAois) + " existing job(s)")
+
+        # Create a new job for each one of these specified features, with as
+        # many being created at once as the database can keep up with (up to
+        # the maximum specified)
         newJobs = []
-        rows = arcpy.SearchCursor(specifiedFeatures)
-        arcpy.SetProgressor("step", "Creating jobs...", 0, numNewJobs, 1)
-        for row in rows:
-            # Iterate through all of the features in this layer, selecting each one in turn
-            objId = row.getValue("OBJECTID")
-            selExp = "OBJECTID = " + str(objId)
-            arcpy.SelectLayerByAttribute_management(specifiedFeatures, "NEW_SELECTION", selExp)
-            logPreviousToolMessages()
-
-            # Create a job based on these parameters
-            result = arcpy.CreateJob_WMXAdminUtils(
-                jobType, owner, assigneeType, assignee, specifiedFeatures,
-                startDate, dueDate, priority, parentJobId, dataWorkspace,
-                parentVersion, wmxDbAlias)
-            logPreviousToolMessages()
+        progress = {"count": 0, "duplicates": 0}
+
+        def featuresWithoutJobs(rows):
+            for row in rows:
+                # Iterate through all of the features in this layer, selecting each one in turn
+                objId = row.getValue("OBJECTID")
+                if journal != None and journal.isCompleted(objId):
+                    newJobs.append(journal.getValue(objId))
+                    progress["count"] += 1
+                    arcpy.SetProgressorPosition(progress["count"])
+                    continue
+
+                # Skip (or just report) any feature that already has a job.
+                # The feature is added to the index as soon as it's handed out,
+                # so that overlapping features in this run are caught even while
+                # its job is still being created.
+                shape = None
+                if aoiIndex != None:
+                    shape = row.getValue(shapeField)
+                    duplicates = aoiIndex.findDuplicates(shape)
+                    if len(duplicates) > 0:
+                        progress["duplicates"] += 1
+                        if not flagDuplicates:
+                            arcpy.AddWarning("Skipping feature " + str(objId) + "; already covered by " + describeDuplicates(duplicates))
+                            progress["count"] += 1
+                            arcpy.SetProgressorPosition(progress["count"])
+                            continue
+                        arcpy.AddWarning("Feature " + str(objId) + " is already covered by " + describeDuplicates(duplicates))
+                    aoiIndex.add(("feature", objId), shape)
+
+                yield objId
+
+        def onJobCreated(objId, result, error):
+            if error != None:
+                raise error
+            logToolResultMessages(result)
             newJobs.append(result.getOutput(0))
+            if journal != None:
+                journal.markCompleted(objId, result.getOutput(0))
+            progress["count"] += 1
+            arcpy.SetProgressorPosition(progress["count"])
 
-            arcpy.SetProgressorPosition(len(newJobs))
+        def onProgress(stats):
+            arcpy.SetProgressorLabel("Creating jobs (" + stats.describe() + ")...")
+
+        rows = arcpy.SearchCursor(specifiedFeatures)
+        arcpy.SetProgressor("step", "Creating jobs...", 0, numNewJobs, 1)
+        # A job creation that timed out may still have created the job, so
+        # the calls are never retried
+        createJob = CreateJobCall(wmxToolbox, fc, fcExpression, specifiedFeatures, [
+            jobType, owner, assigneeType, assignee, AdaptiveExecutor.C_ITEM,
+            startDate, dueDate, priority, parentJobId, dataWorkspace,
+            parentVersion, wmxDbAlias])
+        executor = AdaptiveExecutor.AdaptiveExecutor(maxConcurrentCalls, retryBusyCalls=False)
+        executor.run(featuresWithoutJobs(rows), createJob, onJobCreated, onProgress, isCancelled)
+        arcpy.AddMessage("Created jobs for " + executor.getStats().summarize())
+        numDuplicates = progress["duplicates"]
 
         # Set the return value for this tool (a multivalue containing the list of IDs
         # for the jobs that were created)
@@ -124,8 +281,13 @@ def main():
             newJobsStr += jobId + ";"
 
         newJobsStr = newJobsStr.rstrip(";")
-        arcpy.SetParameterAsText(paramIndex, newJobsStr)
+        arcpy.SetParameterAsText(outputParamIndex, newJobsStr)
         arcpy.AddMessage("Created jobs: " + newJobsStr)
+        if numDuplicates > 0:
+            if flagDuplicates:
+                arcpy.AddWarning(str(numDuplicates) + " feature(s) were already covered by existing jobs")
+            else:
+                arcpy.AddWarning("Skipped " + str(numDuplicates) + " feature(s) already covered by existing jobs")
 
     except Exception, ex:
         arcpy.AddError("Caught exception: " + str(ex))
@@ -138,6 +300,10 @@ def main():
             del rows
             arcpy.Delete_management(specifiedFeatures)
 
+        # Make sure that every job created so far is recorded in the journal
+        if journal != None:
+            journal.close()
+
 
 # Entry point for the script
 if __name__ == "__main__":
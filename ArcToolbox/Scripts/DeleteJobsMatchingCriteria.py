@@ -5,6 +5,9 @@
 # Import arcpy module
 import arcpy
 import os
+import AdaptiveExecutor
+import JobJournal
+import JobMirror
 
 
 # Define a basic class used to call out core installation errors
@@ -48,9 +51,91 @@ def logPreviousToolMessages():
         i += 1
 
 
+# Function to log the messages from a tool that may have been run in another
+# process, where the geoprocessor's own messages may belong to a different tool
+def logToolResultMessages(result):
+    for i in range(result.messageCount):
+        severity = result.getSeverity(i)
+        if severity == 2:
+            arcpy.AddError(result.getMessage(i))
+        elif severity == 1:
+            arcpy.AddWarning(result.getMessage(i))
+        else:
+            arcpy.AddMessage(result.getMessage(i))
+
+
+# Function to determine whether the user has asked for the script to stop
+def isCancelled():
+    return getattr(arcpy.env, "isCancelled", False)
+
+
+# Function to read an optional parameter that the script tool may not define
+# (ex: a parameter added to this script after the tool was added to a
+# toolbox); returns the default value if the tool doesn't define it
+def getOptionalParameterAsText(index, default=""):
+    if index >= arcpy.GetArgumentCount():
+        return default
+    return arcpy.GetParameterAsText(index)
+
+
+# Function to find the jobs matching a query using a local mirror of the
+# JTX_JOBS table, refreshing the mirror first if it is older than the given
+# age (in seconds).  The mirror is used to narrow down the jobs to be
+# deleted; as a safety check, the query is then run against the Workflow
+# Manager database, restricted to the IDs of the jobs found (one ListJobs
+# call per JobMirror.C_ID_CHUNK_SIZE jobs), and only the jobs that the
+# database confirms still match are returned (as a semicolon-delimited list
+# of job IDs).  Jobs that have come to match the query since the mirror was
+# last refreshed are not found.  Returns None if the query can't be run
+# against the mirror.
+def findJobsUsingMirror(mirror, jobsTable, sqlQuery, wmxDbAlias, maxMirrorAge, modifiedField):
+    age = mirror.getAge()
+    if age == None or age > maxMirrorAge:
+        arcpy.SetProgressorLabel("Refreshing job mirror...")
+        (numCopied, numRemoved, fullRefresh) = mirror.sync(jobsTable, modifiedField)
+        if fullRefresh:
+            arcpy.AddMessage("Refreshed job mirror; copied all " + str(numCopied) + " job(s)")
+        else:
+            arcpy.AddMessage("Refreshed job mirror; copied " + str(numCopied) + " new or modified job(s), removed " +
+                             str(numRemoved) + " deleted job(s)")
+    else:
+        arcpy.AddMessage("Using job mirror refreshed " + str(int(age)) + " second(s) ago")
+
+    try:
+        candidates = mirror.findJobs(sqlQuery)
+    except JobMirror.MirrorError, ex:
+        arcpy.AddWarning(str(ex) + "; querying the Workflow Manager database instead")
+        return None
+
+    # The mirror only knows about the jobs as they were at its last refresh
+    staleness = "refreshed " + str(int(mirror.getAge())) + " second(s) ago"
+    if mirror.getModifiedField() == None:
+        staleness += "; changes to existing jobs are only seen after a full refresh"
+    arcpy.AddWarning(str(len(candidates)) + " job(s) matched the query in the job mirror (" + staleness +
+                     "); jobs that have come to match it since then will not be deleted")
+
+    # Confirm the jobs found against the database before anything is deleted
+    arcpy.SetProgressorLabel("Confirming jobs found in mirror...")
+    confirmed = []
+    for query in JobMirror.buildIdQueries(candidates, sqlQuery):
+        result = arcpy.ListJobs_WMXAdminUtils(jobsTable, query, wmxDbAlias)
+        logPreviousToolMessages()
+        if result.outputCount > 0 and result.getOutput(0):
+            confirmed.extend(result.getOutput(0).split(";"))
+
+    if len(confirmed) < len(candidates):
+        arcpy.AddWarning(str(len(candidates) - len(confirmed)) + " job(s) found in the job mirror no longer match " +
+                         "the query in the Workflow Manager database, and will not be deleted")
+    return ";".join(confirmed)
+
+
 # Main function
 def main():
 
+    journal = None
+    mirror = None
+    jobsDeleted = []
+
     try:
         # Error checking and argument fetching
         if arcpy.GetArgumentCount() < 1:
@@ -64,43 +149,103 @@ def main():
         paramIndex += 1
         wmxDbAlias = arcpy.GetParameterAsText(paramIndex)
         paramIndex += 1
+        outputParamIndex = paramIndex
+        paramIndex += 1
+        journalFile = getOptionalParameterAsText(paramIndex)
+        paramIndex += 1
+        resume = getOptionalParameterAsText(paramIndex).lower() == "true"
+        paramIndex += 1
+        mirrorFile = getOptionalParameterAsText(paramIndex)
+        paramIndex += 1
+        maxMirrorAge = getOptionalParameterAsText(paramIndex)
+        paramIndex += 1
+        maxConcurrentCalls = getOptionalParameterAsText(paramIndex)
+        paramIndex += 1
+        mirrorModifiedField = getOptionalParameterAsText(paramIndex)
+        paramIndex += 1
+
+        try:
+            maxMirrorAge = float(maxMirrorAge or 0)
+        except ValueError:
+            raise InvalidArgumentError("Maximum mirror age must be a number of seconds")
+        try:
+            maxConcurrentCalls = AdaptiveExecutor.parseMaxWorkers(maxConcurrentCalls)
+        except ValueError:
+            raise InvalidArgumentError("Maximum concurrent calls must be a whole number of at least 1")
+
+        # Open the journal of deleted jobs, if one was specified; when
+        # resuming, jobs deleted by a previous run are reported again
+        if journalFile:
+            journal = JobJournal.JobJournal(
+                journalFile, "DeleteJobsMatchingCriteria|" + jobsTable + "|" + sqlQuery + "|" + wmxDbAlias, resume)
+            jobsDeleted = journal.getCompletedItems()
+            if len(jobsDeleted) > 0:
+                arcpy.AddMessage("Resuming; " + str(len(jobsDeleted)) + " job(s) were deleted previously")
 
         # Import the Workflow Manager toolbox
         wmxToolbox = getWorkflowManagerToolboxLocation()
         arcpy.ImportToolbox(wmxToolbox, "WMXAdminUtils")
 
-        # Get the list of jobs matching the query
-        result = arcpy.ListJobs_WMXAdminUtils(jobsTable, sqlQuery, wmxDbAlias)
-        logPreviousToolMessages()
-        numOutputs = result.outputCount
+        # Get the list of jobs matching the query, from the job mirror if one
+        # was specified
+        jobListString = None
+        if mirrorFile:
+            mirror = JobMirror.JobMirror(mirrorFile, jobsTable + "|" + wmxDbAlias)
+            jobListString = findJobsUsingMirror(mirror, jobsTable, sqlQuery, wmxDbAlias, maxMirrorAge, mirrorModifiedField)
+
+        if jobListString == None:
+            result = arcpy.ListJobs_WMXAdminUtils(jobsTable, sqlQuery, wmxDbAlias)
+            logPreviousToolMessages()
+            numOutputs = result.outputCount
+
+            if numOutputs <= 0:
+                return
+
+            jobListString = result.getOutput(0)
 
-        if numOutputs <= 0:
-            return
-        
         # Output is a semicolon-delimited list of job IDs, so split up the
         # list, as required.
-        jobListString = result.getOutput(0)
         if jobListString == None or len(jobListString) <= 0:
             arcpy.AddMessage("No jobs matched query")
-            return
-
-        jobsToDelete = jobListString.split(";")
-        arcpy.AddMessage("Jobs to delete: " + str(jobListString))
+            if len(jobsDeleted) <= 0:
+                return
+            jobsToDelete = []
+        else:
+            jobsToDelete = jobListString.split(";")
+            arcpy.AddMessage("Jobs to delete: " + str(jobListString))
 
         # Set up the progress bar
         arcpy.SetProgressor("step", "Deleting jobs...", 0, len(jobsToDelete), 1)
 
-        # Delete each job
-        jobCount = 0
-        jobsDeleted = []
-        for job in jobsToDelete:
-            arcpy.SetProgressorLabel("Deleting job " + str(job))
-            arcpy.DeleteJob_WMXAdminUtils(job, wmxDbAlias)
-            logPreviousToolMessages()
-            jobCount += 1
+        # Delete each job, with as many deletions in progress at once as the
+        # database can keep up with (up to the maximum specified)
+        progress = {"count": 0}
+
+        def jobsNotYetDeleted():
+            for job in jobsToDelete:
+                if journal != None and journal.isCompleted(job):
+                    progress["count"] += 1
+                    arcpy.SetProgressorPosition(progress["count"])
+                    continue
+                yield job
+
+        def onJobDeleted(job, result, error):
+            if error != None:
+                raise error
+            logToolResultMessages(result)
             jobsDeleted.append(job)
-            
-            arcpy.SetProgressorPosition(jobCount)
+            if journal != None:
+                journal.markCompleted(job)
+            progress["count"] += 1
+            arcpy.SetProgressorPosition(progress["count"])
+
+        def onProgress(stats):
+            arcpy.SetProgressorLabel("Deleting jobs (" + stats.describe() + ")...")
+
+        executor = AdaptiveExecutor.AdaptiveExecutor(maxConcurrentCalls)
+        deleteJob = AdaptiveExecutor.ToolCall(wmxToolbox, "DeleteJob", [AdaptiveExecutor.C_ITEM, wmxDbAlias])
+        executor.run(jobsNotYetDeleted(), deleteJob, onJobDeleted, onProgress, isCancelled)
+        arcpy.AddMessage("Deleted " + executor.getStats().summarize())
 
         # Set the return value for this tool (a multivalue containing the list of IDs
         # for the jobs that were deleted)
@@ -109,12 +254,23 @@ def main():
             jobsDeletedStr += jobId + ";"
 
         jobsDeletedStr = jobsDeletedStr.rstrip(";")
-        arcpy.SetParameterAsText(paramIndex, jobsDeletedStr)
+        arcpy.SetParameterAsText(outputParamIndex, jobsDeletedStr)
         arcpy.AddMessage("Deleted jobs: " + jobsDeletedStr)
 
     except Exception, ex:
         arcpy.AddError("Caught exception: " + str(ex))
 
+    finally:
+        # Make sure that everything deleted so far is recorded in the journal
+        if journal != None:
+            journal.close()
+
+        # Keep the deleted jobs from being found in the mirror before its
+        # next refresh
+        if mirror != None:
+            mirror.removeJobs(jobsDeleted)
+            mirror.close()
+
 
 # Entry point for the script
 if __name__ == "__main__":
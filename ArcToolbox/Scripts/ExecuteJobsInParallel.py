@@ -0,0 +1,380 @@
+# ---------------------------------------------------------------------------
+# ExecuteJobsInParallel.py
+#
+# Executes the current step of each job in a set of jobs, using a pool of
+# worker processes.  Each worker imports the Workflow Manager toolbox (and
+# so opens its own connection to the Workflow Manager database), then runs
+# the "Execute Job" tool for each job it is handed.
+#
+# Jobs are handed to the workers through a bounded queue, and the results
+# are written out as they arrive, so memory use stays flat no matter how
+# many jobs are executed.
+#
+# NOTE: When this script is run as a script tool, it must be run out of
+# process ("Run Python script in process" unchecked), since the worker
+# processes cannot be started from within ArcMap itself.
+# ---------------------------------------------------------------------------
+
+# Import arcpy module
+import arcpy
+import csv
+import multiprocessing
+import os
+import signal
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+
+C_DEFAULT_NUM_WORKERS = 4
+C_QUEUE_DEPTH_PER_WORKER = 2
+C_POLL_INTERVAL = 1.0
+
+C_STATUS_SUCCEEDED = "Succeeded"
+C_STATUS_FAILED = "Failed"
+
+C_MSG_RESULT = "result"
+C_MSG_WORKER_DONE = "done"
+
+C_RESULTS_FIELDS = ["JOB_ID", "STATUS", "SECONDS", "WORKER", "MESSAGE"]
+
+
+# Define a basic class used to call out core installation errors
+class InstallationError(Exception):
+    pass
+
+
+# Define a basic class used to call out argument value errors
+class InvalidArgumentError(Exception):
+    pass
+
+
+# Define a basic class used to call out licensing errors
+class LicenseError(Exception):
+    pass
+
+
+# Function to determine the install location of the workflow manager toolbox
+def getWorkflowManagerToolboxLocation():
+    # Import the workflow manager toolbox
+    wmxToolbox = None
+
+    installations = arcpy.ListInstallations()
+    for installation in installations:
+        installInfo = arcpy.GetInstallInfo(installation)
+        if installInfo != None:
+            tbx = installInfo["InstallDir"] + os.sep + "ArcToolbox" + os.sep + "Toolboxes" + os.sep + "Workflow Manager Administration Tools.tbx"
+            tbx = os.path.normpath(tbx)
+            if os.path.exists(tbx):
+                wmxToolbox = tbx
+                break
+
+    if wmxToolbox == None:
+        raise InstallationError("Workflow Manager Administration Tools toolbox not found")
+
+    return wmxToolbox
+
+
+# Function to ensure that messages from a previously-run tool are not lost
+def logPreviousToolMessages():
+    i = 0
+    msgCount = arcpy.GetMessageCount()
+    while i < msgCount:
+        msg = arcpy.GetMessage(i)
+        arcpy.AddReturnMessage(i)
+        i += 1
+
+
+# Function to determine whether the user has asked for the script to stop
+def isCancelled():
+    return getattr(arcpy.env, "isCancelled", False)
+
+
+# Function to read an optional parameter that the script tool may not define;
+# returns the default value if the tool doesn't define it
+def getOptionalParameterAsText(index, default=""):
+    if index >= arcpy.GetArgumentCount():
+        return default
+    return arcpy.GetParameterAsText(index)
+
+
+# Function to run a saved query, writing the IDs of the jobs it finds to a
+# file in the given directory; returns the path to the file.  This must be
+# called on the main thread, since arcpy can't be used from other threads.
+def runQueryToFile(queryName, wmxDbAlias, tempDir):
+    queryResultFile = os.path.join(tempDir, "queryJobIds.txt")
+    arcpy.ListJobsUsingQuery_WMXAdminUtils(queryName, wmxDbAlias, "true", "", queryResultFile)
+    logPreviousToolMessages()
+    return queryResultFile
+
+
+# Generator returning the IDs of the jobs to be executed, one at a time, from
+# each of the given files.  The files are read a line at a time, rather than
+# being held in memory all at once.  A job ID set (.npy file; see
+# JobIdSet.py) may be given in place of a text file, in which case it is
+# memory-mapped.  Doesn't use arcpy, so it's safe to run on another thread.
+def listJobIds(jobIdFiles):
+    for jobIdFile in jobIdFiles:
+        if os.path.splitext(jobIdFile)[1].lower() == ".npy":
+            import JobIdSet
+            for jobId in JobIdSet.load(jobIdFile):
+                yield str(jobId)
+        else:
+            f = open(jobIdFile, "r")
+            try:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        yield line
+            finally:
+                f.close()
+
+
+# Main function for each worker process; executes jobs from the job queue
+# until it receives a None, or until the run is cancelled
+def executeJobsWorker(workerId, wmxToolbox, wmxDbAlias, jobQueue, resultQueue, cancelEvent):
+    error = ""
+
+    # Leave it to the main process to decide what to do when the user presses
+    # Ctrl+C, so that the current job isn't interrupted partway through
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    try:
+        # Each worker is a separate process, so it needs its own license
+        # and its own copy of the toolbox (and database connection)
+        if arcpy.CheckOutExtension("JTX") != "CheckedOut":
+            raise LicenseError("Could not get extension: JTX")
+        arcpy.ImportToolbox(wmxToolbox, "WMXAdminUtils")
+
+        while not cancelEvent.is_set():
+            try:
+                jobId = jobQueue.get(True, C_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if jobId == None or cancelEvent.is_set():
+                break
+
+            startTime = time.time()
+            try:
+                arcpy.ExecuteJob_WMXAdminUtils(jobId, wmxDbAlias)
+                status = C_STATUS_SUCCEEDED
+                message = ""
+            except Exception as ex:
+                status = C_STATUS_FAILED
+                message = " ".join(str(ex).split())
+
+            resultQueue.put((C_MSG_RESULT, workerId, jobId, status, time.time() - startTime, message))
+
+    except Exception as ex:
+        error = str(ex)
+
+    finally:
+        resultQueue.put((C_MSG_WORKER_DONE, workerId, error))
+
+
+# Body of the thread that hands out jobs to the workers.  Blocks whenever the
+# job queue is full, so that only a few jobs are queued up at any one time.
+def queueJobs(jobIds, jobQueue, numWorkers, cancelEvent, stats):
+    try:
+        for jobId in jobIds:
+            while not cancelEvent.is_set():
+                try:
+                    jobQueue.put(jobId, True, C_POLL_INTERVAL)
+                    stats["queued"] += 1
+                    break
+                except queue.Full:
+                    pass
+            if cancelEvent.is_set():
+                break
+
+    except Exception as ex:
+        stats["error"] = str(ex)
+
+    finally:
+        # Tell each of the workers that there are no more jobs
+        stats["doneQueueing"] = True
+        for i in range(numWorkers):
+            while not cancelEvent.is_set():
+                try:
+                    jobQueue.put(None, True, C_POLL_INTERVAL)
+                    break
+                except queue.Full:
+                    pass
+
+
+# Main function
+def main():
+
+    resultsFileHandle = None
+    tempDir = None
+    workers = []
+    jobQueue = None
+    cancelEvent = None
+
+    try:
+        # Set up the tool's parameters
+        paramIndex = 0
+        queryName = arcpy.GetParameterAsText(paramIndex)
+        paramIndex += 1
+        jobIdFile = arcpy.GetParameterAsText(paramIndex)
+        paramIndex += 1
+        numWorkersStr = arcpy.GetParameterAsText(paramIndex)
+        paramIndex += 1
+        wmxDbAlias = arcpy.GetParameterAsText(paramIndex)
+        paramIndex += 1
+        outputParamIndex = paramIndex
+        paramIndex += 1
+        resultsFile = getOptionalParameterAsText(paramIndex)
+        paramIndex += 1
+
+        if not queryName and not jobIdFile:
+            raise InvalidArgumentError("Either a query name or a job ID file must be specified")
+
+        numWorkers = C_DEFAULT_NUM_WORKERS
+        if numWorkersStr:
+            numWorkers = int(numWorkersStr)
+        if numWorkers < 1:
+            raise InvalidArgumentError("The number of worker processes must be at least 1")
+
+        # Import the Workflow Manager toolbox
+        wmxToolbox = getWorkflowManagerToolboxLocation()
+        arcpy.ImportToolbox(wmxToolbox, "WMXAdminUtils")
+
+        # Record the outcome of each job, as it finishes
+        resultsWriter = None
+        if resultsFile:
+            resultsFileHandle = open(resultsFile, "w")
+            resultsWriter = csv.writer(resultsFileHandle, lineterminator="\n")
+            resultsWriter.writerow(C_RESULTS_FIELDS)
+
+        # Start the worker processes.  If this script is being run by another
+        # application (ex: ArcGIS), make sure that the workers are started
+        # with the Python interpreter instead.
+        if not os.path.basename(sys.executable).lower().startswith("python"):
+            multiprocessing.set_executable(os.path.join(sys.exec_prefix, "pythonw.exe"))
+
+        jobQueue = multiprocessing.Queue(numWorkers * C_QUEUE_DEPTH_PER_WORKER)
+        resultQueue = multiprocessing.Queue()
+        cancelEvent = multiprocessing.Event()
+        for workerId in range(numWorkers):
+            worker = multiprocessing.Process(
+                target=executeJobsWorker,
+                args=(workerId + 1, wmxToolbox, wmxDbAlias, jobQueue, resultQueue, cancelEvent))
+            worker.daemon = True
+            worker.start()
+            workers.append(worker)
+        arcpy.AddMessage("Started " + str(numWorkers) + " worker process(es)")
+
+        # Run the query (if any) here, before the feeder thread starts, so
+        # that arcpy is only ever used from this thread
+        tempDir = tempfile.mkdtemp()
+        jobIdFiles = []
+        if jobIdFile:
+            jobIdFiles.append(jobIdFile)
+        if queryName:
+            arcpy.SetProgressorLabel("Running query...")
+            jobIdFiles.append(runQueryToFile(queryName, wmxDbAlias, tempDir))
+
+        # Hand out the jobs from a separate thread, so that this thread is
+        # free to collect the results
+        stats = {"queued": 0, "doneQueueing": False, "error": None}
+        feeder = threading.Thread(
+            target=queueJobs,
+            args=(listJobIds(jobIdFiles), jobQueue, numWorkers, cancelEvent, stats))
+        feeder.daemon = True
+        feeder.start()
+
+        arcpy.SetProgressor("default", "Executing jobs...")
+        startTime = time.time()
+        numSucceeded = 0
+        numFailed = 0
+        workersRunning = set(range(1, numWorkers + 1))
+        while len(workersRunning) > 0:
+            try:
+                try:
+                    msg = resultQueue.get(True, C_POLL_INTERVAL)
+                except queue.Empty:
+                    msg = None
+
+                if msg == None:
+                    # Watch for any workers that died without saying so
+                    for i in range(numWorkers):
+                        if (i + 1) in workersRunning and not workers[i].is_alive():
+                            arcpy.AddWarning("Worker " + str(i + 1) + " exited unexpectedly")
+                            workersRunning.discard(i + 1)
+                elif msg[0] == C_MSG_WORKER_DONE:
+                    workersRunning.discard(msg[1])
+                    if msg[2]:
+                        arcpy.AddWarning("Worker " + str(msg[1]) + " stopped: " + msg[2])
+                else:
+                    (unused, workerId, jobId, status, seconds, message) = msg
+                    if status == C_STATUS_SUCCEEDED:
+                        numSucceeded += 1
+                        arcpy.AddMessage("Job " + str(jobId) + ": " + status + " (%.1f s, worker %d)" % (seconds, workerId))
+                    else:
+                        numFailed += 1
+                        arcpy.AddWarning("Job " + str(jobId) + ": " + status + " (%.1f s, worker %d): %s" % (seconds, workerId, message))
+                    if resultsWriter != None:
+                        resultsWriter.writerow([jobId, status, "%.3f" % seconds, workerId, message])
+                        resultsFileHandle.flush()
+                    arcpy.SetProgressorLabel("Executed " + str(numSucceeded + numFailed) + " job(s)...")
+
+                if isCancelled() and not cancelEvent.is_set():
+                    arcpy.AddWarning("Cancelling; waiting for the workers to finish their current jobs")
+                    cancelEvent.set()
+
+            except KeyboardInterrupt:
+                arcpy.AddWarning("Cancelling; waiting for the workers to finish their current jobs")
+                cancelEvent.set()
+
+        if stats["error"] != None:
+            arcpy.AddError("Could not list the jobs to execute: " + stats["error"])
+
+        # Report the overall results
+        elapsed = time.time() - startTime
+        numExecuted = numSucceeded + numFailed
+        arcpy.AddMessage("Executed " + str(numExecuted) + " job(s): " + str(numSucceeded) +
+                         " succeeded, " + str(numFailed) + " failed")
+        if elapsed > 0:
+            arcpy.AddMessage("Elapsed time: %.1f seconds (%.1f jobs/sec)" % (elapsed, numExecuted / elapsed))
+        if cancelEvent.is_set():
+            arcpy.AddWarning("Run was cancelled; " + str(stats["queued"] - numExecuted) +
+                             " queued job(s) were not executed")
+
+        # Set the return value for this tool (the number of jobs whose
+        # steps were executed successfully)
+        arcpy.SetParameterAsText(outputParamIndex, str(numSucceeded))
+
+    except Exception as ex:
+        arcpy.AddError("Caught exception: " + str(ex))
+
+    finally:
+        # Make sure that none of the workers are left running
+        if cancelEvent != None:
+            cancelEvent.set()
+        for worker in workers:
+            worker.join(C_POLL_INTERVAL)
+            if worker.is_alive():
+                worker.terminate()
+        if jobQueue != None:
+            # Don't wait for any jobs that were never handed out
+            jobQueue.cancel_join_thread()
+
+        if resultsFileHandle != None:
+            resultsFileHandle.close()
+        if tempDir != None:
+            queryResultFile = os.path.join(tempDir, "queryJobIds.txt")
+            if os.path.exists(queryResultFile):
+                os.remove(queryResultFile)
+            os.rmdir(tempDir)
+
+
+# Entry point for the script
+if __name__ == "__main__":
+    main()
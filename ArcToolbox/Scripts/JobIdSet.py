@@ -0,0 +1,235 @@
+# ---------------------------------------------------------------------------
+# JobIdSet.py
+#
+# Reads, writes, and combines job ID sets: files containing a set of job IDs
+# as a NumPy array of 32-bit integers, in ascending order and without
+# duplicates.  The "List Jobs" and "List Jobs Using Query" tools write a job
+# ID set when given an output file with a ".npy" extension.
+#
+# Sets are memory-mapped rather than read, and the union, intersection, and
+# difference of two sets are computed with vectorized NumPy operations
+# (binary searches of one sorted array for the values in the other), so
+# combining sets of millions of job IDs takes milliseconds.  The result of
+# each operation is another sorted array, which can be handed directly to
+# the next operation or saved as a new set.  For example, to find the jobs
+# in saved query "A" but not in "B", among those matching a SQL filter:
+#
+#   a = JobIdSet.listJobsUsingQuery("C:\\temp\\a.npy", "A")
+#   b = JobIdSet.listJobsUsingQuery("C:\\temp\\b.npy", "B")
+#   f = JobIdSet.listJobs("C:\\temp\\f.npy", "JTX_JOBS", "STATUS = 5")
+#   jobIds = JobIdSet.intersection(JobIdSet.difference(a, b), f)
+#
+# Requires NumPy, which is installed with ArcGIS.  Run this script from the
+# command line to combine sets (or text files of job IDs, one per line)
+# without starting ArcGIS.
+# ---------------------------------------------------------------------------
+
+import os
+import sys
+
+import numpy
+
+
+C_DTYPE = numpy.dtype("<i4")
+C_SET_EXTENSION = ".npy"
+C_TEMP_SUFFIX = ".tmp"
+
+C_OP_UNION = "union"
+C_OP_INTERSECT = "intersect"
+C_OP_MINUS = "minus"
+
+
+class JobIdSetError(Exception):
+    pass
+
+
+# Function that prints an explanation of how to use this script
+def printUsage():
+    print("""
+Combines job ID sets written by the "List Jobs" and "List Jobs Using Query"
+tools (.npy files) or text files of job IDs (one per line).
+
+Usage:
+  JobIdSet.py [-o <output file>] <set> [union|intersect|minus <set>]...
+
+The operations are applied from left to right.  The number of jobs in the
+result is printed; the result is also saved as a job ID set if an output
+file is given, or printed as a semicolon-delimited list otherwise.
+""")
+
+
+# Returns an empty job ID set
+def empty():
+    return numpy.empty(0, dtype=C_DTYPE)
+
+
+# Builds a job ID set from a list (or any other sequence) of job IDs, which
+# need not be in order
+def fromIds(jobIds):
+    return numpy.unique(numpy.asarray(jobIds, dtype=C_DTYPE))
+
+
+# Builds a job ID set from a semicolon-delimited list of job IDs, as returned
+# by the "List Jobs" and "List Jobs Using Query" tools
+def fromString(text):
+    text = text.strip()
+    if len(text) == 0:
+        return empty()
+    return fromIds([int(jobId) for jobId in text.split(";") if jobId.strip()])
+
+
+# Converts a job ID set to a semicolon-delimited list of job IDs, as accepted
+# by the GP tools that take several jobs
+def toString(jobIds):
+    return ";".join([str(jobId) for jobId in jobIds.tolist()])
+
+
+# Reads a text file of job IDs, one per line, as written by the "List Jobs
+# Using Query" tool when given a ".txt" output file
+def readTextFile(path):
+    return fromIds(numpy.loadtxt(path, dtype=C_DTYPE, ndmin=1))
+
+
+# Memory-maps a job ID set; the values are only read from the file as they
+# are used
+def load(path):
+    try:
+        jobIds = numpy.load(path, mmap_mode="r")
+    except (IOError, ValueError) as ex:
+        raise JobIdSetError(path + " is not a job ID set (" + str(ex) + ")")
+    if jobIds.ndim != 1 or jobIds.dtype != C_DTYPE:
+        raise JobIdSetError(path + " is not a job ID set (expected a list of 32-bit integers, found " +
+                            str(jobIds.dtype) + " with shape " + str(jobIds.shape) + ")")
+    return jobIds
+
+
+# Reads a job ID set, or a text file of job IDs, depending on the extension
+def loadAny(path):
+    if os.path.splitext(path)[1].lower() == C_SET_EXTENSION:
+        return load(path)
+    return readTextFile(path)
+
+
+# Saves a job ID set.  The set is written to a temporary file that then
+# replaces the original, so that a script memory-mapping the original never
+# sees a partially-written file.
+def save(path, jobIds):
+    jobIds = numpy.asarray(jobIds)
+    if jobIds.dtype != C_DTYPE:
+        jobIds = fromIds(jobIds)
+
+    tempPath = path + C_TEMP_SUFFIX
+    f = open(tempPath, "wb")
+    try:
+        numpy.save(f, jobIds)
+    finally:
+        f.close()
+    if os.path.exists(path):
+        os.remove(path)
+    os.rename(tempPath, path)
+
+
+# Returns an array of booleans, one for each job ID in "a", indicating
+# whether that ID is also in "b"
+def _isIn(a, b):
+    if len(a) == 0 or len(b) == 0:
+        return numpy.zeros(len(a), dtype=bool)
+    positions = numpy.searchsorted(b, a)
+    positions[positions == len(b)] = 0
+    return b[positions] == a
+
+
+# Returns True if a job ID is in a set
+def contains(jobIds, jobId):
+    position = numpy.searchsorted(jobIds, jobId)
+    return position < len(jobIds) and jobIds[position] == jobId
+
+
+# Returns the job IDs in every one of the given sets
+def intersection(*sets):
+    if len(sets) == 0:
+        return empty()
+
+    # Search the larger sets for the values in the smaller ones, so that the
+    # fewest searches are made
+    sets = sorted(sets, key=len)
+    result = numpy.asarray(sets[0])
+    for other in sets[1:]:
+        result = result[_isIn(result, other)]
+    return result
+
+
+# Returns the job IDs in the first set that are not in any of the others
+def difference(first, *others):
+    result = numpy.asarray(first)
+    for other in others:
+        result = result[~_isIn(result, other)]
+    return result
+
+
+# Returns the job IDs in any of the given sets
+def union(*sets):
+    if len(sets) == 0:
+        return empty()
+
+    result = numpy.asarray(sets[0])
+    for other in sets[1:]:
+        added = difference(other, result)
+        if len(added) > 0:
+            # Both parts are already in order, so a merge sort only has to
+            # merge them
+            result = numpy.concatenate((result, added))
+            result.sort(kind="mergesort")
+    return result
+
+
+# Runs the "List Jobs" tool, writing the matching jobs to a job ID set, and
+# memory-maps the set
+def listJobs(path, jobsTable, sqlQuery="", wmxDbAlias=""):
+    import arcpy
+    arcpy.ListJobs_WMXAdminUtils(jobsTable, sqlQuery, wmxDbAlias, path)
+    return load(path)
+
+
+# Runs the "List Jobs Using Query" tool, writing the jobs found to a job ID
+# set, and memory-maps the set
+def listJobsUsingQuery(path, queryName, wmxDbAlias=""):
+    import arcpy
+    arcpy.ListJobsUsingQuery_WMXAdminUtils(queryName, wmxDbAlias, "SUMMARIZE_JOBS", "", path)
+    return load(path)
+
+
+# Combines the sets given on the command line
+def main():
+    args = sys.argv[1:]
+    outputPath = None
+    if len(args) >= 2 and args[0] == "-o":
+        outputPath = args[1]
+        args = args[2:]
+    if len(args) == 0 or len(args) % 2 == 0 or args[0] in ("-h", "--help"):
+        printUsage()
+        return 1
+
+    operations = {C_OP_UNION: union, C_OP_INTERSECT: intersection, C_OP_MINUS: difference}
+    try:
+        result = loadAny(args[0])
+        for i in range(1, len(args), 2):
+            if args[i] not in operations:
+                printUsage()
+                return 1
+            result = operations[args[i]](result, loadAny(args[i + 1]))
+    except (IOError, ValueError, JobIdSetError) as ex:
+        sys.stderr.write(str(ex) + "\n")
+        return 1
+
+    print("%d job(s)" % len(result))
+    if outputPath:
+        save(outputPath, result)
+    else:
+        print(toString(result))
+    return 0
+
+
+# Entry point for the script
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+# ---------------------------------------------------------------------------
+# JobJournal.py
+#
+# An append-only journal of the items (jobs, features, etc.) that a
+# long-running bulk script has finished processing.  If the script is
+# stopped partway through, running it again in "resume" mode with the same
+# journal skips the items that were already processed, rather than starting
+# over from the beginning.
+#
+# Each completed item is written to the journal as soon as it is done, so
+# nothing is lost if the script's process dies; the journal is only synced
+# to disk every few items, so at most that many items may be repeated
+# following an operating system crash or power failure.
+# ---------------------------------------------------------------------------
+
+import os
+
+
+C_HEADER_PREFIX = "# "
+C_DEFAULT_SYNC_INTERVAL = 100
+
+
+# Define a basic class used to call out problems with a journal
+class JournalError(Exception):
+    pass
+
+
+class JobJournal(object):
+
+    # Opens (or creates) a journal.  "description" identifies the operation
+    # being journaled (ex: the script name and its arguments); a journal
+    # can only be resumed by the same operation that created it.  If
+    # "resume" is false, any existing journal is discarded.
+    def __init__(self, journalFile, description, resume, syncInterval=C_DEFAULT_SYNC_INTERVAL):
+        self.journalFile = journalFile
+        self.description = description.replace("\n", " ")
+        self.syncInterval = max(1, syncInterval)
+        self.completed = {}
+        self.completedOrder = []
+        self.unsynced = 0
+
+        needsNewline = False
+        if resume and os.path.exists(journalFile):
+            needsNewline = self._load()
+            self.f = open(journalFile, "a")
+            if needsNewline:
+                self.f.write("\n")
+        else:
+            self.f = open(journalFile, "w")
+            self.f.write(C_HEADER_PREFIX + self.description + "\n")
+            self.sync()
+
+    # Reads the items recorded in an existing journal; returns True if the
+    # journal's last line was only partially written
+    def _load(self):
+        f = open(self.journalFile, "r")
+        try:
+            contents = f.read()
+        finally:
+            f.close()
+
+        lines = contents.split("\n")
+        partialLine = len(lines[-1]) > 0
+        # The last entry is either empty (the file ends with a newline) or
+        # was cut off while being written, so it can't be trusted
+        lines = lines[:-1]
+
+        if len(lines) == 0 or lines[0] != C_HEADER_PREFIX + self.description:
+            raise JournalError("Journal '" + self.journalFile + "' was not created by this operation; " +
+                               "specify a different journal file, or run without resuming")
+
+        for line in lines[1:]:
+            if len(line) == 0:
+                continue
+            (itemId, unused, value) = line.partition("\t")
+            if itemId not in self.completed:
+                self.completedOrder.append(itemId)
+            self.completed[itemId] = value
+
+        return partialLine
+
+    # Returns True if the item was completed in this or a previous run
+    def isCompleted(self, itemId):
+        return str(itemId) in self.completed
+
+    # Returns the value recorded when the item was completed, or None
+    def getValue(self, itemId):
+        return self.completed.get(str(itemId))
+
+    # Returns the IDs of all of the completed items, in the order completed
+    def getCompletedItems(self):
+        return list(self.completedOrder)
+
+    # Returns the number of completed items
+    def getCompletedCount(self):
+        return len(self.completedOrder)
+
+    # Records that an item has been completed, along with an optional value
+    # (ex: the ID of the job created for a feature)
+    def markCompleted(self, itemId, value=""):
+        itemId = str(itemId)
+        value = str(value)
+        self.f.write(itemId + "\t" + value + "\n")
+        self.f.flush()
+
+        if itemId not in self.completed:
+            self.completedOrder.append(itemId)
+        self.completed[itemId] = value
+
+        self.unsynced += 1
+        if self.unsynced >= self.syncInterval:
+            self.sync()
+
+    # Forces any recorded items to disk
+    def sync(self):
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        self.unsynced = 0
+
+    # Syncs and closes the journal
+    def close(self):
+        if self.f != None:
+            self.sync()
+            self.f.close()
+            self.f = None
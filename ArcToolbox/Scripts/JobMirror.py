@@ -0,0 +1,358 @@
+# ---------------------------------------------------------------------------
+# JobMirror.py
+#
+# A local copy of the JTX_JOBS table, stored in a SQLite database, so that
+# the jobs matching a query can be found without querying the Workflow
+# Manager database each time.  Every text, number, and date field in the
+# table is copied, so the same where clauses can be run against the mirror,
+# and the fields most commonly used in queries are indexed.
+#
+# The mirror is refreshed incrementally: only the job IDs (and, if the
+# table has a "last modified" date field, the modification dates) are read
+# from the table, and then only the jobs that were added since the last
+# refresh (based on the highest job ID already mirrored), or whose
+# modification dates have changed, are copied.  Jobs no longer in the table
+# are removed from the mirror.
+#
+# The stock JTX_JOBS table has no "last modified" field, so by default the
+# mirror can't tell when an existing job is edited (ex: its status
+# changes); those changes are only picked up by a full refresh.  Either
+# name a field that records when each job was changed, or refresh the
+# whole mirror periodically (by passing fullRefresh=True to sync(), or by
+# deleting the mirror file).
+#
+# Refreshing requires arcpy; reading an existing mirror does not.  Run this
+# script from the command line to list the jobs in a mirror that match a
+# query.
+# ---------------------------------------------------------------------------
+
+import datetime
+import os
+import sqlite3
+import sys
+import time
+
+
+C_TABLE_JOBS = "JOBS"
+C_TABLE_INFO = "MIRROR_INFO"
+C_FIELD_JOB_ID = "JOB_ID"
+
+# The types of fields copied to the mirror, and the SQLite type used for each
+C_MIRRORED_FIELD_TYPES = {
+    "OID": "INTEGER",
+    "SmallInteger": "INTEGER",
+    "Integer": "INTEGER",
+    "Single": "REAL",
+    "Double": "REAL",
+    "String": "TEXT",
+    "Date": "TEXT",
+    "Guid": "TEXT",
+    "GlobalID": "TEXT",
+}
+
+# Fields that are indexed in the mirror, if present in the table
+C_INDEXED_FIELDS = [
+    "JOB_NAME", "JOB_TYPE_ID", "STATUS", "STAGE", "PRIORITY", "ASSIGNED_TYPE",
+    "ASSIGNED_TO", "CREATED_BY", "CREATED_DATE", "DUE_DATE", "END_DATE",
+    "PARENT_JOB", "DATA_WORKSPACE_ID"]
+
+# Fields recognized as recording when a job was last changed, in order of
+# preference
+C_MODIFIED_FIELD_CANDIDATES = ["LAST_MODIFIED", "LAST_MODIFIED_DATE", "LAST_EDITED_DATE"]
+
+# Dates are stored as text in this format, so that they sort and compare
+# correctly in SQLite
+C_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Number of job IDs to include in each "JOB_ID IN (...)" query
+C_ID_CHUNK_SIZE = 500
+
+
+# Define a basic class used to call out problems with a mirror
+class MirrorError(Exception):
+    pass
+
+
+# Converts a value read from the table into the form stored in the mirror
+def _toMirrorValue(value):
+    if isinstance(value, datetime.datetime):
+        return value.strftime(C_DATE_FORMAT)
+    return value
+
+
+class JobMirror(object):
+
+    # Opens (or creates) a mirror.  "source" identifies the table being
+    # mirrored (ex: the path to the JTX_JOBS table and the database alias); if
+    # an existing mirror was made from a different source, it is emptied.
+    def __init__(self, mirrorFile, source):
+        self.mirrorFile = mirrorFile
+        self.source = source
+        self.conn = sqlite3.connect(mirrorFile)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS " + C_TABLE_INFO + " (NAME TEXT PRIMARY KEY, VALUE TEXT)")
+        self.conn.commit()
+
+        if self._getInfo("source") != source:
+            self.conn.execute("DROP TABLE IF EXISTS " + C_TABLE_JOBS)
+            self.conn.execute("DELETE FROM " + C_TABLE_INFO)
+            self._setInfo("source", source)
+            self.conn.commit()
+
+    # Reads a value from the table describing the mirror; returns None if the
+    # value isn't set
+    def _getInfo(self, name):
+        row = self.conn.execute("SELECT VALUE FROM " + C_TABLE_INFO + " WHERE NAME = ?", (name,)).fetchone()
+        if row == None:
+            return None
+        return row[0]
+
+    # Sets a value in the table describing the mirror
+    def _setInfo(self, name, value):
+        self.conn.execute("INSERT OR REPLACE INTO " + C_TABLE_INFO + " (NAME, VALUE) VALUES (?, ?)", (name, value))
+
+    # Returns the names of the fields in the mirror, in order; the list is
+    # empty if the mirror has never been refreshed
+    def getFields(self):
+        return [row[1] for row in self.conn.execute("PRAGMA table_info(" + C_TABLE_JOBS + ")")]
+
+    # Returns the number of seconds since the mirror was last refreshed, or
+    # None if it has never been refreshed
+    def getAge(self):
+        lastSync = self._getInfo("lastSync")
+        if lastSync == None:
+            return None
+        return max(0.0, time.time() - float(lastSync))
+
+    # Returns the name of the field used to find modified jobs at the last
+    # refresh, or None if modified jobs are only found by a full refresh
+    def getModifiedField(self):
+        return self._getInfo("modifiedField")
+
+    # Returns the number of jobs in the mirror
+    def getJobCount(self):
+        if len(self.getFields()) == 0:
+            return 0
+        return self.conn.execute("SELECT COUNT(*) FROM " + C_TABLE_JOBS).fetchone()[0]
+
+    # (Re)creates the table of jobs, and its indexes
+    def _createJobsTable(self, tableFields):
+        self.conn.execute("DROP TABLE IF EXISTS " + C_TABLE_JOBS)
+        columns = []
+        for (name, sqliteType) in tableFields:
+            if name == C_FIELD_JOB_ID:
+                columns.append(name + " INTEGER PRIMARY KEY")
+            else:
+                columns.append(name + " " + sqliteType)
+        self.conn.execute("CREATE TABLE " + C_TABLE_JOBS + " (" + ", ".join(columns) + ")")
+
+        for (name, sqliteType) in tableFields:
+            if name in C_INDEXED_FIELDS:
+                self.conn.execute("CREATE INDEX IDX_" + C_TABLE_JOBS + "_" + name + " ON " + C_TABLE_JOBS + " (" + name + ")")
+
+    # Copies the jobs matching a where clause from the table into the mirror,
+    # replacing any existing copies; returns the number of jobs copied
+    def _copyJobs(self, arcpy, jobsTable, fieldNames, whereClause):
+        insert = "INSERT OR REPLACE INTO " + C_TABLE_JOBS + " (" + ", ".join(fieldNames) + ") VALUES (" + \
+            ", ".join(["?"] * len(fieldNames)) + ")"
+        count = [0]
+
+        def rowValues():
+            for row in arcpy.SearchCursor(jobsTable, whereClause, None, ";".join(fieldNames)):
+                count[0] += 1
+                yield tuple([_toMirrorValue(row.getValue(name)) for name in fieldNames])
+
+        self.conn.executemany(insert, rowValues())
+        return count[0]
+
+    # Brings the mirror up to date with the JTX_JOBS table.  "jobsTable" is
+    # the path to the table; "modifiedField" names the field recording when
+    # each job was last changed (if not given, a field with one of the usual
+    # names is used, if present).  Without such a field, only new and deleted
+    # jobs are found, unless "fullRefresh" is set.  Returns a tuple containing
+    # the number of jobs copied, the number of jobs removed, and whether
+    # every job was copied.
+    def sync(self, jobsTable, modifiedField=None, fullRefresh=False):
+        import arcpy
+
+        # Mirror every field that SQLite can store
+        tableFields = []
+        for field in arcpy.ListFields(jobsTable):
+            if field.type in C_MIRRORED_FIELD_TYPES:
+                tableFields.append((field.name.upper(), C_MIRRORED_FIELD_TYPES[field.type]))
+        fieldNames = [name for (name, sqliteType) in tableFields]
+        if C_FIELD_JOB_ID not in fieldNames:
+            raise MirrorError("Field " + C_FIELD_JOB_ID + " not found in " + str(jobsTable))
+
+        if modifiedField:
+            modifiedField = modifiedField.upper()
+            if modifiedField not in fieldNames:
+                raise MirrorError("Field " + modifiedField + " not found in " + str(jobsTable))
+        else:
+            modifiedField = None
+            for candidate in C_MODIFIED_FIELD_CANDIDATES:
+                if candidate in fieldNames:
+                    modifiedField = candidate
+                    break
+
+        # Everything is copied if asked, or if the table's fields (or the field
+        # used to compare the jobs) have changed since the last refresh
+        fullRefresh = fullRefresh or \
+            self.getFields() != fieldNames or \
+            self._getInfo("modifiedField") != modifiedField
+
+        startTime = time.time()
+        try:
+            numRemoved = 0
+            if fullRefresh:
+                self._createJobsTable(tableFields)
+                numCopied = self._copyJobs(arcpy, jobsTable, fieldNames, "")
+            else:
+                numCopied = 0
+                cursorFields = [C_FIELD_JOB_ID]
+                if modifiedField != None:
+                    cursorFields.append(modifiedField)
+                mirrored = dict([(row[0], row[-1]) for row in self.conn.execute(
+                    "SELECT " + ", ".join(cursorFields) + " FROM " + C_TABLE_JOBS)])
+                maxJobId = 0
+                if len(mirrored) > 0:
+                    maxJobId = max(mirrored.keys())
+
+                # Read only the ID (and modification date) of each job to find
+                # the jobs that have changed or been deleted
+                current = set()
+                changedIds = []
+                for row in arcpy.SearchCursor(jobsTable, "", None, ";".join(cursorFields)):
+                    jobId = row.getValue(C_FIELD_JOB_ID)
+                    if jobId == None:
+                        continue
+                    current.add(jobId)
+                    if jobId > maxJobId:
+                        continue
+                    if jobId not in mirrored:
+                        changedIds.append(jobId)
+                    elif modifiedField != None and mirrored[jobId] != _toMirrorValue(row.getValue(modifiedField)):
+                        changedIds.append(jobId)
+
+                removedIds = [jobId for jobId in mirrored.keys() if jobId not in current]
+                for i in range(0, len(removedIds), C_ID_CHUNK_SIZE):
+                    chunk = removedIds[i:i + C_ID_CHUNK_SIZE]
+                    self.conn.execute("DELETE FROM " + C_TABLE_JOBS + " WHERE " + C_FIELD_JOB_ID + " IN (" +
+                        ",".join(["?"] * len(chunk)) + ")", chunk)
+                numRemoved = len(removedIds)
+
+                # Jobs added since the last refresh are found by their IDs
+                numCopied += self._copyJobs(arcpy, jobsTable, fieldNames, C_FIELD_JOB_ID + " > " + str(maxJobId))
+                for i in range(0, len(changedIds), C_ID_CHUNK_SIZE):
+                    chunk = [str(jobId) for jobId in changedIds[i:i + C_ID_CHUNK_SIZE]]
+                    numCopied += self._copyJobs(arcpy, jobsTable, fieldNames, C_FIELD_JOB_ID + " IN (" + ",".join(chunk) + ")")
+
+            self._setInfo("modifiedField", modifiedField)
+            self._setInfo("lastSync", repr(startTime))
+            self.conn.commit()
+        except:
+            self.conn.rollback()
+            raise
+
+        return (numCopied, numRemoved, fullRefresh)
+
+    # Returns the IDs of the jobs in the mirror that match a where clause, in
+    # ID order.  The where clause is run by SQLite, so it may not use functions
+    # or date formats specific to the Workflow Manager database, and some
+    # clauses (ex: comparisons of text and numbers) may match different jobs
+    # than they would in the database; use buildIdQueries() to confirm the
+    # jobs found before changing them.
+    def findJobs(self, whereClause):
+        if len(self.getFields()) == 0:
+            raise MirrorError("Mirror " + self.mirrorFile + " has not been refreshed")
+        query = "SELECT " + C_FIELD_JOB_ID + " FROM " + C_TABLE_JOBS
+        if whereClause:
+            query += " WHERE " + whereClause
+        query += " ORDER BY " + C_FIELD_JOB_ID
+        try:
+            return [row[0] for row in self.conn.execute(query)]
+        except sqlite3.Error as ex:
+            raise MirrorError("Could not query mirror: " + str(ex))
+
+    # Removes jobs from the mirror (ex: after they have been deleted), so that
+    # they are not found before the next refresh
+    def removeJobs(self, jobIds):
+        if len(self.getFields()) == 0:
+            return
+        ids = [int(jobId) for jobId in jobIds]
+        for i in range(0, len(ids), C_ID_CHUNK_SIZE):
+            chunk = ids[i:i + C_ID_CHUNK_SIZE]
+            self.conn.execute("DELETE FROM " + C_TABLE_JOBS + " WHERE " + C_FIELD_JOB_ID + " IN (" +
+                ",".join(["?"] * len(chunk)) + ")", chunk)
+        self.conn.commit()
+
+    # Closes the mirror
+    def close(self):
+        if self.conn != None:
+            self.conn.close()
+            self.conn = None
+
+
+# Builds where clauses that select the given jobs, C_ID_CHUNK_SIZE at a time,
+# from those matching another where clause; used to confirm against the
+# Workflow Manager database that the jobs found in a mirror match a query
+def buildIdQueries(jobIds, whereClause):
+    queries = []
+    for i in range(0, len(jobIds), C_ID_CHUNK_SIZE):
+        query = C_FIELD_JOB_ID + " IN (" + ",".join([str(jobId) for jobId in jobIds[i:i + C_ID_CHUNK_SIZE]]) + ")"
+        if whereClause:
+            query += " AND (" + whereClause + ")"
+        queries.append(query)
+    return queries
+
+
+# Function that prints an explanation of how to use this script
+def printUsage():
+    print("""
+Lists the jobs in a job mirror (as created by DeleteJobsMatchingCriteria.py)
+that match a query.  Does not connect to the Workflow Manager database.
+
+Usage:
+  JobMirror.py mirrorFile [whereClause]
+""")
+
+
+# Lists the jobs in a mirror that match a query
+def main():
+    if len(sys.argv) < 2 or len(sys.argv) > 3 or sys.argv[1] in ("-h", "--help"):
+        printUsage()
+        return 1
+    if not os.path.exists(sys.argv[1]):
+        sys.stderr.write("Mirror " + sys.argv[1] + " does not exist\n")
+        return 1
+
+    # Open the database directly, so that the mirror isn't emptied
+    conn = sqlite3.connect(sys.argv[1])
+    try:
+        row = conn.execute("SELECT VALUE FROM " + C_TABLE_INFO + " WHERE NAME = 'source'").fetchone()
+    except sqlite3.Error:
+        row = None
+    conn.close()
+    if row == None:
+        sys.stderr.write(sys.argv[1] + " is not a job mirror\n")
+        return 1
+
+    mirror = JobMirror(sys.argv[1], row[0])
+    try:
+        whereClause = ""
+        if len(sys.argv) > 2:
+            whereClause = sys.argv[2]
+        jobIds = mirror.findJobs(whereClause)
+        age = mirror.getAge()
+        print("%d of %d job(s) match (mirror refreshed %.0f second(s) ago)" % (len(jobIds), mirror.getJobCount(), age))
+        print(";".join([str(jobId) for jobId in jobIds]))
+    except MirrorError as ex:
+        sys.stderr.write(str(ex) + "\n")
+        return 1
+    finally:
+        mirror.close()
+    return 0
+
+
+# Entry point for the script
+if __name__ == "__main__":
+    sys.exit(main())
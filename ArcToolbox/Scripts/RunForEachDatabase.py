@@ -0,0 +1,323 @@
+# ---------------------------------------------------------------------------
+# RunForEachDatabase.py
+#
+# Runs the same Workflow Manager Administration Utilities tool against each
+# of a list of Workflow Manager databases, in parallel.  Each database is
+# handled by its own worker process, which imports the Workflow Manager
+# toolbox, runs the tool once and exits, so that no configuration cache (or
+# database connection) is ever shared between two databases.  At most a
+# given number of workers run at the same time.
+#
+# The tool's arguments are given as a single "|"-delimited string, in which
+# "{alias}" is replaced with each database's alias; ex: for the "Backup
+# Workflow Manager Database" tool:
+#
+#   C:\Backups\{alias}.jxl|{alias}
+#
+# Once every database has been processed, a merged report listing the
+# outcome, run time and messages for each database is written out.
+#
+# NOTE: When this script is run as a script tool, it must be run out of
+# process ("Run Python script in process" unchecked), since the worker
+# processes cannot be started from within ArcMap itself.
+# ---------------------------------------------------------------------------
+
+# Import arcpy module
+import arcpy
+import csv
+import multiprocessing
+import os
+import signal
+import sys
+import time
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+
+C_DEFAULT_MAX_CONCURRENT = 4
+C_POLL_INTERVAL = 1.0
+
+C_ALIAS_PLACEHOLDER = "{alias}"
+C_ARG_DELIMITER = "|"
+
+C_STATUS_SUCCEEDED = "Succeeded"
+C_STATUS_FAILED = "Failed"
+C_STATUS_NOT_RUN = "Not run"
+
+C_REPORT_FIELDS = ["DATABASE", "STATUS", "SECONDS", "OUTPUTS", "MESSAGES"]
+
+
+# Define a basic class used to call out core installation errors
+class InstallationError(Exception):
+    pass
+
+
+# Define a basic class used to call out argument value errors
+class InvalidArgumentError(Exception):
+    pass
+
+
+# Define a basic class used to call out licensing errors
+class LicenseError(Exception):
+    pass
+
+
+# Function to determine the install location of the workflow manager toolbox
+def getWorkflowManagerToolboxLocation():
+    # Import the workflow manager toolbox
+    wmxToolbox = None
+
+    installations = arcpy.ListInstallations()
+    for installation in installations:
+        installInfo = arcpy.GetInstallInfo(installation)
+        if installInfo != None:
+            tbx = installInfo["InstallDir"] + os.sep + "ArcToolbox" + os.sep + "Toolboxes" + os.sep + "Workflow Manager Administration Tools.tbx"
+            tbx = os.path.normpath(tbx)
+            if os.path.exists(tbx):
+                wmxToolbox = tbx
+                break
+
+    if wmxToolbox == None:
+        raise InstallationError("Workflow Manager Administration Tools toolbox not found")
+
+    return wmxToolbox
+
+
+# Function to determine whether the user has asked for the script to stop
+def isCancelled():
+    return getattr(arcpy.env, "isCancelled", False)
+
+
+# Returns the tool's arguments for a particular database
+def getToolArgs(argTemplate, wmxDbAlias):
+    return [arg.replace(C_ALIAS_PLACEHOLDER, wmxDbAlias) for arg in argTemplate]
+
+
+# Main function for each worker process; runs the tool against a single
+# database and reports the outcome
+def runToolWorker(wmxDbAlias, wmxToolbox, toolName, toolArgs, resultQueue):
+    outputs = []
+    messages = ""
+
+    # Leave it to the main process to decide what to do when the user presses
+    # Ctrl+C, so that the tool isn't interrupted partway through
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    startTime = time.time()
+    try:
+        # Each worker is a separate process, so it needs its own license
+        # and its own copy of the toolbox (and database connection)
+        if arcpy.CheckOutExtension("JTX") != "CheckedOut":
+            raise LicenseError("Could not get extension: JTX")
+        arcpy.ImportToolbox(wmxToolbox, "WMXAdminUtils")
+
+        result = getattr(arcpy, toolName + "_WMXAdminUtils")(*toolArgs)
+        for i in range(result.outputCount):
+            outputs.append(str(result.getOutput(i)))
+        status = C_STATUS_SUCCEEDED
+        messages = result.getMessages()
+
+    except Exception as ex:
+        status = C_STATUS_FAILED
+        messages = arcpy.GetMessages() or str(ex)
+
+    resultQueue.put((wmxDbAlias, status, time.time() - startTime, outputs, messages))
+
+
+# Starts a worker process for a database
+def startWorker(wmxDbAlias, wmxToolbox, toolName, argTemplate, resultQueue):
+    worker = multiprocessing.Process(
+        target=runToolWorker,
+        args=(wmxDbAlias, wmxToolbox, toolName, getToolArgs(argTemplate, wmxDbAlias), resultQueue))
+    worker.daemon = True
+    worker.start()
+    return worker
+
+
+# Writes the merged report; the databases are listed in the order in which
+# they were given
+def writeReport(reportFile, wmxDbAliases, results):
+    f = open(reportFile, "w")
+    try:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(C_REPORT_FIELDS)
+        for alias in wmxDbAliases:
+            (status, seconds, outputs, messages) = results[alias]
+            writer.writerow([alias, status, "%.3f" % seconds, ";".join(outputs), messages])
+    finally:
+        f.close()
+
+
+# Main function
+def main():
+
+    workers = {}
+
+    try:
+        # Set up the tool's parameters
+        paramIndex = 0
+        toolName = arcpy.GetParameterAsText(paramIndex)
+        paramIndex += 1
+        toolArgsStr = arcpy.GetParameterAsText(paramIndex)
+        paramIndex += 1
+        wmxDbAliasesStr = arcpy.GetParameterAsText(paramIndex)
+        paramIndex += 1
+        maxConcurrentStr = arcpy.GetParameterAsText(paramIndex)
+        paramIndex += 1
+        outputParamIndex = paramIndex
+        paramIndex += 1
+        reportFile = arcpy.GetParameterAsText(paramIndex)
+        paramIndex += 1
+
+        # The tool may be given with or without the toolbox alias
+        toolName = toolName.strip()
+        if toolName.endswith("_WMXAdminUtils"):
+            toolName = toolName[:-len("_WMXAdminUtils")]
+        if not toolName:
+            raise InvalidArgumentError("A tool name must be specified")
+
+        argTemplate = toolArgsStr.split(C_ARG_DELIMITER)
+        if C_ALIAS_PLACEHOLDER not in toolArgsStr:
+            raise InvalidArgumentError("The tool's arguments must include " + C_ALIAS_PLACEHOLDER +
+                                       " where the database alias is to be used")
+
+        # Preserve the order of the databases, ignoring any repeats
+        wmxDbAliases = []
+        for alias in wmxDbAliasesStr.split(";"):
+            alias = alias.strip().strip("'")
+            if alias and alias not in wmxDbAliases:
+                wmxDbAliases.append(alias)
+        if len(wmxDbAliases) == 0:
+            raise InvalidArgumentError("At least one database alias must be specified")
+
+        maxConcurrent = C_DEFAULT_MAX_CONCURRENT
+        if maxConcurrentStr:
+            maxConcurrent = int(maxConcurrentStr)
+        if maxConcurrent < 1:
+            raise InvalidArgumentError("The number of databases processed at once must be at least 1")
+
+        # Import the Workflow Manager toolbox, to make sure that the tool exists
+        wmxToolbox = getWorkflowManagerToolboxLocation()
+        arcpy.ImportToolbox(wmxToolbox, "WMXAdminUtils")
+        if not hasattr(arcpy, toolName + "_WMXAdminUtils"):
+            raise InvalidArgumentError("Unknown tool: " + toolName)
+
+        # Start the worker processes.  If this script is being run by another
+        # application (ex: ArcGIS), make sure that the workers are started
+        # with the Python interpreter instead.
+        if not os.path.basename(sys.executable).lower().startswith("python"):
+            multiprocessing.set_executable(os.path.join(sys.exec_prefix, "pythonw.exe"))
+
+        arcpy.AddMessage("Running " + toolName + " against " + str(len(wmxDbAliases)) +
+                         " database(s), " + str(min(maxConcurrent, len(wmxDbAliases))) + " at a time")
+        arcpy.SetProgressor("step", "Running " + toolName + "...", 0, len(wmxDbAliases), 1)
+
+        resultQueue = multiprocessing.Queue()
+        results = {}
+        pending = list(wmxDbAliases)
+        cancelled = False
+        startTime = time.time()
+        while len(pending) > 0 or len(workers) > 0:
+            try:
+                # Keep up to the maximum number of workers running
+                while not cancelled and len(pending) > 0 and len(workers) < maxConcurrent:
+                    alias = pending.pop(0)
+                    workers[alias] = startWorker(alias, wmxToolbox, toolName, argTemplate, resultQueue)
+                if cancelled:
+                    del pending[:]
+
+                try:
+                    msg = resultQueue.get(True, C_POLL_INTERVAL)
+                except queue.Empty:
+                    msg = None
+
+                if msg == None:
+                    # Watch for any workers that died without saying so.  A worker
+                    # that has just exited may have sent its result since the queue
+                    # was checked, so check the queue once more before giving up on it.
+                    deadWorkers = [alias for alias in workers.keys() if not workers[alias].is_alive()]
+                    if len(deadWorkers) > 0:
+                        try:
+                            msg = resultQueue.get(True, C_POLL_INTERVAL)
+                        except queue.Empty:
+                            for alias in deadWorkers:
+                                results[alias] = (C_STATUS_FAILED, 0.0, [], "Worker exited unexpectedly")
+                                arcpy.AddWarning(alias + ": worker exited unexpectedly")
+                                del workers[alias]
+
+                if msg != None:
+                    (alias, status, seconds, outputs, messages) = msg
+                    results[alias] = (status, seconds, outputs, messages)
+
+                    # The worker may already have been given up on, if its result
+                    # arrived late
+                    worker = workers.pop(alias, None)
+                    if worker != None:
+                        worker.join()
+                    if status == C_STATUS_SUCCEEDED:
+                        arcpy.AddMessage(alias + ": " + status + " (%.1f s)" % seconds)
+                    else:
+                        arcpy.AddWarning(alias + ": " + status + " (%.1f s)" % seconds)
+                    arcpy.SetProgressorPosition(len(results))
+
+                if isCancelled() and not cancelled:
+                    arcpy.AddWarning("Cancelling; waiting for the databases already started to finish")
+                    cancelled = True
+
+            except KeyboardInterrupt:
+                arcpy.AddWarning("Cancelling; waiting for the databases already started to finish")
+                cancelled = True
+
+        elapsed = time.time() - startTime
+        for alias in wmxDbAliases:
+            if alias not in results:
+                results[alias] = (C_STATUS_NOT_RUN, 0.0, [], "")
+
+        # Report the results for each database, in the order given
+        numSucceeded = 0
+        totalSeconds = 0.0
+        arcpy.AddMessage("")
+        arcpy.AddMessage("Results:")
+        for alias in wmxDbAliases:
+            (status, seconds, outputs, messages) = results[alias]
+            totalSeconds += seconds
+            if status == C_STATUS_SUCCEEDED:
+                numSucceeded += 1
+            arcpy.AddMessage("  " + alias + ": " + status + " (%.1f s)" % seconds)
+            for output in outputs:
+                arcpy.AddMessage("    Output: " + output)
+            if status == C_STATUS_FAILED:
+                for line in messages.splitlines():
+                    arcpy.AddMessage("    " + line)
+
+        arcpy.AddMessage("Ran against " + str(len(wmxDbAliases)) + " database(s): " + str(numSucceeded) +
+                         " succeeded, " + str(len(wmxDbAliases) - numSucceeded) + " did not")
+        arcpy.AddMessage("Elapsed time: %.1f seconds (%.1f seconds if run one at a time)" % (elapsed, totalSeconds))
+        if numSucceeded < len(wmxDbAliases):
+            arcpy.AddWarning("The tool did not succeed for every database")
+
+        if reportFile:
+            writeReport(reportFile, wmxDbAliases, results)
+            arcpy.AddMessage("Report written to " + reportFile)
+
+        # Set the return value for this tool (the number of databases for
+        # which the tool succeeded)
+        arcpy.SetParameterAsText(outputParamIndex, str(numSucceeded))
+
+    except Exception as ex:
+        arcpy.AddError("Caught exception: " + str(ex))
+
+    finally:
+        # Make sure that none of the workers are left running
+        for worker in workers.values():
+            worker.join(C_POLL_INTERVAL)
+            if worker.is_alive():
+                worker.terminate()
+
+
+# Entry point for the script
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@
 # Import arcpy module
 import arcpy
 import os
+import AdaptiveExecutor
+import JobJournal
 
 
 # Define a basic class used to call out core installation errors
@@ -48,9 +50,38 @@ def logPreviousToolMessages():
         i += 1
 
 
+# Function to log the messages from a tool that may have been run in another
+# process, where the geoprocessor's own messages may belong to a different tool
+def logToolResultMessages(result):
+    for i in range(result.messageCount):
+        severity = result.getSeverity(i)
+        if severity == 2:
+            arcpy.AddError(result.getMessage(i))
+        elif severity == 1:
+            arcpy.AddWarning(result.getMessage(i))
+        else:
+            arcpy.AddMessage(result.getMessage(i))
+
+
+# Function to determine whether the user has asked for the script to stop
+def isCancelled():
+    return getattr(arcpy.env, "isCancelled", False)
+
+
+# Function to read an optional parameter that the script tool may not define
+# (ex: a parameter added to this script after the tool was added to a
+# toolbox); returns the default value if the tool doesn't define it
+def getOptionalParameterAsText(index, default=""):
+    if index >= arcpy.GetArgumentCount():
+        return default
+    return arcpy.GetParameterAsText(index)
+
+
 # Main function
 def main():
 
+    journal = None
+
     try:
         # Set up the tool's parameters
         paramIndex = 0
@@ -60,6 +91,29 @@ def main():
         paramIndex += 1
         wmxDbAlias = arcpy.GetParameterAsText(paramIndex)
         paramIndex += 1
+        outputParamIndex = paramIndex
+        paramIndex += 1
+        journalFile = getOptionalParameterAsText(paramIndex)
+        paramIndex += 1
+        resume = getOptionalParameterAsText(paramIndex).lower() == "true"
+        paramIndex += 1
+        maxConcurrentCalls = getOptionalParameterAsText(paramIndex)
+        paramIndex += 1
+
+        try:
+            maxConcurrentCalls = AdaptiveExecutor.parseMaxWorkers(maxConcurrentCalls)
+        except ValueError:
+            raise InvalidArgumentError("Maximum concurrent calls must be a whole number of at least 1")
+
+        # Open the journal of jobs for which notifications have been sent,
+        # if one was specified, so that a resumed run doesn't send the same
+        # notification twice
+        if journalFile:
+            journal = JobJournal.JobJournal(
+                journalFile, "SendNotificationForJobsInQuery|" + queryName + "|" + notificationName + "|" + wmxDbAlias, resume)
+            if journal.getCompletedCount() > 0:
+                arcpy.AddMessage("Resuming; notifications were sent previously for " +
+                                 str(journal.getCompletedCount()) + " job(s)")
 
         # Import the Workflow Manager toolbox
         wmxToolbox = getWorkflowManagerToolboxLocation()
@@ -72,23 +126,53 @@ def main():
 
         jobIdList = result.getOutput(0).split(";")
 
-        # Send a notification for each one of these jobs
+        # Send a notification for each one of these jobs, with as many being
+        # sent at once as the database can keep up with (up to the maximum
+        # specified)
         arcpy.SetProgressor("step", "Sending notifications...", 0, len(jobIdList), 1)
-        jobCount = 0
-        for jobId in jobIdList:
-            arcpy.SendJobNotification_WMXAdminUtils(jobId, notificationName, wmxDbAlias)
-            logPreviousToolMessages()
-
-            jobCount += 1
-            arcpy.SetProgressorPosition(jobCount)
+        progress = {"count": 0}
+
+        def jobsNotYetNotified():
+            for jobId in jobIdList:
+                if journal != None and journal.isCompleted(jobId):
+                    progress["count"] += 1
+                    arcpy.SetProgressorPosition(progress["count"])
+                    continue
+                yield jobId
+
+        def onNotificationSent(jobId, result, error):
+            if error != None:
+                raise error
+            logToolResultMessages(result)
+            if journal != None:
+                journal.markCompleted(jobId)
+            progress["count"] += 1
+            arcpy.SetProgressorPosition(progress["count"])
+
+        def onProgress(stats):
+            arcpy.SetProgressorLabel("Sending notifications (" + stats.describe() + ")...")
+
+        # A notification that timed out may still have been sent, so the
+        # calls are never retried
+        sendNotification = AdaptiveExecutor.ToolCall(
+            wmxToolbox, "SendJobNotification", [AdaptiveExecutor.C_ITEM, notificationName, wmxDbAlias])
+        executor = AdaptiveExecutor.AdaptiveExecutor(maxConcurrentCalls, retryBusyCalls=False)
+        executor.run(jobsNotYetNotified(), sendNotification, onNotificationSent, onProgress, isCancelled)
+        arcpy.AddMessage("Sent notifications for " + executor.getStats().summarize())
 
         # Set the return value for this tool (a multivalue containing
         # the same list of job IDs that was passed in)
-        arcpy.SetParameterAsText(paramIndex, result.getOutput(0))
+        arcpy.SetParameterAsText(outputParamIndex, result.getOutput(0))
 
     except Exception, ex:
         arcpy.AddError("Caught exception: " + str(ex))
 
+    finally:
+        # Make sure that every notification sent so far is recorded in the
+        # journal
+        if journal != None:
+            journal.close()
+
 
 # Entry point for the script
 if __name__ == "__main__":
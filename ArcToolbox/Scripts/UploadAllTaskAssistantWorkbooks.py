@@ -6,6 +6,7 @@
 import arcpy
 import optparse
 import os
+import AdaptiveExecutor
 
 
 # Define a basic class used to call out license errors
@@ -33,6 +34,33 @@ def logPreviousToolMessages():
         i += 1
 
 
+# Function to log the messages from a tool that may have been run in another
+# process, where the geoprocessor's own messages may belong to a different tool
+def logToolResultMessages(result):
+    for i in range(result.messageCount):
+        severity = result.getSeverity(i)
+        if severity == 2:
+            arcpy.AddError(result.getMessage(i))
+        elif severity == 1:
+            arcpy.AddWarning(result.getMessage(i))
+        else:
+            arcpy.AddMessage(result.getMessage(i))
+
+
+# Function to determine whether the user has asked for the script to stop
+def isCancelled():
+    return getattr(arcpy.env, "isCancelled", False)
+
+
+# Function to read an optional parameter that the script tool may not define
+# (ex: a parameter added to this script after the tool was added to a
+# toolbox); returns the default value if the tool doesn't define it
+def getOptionalParameterAsText(index, default=""):
+    if index >= arcpy.GetArgumentCount():
+        return default
+    return arcpy.GetParameterAsText(index)
+
+
 # Function to retrieve the licenses needed by this utility
 def checkOutLicenses(licenseType, extensionList):
     # Check out all necessary licenses
@@ -76,6 +104,26 @@ def getWorkflowManagerToolboxLocation():
         raise InstallationError("Workflow Manager Administration Tools toolbox not found")
 
     return wmxToolbox
+
+
+# Function to determine the name under which a workbook is uploaded
+def getTargetName(tamWkbk, stripExt):
+    targetName = os.path.basename(tamWkbk)
+    if stripExt:
+        (targetName, unused) = os.path.splitext(targetName)
+    return targetName
+
+
+# Uploads a single Task Assistant workbook, named after its file
+class UploadWorkbookCall(AdaptiveExecutor.ToolCall):
+
+    def __init__(self, wmxToolbox, stripExt, wmxDbAlias):
+        AdaptiveExecutor.ToolCall.__init__(self, wmxToolbox, "UploadTaskAssistantWorkbook", [])
+        self.stripExt = stripExt
+        self.wmxDbAlias = wmxDbAlias
+
+    def getArgs(self, tamWkbk):
+        return [tamWkbk, getTargetName(tamWkbk, self.stripExt), "OVERWRITE", self.wmxDbAlias]
     
 
 def main():
@@ -89,6 +137,10 @@ def main():
         paramIndex += 1
         wmxDbAlias = arcpy.GetParameterAsText(paramIndex)
         paramIndex += 1
+        outputParamIndex = paramIndex
+        paramIndex += 1
+        maxConcurrentCalls = AdaptiveExecutor.parseMaxWorkers(getOptionalParameterAsText(paramIndex))
+        paramIndex += 1
         
         if tempStr.lower() == "true":
             stripExt = True
@@ -114,21 +166,26 @@ def main():
             if ext.lower() == ".xml":
                 tamWorkbookFiles.append(sourceDir + os.sep + f)
 
-        # Upload all of the TA workbooks to the DB
+        # Upload all of the TA workbooks to the DB, with as many uploads in
+        # progress at once as the database can keep up with (up to the maximum
+        # specified)
         arcpy.SetProgressor("step", "Uploading Task Assistant Workbooks...", 0, len(tamWorkbookFiles), 1)
-        count = 0
         workbooksUploaded = []
-        for tamWkbk in tamWorkbookFiles:
-            targetName = os.path.basename(tamWkbk)
-            if stripExt:
-                (targetName, unused) = os.path.splitext(targetName)
-            arcpy.SetProgressorLabel("Uploading workbook '" + targetName + "'")
-            arcpy.UploadTaskAssistantWorkbook_WMXAdminUtils(tamWkbk, targetName, "OVERWRITE", wmxDbAlias)
-            logPreviousToolMessages()
-            count += 1
-            workbooksUploaded.append(targetName)
-            
-            arcpy.SetProgressorPosition(count)
+
+        def onWorkbookUploaded(tamWkbk, result, error):
+            if error != None:
+                raise error
+            logToolResultMessages(result)
+            workbooksUploaded.append(getTargetName(tamWkbk, stripExt))
+            arcpy.SetProgressorPosition(len(workbooksUploaded))
+
+        def onProgress(stats):
+            arcpy.SetProgressorLabel("Uploading workbooks (" + stats.describe() + ")...")
+
+        executor = AdaptiveExecutor.AdaptiveExecutor(maxConcurrentCalls)
+        uploadWorkbook = UploadWorkbookCall(wmxToolbox, stripExt, wmxDbAlias)
+        executor.run(tamWorkbookFiles, uploadWorkbook, onWorkbookUploaded, onProgress, isCancelled)
+        log("Uploaded " + executor.getStats().summarize())
             
         # Set the return value for this tool (a multivalue containing the list of
         # Task Assistant workbooks that were uploaded)
@@ -137,7 +194,7 @@ def main():
             workbooksUploadedStr += workbook + ";"
 
         workbooksUploadedStr = workbooksUploadedStr.rstrip(";")
-        arcpy.SetParameterAsText(paramIndex, workbooksUploadedStr)
+        arcpy.SetParameterAsText(outputParamIndex, workbooksUploadedStr)
         arcpy.AddMessage("Workbooks uploaded: " + workbooksUploadedStr)
         
     except LicenseError, lex:
@@ -450,7 +450,10 @@ namespace WorkflowManagerAdministrationUtilities
 
                 // Associate the evaluator with the change rule and save the changes
                 changeRule.Evaluators.Add(areaEvaluator as IJTXConditionEvaluator);
-                changeRule.Store();
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_STORE))
+                {
+                    changeRule.Store();
+                }
 
                 // Set the output parameter
                 WmauParameterMap paramMap = new WmauParameterMap(paramValues);
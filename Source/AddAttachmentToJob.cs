@@ -226,7 +226,11 @@ namespace WorkflowManagerAdministrationUtilities
             try
             {
                 IJTXJobManager jobManager = this.WmxDatabase.JobManager;
-                IJTXJob3 job = jobManager.GetJob(m_jobId) as IJTXJob3;
+                IJTXJob3 job = null;
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_GET_JOB))
+                {
+                    job = jobManager.GetJob(m_jobId) as IJTXJob3;
+                }
                 IJTXConfiguration3 configMgr = this.WmxDatabase.ConfigurationManager as IJTXConfiguration3;
 
                 // As of Jan. 2011, the core Workflow Manager libraries do not
@@ -254,16 +258,22 @@ namespace WorkflowManagerAdministrationUtilities
 
                 msgs.AddMessage("Adding attachment '" + m_attachmentPath + "' to job " + m_jobId + " (" + job.Name + ")");
                 job.AddAttachment(m_attachmentPath, attachmentType, m_attachmentType);
-                job.Store();
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_STORE))
+                {
+                    job.Store();
+                }
 
                 // Do the other things that still need to be handled manually, such as logging
                 // the job's reassignment and sending any necessary notifications.
                 IPropertySet propSet = new PropertySetClass();
                 propSet.SetProperty(C_PROP_VAL_ATTACHMENT, "'" + m_attachmentPath + "'");
-                job.LogJobAction(
-                    configMgr.GetActivityType(ESRI.ArcGIS.JTX.Utilities.Constants.ACTTYPE_ADD_ATTACHMENT),
-                    propSet,
-                    string.Empty);
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_LOG_ACTION))
+                {
+                    job.LogJobAction(
+                        configMgr.GetActivityType(ESRI.ArcGIS.JTX.Utilities.Constants.ACTTYPE_ADD_ATTACHMENT),
+                        propSet,
+                        string.Empty);
+                }
                 Common.WmauHelperFunctions.SendNotification(
                     ESRI.ArcGIS.JTX.Utilities.Constants.NOTIF_ATTACHMENT_ADDED,
                     this.WmxDatabase,
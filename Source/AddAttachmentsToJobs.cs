@@ -0,0 +1,889 @@
+﻿//Copyright 2015 Esri
+//Licensed under the Apache License, Version 2.0 (the "License");
+//you may not use this file except in compliance with the License.
+//You may obtain a copy of the License at
+//    http://www.apache.org/licenses/LICENSE-2.0
+//Unless required by applicable law or agreed to in writing, software
+//distributed under the License is distributed on an "AS IS" BASIS,
+//WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//See the License for the specific language governing permissions and
+//limitations under the License.​
+
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
+using System.Security.Cryptography;
+using System.Text;
+
+using ESRI.ArcGIS.ADF;
+using ESRI.ArcGIS.esriSystem;
+using ESRI.ArcGIS.Geodatabase;
+using ESRI.ArcGIS.Geoprocessing;
+using ESRI.ArcGIS.JTX;
+
+
+namespace WorkflowManagerAdministrationUtilities
+{
+    class AddAttachmentsToJobs : WmauAbstractGpFunction
+    {
+        #region Constants
+        private const string C_PARAM_ATTACHMENT_TABLE = "in_table_attachmentTable";
+        private const string C_PARAM_JOB_ID_FIELD = "in_field_jobIdField";
+        private const string C_PARAM_PATH_FIELD = "in_field_pathField";
+        private const string C_PARAM_ATTACHMENT_FOLDER = "in_folder_attachmentFolder";
+        private const string C_PARAM_ATTACHMENT_TYPE = "in_string_attachmentType";
+        private const string C_PARAM_LINK_DUPLICATES = "in_bool_linkDuplicates";
+        private const string C_PARAM_BATCH_SIZE = "in_long_batchSize";
+        private const string C_PARAM_NUM_ATTACHMENTS_ADDED = "out_long_numAttachmentsAdded";
+        private const string C_PARAM_NUM_ATTACHMENTS_FAILED = "out_long_numAttachmentsFailed";
+
+        private const string C_OPT_EMBEDDED = "EMBEDDED";
+        private const string C_OPT_LINKED = "LINKED";
+        private const string C_OPT_LINK_DUPLICATES = "LINK_DUPLICATES";
+        private const string C_OPT_EMBED_ALL = "EMBED_ALL";
+
+        private const string C_DEFAULT_JOB_ID_FIELD = "JOB_ID";
+        private const string C_DEFAULT_PATH_FIELD = "PATH";
+        private const string C_DEFAULT_ATTACHMENT_TYPE = C_OPT_EMBEDDED;
+        private const bool C_DEFAULT_LINK_DUPLICATES = false;
+        private const int C_DEFAULT_BATCH_SIZE = 100;
+
+        // These values match up with other predetermined values referenced by Workflow
+        // Manager.  Do not modify.
+        private const string C_PROP_VAL_ATTACHMENT = "[ATTACHMENT]";
+        #endregion
+
+        #region MemberVariables
+        private IGPValue m_attachmentTable = null;
+        private string m_jobIdField = C_DEFAULT_JOB_ID_FIELD;
+        private string m_pathField = C_DEFAULT_PATH_FIELD;
+        private string m_attachmentFolder = string.Empty;
+        private string m_attachmentType = C_DEFAULT_ATTACHMENT_TYPE;
+        private bool m_linkDuplicates = C_DEFAULT_LINK_DUPLICATES;
+        private int m_batchSize = C_DEFAULT_BATCH_SIZE;
+
+        private int m_numAttachmentsAdded = 0;
+        private int m_numAttachmentsFailed = 0;
+        private int m_numAttachmentsLinked = 0;
+        private long m_numBytesUploaded = 0;
+        private long m_numBytesNotUploaded = 0;
+        private bool m_groupEdits = true;
+
+        // Maps each file's full path to a key identifying its contents, and each
+        // key to the path of the file whose contents were uploaded to the database
+        private Dictionary<string, string> m_contentKeys = null;
+        private Dictionary<string, string> m_uploadedContent = null;
+        #endregion
+
+        #region SimpleAccessors
+        public override string Name { get { return "AddAttachmentsToJobs"; } }
+        public override string DisplayName { get { return Properties.Resources.TOOL_ADD_ATTACHMENTS_TO_JOBS; } }
+        public override string DisplayToolset { get { return Properties.Resources.CAT_JOB_UTILS; } }
+        #endregion
+
+        #region Private helper functions
+        /// <summary>
+        /// Updates the internal values used by this tool based on the parameters from an input array
+        /// </summary>
+        /// <param name="paramValues"></param>
+        protected override void ExtractParameters(IArray paramValues)
+        {
+            // Get the values for any parameters common to all GP tools
+            ExtractParametersCommon(paramValues);
+
+            WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+            IGPParameter3 param = null;
+
+            // Update the internal values of whatever parameters we're maintaining
+            param = paramMap.GetParam(C_PARAM_ATTACHMENT_TABLE);
+            m_attachmentTable = param.Value;
+
+            param = paramMap.GetParam(C_PARAM_JOB_ID_FIELD);
+            m_jobIdField = param.Value.GetAsText();
+            if (string.IsNullOrEmpty(m_jobIdField))
+            {
+                m_jobIdField = C_DEFAULT_JOB_ID_FIELD;
+            }
+
+            param = paramMap.GetParam(C_PARAM_PATH_FIELD);
+            m_pathField = param.Value.GetAsText();
+            if (string.IsNullOrEmpty(m_pathField))
+            {
+                m_pathField = C_DEFAULT_PATH_FIELD;
+            }
+
+            param = paramMap.GetParam(C_PARAM_ATTACHMENT_FOLDER);
+            m_attachmentFolder = param.Value.GetAsText();
+
+            param = paramMap.GetParam(C_PARAM_ATTACHMENT_TYPE);
+            m_attachmentType = param.Value.GetAsText();
+
+            param = paramMap.GetParam(C_PARAM_LINK_DUPLICATES);
+            m_linkDuplicates = (param.Value as IGPBoolean).Value;
+
+            param = paramMap.GetParam(C_PARAM_BATCH_SIZE);
+            m_batchSize = int.Parse(param.Value.GetAsText());
+        }
+
+        /// <summary>
+        /// Adds a file to the list of attachments for a job, skipping any file that is
+        /// already listed for that job
+        /// </summary>
+        /// <param name="attachments">The attachments to be added, by job ID</param>
+        /// <param name="jobId">The ID of the job</param>
+        /// <param name="path">The path to the file to be attached</param>
+        private void AddToAttachmentList(SortedDictionary<int, List<string>> attachments, int jobId, string path)
+        {
+            List<string> paths = null;
+            if (!attachments.TryGetValue(jobId, out paths))
+            {
+                paths = new List<string>();
+                attachments[jobId] = paths;
+            }
+
+            if (!paths.Contains(path, StringComparer.OrdinalIgnoreCase))
+            {
+                paths.Add(path);
+            }
+        }
+
+        /// <summary>
+        /// Reads the job IDs and file paths from the attachment table
+        /// </summary>
+        /// <param name="attachments">The attachments to be added, by job ID</param>
+        private void ReadAttachmentTable(SortedDictionary<int, List<string>> attachments)
+        {
+            using (ComReleaser cr1 = new ComReleaser(), cr2 = new ComReleaser())
+            {
+                ITable table = m_gpUtilities.DecodeTable(m_attachmentTable);
+                cr1.ManageLifetime(table);
+
+                int jobIdIndex = table.FindField(m_jobIdField);
+                int pathIndex = table.FindField(m_pathField);
+                if (jobIdIndex < 0 || pathIndex < 0)
+                {
+                    throw new WmauException(WmauErrorCodes.C_ATTACHMENT_FIELD_NOT_FOUND_ERROR);
+                }
+
+                IQueryFilter query = new QueryFilterClass();
+                query.SubFields = m_jobIdField + "," + m_pathField;
+                ICursor searchCursor = table.Search(query, true);
+                cr2.ManageLifetime(searchCursor);
+
+                IRow row = null;
+                while ((row = searchCursor.NextRow()) != null)
+                {
+                    object jobId = row.get_Value(jobIdIndex);
+                    object path = row.get_Value(pathIndex);
+                    if (jobId == null || jobId is DBNull || path == null || path is DBNull)
+                    {
+                        continue;
+                    }
+
+                    string pathStr = path.ToString().Trim();
+                    if (pathStr.Length > 0)
+                    {
+                        AddToAttachmentList(attachments, Convert.ToInt32(jobId), Path.GetFullPath(pathStr));
+                    }
+                }
+            }
+        }
+
+        /// <summary>
+        /// Finds the files to attach in the attachment folder.  Each subfolder whose
+        /// name is a job ID holds the files to attach to that job; anything else in
+        /// the folder is ignored.
+        /// </summary>
+        /// <param name="attachments">The attachments to be added, by job ID</param>
+        /// <param name="msgs">The GP messages object for this tool</param>
+        private void ReadAttachmentFolder(SortedDictionary<int, List<string>> attachments, IGPMessages msgs)
+        {
+            DirectoryInfo folder = new DirectoryInfo(m_attachmentFolder);
+            foreach (DirectoryInfo jobFolder in folder.EnumerateDirectories())
+            {
+                int jobId = 0;
+                if (!int.TryParse(jobFolder.Name, out jobId))
+                {
+                    msgs.AddWarning("Skipping folder '" + jobFolder.FullName + "'; its name is not a job ID");
+                    continue;
+                }
+
+                foreach (FileInfo file in jobFolder.EnumerateFiles())
+                {
+                    AddToAttachmentList(attachments, jobId, file.FullName);
+                }
+            }
+        }
+
+        /// <summary>
+        /// Works out which of the files to be attached have the same contents.  Files
+        /// are only hashed if some other file has the same size, and each file is read
+        /// at most once, no matter how many jobs it is attached to.
+        /// </summary>
+        /// <param name="attachments">The attachments to be added, by job ID</param>
+        /// <returns>
+        /// A map from each file's path to a key identifying its contents; files
+        /// that could not be read are omitted
+        /// </returns>
+        private Dictionary<string, string> BuildContentKeys(SortedDictionary<int, List<string>> attachments)
+        {
+            Dictionary<string, string> contentKeys = new Dictionary<string, string>(StringComparer.OrdinalIgnoreCase);
+
+            // Group the files by size
+            Dictionary<long, List<string>> pathsBySize = new Dictionary<long, List<string>>();
+            foreach (List<string> paths in attachments.Values)
+            {
+                foreach (string path in paths)
+                {
+                    if (contentKeys.ContainsKey(path))
+                    {
+                        continue;
+                    }
+
+                    FileInfo file = new FileInfo(path);
+                    if (!file.Exists)
+                    {
+                        continue;
+                    }
+
+                    List<string> sameSize = null;
+                    if (!pathsBySize.TryGetValue(file.Length, out sameSize))
+                    {
+                        sameSize = new List<string>();
+                        pathsBySize[file.Length] = sameSize;
+                    }
+                    sameSize.Add(path);
+                    contentKeys[path] = path;
+                }
+            }
+
+            // A file of a unique size can't be a duplicate, so its path is enough to
+            // identify its contents; hash the rest
+            using (SHA1 hasher = new SHA1CryptoServiceProvider())
+            {
+                foreach (KeyValuePair<long, List<string>> sameSize in pathsBySize)
+                {
+                    if (sameSize.Value.Count < 2)
+                    {
+                        continue;
+                    }
+
+                    foreach (string path in sameSize.Value)
+                    {
+                        try
+                        {
+                            using (FileStream stream = File.OpenRead(path))
+                            {
+                                byte[] hash = hasher.ComputeHash(stream);
+                                contentKeys[path] = sameSize.Key.ToString() + ":" + BitConverter.ToString(hash);
+                            }
+                        }
+                        catch (IOException)
+                        {
+                            // Leave unreadable files to be reported when they're attached
+                            contentKeys.Remove(path);
+                        }
+                        catch (UnauthorizedAccessException)
+                        {
+                            contentKeys.Remove(path);
+                        }
+                    }
+                }
+            }
+
+            return contentKeys;
+        }
+
+        /// <summary>
+        /// Loads a batch of jobs and adds their attachments.  Each job is stored only
+        /// once, regardless of how many files are attached to it.
+        /// </summary>
+        /// <param name="jobIds">The IDs of the jobs to update</param>
+        /// <param name="attachments">The attachments to be added, by job ID</param>
+        /// <param name="attachmentActivity">The activity type used to log the attachments</param>
+        /// <param name="checkHolds">True if held jobs must not be given attachments</param>
+        /// <param name="msgs">The GP messages object for this tool</param>
+        private void AttachToJobBatch(
+            List<int> jobIds,
+            SortedDictionary<int, List<string>> attachments,
+            IJTXActivityType attachmentActivity,
+            bool checkHolds,
+            IGPMessages msgs)
+        {
+            IJTXJobSet jobSet = Common.WmauHelperFunctions.GetJobsById(this.WmxDatabase, jobIds);
+
+            // Note any jobs that couldn't be found
+            HashSet<int> jobsFound = new HashSet<int>();
+            for (int i = 0; i < jobSet.Count; i++)
+            {
+                jobsFound.Add(jobSet.get_Item(i).ID);
+            }
+            foreach (int jobId in jobIds)
+            {
+                if (!jobsFound.Contains(jobId))
+                {
+                    msgs.AddWarning("  Job " + jobId.ToString() + ": not found");
+                    m_numAttachmentsFailed += attachments[jobId].Count;
+                }
+            }
+
+            // Look up the active holds for the entire batch at once, rather than job by job
+            HashSet<int> heldJobs = new HashSet<int>();
+            if (checkHolds)
+            {
+                heldJobs = Common.WmauHelperFunctions.ListJobsWithHolds(this.WmxDatabase, jobsFound);
+            }
+
+            IWorkspaceEdit workspaceEdit = null;
+            if (m_groupEdits)
+            {
+                try
+                {
+                    workspaceEdit = Common.WmauHelperFunctions.StartJobEditOperation(this.WmxDatabase);
+                }
+                catch (Exception ex)
+                {
+                    m_groupEdits = false;
+                    msgs.AddWarning("Could not start an edit session on the Workflow Manager database; " +
+                        "each job will be stored separately (" + ex.Message + ")");
+                }
+            }
+
+            bool saveEdits = false;
+            List<IJTXJob3> updatedJobs = new List<IJTXJob3>();
+            List<string> updateMsgs = new List<string>();
+            List<string> batchNewContent = new List<string>();
+            int batchAttached = 0;
+            int batchLinked = 0;
+            long batchBytesUploaded = 0;
+            long batchBytesNotUploaded = 0;
+            try
+            {
+                for (int i = 0; i < jobSet.Count; i++)
+                {
+                    IJTXJob3 job = jobSet.get_Item(i) as IJTXJob3;
+                    string jobDesc = "  Job " + job.ID.ToString() + " (" + job.Name + ")";
+                    List<string> paths = attachments[job.ID];
+
+                    // As with the "Add Attachment to Job" tool, the core Workflow Manager
+                    // libraries don't check for holds when adding attachments, so do it here
+                    if (heldJobs.Contains(job.ID))
+                    {
+                        WmauError error = new WmauError(WmauErrorCodes.C_NO_ADD_ATTACHMENTS_HELD_JOBS_ERROR);
+                        msgs.AddWarning(jobDesc + ": " + error.Message);
+                        m_numAttachmentsFailed += paths.Count;
+                        continue;
+                    }
+
+                    List<string> attached = new List<string>();
+                    List<string> newContent = new List<string>();
+                    int numMissing = 0;
+                    long bytesUploaded = 0;
+                    long bytesNotUploaded = 0;
+                    int numLinked = 0;
+                    try
+                    {
+                        foreach (string path in paths)
+                        {
+                            string contentKey = null;
+                            if (!m_contentKeys.TryGetValue(path, out contentKey))
+                            {
+                                WmauError error = new WmauError(WmauErrorCodes.C_FILE_ACCESS_ERROR);
+                                msgs.AddWarning(jobDesc + ": " + error.Message + " '" + path + "'");
+                                numMissing++;
+                                continue;
+                            }
+
+                            // Upload the contents of each file once; link to any duplicates
+                            // of a file that has already been uploaded
+                            string attachmentPath = path;
+                            jtxFileStorageType storageType = jtxFileStorageType.jtxStoreAsLink;
+                            string storageDesc = C_OPT_LINKED;
+                            if (m_attachmentType.Equals(C_OPT_EMBEDDED))
+                            {
+                                string uploadedPath = null;
+                                if (m_linkDuplicates && m_uploadedContent.TryGetValue(contentKey, out uploadedPath))
+                                {
+                                    attachmentPath = uploadedPath;
+                                    bytesNotUploaded += new FileInfo(path).Length;
+                                    numLinked++;
+                                }
+                                else
+                                {
+                                    storageType = jtxFileStorageType.jtxStoreInDB;
+                                    storageDesc = C_OPT_EMBEDDED;
+                                    bytesUploaded += new FileInfo(path).Length;
+                                    if (!m_uploadedContent.ContainsKey(contentKey))
+                                    {
+                                        m_uploadedContent[contentKey] = path;
+                                        newContent.Add(contentKey);
+                                    }
+                                }
+                            }
+
+                            using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_ADD_ATTACHMENT))
+                            {
+                                job.AddAttachment(attachmentPath, storageType, storageDesc);
+                            }
+                            attached.Add(attachmentPath);
+                        }
+
+                        m_numAttachmentsFailed += numMissing;
+                        if (attached.Count == 0)
+                        {
+                            continue;
+                        }
+
+                        // Store the job once, regardless of how many files were attached to it
+                        using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_STORE))
+                        {
+                            job.Store();
+                        }
+
+                        foreach (string attachmentPath in attached)
+                        {
+                            IPropertySet propSet = new PropertySetClass();
+                            propSet.SetProperty(C_PROP_VAL_ATTACHMENT, "'" + attachmentPath + "'");
+                            using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_LOG_ACTION))
+                            {
+                                job.LogJobAction(attachmentActivity, propSet, string.Empty);
+                            }
+                        }
+
+                        updateMsgs.Add(jobDesc + ": added " + attached.Count.ToString() + " attachment(s)");
+                        batchNewContent.AddRange(newContent);
+                        batchAttached += attached.Count;
+                        batchLinked += numLinked;
+                        batchBytesUploaded += bytesUploaded;
+                        batchBytesNotUploaded += bytesNotUploaded;
+                        updatedJobs.Add(job);
+                    }
+                    catch (Exception ex)
+                    {
+                        // None of this job's files made it into the database, so later
+                        // copies of them will need to be uploaded
+                        foreach (string contentKey in newContent)
+                        {
+                            m_uploadedContent.Remove(contentKey);
+                        }
+                        msgs.AddWarning(jobDesc + ": could not add attachments (" + ex.Message + ")");
+                        m_numAttachmentsFailed += paths.Count - numMissing;
+                    }
+                }
+                saveEdits = true;
+            }
+            finally
+            {
+                // Discard the changes if the batch didn't run to completion
+                if (!saveEdits)
+                {
+                    Common.WmauHelperFunctions.StopJobEditOperation(workspaceEdit, false);
+                }
+            }
+
+            // Save the batch; if it can't be saved, none of its files were attached
+            try
+            {
+                Common.WmauHelperFunctions.StopJobEditOperation(workspaceEdit, true);
+            }
+            catch (Exception ex)
+            {
+                // None of these files made it into the database, so later copies of
+                // them will need to be uploaded
+                foreach (string contentKey in batchNewContent)
+                {
+                    m_uploadedContent.Remove(contentKey);
+                }
+                foreach (IJTXJob3 job in updatedJobs)
+                {
+                    msgs.AddWarning("  Job " + job.ID.ToString() + " (" + job.Name + "): could not add attachments (" + ex.Message + ")");
+                }
+                m_numAttachmentsFailed += batchAttached;
+                return;
+            }
+
+            // Only report the changes and send notifications once they have been saved
+            foreach (string updateMsg in updateMsgs)
+            {
+                msgs.AddMessage(updateMsg);
+            }
+            m_numAttachmentsAdded += batchAttached;
+            m_numAttachmentsLinked += batchLinked;
+            m_numBytesUploaded += batchBytesUploaded;
+            m_numBytesNotUploaded += batchBytesNotUploaded;
+            foreach (IJTXJob3 job in updatedJobs)
+            {
+                Common.WmauHelperFunctions.SendNotification(
+                    ESRI.ArcGIS.JTX.Utilities.Constants.NOTIF_ATTACHMENT_ADDED,
+                    this.WmxDatabase,
+                    job);
+            }
+        }
+
+        /// <summary>
+        /// Formats a number of bytes for display
+        /// </summary>
+        /// <param name="numBytes">The number of bytes</param>
+        /// <returns>The number of bytes, in MB</returns>
+        private static string FormatBytes(long numBytes)
+        {
+            return String.Format("{0:0.0} MB", numBytes / (1024.0 * 1024.0));
+        }
+        #endregion
+
+        /// <summary>
+        /// Required by IGPFunction2 interface.
+        /// </summary>
+        public override IArray ParameterInfo
+        {
+            get
+            {
+                m_parameters = new ArrayClass();
+                IGPParameterEdit3 paramEdit = null;
+                IGPCodedValueDomain cvDomain = null;
+
+                // Parameter indicating a table listing the files to attach to each job
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_AAJS_ATTACHMENT_TABLE,
+                    C_PARAM_ATTACHMENT_TABLE,
+                    new GPTableViewTypeClass(),
+                    null);
+                m_parameters.Add(paramEdit);
+
+                // Parameters indicating the fields in the table holding the job IDs
+                // and file paths
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_AAJS_JOB_ID_FIELD,
+                    C_PARAM_JOB_ID_FIELD,
+                    new FieldTypeClass(),
+                    null);
+                paramEdit.AddDependency(C_PARAM_ATTACHMENT_TABLE);
+                m_parameters.Add(paramEdit);
+
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_AAJS_PATH_FIELD,
+                    C_PARAM_PATH_FIELD,
+                    new FieldTypeClass(),
+                    null);
+                paramEdit.AddDependency(C_PARAM_ATTACHMENT_TABLE);
+                m_parameters.Add(paramEdit);
+
+                // Parameter indicating a folder containing one subfolder of files for
+                // each job
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_AAJS_ATTACHMENT_FOLDER,
+                    C_PARAM_ATTACHMENT_FOLDER,
+                    new DEFolderTypeClass(),
+                    null);
+                m_parameters.Add(paramEdit);
+
+                // Parameter indicating how to associate the attachments with the jobs
+                cvDomain = new GPCodedValueDomainClass();
+                cvDomain.AddStringCode(C_OPT_EMBEDDED, C_OPT_EMBEDDED);
+                cvDomain.AddStringCode(C_OPT_LINKED, C_OPT_LINKED);
+
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeRequired,
+                    Properties.Resources.DESC_AAJS_ATTACHMENT_TYPE,
+                    C_PARAM_ATTACHMENT_TYPE,
+                    cvDomain.FindValue(C_DEFAULT_ATTACHMENT_TYPE).DataType,
+                    cvDomain.FindValue(C_DEFAULT_ATTACHMENT_TYPE));
+                paramEdit.Domain = cvDomain as IGPDomain;
+                m_parameters.Add(paramEdit);
+
+                // Parameter indicating whether files whose contents have already been
+                // uploaded should be linked rather than embedded again
+                cvDomain = new GPCodedValueDomainClass();
+                cvDomain.AddCode(GpTrue, C_OPT_LINK_DUPLICATES);
+                cvDomain.AddCode(GpFalse, C_OPT_EMBED_ALL);
+
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_AAJS_LINK_DUPLICATES,
+                    C_PARAM_LINK_DUPLICATES,
+                    GpBooleanType,
+                    ToGpBoolean(C_DEFAULT_LINK_DUPLICATES));
+                paramEdit.Domain = cvDomain as IGPDomain;
+                m_parameters.Add(paramEdit);
+
+                // Optional parameter indicating how many jobs should be loaded and
+                // stored at a time
+                IGPLong batchSize = new GPLongClass();
+                batchSize.Value = C_DEFAULT_BATCH_SIZE;
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_AAJS_BATCH_SIZE,
+                    C_PARAM_BATCH_SIZE,
+                    new GPLongTypeClass(),
+                    batchSize as IGPValue);
+                m_parameters.Add(paramEdit);
+
+                // Parameter for specifying the WMX database
+                m_parameters.Add(BuildWmxDbParameter());
+
+                // Parameter indicating the number of attachments added
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionOutput,
+                    esriGPParameterType.esriGPParameterTypeDerived,
+                    Properties.Resources.DESC_AAJS_NUM_ATTACHMENTS_ADDED,
+                    C_PARAM_NUM_ATTACHMENTS_ADDED,
+                    new GPLongTypeClass(),
+                    null);
+                m_parameters.Add(paramEdit);
+
+                // Parameter indicating the number of attachments that could not be added
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionOutput,
+                    esriGPParameterType.esriGPParameterTypeDerived,
+                    Properties.Resources.DESC_AAJS_NUM_ATTACHMENTS_FAILED,
+                    C_PARAM_NUM_ATTACHMENTS_FAILED,
+                    new GPLongTypeClass(),
+                    null);
+                m_parameters.Add(paramEdit);
+
+                return m_parameters;
+            }
+        }
+
+        /// <summary>
+        /// Post validates the given set of values.
+        /// This is where you flag parameters with warnings and error messages, among other things.
+        /// </summary>
+        /// <param name="paramValues"></param>
+        /// <param name="pEnvMgr"></param>
+        /// <param name="msgs"></param>
+        public override void UpdateMessages(IArray paramValues, IGPEnvironmentManager pEnvMgr, IGPMessages msgs)
+        {
+            try
+            {
+                UpdateMessagesCommon(paramValues, pEnvMgr, msgs);
+            }
+            catch (WmxDefaultDbNotSetException)
+            {
+                // If the default DB wasn't set, stop executing
+                return;
+            }
+
+            // Build a hash of which parameter is at which index for ease of access
+            WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+
+            // Ensure that the current user has permissions to be adding attachments to jobs
+            if (!CurrentUserHasPrivilege(ESRI.ArcGIS.JTX.Utilities.Constants.PRIV_MANAGE_ATTACHMENTS))
+            {
+                WmauError error = new WmauError(WmauErrorCodes.C_NO_MANAGE_ATTACHMENTS_PRIV_ERROR);
+                msgs.ReplaceError(paramMap.GetIndex(C_PARAM_ATTACHMENT_TABLE), error.ErrorCodeAsInt, error.Message);
+            }
+
+            // Ensure that some attachments have been specified
+            IGPParameter3 tableParam = paramMap.GetParam(C_PARAM_ATTACHMENT_TABLE);
+            IGPParameter3 folderParam = paramMap.GetParam(C_PARAM_ATTACHMENT_FOLDER);
+            if ((tableParam.Value == null || tableParam.Value.IsEmpty()) &&
+                (folderParam.Value == null || folderParam.Value.IsEmpty()))
+            {
+                WmauError error = new WmauError(WmauErrorCodes.C_NO_ATTACHMENTS_SPECIFIED_ERROR);
+                msgs.ReplaceError(paramMap.GetIndex(C_PARAM_ATTACHMENT_TABLE), error.ErrorCodeAsInt, error.Message);
+            }
+
+            // Ensure that the batch size is sensible
+            IGPParameter3 batchSizeParam = paramMap.GetParam(C_PARAM_BATCH_SIZE);
+            int batchSize = 0;
+            if (batchSizeParam.Value != null &&
+                (!int.TryParse(batchSizeParam.Value.GetAsText(), out batchSize) || batchSize <= 0))
+            {
+                WmauError error = new WmauError(WmauErrorCodes.C_INVALID_BATCH_SIZE_ERROR);
+                msgs.ReplaceError(paramMap.GetIndex(C_PARAM_BATCH_SIZE), error.ErrorCodeAsInt, error.Message);
+            }
+        }
+
+        /// <summary>
+        /// Pre validates the given set of values.
+        /// This is where you populate derived parameters based on input, among other things.
+        /// </summary>
+        /// <param name="paramValues"></param>
+        /// <param name="pEnvMgr"></param>
+        public override void UpdateParameters(IArray paramValues, IGPEnvironmentManager pEnvMgr)
+        {
+            try
+            {
+                UpdateParametersCommon(paramValues, pEnvMgr);
+            }
+            catch (WmxDefaultDbNotSetException)
+            {
+                // If the default DB wasn't set, stop executing
+                return;
+            }
+            catch (NullReferenceException)
+            {
+                // If one of the parameters was null, stop executing
+                return;
+            }
+
+            // Get the parameters as a map for easier access
+            WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+            IGPParameter3 attachmentType = paramMap.GetParam(C_PARAM_ATTACHMENT_TYPE);
+            IGPParameterEdit3 linkDuplicatesEdit = paramMap.GetParamEdit(C_PARAM_LINK_DUPLICATES);
+
+            // Duplicates only matter if the files are being uploaded
+            linkDuplicatesEdit.Enabled =
+                attachmentType.Value != null && attachmentType.Value.GetAsText().Equals(C_OPT_EMBEDDED);
+        }
+
+        /// <summary>
+        /// Required by IGPFunction2 interface; this function is called when the GP tool is ready to be executed.
+        /// </summary>
+        /// <param name="paramValues"></param>
+        /// <param name="trackCancel"></param>
+        /// <param name="envMgr"></param>
+        /// <param name="msgs"></param>
+        public override void Execute(IArray paramValues, ITrackCancel trackCancel, IGPEnvironmentManager envMgr, IGPMessages msgs)
+        {
+            // Do some common error-checking
+            base.Execute(paramValues, trackCancel, envMgr, msgs);
+
+            m_numAttachmentsAdded = 0;
+            m_numAttachmentsFailed = 0;
+            m_numAttachmentsLinked = 0;
+            m_numBytesUploaded = 0;
+            m_numBytesNotUploaded = 0;
+            m_groupEdits = true;
+            m_uploadedContent = new Dictionary<string, string>();
+
+            try
+            {
+                bool useTable = m_attachmentTable != null && !m_attachmentTable.IsEmpty();
+                if (!useTable && string.IsNullOrEmpty(m_attachmentFolder))
+                {
+                    throw new WmauException(WmauErrorCodes.C_NO_ATTACHMENTS_SPECIFIED_ERROR);
+                }
+                if (m_batchSize <= 0)
+                {
+                    throw new WmauException(WmauErrorCodes.C_INVALID_BATCH_SIZE_ERROR);
+                }
+
+                // Check the user's privileges once, up front, rather than for each job
+                if (!CurrentUserHasPrivilege(ESRI.ArcGIS.JTX.Utilities.Constants.PRIV_MANAGE_ATTACHMENTS))
+                {
+                    throw new WmauException(WmauErrorCodes.C_NO_MANAGE_ATTACHMENTS_PRIV_ERROR);
+                }
+                bool checkHolds =
+                    !CurrentUserHasPrivilege(ESRI.ArcGIS.JTX.Utilities.Constants.PRIV_CAN_ADD_ATTACHES_FOR_HELD_JOBS);
+
+                // Likewise, look up the activity type once
+                IJTXConfiguration3 configMgr = this.WmxDatabase.ConfigurationManager as IJTXConfiguration3;
+                IJTXActivityType attachmentActivity = null;
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_GET_ACTIVITY_TYPE))
+                {
+                    attachmentActivity = configMgr.GetActivityType(ESRI.ArcGIS.JTX.Utilities.Constants.ACTTYPE_ADD_ATTACHMENT);
+                }
+
+                // Gather up the files to attach to each job, from the table and/or the folder
+                SortedDictionary<int, List<string>> attachments = new SortedDictionary<int, List<string>>();
+                if (useTable)
+                {
+                    ReadAttachmentTable(attachments);
+                }
+                if (!string.IsNullOrEmpty(m_attachmentFolder))
+                {
+                    ReadAttachmentFolder(attachments, msgs);
+                }
+                m_contentKeys = BuildContentKeys(attachments);
+
+                int numAttachments = 0;
+                foreach (List<string> paths in attachments.Values)
+                {
+                    numAttachments += paths.Count;
+                }
+                int numDistinct = m_contentKeys.Values.Distinct().Count();
+                msgs.AddMessage("Adding " + numAttachments.ToString() + " attachment(s) to " +
+                    attachments.Count.ToString() + " job(s); " + numDistinct.ToString() + " distinct file(s)");
+                if (m_linkDuplicates && m_attachmentType.Equals(C_OPT_EMBEDDED) && numDistinct < numAttachments)
+                {
+                    // Linked copies refer to the path of the first copy, not to the uploaded contents
+                    msgs.AddWarning("Duplicate files will be linked to the first copy of each file; " +
+                        "these files must remain at their current paths, on a shared drive that all " +
+                        "Workflow Manager users can reach, or the linked attachments will not open");
+                }
+
+                List<int> jobIds = attachments.Keys.ToList();
+                System.Diagnostics.Stopwatch timer = System.Diagnostics.Stopwatch.StartNew();
+                for (int start = 0; start < jobIds.Count; start += m_batchSize)
+                {
+                    if (trackCancel != null && !trackCancel.Continue())
+                    {
+                        msgs.AddWarning("Cancelled; " + (jobIds.Count - start).ToString() + " job(s) were not updated");
+                        break;
+                    }
+
+                    List<int> batch = jobIds.GetRange(start, Math.Min(m_batchSize, jobIds.Count - start));
+                    AttachToJobBatch(batch, attachments, attachmentActivity, checkHolds, msgs);
+                }
+                timer.Stop();
+
+                // Report how much uploading was saved by linking to duplicate files
+                double seconds = timer.Elapsed.TotalSeconds;
+                msgs.AddMessage("Added " + m_numAttachmentsAdded.ToString() + " attachment(s); " +
+                    m_numAttachmentsFailed.ToString() + " attachment(s) could not be added");
+                if (m_attachmentType.Equals(C_OPT_EMBEDDED))
+                {
+                    msgs.AddMessage("Uploaded " + FormatBytes(m_numBytesUploaded) + "; linked " +
+                        m_numAttachmentsLinked.ToString() + " duplicate file(s) instead of uploading another " +
+                        FormatBytes(m_numBytesNotUploaded));
+                }
+                if (seconds > 0)
+                {
+                    msgs.AddMessage(String.Format("Processed {0} attachment(s) in {1:0.0} seconds ({2:0.0} attachments/sec, {3:0.00} MB/sec uploaded)",
+                        m_numAttachmentsAdded + m_numAttachmentsFailed, seconds,
+                        (m_numAttachmentsAdded + m_numAttachmentsFailed) / seconds,
+                        m_numBytesUploaded / (1024.0 * 1024.0) / seconds));
+                }
+
+                // Set the output parameters
+                WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+                IGPParameterEdit3 outParamEdit = paramMap.GetParamEdit(C_PARAM_NUM_ATTACHMENTS_ADDED);
+                IGPLong outValue = new GPLongClass();
+                outValue.Value = m_numAttachmentsAdded;
+                outParamEdit.Value = outValue as IGPValue;
+
+                outParamEdit = paramMap.GetParamEdit(C_PARAM_NUM_ATTACHMENTS_FAILED);
+                outValue = new GPLongClass();
+                outValue.Value = m_numAttachmentsFailed;
+                outParamEdit.Value = outValue as IGPValue;
+
+                msgs.AddMessage(Properties.Resources.MSG_DONE);
+            }
+            catch (WmauException wmEx)
+            {
+                try
+                {
+                    msgs.AddError(wmEx.ErrorCodeAsInt, wmEx.Message);
+                }
+                catch
+                {
+                    // Catch anything else that possibly happens
+                }
+            }
+            catch (Exception ex)
+            {
+                WmauError error = new WmauError(WmauErrorCodes.C_UNSPECIFIED_ERROR);
+                msgs.AddError(error.ErrorCodeAsInt, error.Message + "; " + ex.Message);
+            }
+            finally
+            {
+                m_contentKeys = null;
+                m_uploadedContent = null;
+            }
+        }
+    }
+}
@@ -165,7 +165,11 @@ namespace WorkflowManagerAdministrationUtilities
             {
                 IJTXJobManager jobManager = this.WmxDatabase.JobManager;
                 IJTXConfiguration3 configMgr = this.WmxDatabase.ConfigurationManager as IJTXConfiguration3;
-                IJTXJob3 job = jobManager.GetJob(m_jobId) as IJTXJob3;
+                IJTXJob3 job = null;
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_GET_JOB))
+                {
+                    job = jobManager.GetJob(m_jobId) as IJTXJob3;
+                }
 
                 // As of Jan. 2011, the core Workflow Manager libraries do not
                 // seem to check if the user has the privilege to add a comment
@@ -179,9 +183,16 @@ namespace WorkflowManagerAdministrationUtilities
                 }
 
                 // If we get this far, then add the comment to the job.
-                IJTXActivityType commentType = configMgr.GetActivityType(ESRI.ArcGIS.JTX.Utilities.Constants.ACTTYPE_COMMENT);
+                IJTXActivityType commentType = null;
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_GET_ACTIVITY_TYPE))
+                {
+                    commentType = configMgr.GetActivityType(ESRI.ArcGIS.JTX.Utilities.Constants.ACTTYPE_COMMENT);
+                }
                 job.LogJobAction(commentType, null, m_comment);
-                job.Store();
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_STORE))
+                {
+                    job.Store();
+                }
 
                 // Set the output parameter
                 WmauParameterMap paramMap = new WmauParameterMap(paramValues);
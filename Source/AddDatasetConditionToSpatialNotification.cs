@@ -583,7 +583,10 @@ namespace WorkflowManagerAdministrationUtilities
 
                 // Store the configuration in the dataset evaluator
                 datasetEvaluator.DatasetConfigurations.Add(datasetCondition);
-                changeRule.Store();
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_STORE))
+                {
+                    changeRule.Store();
+                }
 
                 // Set the output parameter
                 WmauParameterMap paramMap = new WmauParameterMap(paramValues);
@@ -266,7 +266,11 @@ namespace WorkflowManagerAdministrationUtilities
             try
             {
                 IJTXJobManager jobManager = this.WmxDatabase.JobManager;
-                IJTXJob3 job = jobManager.GetJob(m_jobId) as IJTXJob3;
+                IJTXJob3 job = null;
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_GET_JOB))
+                {
+                    job = jobManager.GetJob(m_jobId) as IJTXJob3;
+                }
                 IJTXConfiguration3 configMgr = this.WmxDatabase.ConfigurationManager as IJTXConfiguration3;
 
                 jtxAssignmentType assigneeType;
@@ -294,14 +298,20 @@ namespace WorkflowManagerAdministrationUtilities
                 msgs.AddMessage("Assigning job " + m_jobId + " (" + job.Name + ") to " + descriptionStr);
                 job.AssignedType = assigneeType;
                 job.AssignedTo = assigneeStr;
-                job.Store();
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_STORE))
+                {
+                    job.Store();
+                }
 
                 // Do the other things that still need to be handled manually, such as logging
                 // the job's reassignment and sending any necessary notifications.
-                job.LogJobAction(
-                    configMgr.GetActivityType(ESRI.ArcGIS.JTX.Utilities.Constants.ACTTYPE_ASSIGN_JOB),
-                    null,
-                    string.Empty);
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_LOG_ACTION))
+                {
+                    job.LogJobAction(
+                        configMgr.GetActivityType(ESRI.ArcGIS.JTX.Utilities.Constants.ACTTYPE_ASSIGN_JOB),
+                        null,
+                        string.Empty);
+                }
                 Common.WmauHelperFunctions.SendNotification(
                     ESRI.ArcGIS.JTX.Utilities.Constants.NOTIF_JOB_ASSIGNED,
                     this.WmxDatabase,
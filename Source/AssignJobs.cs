@@ -0,0 +1,570 @@
+﻿//Copyright 2015 Esri
+//Licensed under the Apache License, Version 2.0 (the "License");
+//you may not use this file except in compliance with the License.
+//You may obtain a copy of the License at
+//    http://www.apache.org/licenses/LICENSE-2.0
+//Unless required by applicable law or agreed to in writing, software
+//distributed under the License is distributed on an "AS IS" BASIS,
+//WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//See the License for the specific language governing permissions and
+//limitations under the License.​
+
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+
+using ESRI.ArcGIS.esriSystem;
+using ESRI.ArcGIS.Geodatabase;
+using ESRI.ArcGIS.Geoprocessing;
+using ESRI.ArcGIS.JTX;
+
+
+namespace WorkflowManagerAdministrationUtilities
+{
+    class AssignJobs : WmauAbstractGpFunction
+    {
+        #region Constants
+        private const string C_PARAM_JOB_IDS = "in_mvLong_jobIds";
+        private const string C_PARAM_SQL_QUERY_FILTER = "in_string_sqlQueryFilter";
+        private const string C_PARAM_ASSIGNEE_TYPE = "in_string_assigneeType";
+        private const string C_PARAM_ASSIGNEE = "in_string_assignee";
+        private const string C_PARAM_BATCH_SIZE = "in_long_batchSize";
+        private const string C_PARAM_NUM_JOBS_ASSIGNED = "out_long_numJobsAssigned";
+        private const string C_PARAM_NUM_JOBS_FAILED = "out_long_numJobsFailed";
+
+        private const string C_OPT_ASSIGN_TO_GROUP = "ASSIGN_TO_GROUP";
+        private const string C_OPT_ASSIGN_TO_USER = "ASSIGN_TO_USER";
+        private const string C_OPT_UNASSIGNED = "UNASSIGNED";
+
+        private const string C_OPT_VAL_UNASSIGNED = "[Unassigned]";
+
+        private const string C_DEFAULT_ASSIGNEE_TYPE = C_OPT_UNASSIGNED;
+        private const string C_DEFAULT_ASSIGNEE = C_OPT_VAL_UNASSIGNED;
+        private const int C_DEFAULT_BATCH_SIZE = 100;
+        #endregion
+
+        #region MemberVariables
+        private List<int> m_jobIds = new List<int>();
+        private string m_sqlQuery = string.Empty;
+        private string m_assigneeType = C_DEFAULT_ASSIGNEE_TYPE;
+        private string m_assignee = C_DEFAULT_ASSIGNEE;
+        private int m_batchSize = C_DEFAULT_BATCH_SIZE;
+
+        private int m_numJobsAssigned = 0;
+        private int m_numJobsFailed = 0;
+        private bool m_groupEdits = true;
+        #endregion
+
+        #region SimpleAccessors
+        public override string Name { get { return "AssignJobs"; } }
+        public override string DisplayName { get { return Properties.Resources.TOOL_ASSIGN_JOBS; } }
+        public override string DisplayToolset { get { return Properties.Resources.CAT_JOB_UTILS; } }
+        #endregion
+
+        #region Private helper functions
+        /// <summary>
+        /// Updates the internal values used by this tool based on the parameters from an input array
+        /// </summary>
+        /// <param name="paramValues"></param>
+        protected override void ExtractParameters(IArray paramValues)
+        {
+            // Get the values for any parameters common to all GP tools
+            ExtractParametersCommon(paramValues);
+
+            WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+            IGPParameter3 param = null;
+
+            // Update the internal values of whatever parameters we're maintaining
+            m_jobIds = new List<int>();
+            param = paramMap.GetParam(C_PARAM_JOB_IDS);
+            IGPMultiValue jobIdValues = m_gpUtilities.UnpackGPValue(param) as IGPMultiValue;
+            if (jobIdValues != null)
+            {
+                for (int i = 0; i < jobIdValues.Count; i++)
+                {
+                    m_jobIds.Add(int.Parse(jobIdValues.get_Value(i).GetAsText()));
+                }
+            }
+
+            param = paramMap.GetParam(C_PARAM_SQL_QUERY_FILTER);
+            m_sqlQuery = param.Value.GetAsText();
+
+            param = paramMap.GetParam(C_PARAM_ASSIGNEE_TYPE);
+            m_assigneeType = param.Value.GetAsText();
+
+            param = paramMap.GetParam(C_PARAM_ASSIGNEE);
+            m_assignee = param.Value.GetAsText();
+
+            param = paramMap.GetParam(C_PARAM_BATCH_SIZE);
+            m_batchSize = int.Parse(param.Value.GetAsText());
+        }
+
+        /// <summary>
+        /// Loads and assigns a batch of jobs.  The jobs are loaded with a single query and,
+        /// where possible, stored together in a single edit operation.
+        /// </summary>
+        /// <param name="jobIds">The IDs of the jobs to assign</param>
+        /// <param name="assigneeType">The type of assignment to make</param>
+        /// <param name="assigneeStr">The user or group to which the jobs are assigned</param>
+        /// <param name="assignActivity">The activity type used to log each assignment</param>
+        /// <param name="msgs">The GP messages object for this tool</param>
+        private void AssignJobBatch(
+            List<int> jobIds,
+            jtxAssignmentType assigneeType,
+            string assigneeStr,
+            IJTXActivityType assignActivity,
+            IGPMessages msgs)
+        {
+            IJTXJobSet jobSet = Common.WmauHelperFunctions.GetJobsById(this.WmxDatabase, jobIds);
+
+            // Note any jobs that couldn't be found
+            HashSet<int> jobsFound = new HashSet<int>();
+            for (int i = 0; i < jobSet.Count; i++)
+            {
+                jobsFound.Add(jobSet.get_Item(i).ID);
+            }
+            foreach (int jobId in jobIds)
+            {
+                if (!jobsFound.Contains(jobId))
+                {
+                    msgs.AddWarning("  Job " + jobId.ToString() + ": not found");
+                    m_numJobsFailed++;
+                }
+            }
+
+            // Group the changes to this batch of jobs into a single edit operation,
+            // if the Workflow Manager database allows it
+            IWorkspaceEdit workspaceEdit = null;
+            if (m_groupEdits)
+            {
+                try
+                {
+                    workspaceEdit = Common.WmauHelperFunctions.StartJobEditOperation(this.WmxDatabase);
+                }
+                catch (Exception ex)
+                {
+                    m_groupEdits = false;
+                    msgs.AddWarning("Could not start an edit session on the Workflow Manager database; " +
+                        "each job will be stored separately (" + ex.Message + ")");
+                }
+            }
+
+            bool saveEdits = false;
+            List<IJTXJob3> assignedJobs = new List<IJTXJob3>();
+            try
+            {
+                for (int i = 0; i < jobSet.Count; i++)
+                {
+                    IJTXJob3 job = jobSet.get_Item(i) as IJTXJob3;
+                    try
+                    {
+                        if (job.Stage == jtxJobStage.jtxJobStageClosed)
+                        {
+                            msgs.AddWarning("  Job " + job.ID.ToString() + " (" + job.Name + "): closed jobs cannot be assigned");
+                            m_numJobsFailed++;
+                            continue;
+                        }
+
+                        job.AssignedType = assigneeType;
+                        job.AssignedTo = assigneeStr;
+                        using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_STORE))
+                        {
+                            job.Store();
+                        }
+                        using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_LOG_ACTION))
+                        {
+                            job.LogJobAction(assignActivity, null, string.Empty);
+                        }
+
+                        assignedJobs.Add(job);
+                    }
+                    catch (Exception ex)
+                    {
+                        msgs.AddWarning("  Job " + job.ID.ToString() + ": could not be assigned (" + ex.Message + ")");
+                        m_numJobsFailed++;
+                    }
+                }
+                saveEdits = true;
+            }
+            finally
+            {
+                // Discard the changes if the batch didn't run to completion
+                if (!saveEdits)
+                {
+                    Common.WmauHelperFunctions.StopJobEditOperation(workspaceEdit, false);
+                }
+            }
+
+            // Save the batch; if it can't be saved, none of its jobs were assigned
+            try
+            {
+                Common.WmauHelperFunctions.StopJobEditOperation(workspaceEdit, true);
+            }
+            catch (Exception ex)
+            {
+                foreach (IJTXJob3 job in assignedJobs)
+                {
+                    msgs.AddWarning("  Job " + job.ID.ToString() + ": could not be assigned (" + ex.Message + ")");
+                }
+                m_numJobsFailed += assignedJobs.Count;
+                return;
+            }
+
+            // Only report the assignments and send notifications once they have been saved
+            m_numJobsAssigned += assignedJobs.Count;
+            foreach (IJTXJob3 job in assignedJobs)
+            {
+                msgs.AddMessage("  Job " + job.ID.ToString() + " (" + job.Name + "): assigned");
+                Common.WmauHelperFunctions.SendNotification(
+                    ESRI.ArcGIS.JTX.Utilities.Constants.NOTIF_JOB_ASSIGNED,
+                    this.WmxDatabase,
+                    job);
+            }
+        }
+        #endregion
+
+        /// <summary>
+        /// Required by IGPFunction2 interface.
+        /// </summary>
+        public override IArray ParameterInfo
+        {
+            get
+            {
+                m_parameters = new ArrayClass();
+                IGPParameterEdit3 paramEdit = null;
+                IGPCodedValueDomain cvDomain = null;
+
+                // Parameter indicating the jobs to be assigned
+                IGPMultiValueType jobIdType = new GPMultiValueTypeClass();
+                jobIdType.MemberDataType = new GPLongTypeClass();
+
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_AJS_JOB_IDS,
+                    C_PARAM_JOB_IDS,
+                    jobIdType as IGPDataType,
+                    null);
+                m_parameters.Add(paramEdit);
+
+                // Parameter indicating a query selecting (additional) jobs to be assigned
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_AJS_SQL_QUERY_FILTER,
+                    C_PARAM_SQL_QUERY_FILTER,
+                    new GPStringTypeClass(),
+                    null);
+                m_parameters.Add(paramEdit);
+
+                // Parameter indicating the type of assignee
+                cvDomain = new GPCodedValueDomainClass();
+                cvDomain.AddStringCode(C_OPT_ASSIGN_TO_GROUP, C_OPT_ASSIGN_TO_GROUP);
+                cvDomain.AddStringCode(C_OPT_ASSIGN_TO_USER, C_OPT_ASSIGN_TO_USER);
+                cvDomain.AddStringCode(C_OPT_UNASSIGNED, C_OPT_UNASSIGNED);
+
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeRequired,
+                    Properties.Resources.DESC_AJS_ASSIGNEE_TYPE,
+                    C_PARAM_ASSIGNEE_TYPE,
+                    cvDomain.FindValue(C_DEFAULT_ASSIGNEE_TYPE).DataType,
+                    cvDomain.FindValue(C_DEFAULT_ASSIGNEE_TYPE));
+                paramEdit.Domain = cvDomain as IGPDomain;
+                m_parameters.Add(paramEdit);
+
+                // Parameter indicating the name of the assignee
+                IGPString strParam = new GPStringClass();
+                strParam.Value = C_DEFAULT_ASSIGNEE;
+
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeRequired,
+                    Properties.Resources.DESC_AJS_ASSIGNEE,
+                    C_PARAM_ASSIGNEE,
+                    (strParam as IGPValue).DataType,
+                    strParam as IGPValue,
+                    true);
+                m_parameters.Add(paramEdit);
+
+                // Optional parameter indicating how many jobs should be loaded and
+                // stored at a time
+                IGPLong batchSize = new GPLongClass();
+                batchSize.Value = C_DEFAULT_BATCH_SIZE;
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_AJS_BATCH_SIZE,
+                    C_PARAM_BATCH_SIZE,
+                    new GPLongTypeClass(),
+                    batchSize as IGPValue);
+                m_parameters.Add(paramEdit);
+
+                // Parameter for specifying the WMX database
+                m_parameters.Add(BuildWmxDbParameter());
+
+                // Parameter indicating the number of jobs assigned
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionOutput,
+                    esriGPParameterType.esriGPParameterTypeDerived,
+                    Properties.Resources.DESC_AJS_NUM_JOBS_ASSIGNED,
+                    C_PARAM_NUM_JOBS_ASSIGNED,
+                    new GPLongTypeClass(),
+                    null);
+                m_parameters.Add(paramEdit);
+
+                // Parameter indicating the number of jobs that could not be assigned
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionOutput,
+                    esriGPParameterType.esriGPParameterTypeDerived,
+                    Properties.Resources.DESC_AJS_NUM_JOBS_FAILED,
+                    C_PARAM_NUM_JOBS_FAILED,
+                    new GPLongTypeClass(),
+                    null);
+                m_parameters.Add(paramEdit);
+
+                return m_parameters;
+            }
+        }
+
+        /// <summary>
+        /// Post validates the given set of values.
+        /// This is where you flag parameters with warnings and error messages, among other things.
+        /// </summary>
+        /// <param name="paramValues"></param>
+        /// <param name="pEnvMgr"></param>
+        /// <param name="msgs"></param>
+        public override void UpdateMessages(IArray paramValues, IGPEnvironmentManager pEnvMgr, IGPMessages msgs)
+        {
+            try
+            {
+                UpdateMessagesCommon(paramValues, pEnvMgr, msgs);
+            }
+            catch (WmxDefaultDbNotSetException)
+            {
+                // If the default DB wasn't set, stop executing
+                return;
+            }
+
+            // Build a hash of which parameter is at which index for ease of access
+            WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+
+            // Ensure that the current user has permissions to be assigning jobs
+            if (!CurrentUserHasPrivilege(ESRI.ArcGIS.JTX.Utilities.Constants.PRIV_ASSIGN_ANY_JOB) &&
+                !CurrentUserHasPrivilege(ESRI.ArcGIS.JTX.Utilities.Constants.PRIV_INDIVIDUAL_JOB_ASSIGN) &&
+                !CurrentUserHasPrivilege(ESRI.ArcGIS.JTX.Utilities.Constants.PRIV_GROUP_JOB_ASSIGN))
+            {
+                WmauError error = new WmauError(WmauErrorCodes.C_NO_ASSIGN_JOB_PRIV_ERROR);
+                msgs.ReplaceError(paramMap.GetIndex(C_PARAM_JOB_IDS), error.ErrorCodeAsInt, error.Message);
+            }
+
+            // Ensure that some jobs have been specified
+            IGPParameter3 jobIdsParam = paramMap.GetParam(C_PARAM_JOB_IDS);
+            IGPParameter3 sqlQueryParam = paramMap.GetParam(C_PARAM_SQL_QUERY_FILTER);
+            if ((jobIdsParam.Value == null || jobIdsParam.Value.IsEmpty()) &&
+                (sqlQueryParam.Value == null || sqlQueryParam.Value.IsEmpty()))
+            {
+                WmauError error = new WmauError(WmauErrorCodes.C_NO_JOBS_SPECIFIED_ERROR);
+                msgs.ReplaceError(paramMap.GetIndex(C_PARAM_JOB_IDS), error.ErrorCodeAsInt, error.Message);
+            }
+
+            // Ensure that the batch size is sensible
+            IGPParameter3 batchSizeParam = paramMap.GetParam(C_PARAM_BATCH_SIZE);
+            int batchSize = 0;
+            if (batchSizeParam.Value != null &&
+                (!int.TryParse(batchSizeParam.Value.GetAsText(), out batchSize) || batchSize <= 0))
+            {
+                WmauError error = new WmauError(WmauErrorCodes.C_INVALID_BATCH_SIZE_ERROR);
+                msgs.ReplaceError(paramMap.GetIndex(C_PARAM_BATCH_SIZE), error.ErrorCodeAsInt, error.Message);
+            }
+        }
+
+        /// <summary>
+        /// Pre validates the given set of values.
+        /// This is where you populate derived parameters based on input, among other things.
+        /// </summary>
+        /// <param name="paramValues"></param>
+        /// <param name="pEnvMgr"></param>
+        public override void UpdateParameters(IArray paramValues, IGPEnvironmentManager pEnvMgr)
+        {
+            try
+            {
+                UpdateParametersCommon(paramValues, pEnvMgr);
+            }
+            catch (WmxDefaultDbNotSetException)
+            {
+                // If the default DB wasn't set, stop executing
+                return;
+            }
+            catch (NullReferenceException)
+            {
+                // If one of the parameters was null, stop executing
+                return;
+            }
+
+            // Get the parameters as a map for easier access
+            WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+            IGPParameter3 assigneeType = paramMap.GetParam(C_PARAM_ASSIGNEE_TYPE);
+            IGPParameter3 assignee = paramMap.GetParam(C_PARAM_ASSIGNEE);
+            IGPParameterEdit assigneeEdit = paramMap.GetParamEdit(C_PARAM_ASSIGNEE);
+
+            // If the assignee type has changed, update the domain for the assignee
+            // parameter.  (As with the "Assign Job" tool, the assignee value itself
+            // is left alone.)
+            if (!assigneeType.Value.GetAsText().Equals(m_assigneeType) || assignee.Domain == null)
+            {
+                m_assigneeType = assigneeType.Value.GetAsText();
+
+                if (m_assigneeType.Equals(C_OPT_ASSIGN_TO_GROUP))
+                {
+                    assigneeEdit.Domain = Common.WmauGpDomainBuilder.BuildAssignableGroupsDomain(this.WmxDatabase);
+                }
+                else if (m_assigneeType.Equals(C_OPT_ASSIGN_TO_USER))
+                {
+                    assigneeEdit.Domain = Common.WmauGpDomainBuilder.BuildAssignableUsersDomain(this.WmxDatabase);
+                }
+                else if (m_assigneeType.Equals(C_OPT_UNASSIGNED))
+                {
+                    assigneeEdit.Domain = null;
+                }
+            }
+
+            assigneeEdit.Enabled = !m_assigneeType.Equals(C_OPT_UNASSIGNED);
+        }
+
+        /// <summary>
+        /// Required by IGPFunction2 interface; this function is called when the GP tool is ready to be executed.
+        /// </summary>
+        /// <param name="paramValues"></param>
+        /// <param name="trackCancel"></param>
+        /// <param name="envMgr"></param>
+        /// <param name="msgs"></param>
+        public override void Execute(IArray paramValues, ITrackCancel trackCancel, IGPEnvironmentManager envMgr, IGPMessages msgs)
+        {
+            // Do some common error-checking
+            base.Execute(paramValues, trackCancel, envMgr, msgs);
+
+            m_numJobsAssigned = 0;
+            m_numJobsFailed = 0;
+            m_groupEdits = true;
+
+            try
+            {
+                // Check the user's privileges once, up front, rather than for each job
+                if (!CurrentUserHasPrivilege(ESRI.ArcGIS.JTX.Utilities.Constants.PRIV_ASSIGN_ANY_JOB) &&
+                    !CurrentUserHasPrivilege(ESRI.ArcGIS.JTX.Utilities.Constants.PRIV_INDIVIDUAL_JOB_ASSIGN) &&
+                    !CurrentUserHasPrivilege(ESRI.ArcGIS.JTX.Utilities.Constants.PRIV_GROUP_JOB_ASSIGN))
+                {
+                    throw new WmauException(WmauErrorCodes.C_NO_ASSIGN_JOB_PRIV_ERROR);
+                }
+                if (m_batchSize <= 0)
+                {
+                    throw new WmauException(WmauErrorCodes.C_INVALID_BATCH_SIZE_ERROR);
+                }
+
+                // Resolve and validate the assignee once, rather than for each job
+                IJTXConfiguration3 configMgr = this.WmxDatabase.ConfigurationManager as IJTXConfiguration3;
+                jtxAssignmentType assigneeType;
+                string descriptionStr;
+                string assigneeStr;
+                if (m_assigneeType.Equals(C_OPT_ASSIGN_TO_GROUP))
+                {
+                    if (configMgr.GetUserGroup(m_assignee) == null)
+                    {
+                        throw new WmauException(WmauErrorCodes.C_GROUP_NOT_FOUND_ERROR);
+                    }
+                    assigneeType = jtxAssignmentType.jtxAssignmentTypeGroup;
+                    assigneeStr = m_assignee;
+                    descriptionStr = "group '" + assigneeStr + "'";
+                }
+                else if (m_assigneeType.Equals(C_OPT_ASSIGN_TO_USER))
+                {
+                    if (configMgr.GetUser(m_assignee) == null)
+                    {
+                        throw new WmauException(WmauErrorCodes.C_USER_NOT_FOUND_ERROR);
+                    }
+                    assigneeType = jtxAssignmentType.jtxAssignmentTypeUser;
+                    assigneeStr = m_assignee;
+                    descriptionStr = "user '" + assigneeStr + "'";
+                }
+                else
+                {
+                    assigneeType = jtxAssignmentType.jtxAssignmentTypeUnassigned;
+                    assigneeStr = string.Empty;
+                    descriptionStr = "no one (unassigned)";
+                }
+
+                IJTXActivityType assignActivity = null;
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_GET_ACTIVITY_TYPE))
+                {
+                    assignActivity = configMgr.GetActivityType(ESRI.ArcGIS.JTX.Utilities.Constants.ACTTYPE_ASSIGN_JOB);
+                }
+
+                // Combine the jobs listed explicitly with any that match the query
+                SortedSet<int> jobIdSet = new SortedSet<int>(m_jobIds);
+                if (!string.IsNullOrEmpty(m_sqlQuery))
+                {
+                    SortedList<int, string> matchingJobs =
+                        Common.WmauHelperFunctions.ListJobsMatchingQuery(this.WmxDatabase, m_sqlQuery);
+                    jobIdSet.UnionWith(matchingJobs.Keys);
+                }
+                List<int> jobIds = jobIdSet.ToList();
+
+                msgs.AddMessage("Assigning " + jobIds.Count.ToString() + " job(s) to " + descriptionStr);
+                System.Diagnostics.Stopwatch timer = System.Diagnostics.Stopwatch.StartNew();
+                for (int start = 0; start < jobIds.Count; start += m_batchSize)
+                {
+                    if (trackCancel != null && !trackCancel.Continue())
+                    {
+                        msgs.AddWarning("Cancelled; " + (jobIds.Count - start).ToString() + " job(s) were not assigned");
+                        break;
+                    }
+
+                    List<int> batch = jobIds.GetRange(start, Math.Min(m_batchSize, jobIds.Count - start));
+                    AssignJobBatch(batch, assigneeType, assigneeStr, assignActivity, msgs);
+                }
+                timer.Stop();
+
+                double seconds = timer.Elapsed.TotalSeconds;
+                msgs.AddMessage("Assigned " + m_numJobsAssigned.ToString() + " job(s); " +
+                    m_numJobsFailed.ToString() + " job(s) could not be assigned");
+                if (seconds > 0)
+                {
+                    msgs.AddMessage(String.Format("Processed {0} job(s) in {1:0.0} seconds ({2:0.0} jobs/sec)",
+                        m_numJobsAssigned + m_numJobsFailed, seconds, (m_numJobsAssigned + m_numJobsFailed) / seconds));
+                }
+
+                // Set the output parameters
+                WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+                IGPParameterEdit3 outParamEdit = paramMap.GetParamEdit(C_PARAM_NUM_JOBS_ASSIGNED);
+                IGPLong outValue = new GPLongClass();
+                outValue.Value = m_numJobsAssigned;
+                outParamEdit.Value = outValue as IGPValue;
+
+                outParamEdit = paramMap.GetParamEdit(C_PARAM_NUM_JOBS_FAILED);
+                outValue = new GPLongClass();
+                outValue.Value = m_numJobsFailed;
+                outParamEdit.Value = outValue as IGPValue;
+
+                msgs.AddMessage(Properties.Resources.MSG_DONE);
+            }
+            catch (WmauException wmEx)
+            {
+                try
+                {
+                    msgs.AddError(wmEx.ErrorCodeAsInt, wmEx.Message);
+                }
+                catch
+                {
+                    // Catch anything else that possibly happens
+                }
+            }
+            catch (Exception ex)
+            {
+                WmauError error = new WmauError(WmauErrorCodes.C_UNSPECIFIED_ERROR);
+                msgs.AddError(error.ErrorCodeAsInt, error.Message + "; " + ex.Message);
+            }
+        }
+    }
+}
@@ -0,0 +1,502 @@
+﻿//Copyright 2015 Esri
+//Licensed under the Apache License, Version 2.0 (the "License");
+//you may not use this file except in compliance with the License.
+//You may obtain a copy of the License at
+//    http://www.apache.org/licenses/LICENSE-2.0
+//Unless required by applicable law or agreed to in writing, software
+//distributed under the License is distributed on an "AS IS" BASIS,
+//WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//See the License for the specific language governing permissions and
+//limitations under the License.​
+
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+
+using ESRI.ArcGIS.esriSystem;
+using ESRI.ArcGIS.Geodatabase;
+using ESRI.ArcGIS.Geoprocessing;
+using ESRI.ArcGIS.JTX;
+
+
+namespace WorkflowManagerAdministrationUtilities
+{
+    /// <summary>
+    /// GP tool to delete the versions of jobs that were deleted with the "Delete Job"
+    /// tool's deferred version cleanup option.  The queued versions are grouped by
+    /// data workspace, so that each workspace is only opened once, and child versions
+    /// are deleted before their parents.
+    /// </summary>
+    class CleanUpDeletedJobVersions : WmauAbstractGpFunction
+    {
+        #region Constants
+        private const string C_PARAM_CLEANUP_QUEUE = "in_file_cleanupQueue";
+        private const string C_PARAM_NUM_VERSIONS_DELETED = "out_long_numVersionsDeleted";
+        private const string C_PARAM_NUM_VERSIONS_REMAINING = "out_long_numVersionsRemaining";
+
+        // The maximum number of job IDs to look up with a single query
+        private const int C_JOB_LOOKUP_BATCH_SIZE = 500;
+        #endregion
+
+        #region MemberVariables
+        private string m_cleanupQueue = string.Empty;
+
+        private int m_numVersionsDeleted = 0;
+        #endregion
+
+        #region SimpleAccessors
+        public override string Name { get { return "CleanUpDeletedJobVersions"; } }
+        public override string DisplayName { get { return Properties.Resources.TOOL_CLEAN_UP_DELETED_JOB_VERSIONS; } }
+        public override string DisplayToolset { get { return Properties.Resources.CAT_JOB_UTILS; } }
+        #endregion
+
+        #region Private helper functions
+        /// <summary>
+        /// Updates the internal values used by this tool based on the parameters from an input array
+        /// </summary>
+        /// <param name="paramValues"></param>
+        protected override void ExtractParameters(IArray paramValues)
+        {
+            // Get the values for any parameters common to all GP tools
+            ExtractParametersCommon(paramValues);
+
+            WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+            IGPParameter3 param = null;
+
+            // Update the internal values of whatever parameters we're maintaining
+            param = paramMap.GetParam(C_PARAM_CLEANUP_QUEUE);
+            m_cleanupQueue = param.Value.GetAsText();
+            if (string.IsNullOrEmpty(m_cleanupQueue))
+            {
+                m_cleanupQueue = Common.WmauDeferredCleanupQueue.DefaultQueuePath;
+            }
+        }
+
+        /// <summary>
+        /// Determines whether an exception means that a version doesn't exist
+        /// </summary>
+        /// <param name="ex">The exception to check</param>
+        /// <returns>True if the version could not be found; false otherwise</returns>
+        private static bool IsVersionNotFound(Exception ex)
+        {
+            System.Runtime.InteropServices.COMException comEx = ex as System.Runtime.InteropServices.COMException;
+            return comEx != null &&
+                (comEx.ErrorCode == (int)fdoError.FDO_E_SE_VERSION_NOEXIST ||
+                 comEx.ErrorCode == (int)fdoError.FDO_E_VERSION_NOT_FOUND);
+        }
+
+        /// <summary>
+        /// Sorts versions so that the deepest versions in the version tree come first
+        /// </summary>
+        /// <param name="a">A version, and its depth in the version tree</param>
+        /// <param name="b">Another version, and its depth in the version tree</param>
+        /// <returns>The result of comparing the two versions' depths, in reverse</returns>
+        private static int CompareByDepthDescending(
+            KeyValuePair<int, Common.WmauDeferredCleanupQueue.Entry> a,
+            KeyValuePair<int, Common.WmauDeferredCleanupQueue.Entry> b)
+        {
+            return b.Key.CompareTo(a.Key);
+        }
+
+        /// <summary>
+        /// Finds the queued versions whose jobs still exist.  The job may not have
+        /// been deleted after its version was queued (for example, if the deletion
+        /// failed), in which case the version is still in use.
+        /// </summary>
+        /// <param name="entries">The queued versions</param>
+        /// <returns>The IDs of the jobs that still exist</returns>
+        private HashSet<int> FindExistingJobs(List<Common.WmauDeferredCleanupQueue.Entry> entries)
+        {
+            HashSet<int> existingJobs = new HashSet<int>();
+            List<int> jobIds = new List<int>();
+            foreach (Common.WmauDeferredCleanupQueue.Entry entry in entries)
+            {
+                jobIds.Add(entry.JobId);
+            }
+
+            for (int start = 0; start < jobIds.Count; start += C_JOB_LOOKUP_BATCH_SIZE)
+            {
+                List<int> batch = jobIds.GetRange(start, Math.Min(C_JOB_LOOKUP_BATCH_SIZE, jobIds.Count - start));
+                IJTXJobSet jobSet = Common.WmauHelperFunctions.GetJobsById(this.WmxDatabase, batch);
+                for (int i = 0; i < jobSet.Count; i++)
+                {
+                    existingJobs.Add(jobSet.get_Item(i).ID);
+                }
+            }
+
+            return existingJobs;
+        }
+
+        /// <summary>
+        /// Deletes the queued versions in a single data workspace.  Versions are
+        /// deleted from the bottom of the version tree up, so that the queued
+        /// children of a version are gone by the time it is deleted; a version that
+        /// still has other children is left in the queue.
+        /// </summary>
+        /// <param name="workspaceId">The ID of the data workspace</param>
+        /// <param name="entries">The queued versions in this workspace</param>
+        /// <param name="trackCancel">Used to check whether the tool has been cancelled</param>
+        /// <param name="msgs">The GP messages object for this tool</param>
+        /// <returns>The entries that could not be processed, and should remain queued</returns>
+        private List<Common.WmauDeferredCleanupQueue.Entry> DeleteWorkspaceVersions(
+            string workspaceId,
+            List<Common.WmauDeferredCleanupQueue.Entry> entries,
+            ITrackCancel trackCancel,
+            IGPMessages msgs)
+        {
+            List<Common.WmauDeferredCleanupQueue.Entry> remaining = new List<Common.WmauDeferredCleanupQueue.Entry>();
+
+            // Open the data workspace once for all of its versions
+            IVersionedWorkspace versionedWorkspace = null;
+            try
+            {
+                versionedWorkspace = this.WmxDatabase.GetDataWorkspace(workspaceId, null) as IVersionedWorkspace;
+            }
+            catch (Exception ex)
+            {
+                msgs.AddWarning("Could not open data workspace '" + workspaceId + "'; its " +
+                    entries.Count.ToString() + " version(s) will remain queued (" + ex.Message + ")");
+                remaining.AddRange(entries);
+                return remaining;
+            }
+            if (versionedWorkspace == null)
+            {
+                msgs.AddWarning("Data workspace '" + workspaceId + "' is not versioned; its " +
+                    entries.Count.ToString() + " version(s) will be removed from the queue");
+                return remaining;
+            }
+
+            // Work out how deep in the version tree each version is
+            List<KeyValuePair<int, Common.WmauDeferredCleanupQueue.Entry>> versionsByDepth =
+                new List<KeyValuePair<int, Common.WmauDeferredCleanupQueue.Entry>>();
+            foreach (Common.WmauDeferredCleanupQueue.Entry entry in entries)
+            {
+                try
+                {
+                    IVersionInfo versionInfo = versionedWorkspace.FindVersion(entry.VersionName).VersionInfo;
+                    int depth = 0;
+                    while ((versionInfo = versionInfo.Parent) != null)
+                    {
+                        depth++;
+                    }
+                    versionsByDepth.Add(new KeyValuePair<int, Common.WmauDeferredCleanupQueue.Entry>(depth, entry));
+                }
+                catch (Exception ex)
+                {
+                    if (IsVersionNotFound(ex))
+                    {
+                        // Someone else has already deleted the version
+                        msgs.AddMessage("  Version '" + entry.VersionName + "' (job " + entry.JobId.ToString() + ") no longer exists");
+                    }
+                    else
+                    {
+                        msgs.AddWarning("  Could not find version '" + entry.VersionName + "' (job " +
+                            entry.JobId.ToString() + "); it will remain queued (" + ex.Message + ")");
+                        remaining.Add(entry);
+                    }
+                }
+            }
+
+            // Delete the deepest versions first
+            versionsByDepth.Sort(CompareByDepthDescending);
+            for (int i = 0; i < versionsByDepth.Count; i++)
+            {
+                Common.WmauDeferredCleanupQueue.Entry entry = versionsByDepth[i].Value;
+                if (trackCancel != null && !trackCancel.Continue())
+                {
+                    for (int j = i; j < versionsByDepth.Count; j++)
+                    {
+                        remaining.Add(versionsByDepth[j].Value);
+                    }
+                    break;
+                }
+
+                try
+                {
+                    IVersion version = versionedWorkspace.FindVersion(entry.VersionName);
+                    if (version.VersionInfo.Children.Next() != null)
+                    {
+                        msgs.AddWarning("  Version '" + entry.VersionName + "' (job " + entry.JobId.ToString() +
+                            ") has child versions that are not queued for deletion; it will remain queued");
+                        remaining.Add(entry);
+                        continue;
+                    }
+
+                    version.Delete();
+                    msgs.AddMessage("  Deleted version '" + entry.VersionName + "' (job " + entry.JobId.ToString() + ")");
+                    m_numVersionsDeleted++;
+                }
+                catch (Exception ex)
+                {
+                    if (IsVersionNotFound(ex))
+                    {
+                        msgs.AddMessage("  Version '" + entry.VersionName + "' (job " + entry.JobId.ToString() + ") no longer exists");
+                    }
+                    else
+                    {
+                        msgs.AddWarning("  Could not delete version '" + entry.VersionName + "' (job " +
+                            entry.JobId.ToString() + "); it will remain queued (" + ex.Message + ")");
+                        remaining.Add(entry);
+                    }
+                }
+            }
+
+            return remaining;
+        }
+        #endregion
+
+        /// <summary>
+        /// Required by IGPFunction2 interface.
+        /// </summary>
+        public override IArray ParameterInfo
+        {
+            get
+            {
+                m_parameters = new ArrayClass();
+                IGPParameterEdit3 paramEdit = null;
+
+                // Parameter indicating the file in which the versions were queued
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_CUDJV_CLEANUP_QUEUE,
+                    C_PARAM_CLEANUP_QUEUE,
+                    new DEFileTypeClass() as IGPDataType,
+                    null);
+                m_parameters.Add(paramEdit);
+
+                // Parameter for specifying the WMX database
+                m_parameters.Add(BuildWmxDbParameter());
+
+                // Parameter indicating the number of versions deleted
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionOutput,
+                    esriGPParameterType.esriGPParameterTypeDerived,
+                    Properties.Resources.DESC_CUDJV_NUM_VERSIONS_DELETED,
+                    C_PARAM_NUM_VERSIONS_DELETED,
+                    new GPLongTypeClass(),
+                    null);
+                m_parameters.Add(paramEdit);
+
+                // Parameter indicating the number of versions still queued
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionOutput,
+                    esriGPParameterType.esriGPParameterTypeDerived,
+                    Properties.Resources.DESC_CUDJV_NUM_VERSIONS_REMAINING,
+                    C_PARAM_NUM_VERSIONS_REMAINING,
+                    new GPLongTypeClass(),
+                    null);
+                m_parameters.Add(paramEdit);
+
+                return m_parameters;
+            }
+        }
+
+        /// <summary>
+        /// Post validates the given set of values.
+        /// This is where you flag parameters with warnings and error messages, among other things.
+        /// </summary>
+        /// <param name="paramValues"></param>
+        /// <param name="pEnvMgr"></param>
+        /// <param name="msgs"></param>
+        public override void UpdateMessages(IArray paramValues, IGPEnvironmentManager pEnvMgr, IGPMessages msgs)
+        {
+            try
+            {
+                UpdateMessagesCommon(paramValues, pEnvMgr, msgs);
+            }
+            catch (WmxDefaultDbNotSetException)
+            {
+                // If the default DB wasn't set, stop executing
+                return;
+            }
+
+            // Build a hash of which parameter is at which index for ease of access
+            WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+
+            // Ensure that the current user has permissions to be deleting versions
+            if (!CurrentUserHasPrivilege(ESRI.ArcGIS.JTX.Utilities.Constants.PRIV_DELETE_VERSION))
+            {
+                WmauError error = new WmauError(WmauErrorCodes.C_NO_DELETE_VERSION_PRIV_ERROR);
+                msgs.ReplaceError(paramMap.GetIndex(C_PARAM_CLEANUP_QUEUE), error.ErrorCodeAsInt, error.Message);
+            }
+        }
+
+        /// <summary>
+        /// Pre validates the given set of values.
+        /// This is where you populate derived parameters based on input, among other things.
+        /// </summary>
+        /// <param name="paramValues"></param>
+        /// <param name="pEnvMgr"></param>
+        public override void UpdateParameters(IArray paramValues, IGPEnvironmentManager pEnvMgr)
+        {
+            try
+            {
+                UpdateParametersCommon(paramValues, pEnvMgr);
+            }
+            catch (WmxDefaultDbNotSetException)
+            {
+                // If the default DB wasn't set, stop executing
+                return;
+            }
+            catch (NullReferenceException)
+            {
+                // If one of the parameters was null, stop executing
+                return;
+            }
+        }
+
+        /// <summary>
+        /// Required by IGPFunction2 interface; this function is called when the GP tool is ready to be executed.
+        /// </summary>
+        /// <param name="paramValues"></param>
+        /// <param name="trackCancel"></param>
+        /// <param name="envMgr"></param>
+        /// <param name="msgs"></param>
+        public override void Execute(IArray paramValues, ITrackCancel trackCancel, IGPEnvironmentManager envMgr, IGPMessages msgs)
+        {
+            // Do some common error-checking
+            base.Execute(paramValues, trackCancel, envMgr, msgs);
+
+            m_numVersionsDeleted = 0;
+
+            try
+            {
+                if (!CurrentUserHasPrivilege(ESRI.ArcGIS.JTX.Utilities.Constants.PRIV_DELETE_VERSION))
+                {
+                    throw new WmauException(WmauErrorCodes.C_NO_DELETE_VERSION_PRIV_ERROR);
+                }
+
+                List<Common.WmauDeferredCleanupQueue.Entry> entries = null;
+                try
+                {
+                    entries = Common.WmauDeferredCleanupQueue.BeginProcessing(m_cleanupQueue);
+                }
+                catch (Exception ex)
+                {
+                    throw new WmauException(WmauErrorCodes.C_CLEANUP_QUEUE_ERROR, ex);
+                }
+
+                // Versions queued for other Workflow Manager databases are left alone, as
+                // are the versions of any jobs that still exist
+                List<Common.WmauDeferredCleanupQueue.Entry> remaining = new List<Common.WmauDeferredCleanupQueue.Entry>();
+                List<Common.WmauDeferredCleanupQueue.Entry> toDelete = new List<Common.WmauDeferredCleanupQueue.Entry>();
+                string wmxDbAlias = this.WmxDatabaseAlias;
+                try
+                {
+                    foreach (Common.WmauDeferredCleanupQueue.Entry entry in entries)
+                    {
+                        if (entry.WmxDatabaseAlias.Equals(wmxDbAlias, StringComparison.CurrentCultureIgnoreCase))
+                        {
+                            toDelete.Add(entry);
+                        }
+                        else
+                        {
+                            remaining.Add(entry);
+                        }
+                    }
+
+                    HashSet<int> existingJobs = FindExistingJobs(toDelete);
+                    SortedList<string, List<Common.WmauDeferredCleanupQueue.Entry>> entriesByWorkspace =
+                        new SortedList<string, List<Common.WmauDeferredCleanupQueue.Entry>>();
+                    foreach (Common.WmauDeferredCleanupQueue.Entry entry in toDelete)
+                    {
+                        if (existingJobs.Contains(entry.JobId))
+                        {
+                            msgs.AddWarning("Job " + entry.JobId.ToString() + " still exists; version '" +
+                                entry.VersionName + "' will not be deleted yet");
+                            remaining.Add(entry);
+                            continue;
+                        }
+
+                        if (!entriesByWorkspace.ContainsKey(entry.DataWorkspaceId))
+                        {
+                            entriesByWorkspace[entry.DataWorkspaceId] = new List<Common.WmauDeferredCleanupQueue.Entry>();
+                        }
+                        entriesByWorkspace[entry.DataWorkspaceId].Add(entry);
+                    }
+
+                    msgs.AddMessage("Found " + toDelete.Count.ToString() + " queued version(s) in " +
+                        entriesByWorkspace.Count.ToString() + " data workspace(s)");
+                    System.Diagnostics.Stopwatch timer = System.Diagnostics.Stopwatch.StartNew();
+                    for (int i = 0; i < entriesByWorkspace.Count; i++)
+                    {
+                        string workspaceId = entriesByWorkspace.Keys[i];
+                        if (trackCancel != null && !trackCancel.Continue())
+                        {
+                            msgs.AddWarning("Cancelled; the remaining versions will stay queued");
+                            for (int j = i; j < entriesByWorkspace.Count; j++)
+                            {
+                                remaining.AddRange(entriesByWorkspace.Values[j]);
+                            }
+                            break;
+                        }
+
+                        msgs.AddMessage("Data workspace '" + workspaceId + "': " +
+                            entriesByWorkspace.Values[i].Count.ToString() + " version(s)");
+                        remaining.AddRange(DeleteWorkspaceVersions(workspaceId, entriesByWorkspace.Values[i], trackCancel, msgs));
+                    }
+                    timer.Stop();
+
+                    double seconds = timer.Elapsed.TotalSeconds;
+                    msgs.AddMessage("Deleted " + m_numVersionsDeleted.ToString() + " version(s); " +
+                        remaining.Count.ToString() + " version(s) remain queued");
+                    if (seconds > 0)
+                    {
+                        msgs.AddMessage(String.Format("Deleted {0} version(s) in {1:0.0} seconds ({2:0.0} versions/sec)",
+                            m_numVersionsDeleted, seconds, m_numVersionsDeleted / seconds));
+                    }
+                }
+                catch
+                {
+                    // If anything goes wrong, put every entry back, rather than risk losing
+                    // track of versions that haven't been deleted
+                    remaining = entries;
+                    throw;
+                }
+                finally
+                {
+                    try
+                    {
+                        Common.WmauDeferredCleanupQueue.EndProcessing(m_cleanupQueue, remaining);
+                    }
+                    catch (Exception ex)
+                    {
+                        throw new WmauException(WmauErrorCodes.C_CLEANUP_QUEUE_ERROR, ex);
+                    }
+                }
+
+                // Set the output parameters
+                WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+                IGPParameterEdit3 outParamEdit = paramMap.GetParamEdit(C_PARAM_NUM_VERSIONS_DELETED);
+                IGPLong outValue = new GPLongClass();
+                outValue.Value = m_numVersionsDeleted;
+                outParamEdit.Value = outValue as IGPValue;
+
+                outParamEdit = paramMap.GetParamEdit(C_PARAM_NUM_VERSIONS_REMAINING);
+                outValue = new GPLongClass();
+                outValue.Value = remaining.Count;
+                outParamEdit.Value = outValue as IGPValue;
+
+                msgs.AddMessage(Properties.Resources.MSG_DONE);
+            }
+            catch (WmauException wmEx)
+            {
+                try
+                {
+                    msgs.AddError(wmEx.ErrorCodeAsInt, wmEx.Message);
+                }
+                catch
+                {
+                    // Catch anything else that possibly happens
+                }
+            }
+            catch (Exception ex)
+            {
+                WmauError error = new WmauError(WmauErrorCodes.C_UNSPECIFIED_ERROR);
+                msgs.AddError(error.ErrorCodeAsInt, error.Message + "; " + ex.Message);
+            }
+        }
+    }
+}
@@ -186,7 +186,11 @@ namespace WorkflowManagerAdministrationUtilities
             try
             {
                 IJTXJobManager jobManager = this.WmxDatabase.JobManager;
-                IJTXJob3 job = jobManager.GetJob(m_jobToClose) as IJTXJob3;
+                IJTXJob3 job = null;
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_GET_JOB))
+                {
+                    job = jobManager.GetJob(m_jobToClose) as IJTXJob3;
+                }
                 IJTXConfiguration3 configMgr = this.WmxDatabase.ConfigurationManager as IJTXConfiguration3;
 
                 if (job.Stage != jtxJobStage.jtxJobStageClosed && !job.CanClose())
@@ -200,12 +204,18 @@ namespace WorkflowManagerAdministrationUtilities
                 // Once the job is closed, do the other things that still need to be handled
                 // separately (status updates, notifications, ...)
                 Common.WmauHelperFunctions.UpdateJobStatus(this.WmxDatabase, job);
-                job.Store();
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_STORE))
+                {
+                    job.Store();
+                }
 
-                job.LogJobAction(
-                    configMgr.GetActivityType(ESRI.ArcGIS.JTX.Utilities.Constants.ACTTYPE_CLOSE_JOB),
-                    null,
-                    string.Empty);
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_LOG_ACTION))
+                {
+                    job.LogJobAction(
+                        configMgr.GetActivityType(ESRI.ArcGIS.JTX.Utilities.Constants.ACTTYPE_CLOSE_JOB),
+                        null,
+                        string.Empty);
+                }
                 Common.WmauHelperFunctions.SendNotification(
                     ESRI.ArcGIS.JTX.Utilities.Constants.NOTIF_JOB_CLOSED,
                     this.WmxDatabase,
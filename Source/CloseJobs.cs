@@ -0,0 +1,590 @@
+﻿//Copyright 2015 Esri
+//Licensed under the Apache License, Version 2.0 (the "License");
+//you may not use this file except in compliance with the License.
+//You may obtain a copy of the License at
+//    http://www.apache.org/licenses/LICENSE-2.0
+//Unless required by applicable law or agreed to in writing, software
+//distributed under the License is distributed on an "AS IS" BASIS,
+//WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//See the License for the specific language governing permissions and
+//limitations under the License.​
+
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+
+using ESRI.ArcGIS.esriSystem;
+using ESRI.ArcGIS.Geodatabase;
+using ESRI.ArcGIS.Geoprocessing;
+using ESRI.ArcGIS.JTX;
+
+
+namespace WorkflowManagerAdministrationUtilities
+{
+    class CloseJobs : WmauAbstractGpFunction
+    {
+        #region Constants
+        private const string C_PARAM_JOB_IDS = "in_mvLong_jobIds";
+        private const string C_PARAM_QUERY_NAME = "in_string_queryName";
+        private const string C_PARAM_COMMENT = "in_string_comment";
+        private const string C_PARAM_CLOSE_JOBS = "in_bool_closeJobs";
+        private const string C_PARAM_BATCH_SIZE = "in_long_batchSize";
+        private const string C_PARAM_NUM_JOBS_UPDATED = "out_long_numJobsUpdated";
+        private const string C_PARAM_NUM_JOBS_FAILED = "out_long_numJobsFailed";
+
+        private const string C_OPT_CLOSE_JOBS = "CLOSE_JOBS";
+        private const string C_OPT_ONLY_ADD_COMMENTS = "ONLY_ADD_COMMENTS";
+
+        private const bool C_DEFAULT_CLOSE_JOBS = true;
+        private const int C_DEFAULT_BATCH_SIZE = 100;
+        #endregion
+
+        #region MemberVariables
+        private List<int> m_jobIds = new List<int>();
+        private string m_queryName = string.Empty;
+        private string m_comment = string.Empty;
+        private bool m_closeJobs = C_DEFAULT_CLOSE_JOBS;
+        private int m_batchSize = C_DEFAULT_BATCH_SIZE;
+
+        private int m_numJobsUpdated = 0;
+        private int m_numJobsFailed = 0;
+        private bool m_groupEdits = true;
+        #endregion
+
+        #region SimpleAccessors
+        public override string Name { get { return "CloseJobs"; } }
+        public override string DisplayName { get { return Properties.Resources.TOOL_CLOSE_JOBS; } }
+        public override string DisplayToolset { get { return Properties.Resources.CAT_JOB_UTILS; } }
+        #endregion
+
+        #region Private helper functions
+        /// <summary>
+        /// Updates the internal values used by this tool based on the parameters from an input array
+        /// </summary>
+        /// <param name="paramValues"></param>
+        protected override void ExtractParameters(IArray paramValues)
+        {
+            // Get the values for any parameters common to all GP tools
+            ExtractParametersCommon(paramValues);
+
+            WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+            IGPParameter3 param = null;
+
+            // Update the internal values of whatever parameters we're maintaining
+            m_jobIds = new List<int>();
+            param = paramMap.GetParam(C_PARAM_JOB_IDS);
+            IGPMultiValue jobIdValues = m_gpUtilities.UnpackGPValue(param) as IGPMultiValue;
+            if (jobIdValues != null)
+            {
+                for (int i = 0; i < jobIdValues.Count; i++)
+                {
+                    m_jobIds.Add(int.Parse(jobIdValues.get_Value(i).GetAsText()));
+                }
+            }
+
+            param = paramMap.GetParam(C_PARAM_QUERY_NAME);
+            m_queryName = param.Value.GetAsText();
+
+            param = paramMap.GetParam(C_PARAM_COMMENT);
+            m_comment = param.Value.GetAsText();
+
+            param = paramMap.GetParam(C_PARAM_CLOSE_JOBS);
+            m_closeJobs = (param.Value as IGPBoolean).Value;
+
+            param = paramMap.GetParam(C_PARAM_BATCH_SIZE);
+            m_batchSize = int.Parse(param.Value.GetAsText());
+        }
+
+        /// <summary>
+        /// Loads, comments on, and/or closes a batch of jobs.  The jobs (and their holds)
+        /// are loaded with a single query each, and each job is stored only once.
+        /// </summary>
+        /// <param name="jobIds">The IDs of the jobs to update</param>
+        /// <param name="commentType">The activity type used to log comments; null if no comment is being added</param>
+        /// <param name="closeActivity">The activity type used to log job closures</param>
+        /// <param name="checkHolds">True if held jobs must not be commented on</param>
+        /// <param name="msgs">The GP messages object for this tool</param>
+        private void UpdateJobBatch(
+            List<int> jobIds,
+            IJTXActivityType commentType,
+            IJTXActivityType closeActivity,
+            bool checkHolds,
+            IGPMessages msgs)
+        {
+            IJTXJobSet jobSet = Common.WmauHelperFunctions.GetJobsById(this.WmxDatabase, jobIds);
+
+            // Note any jobs that couldn't be found
+            HashSet<int> jobsFound = new HashSet<int>();
+            for (int i = 0; i < jobSet.Count; i++)
+            {
+                jobsFound.Add(jobSet.get_Item(i).ID);
+            }
+            foreach (int jobId in jobIds)
+            {
+                if (!jobsFound.Contains(jobId))
+                {
+                    msgs.AddWarning("  Job " + jobId.ToString() + ": not found");
+                    m_numJobsFailed++;
+                }
+            }
+
+            // Look up the active holds for the entire batch at once, rather than job by job
+            HashSet<int> heldJobs = new HashSet<int>();
+            if (checkHolds)
+            {
+                heldJobs = Common.WmauHelperFunctions.ListJobsWithHolds(this.WmxDatabase, jobsFound);
+            }
+
+            IWorkspaceEdit workspaceEdit = null;
+            if (m_groupEdits)
+            {
+                try
+                {
+                    workspaceEdit = Common.WmauHelperFunctions.StartJobEditOperation(this.WmxDatabase);
+                }
+                catch (Exception ex)
+                {
+                    m_groupEdits = false;
+                    msgs.AddWarning("Could not start an edit session on the Workflow Manager database; " +
+                        "each job will be stored separately (" + ex.Message + ")");
+                }
+            }
+
+            bool saveEdits = false;
+            List<IJTXJob3> closedJobs = new List<IJTXJob3>();
+            List<string> updatedJobDescs = new List<string>();
+            List<string> updateMsgs = new List<string>();
+            try
+            {
+                for (int i = 0; i < jobSet.Count; i++)
+                {
+                    IJTXJob3 job = jobSet.get_Item(i) as IJTXJob3;
+                    string jobDesc = "  Job " + job.ID.ToString() + " (" + job.Name + ")";
+                    try
+                    {
+                        // As with the "Add Comment to Job" tool, the core Workflow Manager
+                        // libraries don't check for holds when adding comments, so do it here
+                        if (commentType != null && heldJobs.Contains(job.ID))
+                        {
+                            WmauError error = new WmauError(WmauErrorCodes.C_NO_ADD_COMMENTS_HELD_JOBS_ERROR);
+                            msgs.AddWarning(jobDesc + ": " + error.Message);
+                            m_numJobsFailed++;
+                            continue;
+                        }
+
+                        bool closing = m_closeJobs && job.Stage != jtxJobStage.jtxJobStageClosed;
+                        if (closing && !job.CanClose())
+                        {
+                            WmauError error = new WmauError(WmauErrorCodes.C_CANNOT_CLOSE_JOB_ERROR);
+                            msgs.AddWarning(jobDesc + ": " + error.Message);
+                            m_numJobsFailed++;
+                            continue;
+                        }
+
+                        if (closing)
+                        {
+                            job.Close();
+                            Common.WmauHelperFunctions.UpdateJobStatus(this.WmxDatabase, job);
+                        }
+
+                        // Store the job once, regardless of how many changes were made to it
+                        using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_STORE))
+                        {
+                            job.Store();
+                        }
+
+                        // Only add the comment once the job has been closed and stored, so
+                        // that a job that couldn't be closed isn't left with the comment
+                        if (commentType != null)
+                        {
+                            using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_LOG_ACTION))
+                            {
+                                job.LogJobAction(commentType, null, m_comment);
+                            }
+                        }
+                        if (closing)
+                        {
+                            using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_LOG_ACTION))
+                            {
+                                job.LogJobAction(closeActivity, null, string.Empty);
+                            }
+                            closedJobs.Add(job);
+                        }
+
+                        if (closing && commentType != null)
+                        {
+                            updateMsgs.Add(jobDesc + ": commented and closed");
+                        }
+                        else if (closing)
+                        {
+                            updateMsgs.Add(jobDesc + ": closed");
+                        }
+                        else if (commentType != null)
+                        {
+                            updateMsgs.Add(jobDesc + ": commented");
+                        }
+                        else
+                        {
+                            updateMsgs.Add(jobDesc + ": already closed");
+                        }
+                        updatedJobDescs.Add(jobDesc);
+                    }
+                    catch (Exception ex)
+                    {
+                        msgs.AddWarning(jobDesc + ": could not be updated (" + ex.Message + ")");
+                        m_numJobsFailed++;
+                    }
+                }
+                saveEdits = true;
+            }
+            finally
+            {
+                // Discard the changes if the batch didn't run to completion
+                if (!saveEdits)
+                {
+                    Common.WmauHelperFunctions.StopJobEditOperation(workspaceEdit, false);
+                }
+            }
+
+            // Save the batch; if it can't be saved, none of its jobs were updated
+            try
+            {
+                Common.WmauHelperFunctions.StopJobEditOperation(workspaceEdit, true);
+            }
+            catch (Exception ex)
+            {
+                foreach (string jobDesc in updatedJobDescs)
+                {
+                    msgs.AddWarning(jobDesc + ": could not be updated (" + ex.Message + ")");
+                }
+                m_numJobsFailed += updatedJobDescs.Count;
+                return;
+            }
+
+            // Only report the changes and send notifications once they have been saved
+            foreach (string updateMsg in updateMsgs)
+            {
+                msgs.AddMessage(updateMsg);
+            }
+            m_numJobsUpdated += updateMsgs.Count;
+            foreach (IJTXJob3 job in closedJobs)
+            {
+                Common.WmauHelperFunctions.SendNotification(
+                    ESRI.ArcGIS.JTX.Utilities.Constants.NOTIF_JOB_CLOSED,
+                    this.WmxDatabase,
+                    job);
+            }
+        }
+        #endregion
+
+        /// <summary>
+        /// Required by IGPFunction2 interface.
+        /// </summary>
+        public override IArray ParameterInfo
+        {
+            get
+            {
+                m_parameters = new ArrayClass();
+                IGPParameterEdit3 paramEdit = null;
+                IGPCodedValueDomain cvDomain = null;
+
+                // Parameter indicating the jobs to be updated
+                IGPMultiValueType jobIdType = new GPMultiValueTypeClass();
+                jobIdType.MemberDataType = new GPLongTypeClass();
+
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_CLJS_JOB_IDS,
+                    C_PARAM_JOB_IDS,
+                    jobIdType as IGPDataType,
+                    null);
+                m_parameters.Add(paramEdit);
+
+                // Parameter indicating a public query selecting (additional) jobs to update
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_CLJS_QUERY_NAME,
+                    C_PARAM_QUERY_NAME,
+                    new GPStringTypeClass(),
+                    null);
+                m_parameters.Add(paramEdit);
+
+                // Parameter indicating the comment to add to each job
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_CLJS_COMMENT,
+                    C_PARAM_COMMENT,
+                    new GPStringTypeClass(),
+                    null);
+                m_parameters.Add(paramEdit);
+
+                // Parameter indicating whether the jobs should be closed, or only
+                // commented on
+                cvDomain = new GPCodedValueDomainClass();
+                cvDomain.AddCode(GpTrue, C_OPT_CLOSE_JOBS);
+                cvDomain.AddCode(GpFalse, C_OPT_ONLY_ADD_COMMENTS);
+
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_CLJS_CLOSE_JOBS,
+                    C_PARAM_CLOSE_JOBS,
+                    GpBooleanType,
+                    ToGpBoolean(C_DEFAULT_CLOSE_JOBS));
+                paramEdit.Domain = cvDomain as IGPDomain;
+                m_parameters.Add(paramEdit);
+
+                // Optional parameter indicating how many jobs should be loaded and
+                // stored at a time
+                IGPLong batchSize = new GPLongClass();
+                batchSize.Value = C_DEFAULT_BATCH_SIZE;
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_CLJS_BATCH_SIZE,
+                    C_PARAM_BATCH_SIZE,
+                    new GPLongTypeClass(),
+                    batchSize as IGPValue);
+                m_parameters.Add(paramEdit);
+
+                // Parameter for specifying the WMX database
+                m_parameters.Add(BuildWmxDbParameter());
+
+                // Parameter indicating the number of jobs updated
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionOutput,
+                    esriGPParameterType.esriGPParameterTypeDerived,
+                    Properties.Resources.DESC_CLJS_NUM_JOBS_UPDATED,
+                    C_PARAM_NUM_JOBS_UPDATED,
+                    new GPLongTypeClass(),
+                    null);
+                m_parameters.Add(paramEdit);
+
+                // Parameter indicating the number of jobs that could not be updated
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionOutput,
+                    esriGPParameterType.esriGPParameterTypeDerived,
+                    Properties.Resources.DESC_CLJS_NUM_JOBS_FAILED,
+                    C_PARAM_NUM_JOBS_FAILED,
+                    new GPLongTypeClass(),
+                    null);
+                m_parameters.Add(paramEdit);
+
+                return m_parameters;
+            }
+        }
+
+        /// <summary>
+        /// Post validates the given set of values.
+        /// This is where you flag parameters with warnings and error messages, among other things.
+        /// </summary>
+        /// <param name="paramValues"></param>
+        /// <param name="pEnvMgr"></param>
+        /// <param name="msgs"></param>
+        public override void UpdateMessages(IArray paramValues, IGPEnvironmentManager pEnvMgr, IGPMessages msgs)
+        {
+            try
+            {
+                UpdateMessagesCommon(paramValues, pEnvMgr, msgs);
+            }
+            catch (WmxDefaultDbNotSetException)
+            {
+                // If the default DB wasn't set, stop executing
+                return;
+            }
+
+            // Build a hash of which parameter is at which index for ease of access
+            WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+            IGPParameter3 closeJobsParam = paramMap.GetParam(C_PARAM_CLOSE_JOBS);
+            IGPParameter3 commentParam = paramMap.GetParam(C_PARAM_COMMENT);
+            bool closeJobs = closeJobsParam.Value != null && (closeJobsParam.Value as IGPBoolean).Value;
+            bool addComment = commentParam.Value != null && !commentParam.Value.IsEmpty();
+
+            // Ensure that the current user has permissions to be closing jobs
+            if (closeJobs && !CurrentUserHasPrivilege(ESRI.ArcGIS.JTX.Utilities.Constants.PRIV_CLOSE_JOB))
+            {
+                WmauError error = new WmauError(WmauErrorCodes.C_NO_CLOSE_JOB_PRIV_ERROR);
+                msgs.ReplaceError(paramMap.GetIndex(C_PARAM_CLOSE_JOBS), error.ErrorCodeAsInt, error.Message);
+            }
+
+            // Ensure that there's something to do to the jobs
+            if (!closeJobs && !addComment)
+            {
+                WmauError error = new WmauError(WmauErrorCodes.C_NO_JOB_CHANGES_SPECIFIED_ERROR);
+                msgs.ReplaceError(paramMap.GetIndex(C_PARAM_COMMENT), error.ErrorCodeAsInt, error.Message);
+            }
+
+            // Ensure that some jobs have been specified
+            IGPParameter3 jobIdsParam = paramMap.GetParam(C_PARAM_JOB_IDS);
+            IGPParameter3 queryNameParam = paramMap.GetParam(C_PARAM_QUERY_NAME);
+            if ((jobIdsParam.Value == null || jobIdsParam.Value.IsEmpty()) &&
+                (queryNameParam.Value == null || queryNameParam.Value.IsEmpty()))
+            {
+                WmauError error = new WmauError(WmauErrorCodes.C_NO_JOBS_SPECIFIED_ERROR);
+                msgs.ReplaceError(paramMap.GetIndex(C_PARAM_JOB_IDS), error.ErrorCodeAsInt, error.Message);
+            }
+
+            // Ensure that the batch size is sensible
+            IGPParameter3 batchSizeParam = paramMap.GetParam(C_PARAM_BATCH_SIZE);
+            int batchSize = 0;
+            if (batchSizeParam.Value != null &&
+                (!int.TryParse(batchSizeParam.Value.GetAsText(), out batchSize) || batchSize <= 0))
+            {
+                WmauError error = new WmauError(WmauErrorCodes.C_INVALID_BATCH_SIZE_ERROR);
+                msgs.ReplaceError(paramMap.GetIndex(C_PARAM_BATCH_SIZE), error.ErrorCodeAsInt, error.Message);
+            }
+        }
+
+        /// <summary>
+        /// Pre validates the given set of values.
+        /// This is where you populate derived parameters based on input, among other things.
+        /// </summary>
+        /// <param name="paramValues"></param>
+        /// <param name="pEnvMgr"></param>
+        public override void UpdateParameters(IArray paramValues, IGPEnvironmentManager pEnvMgr)
+        {
+            try
+            {
+                UpdateParametersCommon(paramValues, pEnvMgr);
+            }
+            catch (WmxDefaultDbNotSetException)
+            {
+                // If the default DB wasn't set, stop executing
+                return;
+            }
+            catch (NullReferenceException)
+            {
+                // If one of the parameters was null, stop executing
+                return;
+            }
+
+            // Get the parameters as a map for easier access
+            WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+            IGPParameter3 queryName = paramMap.GetParam(C_PARAM_QUERY_NAME);
+            IGPParameterEdit3 queryNameEdit = paramMap.GetParamEdit(C_PARAM_QUERY_NAME);
+
+            // Set the query domain if it hasn't already been populated
+            if (queryName.Domain == null)
+            {
+                queryNameEdit.Domain = Common.WmauGpDomainBuilder.BuildJobQueryDomain(this.WmxDatabase);
+            }
+        }
+
+        /// <summary>
+        /// Required by IGPFunction2 interface; this function is called when the GP tool is ready to be executed.
+        /// </summary>
+        /// <param name="paramValues"></param>
+        /// <param name="trackCancel"></param>
+        /// <param name="envMgr"></param>
+        /// <param name="msgs"></param>
+        public override void Execute(IArray paramValues, ITrackCancel trackCancel, IGPEnvironmentManager envMgr, IGPMessages msgs)
+        {
+            // Do some common error-checking
+            base.Execute(paramValues, trackCancel, envMgr, msgs);
+
+            m_numJobsUpdated = 0;
+            m_numJobsFailed = 0;
+            m_groupEdits = true;
+
+            try
+            {
+                bool addComment = !string.IsNullOrEmpty(m_comment);
+                if (!m_closeJobs && !addComment)
+                {
+                    throw new WmauException(WmauErrorCodes.C_NO_JOB_CHANGES_SPECIFIED_ERROR);
+                }
+                if (m_batchSize <= 0)
+                {
+                    throw new WmauException(WmauErrorCodes.C_INVALID_BATCH_SIZE_ERROR);
+                }
+
+                // Check the user's privileges once, up front, rather than for each job
+                if (m_closeJobs && !CurrentUserHasPrivilege(ESRI.ArcGIS.JTX.Utilities.Constants.PRIV_CLOSE_JOB))
+                {
+                    throw new WmauException(WmauErrorCodes.C_NO_CLOSE_JOB_PRIV_ERROR);
+                }
+                bool checkHolds = addComment &&
+                    !CurrentUserHasPrivilege(ESRI.ArcGIS.JTX.Utilities.Constants.PRIV_CAN_ADD_COMMENTS_FOR_HELD_JOBS);
+
+                // Likewise, look up the activity types once
+                IJTXConfiguration3 configMgr = this.WmxDatabase.ConfigurationManager as IJTXConfiguration3;
+                IJTXActivityType commentType = null;
+                IJTXActivityType closeActivity = null;
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_GET_ACTIVITY_TYPE))
+                {
+                    if (addComment)
+                    {
+                        commentType = configMgr.GetActivityType(ESRI.ArcGIS.JTX.Utilities.Constants.ACTTYPE_COMMENT);
+                    }
+                    closeActivity = configMgr.GetActivityType(ESRI.ArcGIS.JTX.Utilities.Constants.ACTTYPE_CLOSE_JOB);
+                }
+
+                // Combine the jobs listed explicitly with any returned by the query
+                SortedSet<int> jobIdSet = new SortedSet<int>(m_jobIds);
+                if (!string.IsNullOrEmpty(m_queryName))
+                {
+                    jobIdSet.UnionWith(Common.WmauHelperFunctions.ListJobsInPublicQuery(this.WmxDatabase, m_queryName));
+                }
+                List<int> jobIds = jobIdSet.ToList();
+
+                msgs.AddMessage("Updating " + jobIds.Count.ToString() + " job(s)");
+                System.Diagnostics.Stopwatch timer = System.Diagnostics.Stopwatch.StartNew();
+                for (int start = 0; start < jobIds.Count; start += m_batchSize)
+                {
+                    if (trackCancel != null && !trackCancel.Continue())
+                    {
+                        msgs.AddWarning("Cancelled; " + (jobIds.Count - start).ToString() + " job(s) were not updated");
+                        break;
+                    }
+
+                    List<int> batch = jobIds.GetRange(start, Math.Min(m_batchSize, jobIds.Count - start));
+                    UpdateJobBatch(batch, commentType, closeActivity, checkHolds, msgs);
+                }
+                timer.Stop();
+
+                double seconds = timer.Elapsed.TotalSeconds;
+                msgs.AddMessage("Updated " + m_numJobsUpdated.ToString() + " job(s); " +
+                    m_numJobsFailed.ToString() + " job(s) could not be updated");
+                if (seconds > 0)
+                {
+                    msgs.AddMessage(String.Format("Processed {0} job(s) in {1:0.0} seconds ({2:0.0} jobs/sec)",
+                        m_numJobsUpdated + m_numJobsFailed, seconds, (m_numJobsUpdated + m_numJobsFailed) / seconds));
+                }
+
+                // Set the output parameters
+                WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+                IGPParameterEdit3 outParamEdit = paramMap.GetParamEdit(C_PARAM_NUM_JOBS_UPDATED);
+                IGPLong outValue = new GPLongClass();
+                outValue.Value = m_numJobsUpdated;
+                outParamEdit.Value = outValue as IGPValue;
+
+                outParamEdit = paramMap.GetParamEdit(C_PARAM_NUM_JOBS_FAILED);
+                outValue = new GPLongClass();
+                outValue.Value = m_numJobsFailed;
+                outParamEdit.Value = outValue as IGPValue;
+
+                msgs.AddMessage(Properties.Resources.MSG_DONE);
+            }
+            catch (WmauException wmEx)
+            {
+                try
+                {
+                    msgs.AddError(wmEx.ErrorCodeAsInt, wmEx.Message);
+                }
+                catch
+                {
+                    // Catch anything else that possibly happens
+                }
+            }
+            catch (Exception ex)
+            {
+                WmauError error = new WmauError(WmauErrorCodes.C_UNSPECIFIED_ERROR);
+                msgs.AddError(error.ErrorCodeAsInt, error.Message + "; " + ex.Message);
+            }
+        }
+    }
+}
@@ -249,7 +249,10 @@ namespace WorkflowManagerAdministrationUtilities
                     {
                         IJTXWorkspaceConfiguration workspaceInfo = dbConnection.AddDataWorkspace();
                         this.CopyDataWorkspace(wmauWorkspaceInfo, ref workspaceInfo, msgs);
-                        workspaceInfo.Store();
+                        using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_STORE))
+                        {
+                            workspaceInfo.Store();
+                        }
                         msgs.AddMessage("Added new workspace '" + workspaceName + "'");
 
                         IGPString outElement = new GPStringClass();
@@ -826,7 +826,10 @@ namespace WorkflowManagerAdministrationUtilities
                 IJTXExecuteInfo execInfo;
                 try
                 {
-                    jobSet = jobManager.CreateJobsFromDescription(jobDescription, expectedNumJobs, checkAoi, out execInfo);
+                    using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_CREATE_JOBS))
+                    {
+                        jobSet = jobManager.CreateJobsFromDescription(jobDescription, expectedNumJobs, checkAoi, out execInfo);
+                    }
                 }
                 catch (System.Runtime.InteropServices.COMException comEx)
                 {
@@ -378,7 +378,10 @@ namespace WorkflowManagerAdministrationUtilities
                 changeRule.SummarizeNotifications = m_summarize;
 
                 // Store the resulting change rule
-                changeRule.Store();
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_STORE))
+                {
+                    changeRule.Store();
+                }
 
                 // Update the output parameter
                 WmauParameterMap paramMap = new WmauParameterMap(paramValues);
@@ -44,10 +44,19 @@ namespace WorkflowManagerAdministrationUtilities
         #region Constants
         private const string C_PARAM_JOB_TO_DELETE = "in_long_jobToDelete";
         private const string C_PARAM_JOB_DELETED = "out_long_jobDeleted";
+        private const string C_PARAM_DEFER_VERSION_CLEANUP = "in_bool_deferVersionCleanup";
+        private const string C_PARAM_CLEANUP_QUEUE = "in_file_cleanupQueue";
+
+        private const string C_OPT_DEFER_VERSION_CLEANUP = "DEFER_VERSION_CLEANUP";
+        private const string C_OPT_DELETE_VERSION_NOW = "DELETE_VERSION_NOW";
+
+        private const bool C_DEFAULT_DEFER_VERSION_CLEANUP = false;
         #endregion
 
         #region MemberVariables
         private int m_jobToDelete = -1;
+        private bool m_deferVersionCleanup = C_DEFAULT_DEFER_VERSION_CLEANUP;
+        private string m_cleanupQueue = string.Empty;
         #endregion
 
         #region SimpleAccessors
@@ -72,6 +81,87 @@ namespace WorkflowManagerAdministrationUtilities
             // Update the internal values of whatever parameters we're maintaining
             param = paramMap.GetParam(C_PARAM_JOB_TO_DELETE);
             m_jobToDelete = int.Parse(param.Value.GetAsText());
+
+            param = paramMap.GetParam(C_PARAM_DEFER_VERSION_CLEANUP);
+            m_deferVersionCleanup = (param.Value as IGPBoolean).Value;
+
+            param = paramMap.GetParam(C_PARAM_CLEANUP_QUEUE);
+            m_cleanupQueue = param.Value.GetAsText();
+            if (string.IsNullOrEmpty(m_cleanupQueue))
+            {
+                m_cleanupQueue = Common.WmauDeferredCleanupQueue.DefaultQueuePath;
+            }
+        }
+
+        /// <summary>
+        /// Deletes the job's version right away, if the current user is allowed to
+        /// </summary>
+        /// <param name="job">The job whose version is to be deleted</param>
+        /// <param name="msgs">The GP messages object for this tool</param>
+        private void DeleteJobVersion(IJTXJob3 job, IGPMessages msgs)
+        {
+            if (job.VersionExists())
+            {
+                if (CurrentUserHasPrivilege(ESRI.ArcGIS.JTX.Utilities.Constants.PRIV_DELETE_VERSION))
+                {
+                    try
+                    {
+                        job.DeleteVersion(null);
+                    }
+                    catch (System.Runtime.InteropServices.COMException comEx)
+                    {
+                        if (comEx.ErrorCode == (int)fdoError.FDO_E_SE_VERSION_NOEXIST)
+                        {
+                            // The "VersionExists" method above can apparently be fooled; if it is, an exception with this
+                            // error code is thrown.  In this case, add a warning and continue on.
+                            msgs.AddWarning("Version '" + job.VersionName + "' is assigned to job " + job.ID.ToString() + " but could not be found");
+                        }
+                        else
+                        {
+                            // If there's a different error, then re-throw it for someone else to deal with
+                            throw comEx;
+                        }
+                    }
+                }
+                else
+                {
+                    string username = ESRI.ArcGIS.JTXUI.ConfigurationCache.GetCurrentSystemUser(ESRI.ArcGIS.JTXUI.ConfigurationCache.UseUserDomain);
+                    msgs.AddWarning("User '" + username + "' does not have permissions to " +
+                        "delete job versions; version '" + job.VersionName + "' will not be deleted");
+                }
+            }
+        }
+
+        /// <summary>
+        /// Adds the job's version to the deferred cleanup queue, so that it can be
+        /// deleted later by the "Clean Up Deleted Job Versions" tool.  Checking
+        /// whether the version exists would mean connecting to the data workspace,
+        /// so this is also left to the cleanup tool.
+        /// </summary>
+        /// <param name="job">The job whose version is to be deleted</param>
+        /// <param name="msgs">The GP messages object for this tool</param>
+        private void QueueJobVersion(IJTXJob3 job, IGPMessages msgs)
+        {
+            if (string.IsNullOrEmpty(job.VersionName) || string.IsNullOrEmpty(job.DataWorkspaceID))
+            {
+                return;
+            }
+
+            Common.WmauDeferredCleanupQueue.Entry entry = new Common.WmauDeferredCleanupQueue.Entry();
+            entry.WmxDatabaseAlias = this.WmxDatabaseAlias;
+            entry.JobId = job.ID;
+            entry.DataWorkspaceId = job.DataWorkspaceID;
+            entry.VersionName = job.VersionName;
+
+            try
+            {
+                Common.WmauDeferredCleanupQueue.Enqueue(m_cleanupQueue, new Common.WmauDeferredCleanupQueue.Entry[] { entry });
+            }
+            catch (Exception ex)
+            {
+                throw new WmauException(WmauErrorCodes.C_CLEANUP_QUEUE_ERROR, ex);
+            }
+            msgs.AddMessage("Queued version '" + job.VersionName + "' to be deleted later (" + m_cleanupQueue + ")");
         }
         #endregion
 
@@ -109,6 +199,32 @@ namespace WorkflowManagerAdministrationUtilities
                     null);
                 m_parameters.Add(paramEdit);
 
+                // Parameter indicating whether the job's version should be queued for
+                // deletion later, rather than being deleted right away
+                IGPCodedValueDomain cvDomain = new GPCodedValueDomainClass();
+                cvDomain.AddCode(GpTrue, C_OPT_DEFER_VERSION_CLEANUP);
+                cvDomain.AddCode(GpFalse, C_OPT_DELETE_VERSION_NOW);
+
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_DJ_DEFER_VERSION_CLEANUP,
+                    C_PARAM_DEFER_VERSION_CLEANUP,
+                    GpBooleanType,
+                    ToGpBoolean(C_DEFAULT_DEFER_VERSION_CLEANUP));
+                paramEdit.Domain = cvDomain as IGPDomain;
+                m_parameters.Add(paramEdit);
+
+                // Parameter indicating the file in which deferred versions are queued
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_DJ_CLEANUP_QUEUE,
+                    C_PARAM_CLEANUP_QUEUE,
+                    new DEFileTypeClass() as IGPDataType,
+                    null);
+                m_parameters.Add(paramEdit);
+
                 return m_parameters;
             }
         }
@@ -212,41 +328,29 @@ namespace WorkflowManagerAdministrationUtilities
             try
             {
                 IJTXJobManager jobManager = this.WmxDatabase.JobManager;
-                IJTXJob3 job = jobManager.GetJob(m_jobToDelete) as IJTXJob3;
+                IJTXJob3 job = null;
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_GET_JOB))
+                {
+                    job = jobManager.GetJob(m_jobToDelete) as IJTXJob3;
+                }
 
                 msgs.AddMessage("Deleting job " + m_jobToDelete + " (" + job.Name + ")");
                 job.DeleteMXD();
-                if (job.VersionExists())
+
+                // The version is queued before the job is deleted, so that it can't be
+                // lost; the cleanup tool skips the versions of any jobs that still exist
+                if (m_deferVersionCleanup)
                 {
-                    if (CurrentUserHasPrivilege(ESRI.ArcGIS.JTX.Utilities.Constants.PRIV_DELETE_VERSION))
-                    {
-                        try
-                        {
-                            job.DeleteVersion(null);
-                        }
-                        catch (System.Runtime.InteropServices.COMException comEx)
-                        {
-                            if (comEx.ErrorCode == (int)fdoError.FDO_E_SE_VERSION_NOEXIST)
-                            {
-                                // The "VersionExists" method above can apparently be fooled; if it is, an exception with this
-                                // error code is thrown.  In this case, add a warning and continue on.
-                                msgs.AddWarning("Version '" + job.VersionName + "' is assigned to job " + job.ID.ToString() + " but could not be found");
-                            }
-                            else
-                            {
-                                // If there's a different error, then re-throw it for someone else to deal with
-                                throw comEx;
-                            }
-                        }
-                    }
-                    else
-                    {
-                        string username = ESRI.ArcGIS.JTXUI.ConfigurationCache.GetCurrentSystemUser(ESRI.ArcGIS.JTXUI.ConfigurationCache.UseUserDomain);
-                        msgs.AddWarning("User '" + username + "' does not have permissions to " +
-                            "delete job versions; version '" + job.VersionName + "' will not be deleted");
-                    }
+                    QueueJobVersion(job, msgs);
+                }
+                else
+                {
+                    DeleteJobVersion(job, msgs);
+                }
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_DELETE_JOB))
+                {
+                    jobManager.DeleteJob(m_jobToDelete, true);
                 }
-                jobManager.DeleteJob(m_jobToDelete, true);
 
                 // Set the output parameter
                 WmauParameterMap paramMap = new WmauParameterMap(paramValues);
@@ -257,6 +361,17 @@ namespace WorkflowManagerAdministrationUtilities
 
                 msgs.AddMessage(Properties.Resources.MSG_DONE);
             }
+            catch (WmauException wmEx)
+            {
+                try
+                {
+                    msgs.AddError(wmEx.ErrorCodeAsInt, wmEx.Message);
+                }
+                catch
+                {
+                    // Catch anything else that possibly happens
+                }
+            }
             catch (Exception ex)
             {
                 WmauError error = new WmauError(WmauErrorCodes.C_DELETE_JOB_VERSION_ERROR);
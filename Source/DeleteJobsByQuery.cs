@@ -0,0 +1,472 @@
+﻿//Copyright 2015 Esri
+//Licensed under the Apache License, Version 2.0 (the "License");
+//you may not use this file except in compliance with the License.
+//You may obtain a copy of the License at
+//    http://www.apache.org/licenses/LICENSE-2.0
+//Unless required by applicable law or agreed to in writing, software
+//distributed under the License is distributed on an "AS IS" BASIS,
+//WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//See the License for the specific language governing permissions and
+//limitations under the License.​
+
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+
+using ESRI.ArcGIS.esriSystem;
+using ESRI.ArcGIS.Geodatabase;
+using ESRI.ArcGIS.Geoprocessing;
+using ESRI.ArcGIS.JTX;
+using ESRI.ArcGIS.JTX.Utilities;
+
+
+namespace WorkflowManagerAdministrationUtilities
+{
+    /// <summary>
+    /// GP tool to delete all of the jobs matching a query against the JTX_JOBS
+    /// table.<br/>
+    /// <br/>
+    /// The query is run once, and the matching jobs are then loaded and deleted
+    /// in batches.  Within each batch, the jobs are grouped by data workspace so
+    /// that each workspace is only opened once when deleting the jobs' versions.
+    /// See the "DeleteJob" tool for notes on the job-deletion logic.
+    /// </summary>
+    class DeleteJobsByQuery : WmauAbstractGpFunction
+    {
+        #region Constants
+        private const string C_PARAM_JOBS_TABLE = "in_table_jobsTable";
+        private const string C_PARAM_SQL_QUERY_FILTER = "in_string_sqlQueryFilter";
+        private const string C_PARAM_BATCH_SIZE = "in_long_batchSize";
+        private const string C_PARAM_PREVIEW_CHANGES = "in_bool_previewChangesOnly";
+        private const string C_PARAM_NUM_JOBS_DELETED = "out_long_numJobsDeleted";
+        private const string C_PARAM_NUM_JOBS_FAILED = "out_long_numJobsFailed";
+
+        private const string C_OPT_PREVIEW_DELETES = "PREVIEW_DELETES";
+        private const string C_OPT_PERFORM_DELETES = "PERFORM_DELETES";
+
+        private const int C_DEFAULT_BATCH_SIZE = 100;
+        private const bool C_DEFAULT_PREVIEW_CHANGES = true;
+        #endregion
+
+        #region MemberVariables
+        private string m_sqlQuery = string.Empty;
+        private int m_batchSize = C_DEFAULT_BATCH_SIZE;
+        private bool m_previewChanges = C_DEFAULT_PREVIEW_CHANGES;
+        private int m_numJobsDeleted = 0;
+        private int m_numJobsFailed = 0;
+        #endregion
+
+        #region SimpleAccessors
+        public override string Name { get { return "DeleteJobsByQuery"; } }
+        public override string DisplayName { get { return Properties.Resources.TOOL_DELETE_JOBS_BY_QUERY; } }
+        public override string DisplayToolset { get { return Properties.Resources.CAT_JOB_UTILS; } }
+        #endregion
+
+        #region Private helper functions
+        /// <summary>
+        /// Updates the internal values used by this tool based on the parameters from an input array
+        /// </summary>
+        /// <param name="paramValues"></param>
+        protected override void ExtractParameters(IArray paramValues)
+        {
+            // Get the values for any parameters common to all GP tools
+            ExtractParametersCommon(paramValues);
+
+            WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+            IGPParameter3 param = null;
+
+            // Update the internal values of whatever parameters we're maintaining
+            param = paramMap.GetParam(C_PARAM_SQL_QUERY_FILTER);
+            m_sqlQuery = param.Value.GetAsText();
+
+            param = paramMap.GetParam(C_PARAM_BATCH_SIZE);
+            m_batchSize = int.Parse(param.Value.GetAsText());
+
+            param = paramMap.GetParam(C_PARAM_PREVIEW_CHANGES);
+            m_previewChanges = (param.Value as IGPBoolean).Value;
+        }
+
+        /// <summary>
+        /// Gets the names of all of the versions in a data workspace.  Both the
+        /// fully-qualified and unqualified forms of each name are included, in
+        /// upper case.
+        /// </summary>
+        /// <param name="workspace">The data workspace</param>
+        /// <returns>The set of version names</returns>
+        private HashSet<string> GetVersionNames(IWorkspace workspace)
+        {
+            HashSet<string> versionNames = new HashSet<string>();
+
+            IEnumVersionInfo allVersions = (workspace as IVersionedWorkspace).Versions;
+            IVersionInfo version = null;
+            while ((version = allVersions.Next()) != null)
+            {
+                string name = version.VersionName.ToUpper();
+                versionNames.Add(name);
+                versionNames.Add(name.Substring(name.LastIndexOf('.') + 1));
+            }
+
+            return versionNames;
+        }
+
+        /// <summary>
+        /// Deletes a single job, along with its map document and (if possible) its version.
+        /// </summary>
+        /// <param name="job">The job to delete</param>
+        /// <param name="workspace">The job's data workspace; null if it isn't available</param>
+        /// <param name="versionNames">The names of the versions in the data workspace</param>
+        /// <param name="msgs">The GP messages object for this tool</param>
+        private void DeleteSingleJob(IJTXJob3 job, IWorkspace workspace, HashSet<string> versionNames, IGPMessages msgs)
+        {
+            msgs.AddMessage("  Deleting job " + job.ID.ToString() + " (" + job.Name + ")");
+            job.DeleteMXD();
+
+            string versionName = job.VersionName;
+            if (workspace != null && !string.IsNullOrEmpty(versionName) && versionNames.Contains(versionName.ToUpper()))
+            {
+                try
+                {
+                    job.DeleteVersion(workspace);
+                }
+                catch (System.Runtime.InteropServices.COMException comEx)
+                {
+                    if (comEx.ErrorCode == (int)fdoError.FDO_E_SE_VERSION_NOEXIST)
+                    {
+                        // As with the "DeleteJob" tool, warn about the missing version and continue on
+                        msgs.AddWarning("Version '" + versionName + "' is assigned to job " + job.ID.ToString() + " but could not be found");
+                    }
+                    else
+                    {
+                        throw comEx;
+                    }
+                }
+            }
+
+            using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_DELETE_JOB))
+            {
+                this.WmxDatabase.JobManager.DeleteJob(job.ID, true);
+            }
+        }
+
+        /// <summary>
+        /// Loads and deletes a batch of jobs.  The jobs are loaded with a single query and
+        /// grouped by data workspace, so that each workspace is only opened once.
+        /// </summary>
+        /// <param name="jobIds">The IDs of the jobs to delete</param>
+        /// <param name="canDeleteVersions">True if the current user may delete job versions</param>
+        /// <param name="msgs">The GP messages object for this tool</param>
+        private void DeleteJobBatch(List<int> jobIds, bool canDeleteVersions, IGPMessages msgs)
+        {
+            IJTXJobSet jobSet = Common.WmauHelperFunctions.GetJobsById(this.WmxDatabase, jobIds);
+
+            // Group the jobs by data workspace
+            SortedList<string, List<IJTXJob3>> jobsByWorkspace = new SortedList<string, List<IJTXJob3>>();
+            HashSet<int> jobsFound = new HashSet<int>();
+            for (int i = 0; i < jobSet.Count; i++)
+            {
+                IJTXJob3 job = jobSet.get_Item(i) as IJTXJob3;
+                string workspaceId = job.DataWorkspaceID;
+                if (workspaceId == null)
+                {
+                    workspaceId = string.Empty;
+                }
+
+                if (!jobsByWorkspace.ContainsKey(workspaceId))
+                {
+                    jobsByWorkspace[workspaceId] = new List<IJTXJob3>();
+                }
+                jobsByWorkspace[workspaceId].Add(job);
+                jobsFound.Add(job.ID);
+            }
+
+            // Any jobs that matched the original query, but which can no longer be
+            // found, have been deleted by someone else in the meantime
+            foreach (int jobId in jobIds)
+            {
+                if (!jobsFound.Contains(jobId))
+                {
+                    msgs.AddWarning("Job " + jobId.ToString() + " no longer exists");
+                    m_numJobsFailed++;
+                }
+            }
+
+            foreach (KeyValuePair<string, List<IJTXJob3>> group in jobsByWorkspace)
+            {
+                // Open the data workspace once for all of the jobs that have versions in it
+                IWorkspace workspace = null;
+                HashSet<string> versionNames = null;
+                bool hasVersions = false;
+                foreach (IJTXJob3 job in group.Value)
+                {
+                    hasVersions = hasVersions || !string.IsNullOrEmpty(job.VersionName);
+                }
+
+                if (canDeleteVersions && hasVersions && !string.IsNullOrEmpty(group.Key))
+                {
+                    try
+                    {
+                        workspace = this.WmxDatabase.GetDataWorkspace(group.Key, null);
+                        versionNames = GetVersionNames(workspace);
+                    }
+                    catch (Exception ex)
+                    {
+                        workspace = null;
+                        msgs.AddWarning("Could not open data workspace '" + group.Key + "'; job versions " +
+                            "in this workspace will not be deleted (" + ex.Message + ")");
+                    }
+                }
+
+                foreach (IJTXJob3 job in group.Value)
+                {
+                    try
+                    {
+                        DeleteSingleJob(job, workspace, versionNames, msgs);
+                        m_numJobsDeleted++;
+                    }
+                    catch (Exception ex)
+                    {
+                        msgs.AddWarning("Could not delete job " + job.ID.ToString() + ": " + ex.Message);
+                        m_numJobsFailed++;
+                    }
+                }
+            }
+        }
+        #endregion
+
+        /// <summary>
+        /// Required by IGPFunction2 interface.
+        /// </summary>
+        public override IArray ParameterInfo
+        {
+            get
+            {
+                m_parameters = new ArrayClass();
+                IGPParameterEdit3 paramEdit = null;
+                IGPCodedValueDomain cvDomain = null;
+
+                // Dummy "table" parameter, used to populate the SQL query dialog
+                GPTableViewClass tableView = new GPTableViewClass();
+                IGPParameterEdit3 jobsTableLocation = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeRequired,
+                    String.Format(Properties.Resources.DESC_DJBQ_JOBS_TABLE_1, Constants.JTX_TABLE_JTX_JOBS_TABLE),
+                    C_PARAM_JOBS_TABLE,
+                    tableView.DataType,
+                    tableView as IGPValue);
+                m_parameters.Add(jobsTableLocation);
+
+                // SQL query filter; required, so that all of the jobs in the database aren't
+                // deleted by accident
+                GPSQLExpressionClass expression = new GPSQLExpressionClass();
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeRequired,
+                    String.Format(Properties.Resources.DESC_DJBQ_SQL_QUERY_FILTER_1, Constants.JTX_TABLE_JTX_JOBS_TABLE),
+                    C_PARAM_SQL_QUERY_FILTER,
+                    expression.DataType,
+                    expression as IGPValue);
+                paramEdit.AddDependency((jobsTableLocation as IGPParameter3).Name);
+                m_parameters.Add(paramEdit);
+
+                // Optional parameter indicating how many jobs to load and delete at a time
+                IGPLong batchSize = new GPLongClass();
+                batchSize.Value = C_DEFAULT_BATCH_SIZE;
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_DJBQ_BATCH_SIZE,
+                    C_PARAM_BATCH_SIZE,
+                    new GPLongTypeClass(),
+                    batchSize as IGPValue);
+                m_parameters.Add(paramEdit);
+
+                // Optional parameter indicating whether the jobs should truly be deleted,
+                // or whether they should merely be listed.
+                cvDomain = new GPCodedValueDomainClass();
+                cvDomain.AddCode(GpTrue, C_OPT_PREVIEW_DELETES);
+                cvDomain.AddCode(GpFalse, C_OPT_PERFORM_DELETES);
+
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_DJBQ_PREVIEW_CHANGES,
+                    C_PARAM_PREVIEW_CHANGES,
+                    GpBooleanType,
+                    ToGpBoolean(C_DEFAULT_PREVIEW_CHANGES));
+                paramEdit.Domain = cvDomain as IGPDomain;
+                m_parameters.Add(paramEdit);
+
+                // Parameter for specifying the WMX database
+                m_parameters.Add(BuildWmxDbParameter());
+
+                // Parameter indicating the number of jobs deleted
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionOutput,
+                    esriGPParameterType.esriGPParameterTypeDerived,
+                    Properties.Resources.DESC_DJBQ_NUM_JOBS_DELETED,
+                    C_PARAM_NUM_JOBS_DELETED,
+                    new GPLongTypeClass(),
+                    null);
+                m_parameters.Add(paramEdit);
+
+                // Parameter indicating the number of jobs that could not be deleted
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionOutput,
+                    esriGPParameterType.esriGPParameterTypeDerived,
+                    Properties.Resources.DESC_DJBQ_NUM_JOBS_FAILED,
+                    C_PARAM_NUM_JOBS_FAILED,
+                    new GPLongTypeClass(),
+                    null);
+                m_parameters.Add(paramEdit);
+
+                return m_parameters;
+            }
+        }
+
+        /// <summary>
+        /// Post validates the given set of values.
+        /// This is where you flag parameters with warnings and error messages, among other things.
+        /// </summary>
+        /// <param name="paramValues"></param>
+        /// <param name="pEnvMgr"></param>
+        /// <param name="msgs"></param>
+        public override void UpdateMessages(IArray paramValues, IGPEnvironmentManager pEnvMgr, IGPMessages msgs)
+        {
+            try
+            {
+                UpdateMessagesCommon(paramValues, pEnvMgr, msgs);
+            }
+            catch (WmxDefaultDbNotSetException)
+            {
+                // If the default DB wasn't set, stop executing
+                return;
+            }
+
+            // Build a hash of which parameter is at which index for ease of access
+            WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+
+            // Ensure that the current user has permissions to be deleting jobs
+            if (!CurrentUserHasPrivilege(ESRI.ArcGIS.JTX.Utilities.Constants.PRIV_DELETE_JOBS))
+            {
+                WmauError error = new WmauError(WmauErrorCodes.C_NO_DELETE_JOB_PRIV_ERROR);
+                msgs.ReplaceError(paramMap.GetIndex(C_PARAM_SQL_QUERY_FILTER), error.ErrorCodeAsInt, error.Message);
+            }
+
+            // Ensure that the batch size is sensible
+            IGPParameter3 batchSizeParam = paramMap.GetParam(C_PARAM_BATCH_SIZE);
+            int batchSize = 0;
+            if (batchSizeParam.Value != null &&
+                (!int.TryParse(batchSizeParam.Value.GetAsText(), out batchSize) || batchSize <= 0))
+            {
+                WmauError error = new WmauError(WmauErrorCodes.C_INVALID_BATCH_SIZE_ERROR);
+                msgs.ReplaceError(paramMap.GetIndex(C_PARAM_BATCH_SIZE), error.ErrorCodeAsInt, error.Message);
+            }
+        }
+
+        /// <summary>
+        /// Required by IGPFunction2 interface; this function is called when the GP tool is ready to be executed.
+        /// </summary>
+        /// <param name="paramValues"></param>
+        /// <param name="trackCancel"></param>
+        /// <param name="envMgr"></param>
+        /// <param name="msgs"></param>
+        public override void Execute(IArray paramValues, ITrackCancel trackCancel, IGPEnvironmentManager envMgr, IGPMessages msgs)
+        {
+            // Do some common error-checking
+            base.Execute(paramValues, trackCancel, envMgr, msgs);
+
+            m_numJobsDeleted = 0;
+            m_numJobsFailed = 0;
+
+            try
+            {
+                // Check the user's privileges once, up front, rather than for each job
+                if (!CurrentUserHasPrivilege(ESRI.ArcGIS.JTX.Utilities.Constants.PRIV_DELETE_JOBS))
+                {
+                    throw new WmauException(WmauErrorCodes.C_NO_DELETE_JOB_PRIV_ERROR);
+                }
+                if (m_batchSize <= 0)
+                {
+                    throw new WmauException(WmauErrorCodes.C_INVALID_BATCH_SIZE_ERROR);
+                }
+
+                bool canDeleteVersions = CurrentUserHasPrivilege(ESRI.ArcGIS.JTX.Utilities.Constants.PRIV_DELETE_VERSION);
+                if (!canDeleteVersions && !m_previewChanges)
+                {
+                    string username = ESRI.ArcGIS.JTXUI.ConfigurationCache.GetCurrentSystemUser(ESRI.ArcGIS.JTXUI.ConfigurationCache.UseUserDomain);
+                    msgs.AddWarning("User '" + username + "' does not have permissions to " +
+                        "delete job versions; job versions will not be deleted");
+                }
+
+                // Run the query once to find all of the matching jobs
+                SortedList<int, string> jobs = Common.WmauHelperFunctions.ListJobsMatchingQuery(this.WmxDatabase, m_sqlQuery);
+                msgs.AddMessage("Found " + jobs.Count.ToString() + " job(s) matching query");
+
+                if (m_previewChanges)
+                {
+                    msgs.AddMessage("PREVIEWING CHANGES ONLY; no changes will be made");
+                    foreach (KeyValuePair<int, string> item in jobs)
+                    {
+                        msgs.AddMessage("  Found job " + item.Key.ToString() + " (" + item.Value + ")");
+                    }
+                }
+                else
+                {
+                    List<int> jobIds = jobs.Keys.ToList();
+                    for (int start = 0; start < jobIds.Count; start += m_batchSize)
+                    {
+                        if (trackCancel != null && !trackCancel.Continue())
+                        {
+                            msgs.AddWarning("Cancelled; " + (jobIds.Count - start).ToString() + " job(s) were not deleted");
+                            break;
+                        }
+
+                        List<int> batch = jobIds.GetRange(start, Math.Min(m_batchSize, jobIds.Count - start));
+                        DeleteJobBatch(batch, canDeleteVersions, msgs);
+                    }
+
+                    msgs.AddMessage("Deleted " + m_numJobsDeleted.ToString() + " job(s); " +
+                        m_numJobsFailed.ToString() + " job(s) could not be deleted");
+                }
+
+                // Set the output parameters
+                WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+                IGPParameterEdit3 outParamEdit = paramMap.GetParamEdit(C_PARAM_NUM_JOBS_DELETED);
+                IGPLong outValue = new GPLongClass();
+                outValue.Value = m_numJobsDeleted;
+                outParamEdit.Value = outValue as IGPValue;
+
+                outParamEdit = paramMap.GetParamEdit(C_PARAM_NUM_JOBS_FAILED);
+                outValue = new GPLongClass();
+                outValue.Value = m_numJobsFailed;
+                outParamEdit.Value = outValue as IGPValue;
+
+                msgs.AddMessage(Properties.Resources.MSG_DONE);
+            }
+            catch (WmauException wmEx)
+            {
+                try
+                {
+                    msgs.AddError(wmEx.ErrorCodeAsInt, wmEx.Message);
+                }
+                catch
+                {
+                    // Catch anything else that possibly happens
+                }
+            }
+            catch (Exception ex)
+            {
+                try
+                {
+                    WmauError error = new WmauError(WmauErrorCodes.C_DELETE_JOB_ERROR);
+                    msgs.AddError(error.ErrorCodeAsInt, error.Message + "; " + ex.Message);
+                }
+                catch
+                {
+                    // Catch anything else that possibly happens
+                }
+            }
+        }
+    }
+}
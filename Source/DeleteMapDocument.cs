@@ -157,6 +157,7 @@ namespace WorkflowManagerAdministrationUtilities
                 IJTXConfiguration3 configMgr = WmxDatabase.ConfigurationManager as IJTXConfiguration3;
                 IJTXMap map = configMgr.GetJTXMap(m_mxdName);
                 configMgr.DeleteJTXMap(map.ID);
+                Common.WmauArtifactCache.InvalidateMapDocument(WmxDatabase.Alias, m_mxdName);
 
                 // Update the output parameter
                 WmauParameterMap paramMap = new WmauParameterMap(paramValues);
@@ -555,7 +555,11 @@ namespace WorkflowManagerAdministrationUtilities
                     IJTXJob3 job = allJobs.get_Item(i) as IJTXJob3;
                     if (job.AssignedType == jtxAssignmentType.jtxAssignmentTypeUser)
                     {
-                        IJTXUser3 user = configMgr.GetUser(job.AssignedTo) as IJTXUser3;
+                        IJTXUser3 user = null;
+                        using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_GET_USER))
+                        {
+                            user = configMgr.GetUser(job.AssignedTo) as IJTXUser3;
+                        }
                         
                         // It's possible for a user to have a job assigned, but have
                         // already been removed from the DB.  Throw an exception in
@@ -581,7 +585,11 @@ namespace WorkflowManagerAdministrationUtilities
                     IJTXJobType3 jobType = allJobTypes.get_Item(i) as IJTXJobType3;
                     if (jobType.DefaultAssignedType == jtxAssignmentType.jtxAssignmentTypeUser)
                     {
-                        IJTXUser3 user = configMgr.GetUser(jobType.DefaultAssignedTo) as IJTXUser3;
+                        IJTXUser3 user = null;
+                        using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_GET_USER))
+                        {
+                            user = configMgr.GetUser(jobType.DefaultAssignedTo) as IJTXUser3;
+                        }
 
                         // It's possible for a user to have a job assigned, but have
                         // already been removed from the DB.  Throw an exception in
@@ -617,7 +625,11 @@ namespace WorkflowManagerAdministrationUtilities
                         IJTXStep3 step = workflowCfg.GetStep(j) as IJTXStep3;
                         if (step.AssignedType == jtxAssignmentType.jtxAssignmentTypeUser)
                         {
-                            IJTXUser3 user = configMgr.GetUser(step.AssignedTo) as IJTXUser3;
+                            IJTXUser3 user = null;
+                            using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_GET_USER))
+                            {
+                                user = configMgr.GetUser(step.AssignedTo) as IJTXUser3;
+                            }
 
                             // It's possible for a user to have a job assigned, but have
                             // already been removed from the DB.  Throw an exception in
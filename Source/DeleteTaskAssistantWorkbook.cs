@@ -156,6 +156,7 @@ namespace WorkflowManagerAdministrationUtilities
                 // Delete the specified TA workbook
                 IJTXConfiguration3 configMgr = WmxDatabase.ConfigurationManager as IJTXConfiguration3;
                 configMgr.RemoveTaskAssistantWorkflowRecord(m_workbookName);
+                Common.WmauArtifactCache.InvalidateTamWorkbook(WmxDatabase.Alias, m_workbookName);
 
                 // Update the output parameter
                 WmauParameterMap paramMap = new WmauParameterMap(paramValues);
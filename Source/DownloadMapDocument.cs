@@ -28,11 +28,18 @@ namespace WorkflowManagerAdministrationUtilities
         #region Constants
         private const string C_PARAM_SOURCE_NAME = "in_string_sourceName";
         private const string C_PARAM_MXD_FILE_PATH = "out_file_mxdFile";
+        private const string C_PARAM_USE_LOCAL_CACHE = "in_bool_useLocalCache";
+
+        private const string C_OPT_USE_LOCAL_CACHE = "USE_LOCAL_CACHE";
+        private const string C_OPT_NO_LOCAL_CACHE = "NO_LOCAL_CACHE";
+
+        private const bool C_DEFAULT_USE_LOCAL_CACHE = false;
         #endregion
 
         #region MemberVariables
         private string m_sourceName = string.Empty;
         private string m_mxdFilePath = string.Empty;
+        private bool m_useLocalCache = C_DEFAULT_USE_LOCAL_CACHE;
         #endregion
 
         #region SimpleAccessors
@@ -60,6 +67,9 @@ namespace WorkflowManagerAdministrationUtilities
 
             param = paramMap.GetParam(C_PARAM_MXD_FILE_PATH);
             m_mxdFilePath = param.Value.GetAsText();
+
+            param = paramMap.GetParam(C_PARAM_USE_LOCAL_CACHE);
+            m_useLocalCache = (param.Value as IGPBoolean).Value;
         }
 
         /// <summary>
@@ -73,6 +83,49 @@ namespace WorkflowManagerAdministrationUtilities
                 System.IO.File.Delete(filePath);
             }
         }
+
+        /// <summary>
+        /// Helper function to copy the MXD out of the local cache, if it hasn't changed
+        /// since it was cached.  Problems with the cache are reported as warnings, and
+        /// the MXD is then downloaded as usual.
+        /// </summary>
+        /// <param name="cache">The local cache</param>
+        /// <param name="cacheKey">The key identifying the MXD in the cache</param>
+        /// <param name="marker">The MXD's current change marker</param>
+        /// <param name="msgs">Used to report any problems with the cache</param>
+        /// <returns>True if the MXD was read from the cache; false if it must be downloaded</returns>
+        private bool TryReadFromCache(Common.WmauArtifactCache cache, string cacheKey, string marker, IGPMessages msgs)
+        {
+            try
+            {
+                return cache.TryGet(cacheKey, marker, this.m_mxdFilePath);
+            }
+            catch (Exception ex)
+            {
+                msgs.AddWarning("Could not read from the local cache; " + ex.Message);
+                this.DeleteFile(this.m_mxdFilePath);
+                return false;
+            }
+        }
+
+        /// <summary>
+        /// Helper function to add a newly-downloaded MXD to the local cache
+        /// </summary>
+        /// <param name="cache">The local cache</param>
+        /// <param name="cacheKey">The key identifying the MXD in the cache</param>
+        /// <param name="marker">The MXD's change marker, as of the download</param>
+        /// <param name="msgs">Used to report any problems with the cache</param>
+        private void AddToCache(Common.WmauArtifactCache cache, string cacheKey, string marker, IGPMessages msgs)
+        {
+            try
+            {
+                cache.Put(cacheKey, marker, this.m_mxdFilePath);
+            }
+            catch (Exception ex)
+            {
+                msgs.AddWarning("Could not add the map document to the local cache; " + ex.Message);
+            }
+        }
         #endregion
 
         /// <summary>
@@ -109,6 +162,22 @@ namespace WorkflowManagerAdministrationUtilities
                 // Parameter for specifying the WMX database
                 m_parameters.Add(BuildWmxDbParameter());
 
+                // Parameter indicating whether an unchanged MXD can be read from the
+                // local cache rather than downloaded again
+                IGPCodedValueDomain cvDomain = new GPCodedValueDomainClass();
+                cvDomain.AddCode(GpTrue, C_OPT_USE_LOCAL_CACHE);
+                cvDomain.AddCode(GpFalse, C_OPT_NO_LOCAL_CACHE);
+
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_DMXD_USE_LOCAL_CACHE,
+                    C_PARAM_USE_LOCAL_CACHE,
+                    GpBooleanType,
+                    ToGpBoolean(C_DEFAULT_USE_LOCAL_CACHE));
+                paramEdit.Domain = cvDomain as IGPDomain;
+                m_parameters.Add(paramEdit);
+
                 return m_parameters;
             }
         }
@@ -170,15 +239,53 @@ namespace WorkflowManagerAdministrationUtilities
                     throw new WmauException(WmauErrorCodes.C_USER_NOT_ADMIN_ERROR);
                 }
 
-                // Retrieve the MXD
-                IJTXConfiguration3 defaultDbReadonly = WmxDatabase.ConfigurationManager as IJTXConfiguration3;
-                IJTXMap map = defaultDbReadonly.GetJTXMap(this.m_sourceName);
-
                 // Delete any existing file that we're going to replace
                 this.DeleteFile(this.m_mxdFilePath);
 
-                // Save the map to disk
-                map.CopyToLocation(this.m_mxdFilePath);
+                // If requested, copy the MXD out of the local cache instead, so long as
+                // it hasn't changed since it was last downloaded
+                Common.WmauArtifactCache cache = null;
+                string cacheKey = null;
+                string marker = null;
+                bool isCached = false;
+                if (m_useLocalCache)
+                {
+                    cache = new Common.WmauArtifactCache(Common.WmauArtifactCache.DefaultCachePath);
+                    cacheKey = Common.WmauArtifactCache.BuildKey(
+                        WmxDatabase.Alias, Common.WmauArtifactCache.C_TYPE_MAP_DOCUMENT, this.m_sourceName);
+                    marker = Common.WmauHelperFunctions.GetMapDocumentChangeMarker(WmxDatabase, this.m_sourceName);
+                    if (marker == null)
+                    {
+                        msgs.AddWarning("Could not determine whether map document '" + this.m_sourceName +
+                            "' has changed; it will be downloaded");
+                    }
+                    else
+                    {
+                        isCached = TryReadFromCache(cache, cacheKey, marker, msgs);
+                    }
+                }
+
+                if (isCached)
+                {
+                    msgs.AddMessage("Read map document '" + this.m_sourceName + "' from the local cache");
+                }
+                else
+                {
+                    // Retrieve the MXD and save it to disk
+                    IJTXConfiguration3 defaultDbReadonly = WmxDatabase.ConfigurationManager as IJTXConfiguration3;
+                    IJTXMap map = defaultDbReadonly.GetJTXMap(this.m_sourceName);
+                    map.CopyToLocation(this.m_mxdFilePath);
+
+                    if (marker != null)
+                    {
+                        AddToCache(cache, cacheKey, marker, msgs);
+                    }
+                }
+
+                if (cache != null && marker != null)
+                {
+                    msgs.AddMessage(cache.DescribeStatistics());
+                }
 
                 msgs.AddMessage(Properties.Resources.MSG_DONE);
             }
@@ -28,11 +28,18 @@ namespace WorkflowManagerAdministrationUtilities
         #region Constants
         private const string C_PARAM_SOURCE_NAME = "in_string_sourceName";
         private const string C_PARAM_XML_FILE_PATH = "out_file_tamWorkbookXml";
+        private const string C_PARAM_USE_LOCAL_CACHE = "in_bool_useLocalCache";
+
+        private const string C_OPT_USE_LOCAL_CACHE = "USE_LOCAL_CACHE";
+        private const string C_OPT_NO_LOCAL_CACHE = "NO_LOCAL_CACHE";
+
+        private const bool C_DEFAULT_USE_LOCAL_CACHE = false;
         #endregion
 
         #region MemberVariables
         private string m_sourceName = string.Empty;
         private string m_xmlFilePath = string.Empty;
+        private bool m_useLocalCache = C_DEFAULT_USE_LOCAL_CACHE;
         #endregion
 
         #region SimpleAccessors
@@ -71,6 +78,9 @@ namespace WorkflowManagerAdministrationUtilities
 
             param = paramMap.GetParam(C_PARAM_SOURCE_NAME);
             m_sourceName = param.Value.GetAsText();
+
+            param = paramMap.GetParam(C_PARAM_USE_LOCAL_CACHE);
+            m_useLocalCache = (param.Value as IGPBoolean).Value;
         }
 
         /// <summary>
@@ -99,6 +109,51 @@ namespace WorkflowManagerAdministrationUtilities
                 textWriter.Close();
             }
         }
+
+        /// <summary>
+        /// Helper function to copy one of the workbook's files out of the local cache,
+        /// if it hasn't changed since it was cached.  Problems with the cache are
+        /// reported as warnings, and the workbook is then downloaded as usual.
+        /// </summary>
+        /// <param name="cache">The local cache</param>
+        /// <param name="cacheKey">The key identifying the file in the cache</param>
+        /// <param name="marker">The workbook's current change marker</param>
+        /// <param name="filePath">Full path to the file to be written</param>
+        /// <param name="msgs">Used to report any problems with the cache</param>
+        /// <returns>True if the file was read from the cache; false if it must be downloaded</returns>
+        private bool TryReadFromCache(Common.WmauArtifactCache cache, string cacheKey, string marker, string filePath, IGPMessages msgs)
+        {
+            try
+            {
+                return cache.TryGet(cacheKey, marker, filePath);
+            }
+            catch (Exception ex)
+            {
+                msgs.AddWarning("Could not read from the local cache; " + ex.Message);
+                return false;
+            }
+        }
+
+        /// <summary>
+        /// Helper function to add one of a newly-downloaded workbook's files to the
+        /// local cache
+        /// </summary>
+        /// <param name="cache">The local cache</param>
+        /// <param name="cacheKey">The key identifying the file in the cache</param>
+        /// <param name="marker">The workbook's change marker, as of the download</param>
+        /// <param name="filePath">Full path to the file; it is cached as empty if it wasn't written</param>
+        /// <param name="msgs">Used to report any problems with the cache</param>
+        private void AddToCache(Common.WmauArtifactCache cache, string cacheKey, string marker, string filePath, IGPMessages msgs)
+        {
+            try
+            {
+                cache.Put(cacheKey, marker, System.IO.File.Exists(filePath) ? filePath : null);
+            }
+            catch (Exception ex)
+            {
+                msgs.AddWarning("Could not add the workbook to the local cache; " + ex.Message);
+            }
+        }
         #endregion
 
         /// <summary>
@@ -139,6 +194,22 @@ namespace WorkflowManagerAdministrationUtilities
                 // Parameter for specifying the WMX database
                 m_parameters.Add(BuildWmxDbParameter());
 
+                // Parameter indicating whether an unchanged workbook can be read from
+                // the local cache rather than downloaded again
+                IGPCodedValueDomain cvDomain = new GPCodedValueDomainClass();
+                cvDomain.AddCode(GpTrue, C_OPT_USE_LOCAL_CACHE);
+                cvDomain.AddCode(GpFalse, C_OPT_NO_LOCAL_CACHE);
+
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_DTAM_USE_LOCAL_CACHE,
+                    C_PARAM_USE_LOCAL_CACHE,
+                    GpBooleanType,
+                    ToGpBoolean(C_DEFAULT_USE_LOCAL_CACHE));
+                paramEdit.Domain = cvDomain as IGPDomain;
+                m_parameters.Add(paramEdit);
+
                 return m_parameters;
             }
         }
@@ -197,17 +268,65 @@ namespace WorkflowManagerAdministrationUtilities
                 // Update the internal parameters used by this GP tool
                 string styleFileName = this.DetermineStyleFileName(this.m_xmlFilePath);
 
-                // Retrieve the TA workbook
-                IJTXConfiguration3 defaultDbReadonly = WmxDatabase.ConfigurationManager as IJTXConfiguration3;
-                IJTXTaskAssistantWorkflowRecord tamRecord = defaultDbReadonly.GetTaskAssistantWorkflowRecord(this.m_sourceName);
-
                 // Delete any existing workflow or style files that we're going to replace
                 this.DeleteFile(this.m_xmlFilePath);
                 this.DeleteFile(styleFileName);
 
-                // Save the TAM workbook data out to file
-                this.SaveStringToXmlFile(tamRecord.WorkflowXML, this.m_xmlFilePath);
-                this.SaveStringToXmlFile(tamRecord.StyleXML, styleFileName);
+                // If requested, copy the workbook's files out of the local cache instead,
+                // so long as the workbook hasn't changed since it was last downloaded
+                Common.WmauArtifactCache cache = null;
+                string workflowKey = null;
+                string styleKey = null;
+                string marker = null;
+                bool isCached = false;
+                if (m_useLocalCache)
+                {
+                    cache = new Common.WmauArtifactCache(Common.WmauArtifactCache.DefaultCachePath);
+                    workflowKey = Common.WmauArtifactCache.BuildKey(
+                        WmxDatabase.Alias, Common.WmauArtifactCache.C_TYPE_TAM_WORKFLOW, this.m_sourceName);
+                    styleKey = Common.WmauArtifactCache.BuildKey(
+                        WmxDatabase.Alias, Common.WmauArtifactCache.C_TYPE_TAM_STYLE, this.m_sourceName);
+                    marker = Common.WmauHelperFunctions.GetTamWorkbookChangeMarker(WmxDatabase, this.m_sourceName);
+                    if (marker == null)
+                    {
+                        msgs.AddWarning("Could not determine whether workbook '" + this.m_sourceName +
+                            "' has changed; it will be downloaded");
+                    }
+                    else
+                    {
+                        isCached =
+                            TryReadFromCache(cache, workflowKey, marker, this.m_xmlFilePath, msgs) &&
+                            TryReadFromCache(cache, styleKey, marker, styleFileName, msgs);
+                    }
+                }
+
+                if (isCached)
+                {
+                    msgs.AddMessage("Read workbook '" + this.m_sourceName + "' from the local cache");
+                }
+                else
+                {
+                    // Don't leave behind half of a cached workbook
+                    this.DeleteFile(this.m_xmlFilePath);
+                    this.DeleteFile(styleFileName);
+
+                    // Retrieve the TA workbook and save its data out to file
+                    IJTXConfiguration3 defaultDbReadonly = WmxDatabase.ConfigurationManager as IJTXConfiguration3;
+                    IJTXTaskAssistantWorkflowRecord tamRecord = defaultDbReadonly.GetTaskAssistantWorkflowRecord(this.m_sourceName);
+                    this.SaveStringToXmlFile(tamRecord.WorkflowXML, this.m_xmlFilePath);
+                    this.SaveStringToXmlFile(tamRecord.StyleXML, styleFileName);
+
+                    if (marker != null)
+                    {
+                        AddToCache(cache, workflowKey, marker, this.m_xmlFilePath, msgs);
+                        AddToCache(cache, styleKey, marker, styleFileName, msgs);
+                    }
+                }
+
+                if (cache != null && marker != null)
+                {
+                    msgs.AddMessage(cache.DescribeStatistics());
+                }
 
                 msgs.AddMessage(Properties.Resources.MSG_DONE);
             }
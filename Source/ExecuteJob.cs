@@ -229,7 +229,11 @@ namespace WorkflowManagerAdministrationUtilities
             try
             {
                 IJTXJobManager jobManager = this.WmxDatabase.JobManager;
-                IJTXWorkflowExecution3 jobExec = jobManager.GetJob(m_jobId) as IJTXWorkflowExecution3;
+                IJTXWorkflowExecution3 jobExec = null;
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_GET_JOB))
+                {
+                    jobExec = jobManager.GetJob(m_jobId) as IJTXWorkflowExecution3;
+                }
 
                 // Don't try to deal with the case of multiple active steps
                 int[] currentStepIds = jobExec.GetCurrentSteps();
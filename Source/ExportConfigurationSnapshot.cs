@@ -0,0 +1,218 @@
+﻿//Copyright 2015 Esri
+//Licensed under the Apache License, Version 2.0 (the "License");
+//you may not use this file except in compliance with the License.
+//You may obtain a copy of the License at
+//    http://www.apache.org/licenses/LICENSE-2.0
+//Unless required by applicable law or agreed to in writing, software
+//distributed under the License is distributed on an "AS IS" BASIS,
+//WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//See the License for the specific language governing permissions and
+//limitations under the License.​
+
+
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+
+using ESRI.ArcGIS.DataSourcesFile;
+using ESRI.ArcGIS.esriSystem;
+using ESRI.ArcGIS.Geodatabase;
+using ESRI.ArcGIS.Geoprocessing;
+using ESRI.ArcGIS.JTX;
+
+
+namespace WorkflowManagerAdministrationUtilities
+{
+    class ExportConfigurationSnapshot : WmauAbstractGpFunction
+    {
+        #region Constants
+        private const string C_PARAM_SNAPSHOT_FILE = "in_file_snapshotFile";
+        private const string C_PARAM_ONLY_IF_CHANGED = "in_bool_onlyIfChanged";
+        private const string C_PARAM_OUT_SNAPSHOT_UPDATED = "out_bool_snapshotUpdated";
+
+        private const string C_OPT_ONLY_IF_CHANGED = "ONLY_IF_CHANGED";
+        private const string C_OPT_ALWAYS_EXPORT = "ALWAYS_EXPORT";
+
+        private const bool C_DEFAULT_ONLY_IF_CHANGED = false;
+        #endregion
+
+        #region MemberVariables
+        private string m_snapshotFilePath = string.Empty;
+        private bool m_onlyIfChanged = C_DEFAULT_ONLY_IF_CHANGED;
+        #endregion
+
+        #region SimpleAccessors
+        public override string Name { get { return "ExportConfigurationSnapshot"; } }
+        public override string DisplayName { get { return Properties.Resources.TOOL_EXPORT_CONFIGURATION_SNAPSHOT; } }
+        public override string DisplayToolset { get { return Properties.Resources.CAT_WMX_DB_UTILS; } }
+        #endregion
+
+        #region Private helper functions
+        /// <summary>
+        /// Updates the internal values used by this tool based on the parameters from an input array
+        /// </summary>
+        /// <param name="paramValues"></param>
+        protected override void ExtractParameters(IArray paramValues)
+        {
+            // Get the values for any parameters common to all GP tools
+            ExtractParametersCommon(paramValues);
+
+            WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+            IGPParameter3 param = null;
+
+            param = paramMap.GetParam(C_PARAM_SNAPSHOT_FILE);
+            m_snapshotFilePath = param.Value.GetAsText();
+
+            param = paramMap.GetParam(C_PARAM_ONLY_IF_CHANGED);
+            m_onlyIfChanged = (param.Value as IGPBoolean).Value;
+        }
+        #endregion
+
+        /// <summary>
+        /// Required by IGPFunction2 interface.
+        /// </summary>
+        public override IArray ParameterInfo
+        {
+            get
+            {
+                m_parameters = new ArrayClass();
+
+                IGPParameterEdit3 paramEdit = null;
+                IGPCodedValueDomain cvDomain = null;
+
+                // Snapshot file parameter (path to the snapshot file, which may already exist)
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeRequired,
+                    Properties.Resources.DESC_ECS_SNAPSHOT_FILE,
+                    C_PARAM_SNAPSHOT_FILE,
+                    new DEFileTypeClass() as IGPDataType,
+                    null);
+                m_parameters.Add(paramEdit);
+
+                // Optional parameter indicating whether an existing snapshot should be left
+                // alone if the configuration hasn't changed since it was taken
+                cvDomain = new GPCodedValueDomainClass();
+                cvDomain.AddCode(GpTrue, C_OPT_ONLY_IF_CHANGED);
+                cvDomain.AddCode(GpFalse, C_OPT_ALWAYS_EXPORT);
+
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_ECS_ONLY_IF_CHANGED,
+                    C_PARAM_ONLY_IF_CHANGED,
+                    GpBooleanType,
+                    ToGpBoolean(C_DEFAULT_ONLY_IF_CHANGED));
+                paramEdit.Domain = cvDomain as IGPDomain;
+                m_parameters.Add(paramEdit);
+
+                // Parameter for specifying the WMX database
+                m_parameters.Add(BuildWmxDbParameter());
+
+                // Parameter indicating whether the snapshot was written
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionOutput,
+                    esriGPParameterType.esriGPParameterTypeDerived,
+                    Properties.Resources.DESC_ECS_OUT_SNAPSHOT_UPDATED,
+                    C_PARAM_OUT_SNAPSHOT_UPDATED,
+                    GpBooleanType,
+                    null);
+                m_parameters.Add(paramEdit);
+
+                return m_parameters;
+            }
+        }
+
+        /// <summary>
+        /// Required by IGPFunction2 interface; this function is called when the GP tool is ready to be executed.
+        /// </summary>
+        /// <param name="paramValues"></param>
+        /// <param name="trackCancel"></param>
+        /// <param name="envMgr"></param>
+        /// <param name="msgs"></param>
+        public override void Execute(IArray paramValues, ITrackCancel trackCancel, IGPEnvironmentManager envMgr, IGPMessages msgs)
+        {
+            // Do some common error-checking
+            base.Execute(paramValues, trackCancel, envMgr, msgs);
+
+            try
+            {
+                // Ensure that the current user has admin access to the current Workflow Manager DB
+                if (!CurrentUserIsWmxAdministrator())
+                {
+                    throw new WmauException(WmauErrorCodes.C_USER_NOT_ADMIN_ERROR);
+                }
+
+                // The stamp is computed before the configuration is read, so that anything
+                // changed while the snapshot is being taken makes the snapshot look stale
+                string missingTableName = null;
+                string stamp = Common.WmauHelperFunctions.ComputeConfigurationStamp(this.WmxDatabase, out missingTableName);
+                if (stamp == null)
+                {
+                    msgs.AddWarning("Could not compute a stamp for the configuration (table '" + missingTableName +
+                        "' not found); the snapshot will always be treated as out of date");
+                }
+
+                bool snapshotUpdated = false;
+                string previousStamp = Common.WmauConfigSnapshot.ReadStamp(m_snapshotFilePath, this.WmxDatabase.Alias);
+                if (m_onlyIfChanged && stamp != null && stamp.Equals(previousStamp))
+                {
+                    msgs.AddMessage("The configuration has not changed since the snapshot was taken");
+                }
+                else
+                {
+                    msgs.AddMessage("Reading configuration from Workflow Manager database...");
+                    Common.WmauConfigSnapshot snapshot = Common.WmauConfigSnapshot.Read(this.WmxDatabase, stamp);
+
+                    msgs.AddMessage("Saving snapshot to file...");
+                    snapshot.Save(m_snapshotFilePath);
+                    msgs.AddMessage(snapshot.Summary);
+                    snapshotUpdated = true;
+                }
+
+                // Update the output parameter
+                WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+                IGPParameterEdit3 outParamEdit = paramMap.GetParamEdit(C_PARAM_OUT_SNAPSHOT_UPDATED);
+                outParamEdit.Value = ToGpBoolean(snapshotUpdated);
+
+                msgs.AddMessage(Properties.Resources.MSG_DONE);
+            }
+            catch (System.IO.IOException ioEx)
+            {
+                try
+                {
+                    WmauError error = new WmauError(WmauErrorCodes.C_FILE_ACCESS_ERROR);
+                    msgs.AddError(error.ErrorCodeAsInt, error.Message + "; " + ioEx.Message);
+                }
+                catch
+                {
+                    // Catch anything else that possibly happens
+                }
+            }
+            catch (WmauException wmEx)
+            {
+                try
+                {
+                    msgs.AddError(wmEx.ErrorCodeAsInt, wmEx.Message);
+                }
+                catch
+                {
+                    // Catch anything else that possibly happens
+                }
+            }
+            catch (Exception ex)
+            {
+                try
+                {
+                    WmauError error = new WmauError(WmauErrorCodes.C_CONFIG_SNAPSHOT_ERROR);
+                    msgs.AddError(error.ErrorCodeAsInt, error.Message + "; " + ex.Message);
+                }
+                catch
+                {
+                    // Catch anything else that possibly happens
+                }
+            }
+        }
+    }
+}
@@ -0,0 +1,562 @@
+﻿//Copyright 2015 Esri
+//Licensed under the Apache License, Version 2.0 (the "License");
+//you may not use this file except in compliance with the License.
+//You may obtain a copy of the License at
+//    http://www.apache.org/licenses/LICENSE-2.0
+//Unless required by applicable law or agreed to in writing, software
+//distributed under the License is distributed on an "AS IS" BASIS,
+//WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//See the License for the specific language governing permissions and
+//limitations under the License.​
+
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
+using System.Text;
+
+using ESRI.ArcGIS.ADF;
+using ESRI.ArcGIS.esriSystem;
+using ESRI.ArcGIS.Geodatabase;
+using ESRI.ArcGIS.Geoprocessing;
+using ESRI.ArcGIS.JTX;
+using ESRI.ArcGIS.JTX.Utilities;
+
+
+namespace WorkflowManagerAdministrationUtilities
+{
+    /// <summary>
+    /// GP tool to export the jobs in a Workflow Manager database for offline
+    /// analysis.<br/>
+    /// <br/>
+    /// The JTX_JOBS table is read directly, once, using a recycling cursor over
+    /// only those fields being exported.  Each field is written to its own NumPy
+    /// ".npy" file, which can be memory-mapped by the "AnalyzeJobExport.py"
+    /// utility script; text fields are dictionary-encoded, with the distinct
+    /// values written to a separate text file.  A CSV file containing the same
+    /// information is also written, for use in other applications.
+    /// </summary>
+    class ExportJobsForAnalysis : WmauAbstractGpFunction
+    {
+        #region Helper classes
+        /// <summary>
+        /// The ways in which a field can be written to the export
+        /// </summary>
+        private enum ColumnKind
+        {
+            Integer,
+            Text,
+            Date
+        }
+
+        /// <summary>
+        /// Helper class used to track the output for a single field
+        /// </summary>
+        private class ExportColumn
+        {
+            public string FieldName = string.Empty;
+            public ColumnKind Kind = ColumnKind.Integer;
+            public int FieldIndex = -1;
+            public Common.WmauNpyWriter Writer = null;
+
+            // Used to translate integer codes (ex: a status ID) into the text
+            // that is written to the export
+            public Dictionary<int, string> Lookup = null;
+
+            // The distinct values of a text field, and the code assigned to each
+            public Dictionary<string, int> Codes = new Dictionary<string, int>();
+            public List<string> Values = new List<string>();
+
+            public ExportColumn(string fieldName, ColumnKind kind, Dictionary<int, string> lookup)
+            {
+                this.FieldName = fieldName;
+                this.Kind = kind;
+                this.Lookup = lookup;
+            }
+
+            /// <summary>
+            /// Gets the dictionary code for a text value, adding the value to the
+            /// dictionary if it hasn't been seen before
+            /// </summary>
+            /// <param name="value">The value to encode</param>
+            /// <returns>The value's code</returns>
+            public int Encode(string value)
+            {
+                int code = 0;
+                if (!this.Codes.TryGetValue(value, out code))
+                {
+                    code = this.Values.Count;
+                    this.Codes[value] = code;
+                    this.Values.Add(value);
+                }
+                return code;
+            }
+        }
+        #endregion
+
+        #region Constants
+        private const string C_PARAM_JOBS_TABLE = "in_table_jobsTable";
+        private const string C_PARAM_SQL_QUERY_FILTER = "in_string_sqlQueryFilter";
+        private const string C_PARAM_OUT_EXPORT_FOLDER = "out_folder_exportFolder";
+        private const string C_PARAM_NUM_JOBS_EXPORTED = "out_long_numJobsExported";
+
+        private const string C_FIELD_STATUS = "STATUS";
+        private const string C_FIELD_PRIORITY = "PRIORITY";
+        private const string C_FIELD_ASSIGNED_TO = "ASSIGNED_TO";
+        private const string C_FIELD_ASSIGNED_TYPE = "ASSIGNED_TYPE";
+        private const string C_FIELD_CREATED_BY = "CREATED_BY";
+        private const string C_FIELD_CREATED_DATE = "CREATED_DATE";
+        private const string C_FIELD_START_DATE = "START_DATE";
+        private const string C_FIELD_DUE_DATE = "DUE_DATE";
+        private const string C_FIELD_END_DATE = "END_DATE";
+        private const string C_FIELD_PARENT_JOB = "PARENT_JOB";
+        private const string C_FIELD_DATA_WORKSPACE_ID = "DATA_WORKSPACE_ID";
+
+        private const string C_FILE_CSV = "jobs.csv";
+        private const string C_FILE_MANIFEST = "manifest.txt";
+        private const string C_EXT_ARRAY = ".npy";
+        private const string C_EXT_DICTIONARY = ".dict.txt";
+
+        private const string C_KIND_INTEGER = "int32";
+        private const string C_KIND_TEXT = "text";
+        private const string C_KIND_DATE = "datetime";
+        private const string C_DATE_FORMAT = "yyyy-MM-ddTHH:mm:ss";
+
+        // Integer value written for null integer fields, and the code written for
+        // null text fields
+        private const int C_NULL_VALUE = -1;
+
+        private const int C_PROGRESS_INTERVAL = 10000;
+        #endregion
+
+        #region MemberVariables
+        private string m_sqlQuery = string.Empty;
+        private string m_exportFolder = string.Empty;
+        private int m_numJobsExported = 0;
+        #endregion
+
+        #region SimpleAccessors
+        public override string Name { get { return "ExportJobsForAnalysis"; } }
+        public override string DisplayName { get { return Properties.Resources.TOOL_EXPORT_JOBS_FOR_ANALYSIS; } }
+        public override string DisplayToolset { get { return Properties.Resources.CAT_JOB_UTILS; } }
+        #endregion
+
+        #region Private helper functions
+        /// <summary>
+        /// Updates the internal values used by this tool based on the parameters from an input array
+        /// </summary>
+        /// <param name="paramValues"></param>
+        protected override void ExtractParameters(IArray paramValues)
+        {
+            // Get the values for any parameters common to all GP tools
+            ExtractParametersCommon(paramValues);
+
+            WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+            IGPParameter3 param = null;
+
+            // Update the internal values of whatever parameters we're maintaining
+            param = paramMap.GetParam(C_PARAM_SQL_QUERY_FILTER);
+            m_sqlQuery = param.Value == null ? string.Empty : param.Value.GetAsText();
+
+            param = paramMap.GetParam(C_PARAM_OUT_EXPORT_FOLDER);
+            m_exportFolder = param.Value.GetAsText();
+        }
+
+        /// <summary>
+        /// Builds a lookup from the values of an enumeration to their names
+        /// </summary>
+        /// <param name="enumType">The enumeration type</param>
+        /// <param name="prefix">A prefix to remove from each name, if present</param>
+        /// <returns>The lookup table</returns>
+        private Dictionary<int, string> BuildEnumLookup(Type enumType, string prefix)
+        {
+            Dictionary<int, string> lookup = new Dictionary<int, string>();
+            foreach (object value in Enum.GetValues(enumType))
+            {
+                string name = value.ToString();
+                if (name.StartsWith(prefix) && name.Length > prefix.Length)
+                {
+                    name = name.Substring(prefix.Length);
+                }
+                lookup[Convert.ToInt32(value)] = name;
+            }
+            return lookup;
+        }
+
+        /// <summary>
+        /// Builds the list of fields to be exported from the JTX_JOBS table
+        /// </summary>
+        /// <returns>The columns to be exported, in the order in which they will appear</returns>
+        private List<ExportColumn> BuildColumns()
+        {
+            IJTXConfiguration3 configMgr = this.WmxDatabase.ConfigurationManager as IJTXConfiguration3;
+
+            // Job types and statuses are stored by ID; export their names instead
+            Dictionary<int, string> jobTypeNames = new Dictionary<int, string>();
+            IJTXJobTypeSet allJobTypes = configMgr.JobTypes;
+            for (int i = 0; i < allJobTypes.Count; i++)
+            {
+                IJTXJobType3 jobType = allJobTypes.get_Item(i) as IJTXJobType3;
+                jobTypeNames[jobType.ID] = jobType.Name;
+            }
+
+            Dictionary<int, string> statusNames = new Dictionary<int, string>();
+            IJTXStatusSet allStatusTypes = configMgr.Statuses;
+            for (int i = 0; i < allStatusTypes.Count; i++)
+            {
+                IJTXStatus2 statusType = allStatusTypes.get_Item(i) as IJTXStatus2;
+                statusNames[statusType.ID] = statusType.Name;
+            }
+
+            List<ExportColumn> columns = new List<ExportColumn>();
+            columns.Add(new ExportColumn(Constants.FIELD_JOBID, ColumnKind.Integer, null));
+            columns.Add(new ExportColumn(Constants.FIELD_JOBTYPEID, ColumnKind.Text, jobTypeNames));
+            columns.Add(new ExportColumn(C_FIELD_STATUS, ColumnKind.Text, statusNames));
+            columns.Add(new ExportColumn(Constants.FIELD_STAGE, ColumnKind.Text, BuildEnumLookup(typeof(jtxJobStage), "jtxJobStage")));
+            columns.Add(new ExportColumn(C_FIELD_PRIORITY, ColumnKind.Integer, null));
+            columns.Add(new ExportColumn(C_FIELD_ASSIGNED_TYPE, ColumnKind.Text, BuildEnumLookup(typeof(jtxAssignmentType), "jtxAssignmentType")));
+            columns.Add(new ExportColumn(C_FIELD_ASSIGNED_TO, ColumnKind.Text, null));
+            columns.Add(new ExportColumn(C_FIELD_CREATED_BY, ColumnKind.Text, null));
+            columns.Add(new ExportColumn(C_FIELD_CREATED_DATE, ColumnKind.Date, null));
+            columns.Add(new ExportColumn(C_FIELD_START_DATE, ColumnKind.Date, null));
+            columns.Add(new ExportColumn(C_FIELD_DUE_DATE, ColumnKind.Date, null));
+            columns.Add(new ExportColumn(C_FIELD_END_DATE, ColumnKind.Date, null));
+            columns.Add(new ExportColumn(C_FIELD_PARENT_JOB, ColumnKind.Integer, null));
+            columns.Add(new ExportColumn(C_FIELD_DATA_WORKSPACE_ID, ColumnKind.Text, null));
+
+            return columns;
+        }
+
+        /// <summary>
+        /// Quotes a value for inclusion in a CSV file, if necessary
+        /// </summary>
+        /// <param name="value">The value to be written</param>
+        /// <returns>The value, quoted and escaped as needed</returns>
+        private string EscapeCsvValue(string value)
+        {
+            if (value.IndexOfAny(new char[] { ',', '"', '\r', '\n' }) >= 0)
+            {
+                return "\"" + value.Replace("\"", "\"\"") + "\"";
+            }
+            return value;
+        }
+
+        /// <summary>
+        /// Writes a single value from a row of the JTX_JOBS table to the export
+        /// </summary>
+        /// <param name="column">The column being written</param>
+        /// <param name="value">The value from the row</param>
+        /// <returns>The value as it should appear in the CSV file</returns>
+        private string ExportValue(ExportColumn column, object value)
+        {
+            bool isNull = value == null || value is DBNull;
+            int intValue = C_NULL_VALUE;
+
+            if (column.Kind == ColumnKind.Date)
+            {
+                if (isNull)
+                {
+                    column.Writer.Write(Common.WmauNpyWriter.C_NOT_A_TIME);
+                    return string.Empty;
+                }
+
+                DateTime date = Convert.ToDateTime(value);
+                TimeSpan sinceEpoch = date - new DateTime(1970, 1, 1);
+                column.Writer.Write(sinceEpoch.Ticks / TimeSpan.TicksPerSecond);
+                return date.ToString(C_DATE_FORMAT);
+            }
+
+            // Some fields (ex: STAGE) may be stored as text in some databases, so
+            // parse the integer from the text in all cases
+            string textValue = isNull ? string.Empty : value.ToString().Trim();
+            bool isInteger = !isNull && int.TryParse(textValue, out intValue);
+
+            if (column.Kind == ColumnKind.Integer)
+            {
+                column.Writer.Write(isInteger ? intValue : C_NULL_VALUE);
+                return isInteger ? intValue.ToString() : string.Empty;
+            }
+
+            if (isNull)
+            {
+                column.Writer.Write(C_NULL_VALUE);
+                return string.Empty;
+            }
+
+            // Translate IDs into names where possible; any ID that can't be
+            // translated is exported as-is
+            string name = null;
+            if (column.Lookup != null && isInteger && column.Lookup.TryGetValue(intValue, out name))
+            {
+                textValue = name;
+            }
+
+            // Each value must fit on a single line of the dictionary file
+            textValue = textValue.Replace("\r", " ").Replace("\n", " ");
+            column.Writer.Write(column.Encode(textValue));
+            return textValue;
+        }
+
+        /// <summary>
+        /// Reads the matching rows from the JTX_JOBS table, writing them to the
+        /// export folder
+        /// </summary>
+        /// <param name="columns">The columns to be exported</param>
+        /// <param name="trackCancel">The cancel tracker for this tool</param>
+        /// <param name="msgs">The GP messages object for this tool</param>
+        private void ExportJobs(List<ExportColumn> columns, ITrackCancel trackCancel, IGPMessages msgs)
+        {
+            IFeatureWorkspace featureWorkspace = this.WmxDatabase.JTXWorkspace as IFeatureWorkspace;
+
+            // Declare some of these ComReleaser objects to help ensure that cursors, etc., are
+            // immediately released after they go out of scope.
+            using (ComReleaser cr1 = new ComReleaser(), cr2 = new ComReleaser())
+            {
+                // Get the name of the correct table from the jobs workspace, so
+                // that the table doesn't have to be owned by the connecting user.
+                string tableName = Common.WmauHelperFunctions.GetQualifiedTableName(Constants.JTX_TABLE_JTX_JOBS_TABLE, this.WmxDatabase.JTXWorkspace);
+
+                ITable jobsTable = featureWorkspace.OpenTable(tableName);
+                cr1.ManageLifetime(jobsTable);
+
+                // Not every version of the schema has every field; skip any that are missing
+                for (int i = columns.Count - 1; i >= 0; i--)
+                {
+                    if (jobsTable.FindField(columns[i].FieldName) < 0)
+                    {
+                        msgs.AddWarning("Field '" + columns[i].FieldName + "' not found in " + tableName + "; skipping");
+                        columns.RemoveAt(i);
+                    }
+                }
+
+                // Create the array files only for the fields that remain; the caller
+                // closes them once the export is finished
+                foreach (ExportColumn column in columns)
+                {
+                    column.Writer = new Common.WmauNpyWriter(
+                        Path.Combine(m_exportFolder, column.FieldName + C_EXT_ARRAY),
+                        column.Kind == ColumnKind.Date ? Common.WmauNpyWriter.C_DTYPE_DATETIME64_SECONDS : Common.WmauNpyWriter.C_DTYPE_INT32);
+                }
+
+                // Only retrieve the fields being exported, and reuse the same row
+                // object for each record
+                List<string> fieldNames = new List<string>();
+                foreach (ExportColumn column in columns)
+                {
+                    fieldNames.Add(column.FieldName);
+                }
+
+                IQueryFilter query = new QueryFilterClass();
+                IQueryFilterDefinition queryDef = query as IQueryFilterDefinition;
+                query.SubFields = string.Join(",", fieldNames);
+                query.WhereClause = m_sqlQuery;
+                queryDef.PostfixClause = "ORDER BY " + Constants.FIELD_JOBID;
+
+                ICursor searchCursor = jobsTable.Search(query, true);
+                cr2.ManageLifetime(searchCursor);
+
+                foreach (ExportColumn column in columns)
+                {
+                    column.FieldIndex = searchCursor.FindField(column.FieldName);
+                }
+
+                using (StreamWriter csvWriter = new StreamWriter(Path.Combine(m_exportFolder, C_FILE_CSV), false, Encoding.UTF8))
+                {
+                    csvWriter.WriteLine(string.Join(",", fieldNames));
+
+                    string[] csvValues = new string[columns.Count];
+                    IRow row = null;
+                    while ((row = searchCursor.NextRow()) != null)
+                    {
+                        for (int i = 0; i < columns.Count; i++)
+                        {
+                            csvValues[i] = EscapeCsvValue(ExportValue(columns[i], row.get_Value(columns[i].FieldIndex)));
+                        }
+                        csvWriter.WriteLine(string.Join(",", csvValues));
+                        m_numJobsExported++;
+
+                        if (m_numJobsExported % C_PROGRESS_INTERVAL == 0)
+                        {
+                            msgs.AddMessage("  Exported " + m_numJobsExported.ToString() + " job(s)");
+                            if (trackCancel != null && !trackCancel.Continue())
+                            {
+                                msgs.AddWarning("Cancelled; the export contains only the first " + m_numJobsExported.ToString() + " job(s)");
+                                break;
+                            }
+                        }
+                    }
+                }
+            }
+        }
+
+        /// <summary>
+        /// Writes the files describing the columns in the export
+        /// </summary>
+        /// <param name="columns">The columns that were exported</param>
+        private void WriteManifest(List<ExportColumn> columns)
+        {
+            using (StreamWriter manifestWriter = new StreamWriter(Path.Combine(m_exportFolder, C_FILE_MANIFEST), false, Encoding.UTF8))
+            {
+                foreach (ExportColumn column in columns)
+                {
+                    string kind = C_KIND_INTEGER;
+                    if (column.Kind == ColumnKind.Text)
+                    {
+                        kind = C_KIND_TEXT;
+                        File.WriteAllLines(Path.Combine(m_exportFolder, column.FieldName + C_EXT_DICTIONARY), column.Values, Encoding.UTF8);
+                    }
+                    else if (column.Kind == ColumnKind.Date)
+                    {
+                        kind = C_KIND_DATE;
+                    }
+                    manifestWriter.WriteLine(column.FieldName + "\t" + kind);
+                }
+            }
+        }
+        #endregion
+
+        /// <summary>
+        /// Required by IGPFunction2 interface.
+        /// </summary>
+        public override IArray ParameterInfo
+        {
+            get
+            {
+                m_parameters = new ArrayClass();
+                IGPParameterEdit3 paramEdit = null;
+
+                // Dummy "table" parameter, used to populate the SQL query dialog
+                GPTableViewClass tableView = new GPTableViewClass();
+                IGPParameterEdit3 jobsTableLocation = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeRequired,
+                    String.Format(Properties.Resources.DESC_EJFA_JOBS_TABLE_1, Constants.JTX_TABLE_JTX_JOBS_TABLE),
+                    C_PARAM_JOBS_TABLE,
+                    tableView.DataType,
+                    tableView as IGPValue);
+                m_parameters.Add(jobsTableLocation);
+
+                // Optional SQL query filter; if not specified, all jobs are exported
+                GPSQLExpressionClass expression = new GPSQLExpressionClass();
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    String.Format(Properties.Resources.DESC_EJFA_SQL_QUERY_FILTER_1, Constants.JTX_TABLE_JTX_JOBS_TABLE),
+                    C_PARAM_SQL_QUERY_FILTER,
+                    expression.DataType,
+                    expression as IGPValue);
+                paramEdit.AddDependency((jobsTableLocation as IGPParameter3).Name);
+                m_parameters.Add(paramEdit);
+
+                // Folder into which the exported files will be written
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionOutput,
+                    esriGPParameterType.esriGPParameterTypeRequired,
+                    Properties.Resources.DESC_EJFA_EXPORT_FOLDER,
+                    C_PARAM_OUT_EXPORT_FOLDER,
+                    new DEFolderTypeClass(),
+                    null);
+                m_parameters.Add(paramEdit);
+
+                // Parameter for specifying the WMX database
+                m_parameters.Add(BuildWmxDbParameter());
+
+                // Parameter indicating the number of jobs exported
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionOutput,
+                    esriGPParameterType.esriGPParameterTypeDerived,
+                    Properties.Resources.DESC_EJFA_NUM_JOBS_EXPORTED,
+                    C_PARAM_NUM_JOBS_EXPORTED,
+                    new GPLongTypeClass(),
+                    null);
+                m_parameters.Add(paramEdit);
+
+                return m_parameters;
+            }
+        }
+
+        /// <summary>
+        /// Required by IGPFunction2 interface; this function is called when the GP tool is ready to be executed.
+        /// </summary>
+        /// <param name="paramValues"></param>
+        /// <param name="trackCancel"></param>
+        /// <param name="envMgr"></param>
+        /// <param name="msgs"></param>
+        public override void Execute(IArray paramValues, ITrackCancel trackCancel, IGPEnvironmentManager envMgr, IGPMessages msgs)
+        {
+            // Do some common error-checking
+            base.Execute(paramValues, trackCancel, envMgr, msgs);
+
+            m_numJobsExported = 0;
+
+            try
+            {
+                if (!Directory.Exists(m_exportFolder))
+                {
+                    Directory.CreateDirectory(m_exportFolder);
+                }
+
+                List<ExportColumn> columns = BuildColumns();
+
+                System.Diagnostics.Stopwatch timer = System.Diagnostics.Stopwatch.StartNew();
+                try
+                {
+                    ExportJobs(columns, trackCancel, msgs);
+                }
+                finally
+                {
+                    // Closing the writers records the final length of each array
+                    foreach (ExportColumn column in columns)
+                    {
+                        if (column.Writer != null)
+                        {
+                            column.Writer.Dispose();
+                        }
+                    }
+                }
+                WriteManifest(columns);
+                timer.Stop();
+
+                msgs.AddMessage("Exported " + m_numJobsExported.ToString() + " job(s) to " + m_exportFolder);
+                double seconds = timer.Elapsed.TotalSeconds;
+                if (seconds > 0)
+                {
+                    msgs.AddMessage(String.Format("Exported {0} job(s) in {1:0.0} seconds ({2:0.0} jobs/sec)",
+                        m_numJobsExported, seconds, m_numJobsExported / seconds));
+                }
+
+                // Set the output parameters
+                WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+                IGPParameterEdit3 outParamEdit = paramMap.GetParamEdit(C_PARAM_NUM_JOBS_EXPORTED);
+                IGPLong outValue = new GPLongClass();
+                outValue.Value = m_numJobsExported;
+                outParamEdit.Value = outValue as IGPValue;
+
+                msgs.AddMessage(Properties.Resources.MSG_DONE);
+            }
+            catch (WmauException wmEx)
+            {
+                try
+                {
+                    msgs.AddError(wmEx.ErrorCodeAsInt, wmEx.Message);
+                }
+                catch
+                {
+                    // Catch anything else that possibly happens
+                }
+            }
+            catch (Exception ex)
+            {
+                try
+                {
+                    WmauError error = new WmauError(WmauErrorCodes.C_JOB_EXPORT_ERROR);
+                    msgs.AddError(error.ErrorCodeAsInt, error.Message + "; " + ex.Message);
+                }
+                catch
+                {
+                    // Catch anything else that possibly happens
+                }
+            }
+        }
+    }
+}
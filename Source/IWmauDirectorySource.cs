@@ -0,0 +1,40 @@
+﻿//Copyright 2015 Esri
+//Licensed under the Apache License, Version 2.0 (the "License");
+//you may not use this file except in compliance with the License.
+//You may obtain a copy of the License at
+//    http://www.apache.org/licenses/LICENSE-2.0
+//Unless required by applicable law or agreed to in writing, software
+//distributed under the License is distributed on an "AS IS" BASIS,
+//WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//See the License for the specific language governing permissions and
+//limitations under the License.​
+
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+
+
+namespace WorkflowManagerAdministrationUtilities.Common
+{
+    /// <summary>
+    /// A source of the users and groups with which a Workflow Manager database is
+    /// synchronized (see WmauDirectorySync).  The Workflow Manager users are the
+    /// members of one directory group, including the members of any groups nested
+    /// within it; the Workflow Manager groups are the groups that belong to a
+    /// second directory group.
+    /// </summary>
+    interface IWmauDirectorySource
+    {
+        /// <summary>
+        /// Reads the users and groups from the directory
+        /// </summary>
+        /// <param name="userGroup">The group whose members are the Workflow Manager users</param>
+        /// <param name="groupGroup">The group whose member groups are the Workflow Manager groups</param>
+        /// <returns>
+        /// The users and groups; a group's members include only those users that
+        /// belong to the user group
+        /// </returns>
+        WmauDirectoryContents GetContents(string userGroup, string groupGroup);
+    }
+}
@@ -31,17 +31,24 @@ namespace WorkflowManagerAdministrationUtilities
         private const string C_PARAM_PRESERVE_CURRENT_USER = "in_bool_preserveCurrentUser";
         private const string C_PARAM_OUT_NUM_USERS = "out_long_numberOfUsers";
         private const string C_PARAM_OUT_NUM_GROUPS = "out_long_numberOfGroups";
+        private const string C_PARAM_SYNC_CHANGES_ONLY = "in_bool_syncChangesOnly";
+        private const string C_PARAM_DIRECTORY_FILE = "in_file_directoryFile";
 
         private const string C_OPT_PRESERVE_USER = "PRESERVE";
         private const string C_OPT_DO_NOT_PRESERVE_USER = "NO_PRESERVE";
+        private const string C_OPT_SYNC_CHANGES_ONLY = "SYNC_CHANGES_ONLY";
+        private const string C_OPT_FULL_IMPORT = "FULL_IMPORT";
 
         private const bool C_DEFAULT_PRESERVE_CURRENT_USER = false;
+        private const bool C_DEFAULT_SYNC_CHANGES_ONLY = false;
         #endregion
 
         #region MemberVariables
         private string m_userGroup = string.Empty;
         private string m_groupGroup = string.Empty;
         private bool m_preserveCurrentUser = C_DEFAULT_PRESERVE_CURRENT_USER;
+        private bool m_syncChangesOnly = C_DEFAULT_SYNC_CHANGES_ONLY;
+        private string m_directoryFilePath = string.Empty;
         #endregion
 
         #region SimpleAccessors
@@ -72,6 +79,149 @@ namespace WorkflowManagerAdministrationUtilities
 
             param = paramMap.GetParam(C_PARAM_PRESERVE_CURRENT_USER);
             m_preserveCurrentUser = (param.Value as IGPBoolean).Value;
+
+            param = paramMap.GetParam(C_PARAM_SYNC_CHANGES_ONLY);
+            m_syncChangesOnly = (param.Value as IGPBoolean).Value;
+
+            param = paramMap.GetParam(C_PARAM_DIRECTORY_FILE);
+            m_directoryFilePath = param.Value.GetAsText();
+        }
+
+        /// <summary>
+        /// Imports the users and groups from the AD using the Workflow Manager
+        /// libraries, which rewrite every user and group in the database
+        /// </summary>
+        /// <param name="username">The name of the user running the tool</param>
+        /// <param name="msgs">The GP messages object for this tool</param>
+        /// <param name="numUsers">The number of users imported</param>
+        /// <param name="numGroups">The number of groups imported</param>
+        private void ImportAllUsersAndGroups(string username, IGPMessages msgs, out int numUsers, out int numGroups)
+        {
+            // Stash away the executing user's information, if appropriate
+            IJTXConfiguration3 configMgr = this.WmxDatabase.ConfigurationManager as IJTXConfiguration3;
+            IJTXUser3 executingUser = null;
+            using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_GET_USER))
+            {
+                executingUser = configMgr.GetUser(username) as IJTXUser3;
+            }
+
+            // Import the AD information
+            string domain = System.Environment.UserDomainName;
+            string domainUsername = string.Empty;
+            string domainPassword = string.Empty;
+            ActiveDirectoryHelper.SyncronizeJTXDatabaseWithActiveDirectory(this.WmxDatabase, domain, domainUsername, domainPassword, m_userGroup, m_groupGroup, out numGroups, out numUsers);
+
+            // If the tool was set to preserve the current user's account and the user
+            // was removed from the DB, then re-add their account
+            if (configMgr.GetUser(username) == null)
+            {
+                if (m_preserveCurrentUser)
+                {
+                    IJTXConfigurationEdit2 configEdit = this.WmxDatabase.ConfigurationManager as IJTXConfigurationEdit2;
+                    IJTXUserConfig newUser = configEdit.CreateUser() as IJTXUserConfig;
+                    newUser.FirstName_2 = executingUser.FirstName;
+                    newUser.FullName_2 = executingUser.FullName;
+                    newUser.LastName_2 = executingUser.LastName;
+                    newUser.UserName_2 = executingUser.UserName;
+                    (newUser as IJTXUser3).IsAdministrator = executingUser.IsAdministrator;
+                    using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_STORE))
+                    {
+                        newUser.Store();
+                    }
+
+                    msgs.AddMessage("User '" + username + "' not found in Active Directory group '" + m_userGroup + "'; re-added placeholder to Workflow Manager database");
+                }
+                else
+                {
+                    msgs.AddWarning("User '" + username + "' removed from Workflow Manager database");
+                }
+            }
+        }
+
+        /// <summary>
+        /// Compares the users and groups in the AD (or the directory file) with those
+        /// in the Workflow Manager database, and only writes the differences
+        /// </summary>
+        /// <param name="username">The name of the user running the tool</param>
+        /// <param name="msgs">The GP messages object for this tool</param>
+        /// <param name="numUsers">The number of users in the AD group</param>
+        /// <param name="numGroups">The number of groups in the AD group</param>
+        private void SyncChangedUsersAndGroups(string username, IGPMessages msgs, out int numUsers, out int numGroups)
+        {
+            // Work out which users and groups should be in the database
+            Common.IWmauDirectorySource directory = null;
+            if (!string.IsNullOrEmpty(m_directoryFilePath))
+            {
+                directory = new Common.WmauDirectoryFileSource(m_directoryFilePath);
+            }
+            else
+            {
+                string domain = System.Environment.UserDomainName;
+                string domainUsername = string.Empty;
+                string domainPassword = string.Empty;
+                string namePrefix = ESRI.ArcGIS.JTXUI.ConfigurationCache.UseUserDomain ? domain + "\\" : string.Empty;
+                directory = new Common.WmauActiveDirectorySource(domain, domainUsername, domainPassword, namePrefix);
+            }
+            Common.WmauDirectoryContents directoryContents = directory.GetContents(m_userGroup, m_groupGroup);
+            numUsers = directoryContents.Users.Count;
+            numGroups = directoryContents.Groups.Count;
+
+            // Compare them against what's there now, only touching what has changed.
+            // If the tool was set to preserve the current user's account, then it's
+            // simply left in place.
+            IJTXConfiguration3 configMgr = this.WmxDatabase.ConfigurationManager as IJTXConfiguration3;
+            Common.WmauDirectorySync sync = new Common.WmauDirectorySync(
+                Common.WmauDirectorySync.ReadWorkflowManagerContents(configMgr),
+                directoryContents,
+                m_preserveCurrentUser ? username : null);
+
+            foreach (Common.WmauDirectoryContents.UserInfo user in sync.UsersToAdd)
+            {
+                msgs.AddMessage("Adding user '" + user.UserName + "'");
+            }
+            foreach (Common.WmauDirectoryContents.UserInfo user in sync.UsersToUpdate)
+            {
+                msgs.AddMessage("Updating user '" + user.UserName + "'");
+            }
+            foreach (string groupName in sync.GroupsToAdd)
+            {
+                msgs.AddMessage("Adding group '" + groupName + "'");
+            }
+            foreach (KeyValuePair<string, string> member in sync.MembersToAdd)
+            {
+                msgs.AddMessage("Adding user '" + member.Value + "' to group '" + member.Key + "'");
+            }
+            foreach (KeyValuePair<string, string> member in sync.MembersToRemove)
+            {
+                msgs.AddMessage("Removing user '" + member.Value + "' from group '" + member.Key + "'");
+            }
+            foreach (string groupName in sync.GroupsToRemove)
+            {
+                msgs.AddMessage("Removing group '" + groupName + "'");
+            }
+            foreach (string userName in sync.UsersToRemove)
+            {
+                msgs.AddMessage("Removing user '" + userName + "'");
+            }
+
+            sync.Apply(this.WmxDatabase.ConfigurationManager as IJTXConfigurationEdit2);
+
+            if (!directoryContents.Users.ContainsKey(username))
+            {
+                if (m_preserveCurrentUser)
+                {
+                    msgs.AddMessage("User '" + username + "' not found in Active Directory group '" + m_userGroup + "'; preserved in Workflow Manager database");
+                }
+                else if (sync.UsersToRemove.Contains(username, StringComparer.OrdinalIgnoreCase))
+                {
+                    msgs.AddWarning("User '" + username + "' removed from Workflow Manager database");
+                }
+            }
+            msgs.AddMessage(
+                "Users added/updated/removed: " + sync.UsersToAdd.Count.ToString() + "/" +
+                sync.UsersToUpdate.Count.ToString() + "/" + sync.UsersToRemove.Count.ToString() +
+                "; groups added/removed: " + sync.GroupsToAdd.Count.ToString() + "/" + sync.GroupsToRemove.Count.ToString() +
+                "; memberships added/removed: " + sync.MembersToAdd.Count.ToString() + "/" + sync.MembersToRemove.Count.ToString());
         }
         #endregion
 
@@ -146,10 +296,77 @@ namespace WorkflowManagerAdministrationUtilities
                     null);
                 m_parameters.Add(paramEdit);
 
+                // Option indicating whether only the users, groups and memberships that
+                // differ from the AD should be written, rather than all of them
+                cvDomain = new GPCodedValueDomainClass();
+                cvDomain.AddCode(GpTrue, C_OPT_SYNC_CHANGES_ONLY);
+                cvDomain.AddCode(GpFalse, C_OPT_FULL_IMPORT);
+
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_IADC_SYNC_CHANGES_ONLY,
+                    C_PARAM_SYNC_CHANGES_ONLY,
+                    GpBooleanType,
+                    ToGpBoolean(C_DEFAULT_SYNC_CHANGES_ONLY));
+                paramEdit.Domain = cvDomain as IGPDomain;
+                m_parameters.Add(paramEdit);
+
+                // Optional parameter indicating a file (LDIF or JSON) from which the
+                // users and groups should be read, in place of the AD; only used when
+                // syncing the changes
+                IGPFileDomain directoryFileDomain = new GPFileDomainClass();
+                directoryFileDomain.AddType("ldf");
+                directoryFileDomain.AddType("ldif");
+                directoryFileDomain.AddType("json");
+
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_IADC_DIRECTORY_FILE,
+                    C_PARAM_DIRECTORY_FILE,
+                    new DEFileTypeClass() as IGPDataType,
+                    null);
+                paramEdit.Domain = directoryFileDomain as IGPDomain;
+                m_parameters.Add(paramEdit);
+
                 return m_parameters;
             }
         }
 
+        /// <summary>
+        /// Pre validates the given set of values.
+        /// This is where you populate derived parameters based on input, among other things.
+        /// </summary>
+        /// <param name="paramValues"></param>
+        /// <param name="pEnvMgr"></param>
+        public override void UpdateParameters(IArray paramValues, IGPEnvironmentManager pEnvMgr)
+        {
+            try
+            {
+                UpdateParametersCommon(paramValues, pEnvMgr);
+            }
+            catch (WmxDefaultDbNotSetException)
+            {
+                // If the default DB wasn't set, stop executing
+                return;
+            }
+            catch (NullReferenceException)
+            {
+                // If one of the parameters was null, stop executing
+                return;
+            }
+
+            // Get the parameters as a map for easier access
+            WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+            IGPParameter3 syncChangesOnly = paramMap.GetParam(C_PARAM_SYNC_CHANGES_ONLY);
+            IGPParameterEdit3 directoryFileEdit = paramMap.GetParamEdit(C_PARAM_DIRECTORY_FILE);
+
+            // The directory file is only read when syncing the changes
+            directoryFileEdit.Enabled =
+                syncChangesOnly.Value != null && (syncChangesOnly.Value as IGPBoolean).Value;
+        }
+
         /// <summary>
         /// Required by IGPFunction2 interface; this function is called when the GP tool is ready to be executed.
         /// </summary>
@@ -170,40 +387,21 @@ namespace WorkflowManagerAdministrationUtilities
                     throw new WmauException(WmauErrorCodes.C_USER_NOT_ADMIN_ERROR);
                 }
 
-                // Stash away the executing user's information, if appropriate
                 string username = ESRI.ArcGIS.JTXUI.ConfigurationCache.GetCurrentSystemUser(ESRI.ArcGIS.JTXUI.ConfigurationCache.UseUserDomain);
-                IJTXConfiguration3 configMgr = this.WmxDatabase.ConfigurationManager as IJTXConfiguration3;
-                IJTXUser3 executingUser = configMgr.GetUser(username) as IJTXUser3;
-
-                // Import the AD information
-                string domain = System.Environment.UserDomainName;
-                string domainUsername = string.Empty;
-                string domainPassword = string.Empty;
                 int numUsers = 0;
                 int numGroups = 0;
-                ActiveDirectoryHelper.SyncronizeJTXDatabaseWithActiveDirectory(this.WmxDatabase, domain, domainUsername, domainPassword, m_userGroup, m_groupGroup, out numGroups, out numUsers);
-
-                // If the tool was set to preserve the current user's account and the user
-                // was removed from the DB, then re-add their account
-                if (configMgr.GetUser(username) == null)
+                if (m_syncChangesOnly)
                 {
-                    if (m_preserveCurrentUser)
-                    {
-                        IJTXConfigurationEdit2 configEdit = this.WmxDatabase.ConfigurationManager as IJTXConfigurationEdit2;
-                        IJTXUserConfig newUser = configEdit.CreateUser() as IJTXUserConfig;
-                        newUser.FirstName_2 = executingUser.FirstName;
-                        newUser.FullName_2 = executingUser.FullName;
-                        newUser.LastName_2 = executingUser.LastName;
-                        newUser.UserName_2 = executingUser.UserName;
-                        (newUser as IJTXUser3).IsAdministrator = executingUser.IsAdministrator;
-                        newUser.Store();
-
-                        msgs.AddMessage("User '" + username + "' not found in Active Directory group '" + m_userGroup + "'; re-added placeholder to Workflow Manager database");
-                    }
-                    else
+                    SyncChangedUsersAndGroups(username, msgs, out numUsers, out numGroups);
+                }
+                else
+                {
+                    if (!string.IsNullOrEmpty(m_directoryFilePath))
                     {
-                        msgs.AddWarning("User '" + username + "' removed from Workflow Manager database");
+                        msgs.AddWarning("The directory file is only read when syncing the changes (" +
+                            C_OPT_SYNC_CHANGES_ONLY + "); importing from Active Directory instead");
                     }
+                    ImportAllUsersAndGroups(username, msgs, out numUsers, out numGroups);
                 }
 
                 // Update the output parameters
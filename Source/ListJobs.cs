@@ -30,9 +30,11 @@ namespace WorkflowManagerAdministrationUtilities
         private const string C_PARAM_JOBS_TABLE = "in_table_jobsTable";
         private const string C_PARAM_SQL_QUERY_FILTER = "in_string_sqlQueryFilter";
         private const string C_PARAM_JOB_ID_LIST = "out_intlist_jobIds";
+        private const string C_PARAM_OUT_JOB_ID_FILE = "out_file_jobIdFile";
         #endregion
 
         #region MemberVariables
+        private string m_jobIdFilePath = string.Empty;
         #endregion
 
         #region SimpleAccessors
@@ -42,63 +44,6 @@ namespace WorkflowManagerAdministrationUtilities
         #endregion
 
         #region Private helper functions
-        /// <summary>
-        /// Gets a list of the jobs stored in the current WMX database that match the specified
-        /// query filter.
-        /// </summary>
-        /// <returns>A sorted list of the job IDs</returns>
-        private SortedList<int, string> ListJobsInDatabase(string filter)
-        {
-            SortedList<int, string> jobIds = new SortedList<int, string>();
-
-            // Build up a query that will return the job IDs filtered by the provided query string
-            IQueryFilter query = new QueryFilterClass();
-            IQueryFilterDefinition queryDef = query as IQueryFilterDefinition;
-            query.WhereClause = filter;
-            queryDef.PostfixClause = "ORDER BY " + Constants.FIELD_JOBID;
-
-            IFeatureWorkspace featureWorkspace = this.WmxDatabase.JTXWorkspace as IFeatureWorkspace;
-
-            // Declare some of these ComReleaser objects to help ensure that cursors, etc., are
-            // immediately released after they go out of scope.
-            using (ComReleaser cr1 = new ComReleaser(), cr2 = new ComReleaser())
-            {
-                // Get the name of the correct table from the jobs workspace, so
-                // that the table doesn't have to be owned by the connecting user.
-                string tableName = Common.WmauHelperFunctions.GetQualifiedTableName(Constants.JTX_TABLE_JTX_JOBS_TABLE, this.WmxDatabase.JTXWorkspace);
-
-                ITable jobsTable = featureWorkspace.OpenTable(tableName);
-                cr1.ManageLifetime(jobsTable);
-                ICursor searchCursor = jobsTable.Search(query, true);
-                cr2.ManageLifetime(searchCursor);
-
-                // Store the ID and name of each job matching this query
-                int idIndex = jobsTable.FindField(Constants.FIELD_JOBID);
-                int nameIndex = jobsTable.FindField(Constants.FIELD_JOBNAME);
-                IRow row = null;
-                while ((row = searchCursor.NextRow()) != null)
-                {
-                    string targetIdxStr = row.get_Value(idIndex).ToString();
-                    int targetIdx = -1;
-                    try
-                    {
-                        // NOTE: Have seen cases where the JTX_JOBS table contained a row with
-                        // nothing but null attributes; since this function accesses the table
-                        // directly, try to protect against this error.
-                        targetIdx = int.Parse(targetIdxStr);
-                    }
-                    catch (Exception ex)
-                    {
-                        throw new WmauException(WmauErrorCodes.C_JOB_ID_PARSE_ERROR, ex);
-                    }
-                    string targetValStr = row.get_Value(nameIndex).ToString();
-                    jobIds[targetIdx] = targetValStr;
-                }
-            }
-
-            return jobIds;
-        }
-
         /// <summary>
         /// Updates the internal values used by this tool based on the parameters from an input array
         /// </summary>
@@ -107,6 +52,10 @@ namespace WorkflowManagerAdministrationUtilities
         {
             // Get the values for any parameters common to all GP tools
             ExtractParametersCommon(paramValues);
+
+            WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+            IGPParameter3 param = paramMap.GetParam(C_PARAM_OUT_JOB_ID_FILE);
+            m_jobIdFilePath = param.Value.GetAsText();
         }
         #endregion
 
@@ -162,6 +111,23 @@ namespace WorkflowManagerAdministrationUtilities
                     null);
                 tempArray.Add(jobIdList);
 
+                // Optional parameter indicating a file to which the job IDs should
+                // be written; either a text file or a job ID set (.npy).  (This is
+                // at the end of the list so that existing scripts continue to work.)
+                IGPFileDomain jobIdFileDomain = new GPFileDomainClass();
+                jobIdFileDomain.AddType("txt");
+                jobIdFileDomain.AddType("npy");
+
+                IGPParameterEdit3 jobIdFile = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionOutput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_LJ_OUT_JOB_ID_FILE,
+                    C_PARAM_OUT_JOB_ID_FILE,
+                    new DEFileTypeClass() as IGPDataType,
+                    null);
+                jobIdFile.Domain = jobIdFileDomain as IGPDomain;
+                tempArray.Add(jobIdFile);
+
                 m_parameters = tempArray;
 
                 return m_parameters;
@@ -197,15 +163,30 @@ namespace WorkflowManagerAdministrationUtilities
                     outputValues.Remove(i);
                 }
 
-                // Get the list of job IDs and add them all to the multivalue
-                SortedList<int, string> jobs = this.ListJobsInDatabase(filterParam.Value.GetAsText());
-                msgs.AddMessage("Jobs matching query:");
-                foreach (KeyValuePair<int, string> item in jobs)
+                // Get the list of job IDs
+                SortedList<int, string> jobs = Common.WmauHelperFunctions.ListJobsMatchingQuery(this.WmxDatabase, filterParam.Value.GetAsText());
+
+                if (!string.IsNullOrEmpty(m_jobIdFilePath))
                 {
-                    IGPLong value = new GPLongClass();
-                    value.Value = item.Key;
-                    outputValues.AddValue(value as IGPValue);
-                    msgs.AddMessage("  " + value.Value.ToString() + " (" + item.Value + ")");
+                    // Write the job IDs to a file, if requested.  Listing each job and
+                    // building the multivalue are slow for very large queries, so both
+                    // are skipped in this case.
+                    int[] jobIds = new int[jobs.Count];
+                    jobs.Keys.CopyTo(jobIds, 0);
+                    Common.WmauHelperFunctions.WriteJobIdsToFile(jobIds, m_jobIdFilePath);
+                    msgs.AddMessage("Found " + jobIds.Length.ToString() + " job(s)");
+                }
+                else
+                {
+                    // Add the job IDs to the multivalue
+                    msgs.AddMessage("Jobs matching query:");
+                    foreach (KeyValuePair<int, string> item in jobs)
+                    {
+                        IGPLong value = new GPLongClass();
+                        value.Value = item.Key;
+                        outputValues.AddValue(value as IGPValue);
+                        msgs.AddMessage("  " + value.Value.ToString() + " (" + item.Value + ")");
+                    }
                 }
 
                 paramEdit.Value = (IGPValue)outputValues;
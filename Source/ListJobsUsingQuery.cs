@@ -14,6 +14,7 @@ using System.Collections.Generic;
 using System.Linq;
 using System.Text;
 
+using ESRI.ArcGIS.ADF;
 using ESRI.ArcGIS.esriSystem;
 using ESRI.ArcGIS.Geodatabase;
 using ESRI.ArcGIS.Geoprocessing;
@@ -27,10 +28,21 @@ namespace WorkflowManagerAdministrationUtilities
         #region Constants
         private const string C_PARAM_QUERY_NAME = "in_string_queryName";
         private const string C_PARAM_OUT_JOB_ID_LIST = "out_mvLong_jobIds";
+        private const string C_PARAM_SUMMARIZE_MESSAGES = "in_bool_summarizeMessages";
+        private const string C_PARAM_OUT_JOB_ID_TABLE = "out_table_jobIdTable";
+        private const string C_PARAM_OUT_JOB_ID_FILE = "out_file_jobIdFile";
+
+        private const string C_OPT_LIST_EACH_JOB = "LIST_EACH_JOB";
+        private const string C_OPT_SUMMARIZE_JOBS = "SUMMARIZE_JOBS";
+
+        private const bool C_DEFAULT_SUMMARIZE_MESSAGES = false;
         #endregion
 
         #region MemberVariables
         private string m_queryName = string.Empty;
+        private bool m_summarizeMessages = C_DEFAULT_SUMMARIZE_MESSAGES;
+        private string m_jobIdTablePath = string.Empty;
+        private string m_jobIdFilePath = string.Empty;
         #endregion
 
         #region SimpleAccessors
@@ -40,53 +52,59 @@ namespace WorkflowManagerAdministrationUtilities
         #endregion
 
         #region Private helper functions
-        private void AddQueriesFromContainer(
-            IJTXJobQueryContainer container,
-            string prefix,
-            SortedList<string, IJTXJobQuery> queryList)
-        {
-            // Add the queries from the container at the current level
-            IJTXJobQuerySet querySet = container.Queries;
-            for (int i = 0; i < querySet.Count; i++)
-            {
-                IJTXJobQuery query = querySet.get_Item(i) as IJTXJobQuery;
-                queryList.Add(prefix + query.Name, query);
-            }
-
-            // Iterate through each of the subcontainers and add them as well
-            IJTXJobQueryContainerSet subcontainers = container.SubContainers;
-            for (int i = 0; i < subcontainers.Count; i++)
-            {
-                IJTXJobQueryContainer tempContainer = subcontainers.get_Item(i);
-                AddQueriesFromContainer(
-                    tempContainer,
-                    prefix + tempContainer.Name + Properties.Resources.CONST_JOB_QUERY_SEP,
-                    queryList);
-            }
-        }
-
         /// <summary>
-        /// Helper function to extract a list of job IDs from the XML string
-        /// returned by IJTXJobQuery.ExecuteXML()
+        /// Writes a list of job IDs to a new table containing a single JOB_ID field.
+        /// Any existing table at this location is replaced.
         /// </summary>
-        /// <param name="rawXml">The XML string returned by IJTXJobQuery.ExecuteXML()</param>
-        /// <returns>A list of the job IDs contained in the XML query result</returns>
-        private List<int> ParseJobIdsFromXml(string rawXml)
+        /// <param name="jobIds">The job IDs to be written</param>
+        /// <param name="tablePath">The catalog path of the table to be created</param>
+        private void WriteJobIdsToTable(int[] jobIds, string tablePath)
         {
-            // TODO: Remove this function once IJTXJobQuery.Execute() is fixed
-
-            List<int> jobIDList = new List<int>();
-            System.Xml.XmlDocument xmlDoc = new System.Xml.XmlDocument();
-
-            xmlDoc.LoadXml(rawXml);
+            IWorkspace workspace = m_gpUtilities.CreateParentFromCatalogPath(tablePath).Open() as IWorkspace;
+            IFeatureWorkspace featureWorkspace = workspace as IFeatureWorkspace;
 
-            foreach (System.Xml.XmlNode node in xmlDoc.SelectNodes("/RS/ROW"))
+            // Tables in a folder (i.e., dBASE tables) are named without their extension
+            string tableName = System.IO.Path.GetFileName(tablePath);
+            if (workspace.Type == esriWorkspaceType.esriFileSystemWorkspace)
             {
-                int jobID = Int32.Parse(node.ChildNodes[0].InnerText);
-                jobIDList.Add(jobID);
+                tableName = System.IO.Path.GetFileNameWithoutExtension(tablePath);
             }
 
-            return jobIDList;
+            using (ComReleaser cr = new ComReleaser())
+            {
+                if ((workspace as IWorkspace2).get_NameExists(esriDatasetType.esriDTTable, tableName))
+                {
+                    IDataset existingTable = featureWorkspace.OpenTable(tableName) as IDataset;
+                    existingTable.Delete();
+                }
+
+                // Build the table from the required fields for a standalone table,
+                // plus a field to hold the job IDs
+                IObjectClassDescription ocDescription = new ObjectClassDescriptionClass();
+                IFieldsEdit fields = ocDescription.RequiredFields as IFieldsEdit;
+                IFieldEdit jobIdField = new FieldClass();
+                jobIdField.Name_2 = ESRI.ArcGIS.JTX.Utilities.Constants.FIELD_JOBID;
+                jobIdField.Type_2 = esriFieldType.esriFieldTypeInteger;
+                fields.AddField(jobIdField as IField);
+
+                ITable table = featureWorkspace.CreateTable(
+                    tableName, fields as IFields, ocDescription.InstanceCLSID, null, string.Empty);
+                cr.ManageLifetime(table);
+
+                // Use a buffered insert cursor, since there may be many rows to write
+                int jobIdIndex = table.FindField(ESRI.ArcGIS.JTX.Utilities.Constants.FIELD_JOBID);
+                ICursor insertCursor = table.Insert(true);
+                cr.ManageLifetime(insertCursor);
+                IRowBuffer rowBuffer = table.CreateRowBuffer();
+                cr.ManageLifetime(rowBuffer);
+
+                for (int i = 0; i < jobIds.Length; i++)
+                {
+                    rowBuffer.set_Value(jobIdIndex, jobIds[i]);
+                    insertCursor.InsertRow(rowBuffer);
+                }
+                insertCursor.Flush();
+            }
         }
 
         /// <summary>
@@ -104,6 +122,15 @@ namespace WorkflowManagerAdministrationUtilities
             // Update the internal values of whatever parameters we're maintaining
             param = paramMap.GetParam(C_PARAM_QUERY_NAME);
             m_queryName = param.Value.GetAsText();
+
+            param = paramMap.GetParam(C_PARAM_SUMMARIZE_MESSAGES);
+            m_summarizeMessages = (param.Value as IGPBoolean).Value;
+
+            param = paramMap.GetParam(C_PARAM_OUT_JOB_ID_TABLE);
+            m_jobIdTablePath = param.Value.GetAsText();
+
+            param = paramMap.GetParam(C_PARAM_OUT_JOB_ID_FILE);
+            m_jobIdFilePath = param.Value.GetAsText();
         }
         #endregion
 
@@ -144,6 +171,51 @@ namespace WorkflowManagerAdministrationUtilities
                     null);
                 m_parameters.Add(paramEdit);
 
+                // Optional parameter indicating whether a message should be logged for
+                // every job found, or only a summary of the jobs found.  (This and the
+                // following parameters are at the end of the list so that existing
+                // scripts continue to work.)
+                IGPCodedValueDomain cvDomain = new GPCodedValueDomainClass();
+                cvDomain.AddCode(GpFalse, C_OPT_LIST_EACH_JOB);
+                cvDomain.AddCode(GpTrue, C_OPT_SUMMARIZE_JOBS);
+
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_LJUQ_SUMMARIZE_MESSAGES,
+                    C_PARAM_SUMMARIZE_MESSAGES,
+                    GpBooleanType,
+                    ToGpBoolean(C_DEFAULT_SUMMARIZE_MESSAGES));
+                paramEdit.Domain = cvDomain as IGPDomain;
+                m_parameters.Add(paramEdit);
+
+                // Optional parameter indicating a table to which the job IDs should
+                // be written
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionOutput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_LJUQ_OUT_JOB_ID_TABLE,
+                    C_PARAM_OUT_JOB_ID_TABLE,
+                    new DETableTypeClass() as IGPDataType,
+                    null);
+                m_parameters.Add(paramEdit);
+
+                // Optional parameter indicating a file to which the job IDs should
+                // be written; either a text file or a job ID set (.npy)
+                IGPFileDomain jobIdFileDomain = new GPFileDomainClass();
+                jobIdFileDomain.AddType("txt");
+                jobIdFileDomain.AddType("npy");
+
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionOutput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_LJUQ_OUT_JOB_ID_FILE,
+                    C_PARAM_OUT_JOB_ID_FILE,
+                    new DEFileTypeClass() as IGPDataType,
+                    null);
+                paramEdit.Domain = jobIdFileDomain as IGPDomain;
+                m_parameters.Add(paramEdit);
+
                 return m_parameters;
             }
         }
@@ -200,32 +272,51 @@ namespace WorkflowManagerAdministrationUtilities
             try
             {
                 WmauParameterMap paramMap = new WmauParameterMap(paramValues);
-                IJTXConfiguration3 configMgr = this.WmxDatabase.ConfigurationManager as IJTXConfiguration3;
 
-                // Determine which query the user has selected
-                SortedList<string, IJTXJobQuery> queryMap = new SortedList<string, IJTXJobQuery>();
-                AddQueriesFromContainer(configMgr.GetPublicQueryContainer(), string.Empty, queryMap);
-                if (!queryMap.Keys.Contains(m_queryName))
+                // Run the selected job query
+                int[] jobIds = Common.WmauHelperFunctions.ListJobsInPublicQuery(this.WmxDatabase, m_queryName);
+
+                // Report the jobs that were found
+                if (m_summarizeMessages)
+                {
+                    msgs.AddMessage("Found " + jobIds.Length.ToString() + " job(s)");
+                    if (jobIds.Length > 0)
+                    {
+                        msgs.AddMessage("Job IDs range from " + jobIds[0].ToString() +
+                            " to " + jobIds[jobIds.Length - 1].ToString());
+                    }
+                }
+                else
                 {
-                    throw new WmauException(WmauErrorCodes.C_UNKNOWN_QUERY_ERROR);
+                    for (int i = 0; i < jobIds.Length; i++)
+                    {
+                        msgs.AddMessage("Found job: " + jobIds[i]);
+                    }
                 }
 
-                // Run the selected job query
-                IJTXJobQuery tempQuery = queryMap[m_queryName];
+                // Write the job IDs to a table and/or file, if requested
+                if (!string.IsNullOrEmpty(m_jobIdTablePath))
+                {
+                    WriteJobIdsToTable(jobIds, m_jobIdTablePath);
+                }
+                if (!string.IsNullOrEmpty(m_jobIdFilePath))
+                {
+                    Common.WmauHelperFunctions.WriteJobIdsToFile(jobIds, m_jobIdFilePath);
+                }
 
-                // TODO: Change this to use ".Evaluate()" once it's fixed
-                List<int> jobIds = ParseJobIdsFromXml(tempQuery.EvaluateXML());
-                jobIds.Sort();
-                
-                // Store the job IDs from the query into the output GP param
+                // Store the job IDs from the query into the output GP param.  Building
+                // this list is slow for very large queries, so it's skipped if the IDs
+                // are being written elsewhere.
                 IGPMultiValue outputValues = new GPMultiValueClass();
                 outputValues.MemberDataType = paramMap.GetParam(C_PARAM_OUT_JOB_ID_LIST).DataType;
-                for (int i = 0; i < jobIds.Count; i++)
+                if (string.IsNullOrEmpty(m_jobIdTablePath) && string.IsNullOrEmpty(m_jobIdFilePath))
                 {
-                    IGPLong jobIdVal = new GPLongClass();
-                    jobIdVal.Value = jobIds[i];
-                    outputValues.AddValue(jobIdVal as IGPValue);
-                    msgs.AddMessage("Found job: " + jobIds[i]);
+                    for (int i = 0; i < jobIds.Length; i++)
+                    {
+                        IGPLong jobIdVal = new GPLongClass();
+                        jobIdVal.Value = jobIds[i];
+                        outputValues.AddValue(jobIdVal as IGPValue);
+                    }
                 }
 
                 paramMap.GetParamEdit(C_PARAM_OUT_JOB_ID_LIST).Value = (IGPValue)outputValues;
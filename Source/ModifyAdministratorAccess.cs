@@ -226,19 +226,29 @@ namespace WorkflowManagerAdministrationUtilities
                 {
                     IJTXUser3 user = users.get_Item(i) as IJTXUser3;
                     user.IsAdministrator = m_privilegeAction.Equals(C_OPT_GRANT) ? true : false;
-                    (user as IJTXUserConfig).Store();
+                    using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_STORE))
+                    {
+                        (user as IJTXUserConfig).Store();
+                    }
                 }
 
                 // If the tool was set to preserve the current user's access and the tool removed it,
                 // re-grant their access
                 string username = ESRI.ArcGIS.JTXUI.ConfigurationCache.GetCurrentSystemUser(ESRI.ArcGIS.JTXUI.ConfigurationCache.UseUserDomain);
-                IJTXUser3 userObj = configEdit.GetUser(username) as IJTXUser3;
+                IJTXUser3 userObj = null;
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_GET_USER))
+                {
+                    userObj = configEdit.GetUser(username) as IJTXUser3;
+                }
                 if (!userObj.IsAdministrator)
                 {
                     if (m_preserveCurrentUser)
                     {
                         userObj.IsAdministrator = true;
-                        (userObj as IJTXUserConfig).Store();
+                        using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_STORE))
+                        {
+                            (userObj as IJTXUserConfig).Store();
+                        }
                         msgs.AddMessage("Re-granting admin access for user '" + username + "'");
                     }
                     else
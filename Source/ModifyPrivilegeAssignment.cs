@@ -277,7 +277,10 @@ namespace WorkflowManagerAdministrationUtilities
                         {
                             targetGroup.RemovePrivilegeFromGroup2(privilege.UID);
                         }
-                        targetGroup.Store();
+                        using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_STORE))
+                        {
+                            targetGroup.Store();
+                        }
                     }
                 }
 
@@ -0,0 +1,1141 @@
+﻿//Copyright 2015 Esri
+//Licensed under the Apache License, Version 2.0 (the "License");
+//you may not use this file except in compliance with the License.
+//You may obtain a copy of the License at
+//    http://www.apache.org/licenses/LICENSE-2.0
+//Unless required by applicable law or agreed to in writing, software
+//distributed under the License is distributed on an "AS IS" BASIS,
+//WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//See the License for the specific language governing permissions and
+//limitations under the License.​
+
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
+using System.Security.Cryptography;
+using System.Text;
+using System.Xml;
+
+using ESRI.ArcGIS.esriSystem;
+using ESRI.ArcGIS.Geodatabase;
+using ESRI.ArcGIS.Geoprocessing;
+using ESRI.ArcGIS.JTX;
+using ESRI.ArcGIS.JTX.Utilities;
+
+
+namespace WorkflowManagerAdministrationUtilities
+{
+    /// <summary>
+    /// GP tool to copy the configuration changes made in one Workflow Manager
+    /// database (ex: a development database) to another.<br/>
+    /// <br/>
+    /// Both JXL exports are read in a single forward-only pass, one configuration
+    /// object (ex: a job type or a step type) at a time.  Each object is identified
+    /// by its element name and its name (or, failing that, its ID), and compared
+    /// using a hash of its contents.  Only the objects that are new or that have
+    /// changed are imported into the target database.<br/>
+    /// <br/>
+    /// The same object usually has different IDs in the two databases.  The IDs
+    /// and references to other objects in each Workflow Manager table are listed
+    /// in an explicit schema (see BuildSchema()), and each file is first read to
+    /// find the name behind each object's ID.  Objects are compared with their
+    /// references replaced by the names of the objects referred to; the objects
+    /// imported have their IDs and references translated to the target database's
+    /// IDs, and new objects are given IDs that are free in the target.  Changes
+    /// are only applied if every ID-like field in them could be translated.
+    /// </summary>
+    class PromoteConfiguration : WmauAbstractGpFunction
+    {
+        #region Helper classes
+        /// <summary>
+        /// A configuration object read from a JXL file; each object is either a
+        /// row of one of the Workflow Manager tables in the schema, or a child of
+        /// one of the top-level sections of the file
+        /// </summary>
+        private class ConfigObject
+        {
+            public string Section;
+            public string Key;
+            public string Description;
+            public string Hash;
+            public XmlNode Node;
+            public TableSchema Schema;
+        }
+
+        /// <summary>
+        /// Describes the ID-like fields of a Workflow Manager table, as they appear
+        /// in a JXL file
+        /// </summary>
+        private class TableSchema
+        {
+            public string Table;
+            public string IdField;
+            public string NameField;
+
+            // Maps each field that refers to another object to that object's table
+            public Dictionary<string, string> References = new Dictionary<string, string>(StringComparer.OrdinalIgnoreCase);
+
+            // Fields whose names look like IDs, but that don't refer to another
+            // object in the database (ex: COM ProgIDs)
+            public HashSet<string> OtherIdFields = new HashSet<string>(StringComparer.OrdinalIgnoreCase);
+        }
+
+        /// <summary>
+        /// The IDs of the configuration objects in a JXL file.  Each object is
+        /// known by its table and its name (or, if it has no name, its ID).
+        /// </summary>
+        private class IdIndex
+        {
+            // Maps a table and ID to the name of the object
+            public Dictionary<string, string> Names = new Dictionary<string, string>();
+
+            // Maps a table and object name to the object's ID
+            public Dictionary<string, string> Ids = new Dictionary<string, string>();
+
+            // The highest numeric ID in each table
+            public Dictionary<string, long> MaxIds = new Dictionary<string, long>(StringComparer.OrdinalIgnoreCase);
+
+            // The table and ID of each object, in the order in which they appear
+            public List<KeyValuePair<string, string>> Objects = new List<KeyValuePair<string, string>>();
+        }
+        #endregion
+
+        #region Constants
+        private const string C_PARAM_SOURCE_JXL = "in_file_sourceJxl";
+        private const string C_PARAM_TARGET_JXL = "in_file_targetJxl";
+        private const string C_PARAM_DRY_RUN = "in_bool_dryRun";
+        private const string C_PARAM_OUT_CHANGES_JXL = "out_file_changesJxl";
+        private const string C_PARAM_OUT_NUM_CHANGED = "out_long_numObjectsChanged";
+
+        private const string C_OPT_DRY_RUN = "DRY_RUN";
+        private const string C_OPT_APPLY_CHANGES = "APPLY_CHANGES";
+
+        private const bool C_DEFAULT_DRY_RUN = true;
+
+        // Fields whose names end with this are assumed to hold IDs
+        private const string C_ID_SUFFIX = "ID";
+
+        // The Workflow Manager libraries don't define constants for these tables
+        private const string C_TABLE_MAPS = "JTX_MAPS";
+        private const string C_TABLE_WORKFLOWS = "JTX_WORKFLOWS";
+
+        // Attributes or child elements used to identify an object that isn't in
+        // the schema, in order of preference
+        private static readonly string[] C_IDENTITY_NAMES = { "Name", "NAME", "name", "ID", "Id", "id" };
+
+        private static readonly Dictionary<string, TableSchema> C_SCHEMA = BuildSchema();
+        #endregion
+
+        #region MemberVariables
+        private string m_sourceJxlPath = string.Empty;
+        private string m_targetJxlPath = string.Empty;
+        private bool m_dryRun = C_DEFAULT_DRY_RUN;
+        private string m_changesJxlPath = string.Empty;
+        private int m_numObjectsChanged = 0;
+        #endregion
+
+        #region SimpleAccessors
+        public override string Name { get { return "PromoteConfiguration"; } }
+        public override string DisplayName { get { return Properties.Resources.TOOL_PROMOTE_CONFIGURATION; } }
+        public override string DisplayToolset { get { return Properties.Resources.CAT_WMX_DB_UTILS; } }
+        #endregion
+
+        #region Private helper functions
+        /// <summary>
+        /// Updates the internal values used by this tool based on the parameters from an input array
+        /// </summary>
+        /// <param name="paramValues"></param>
+        protected override void ExtractParameters(IArray paramValues)
+        {
+            // Get the values for any parameters common to all GP tools
+            ExtractParametersCommon(paramValues);
+
+            WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+            IGPParameter3 param = null;
+
+            param = paramMap.GetParam(C_PARAM_SOURCE_JXL);
+            m_sourceJxlPath = param.Value.GetAsText();
+
+            param = paramMap.GetParam(C_PARAM_TARGET_JXL);
+            m_targetJxlPath = param.Value.GetAsText();
+
+            param = paramMap.GetParam(C_PARAM_DRY_RUN);
+            m_dryRun = (param.Value as IGPBoolean).Value;
+
+            param = paramMap.GetParam(C_PARAM_OUT_CHANGES_JXL);
+            m_changesJxlPath = param.Value.GetAsText();
+        }
+
+        /// <summary>
+        /// Adds a table to the schema
+        /// </summary>
+        /// <param name="schema">The schema to which the table is added</param>
+        /// <param name="table">The name of the table (the name of its rows' elements)</param>
+        /// <param name="idField">The field holding each object's ID, or null if the objects have none</param>
+        /// <param name="nameField">The field holding each object's name, or null if the objects have none</param>
+        /// <param name="otherIdFields">Fields that look like IDs but don't refer to other objects</param>
+        /// <param name="references">Pairs of the fields referring to other objects, and the tables to which they refer</param>
+        private static void AddTable(
+            Dictionary<string, TableSchema> schema,
+            string table,
+            string idField,
+            string nameField,
+            string[] otherIdFields,
+            params string[] references)
+        {
+            TableSchema tableSchema = new TableSchema();
+            tableSchema.Table = table;
+            tableSchema.IdField = idField;
+            tableSchema.NameField = nameField;
+            if (otherIdFields != null)
+            {
+                tableSchema.OtherIdFields.UnionWith(otherIdFields);
+            }
+            for (int i = 0; i + 1 < references.Length; i += 2)
+            {
+                tableSchema.References[references[i]] = references[i + 1];
+            }
+            schema[table] = tableSchema;
+        }
+
+        /// <summary>
+        /// Builds the schema of the Workflow Manager configuration tables: the ID,
+        /// name, and references to other objects of each.  Any other field whose
+        /// name ends with "ID" in a changed object keeps the changes from being
+        /// applied, since it can't be translated to the target database's IDs.
+        /// </summary>
+        /// <returns>A dictionary of table names to their schemas</returns>
+        private static Dictionary<string, TableSchema> BuildSchema()
+        {
+            Dictionary<string, TableSchema> schema = new Dictionary<string, TableSchema>(StringComparer.OrdinalIgnoreCase);
+            string[] comIds = { "PROGID", "CLSID" };
+
+            // Lookup tables
+            AddTable(schema, Constants.JTX_TABLE_JTX_ACTIVITY_TYPES_TABLE,
+                Constants.FIELD_JTX_ACTIVITY_TYPES_ID, Constants.FIELD_JTX_ACTIVITY_TYPES_NAME, null);
+            AddTable(schema, Constants.JTX_TABLE_JTX_STATUSES_TABLE, "ID", Constants.FIELD_JTX_STATUS_NAME, null);
+            AddTable(schema, Constants.JTX_TABLE_JTX_STEP_STATUS_TABLE, "ID", "NAME", null);
+            AddTable(schema, Constants.JTX_TABLE_JTX_PRIORITIES_TABLE, null, "NAME", null);
+            AddTable(schema, Constants.JTX_TABLE_JTX_HOLD_TYPES_TABLE, "ID", "NAME", null);
+            AddTable(schema, Constants.JTX_TABLE_JTX_PROPERTIES_TABLE, null, Constants.FIELD_JTX_PROPERTIES_PROP_NAME, null);
+            AddTable(schema, Constants.JTX_TABLE_JTX_TOKEN_PARSERS_TABLE, "ID", "NAME", comIds);
+
+            // Users, groups, and privileges
+            AddTable(schema, Constants.JTX_TABLE_JTX_USERS_TABLE, "USER_ID", "USER_NAME", null);
+            AddTable(schema, Constants.JTX_TABLE_JTX_USER_GROUPS_TABLE,
+                Constants.FIELD_JTX_USER_GROUPS_GROUP_ID, "GROUP_NAME", null);
+            AddTable(schema, Constants.JTX_TABLE_JTX_PRIVILEGES_TABLE,
+                Constants.FIELD_JTX_PRIVILEGES_PRIV_ID, Constants.FIELD_JTX_PRIVILEGES_PRIV_NAME, null);
+            AddTable(schema, Constants.JTX_TABLE_JTX_USER_GROUP_XREF_TABLE, null, null, null,
+                "GROUP_ID", Constants.JTX_TABLE_JTX_USER_GROUPS_TABLE,
+                "USER_ID", Constants.JTX_TABLE_JTX_USERS_TABLE);
+            AddTable(schema, Constants.JTX_TABLE_JTX_PRIV_XREF_TABLE, null, null, null,
+                Constants.FIELD_JTX_PRIV_XREF_GROUP_ID, Constants.JTX_TABLE_JTX_USER_GROUPS_TABLE,
+                Constants.FIELD_JTX_PRIV_XREF_GROUP_UID, Constants.JTX_TABLE_JTX_USER_GROUPS_TABLE,
+                Constants.FIELD_JTX_PRIV_XREF_PRIV_ID, Constants.JTX_TABLE_JTX_PRIVILEGES_TABLE,
+                Constants.FIELD_JTX_PRIV_XREF_PRIV_UID, Constants.JTX_TABLE_JTX_PRIVILEGES_TABLE);
+
+            // Data workspaces, map documents, workflows, and step types
+            AddTable(schema, Constants.JTX_TABLE_JTX_DATABASES, "DATABASE_ID", "ALIAS", null);
+            AddTable(schema, C_TABLE_MAPS, "ID", "NAME", null);
+            AddTable(schema, C_TABLE_WORKFLOWS, "ID", "NAME", null);
+            AddTable(schema, Constants.JTX_TABLE_JTX_TABLE_TASK_ASSISTANT_WORKFLOWS, "ID", "ALIAS", null);
+            AddTable(schema, Constants.JTX_TABLE_JTX_STEP_TYPES_TABLE, "ID", "NAME", comIds,
+                "STATUS_ID", Constants.JTX_TABLE_JTX_STEP_STATUS_TABLE);
+
+            // Job types and their properties
+            AddTable(schema, Constants.JTX_TABLE_JTX_JOB_TYPES_TABLE, Constants.FIELD_JTX_JOB_TYPES_ID, "NAME", null,
+                Constants.FIELD_JTX_JOB_TYPES_DEFAULT_DATA_WS_ID, Constants.JTX_TABLE_JTX_DATABASES,
+                "DEFAULT_WORKFLOW_ID", C_TABLE_WORKFLOWS,
+                "DEFAULT_MAP_ID", C_TABLE_MAPS,
+                "DEFAULT_STATUS_ID", Constants.JTX_TABLE_JTX_STATUSES_TABLE);
+            AddTable(schema, Constants.JTX_TABLE_JTX_AUX_PROPS_TABLE, "ID", "NAME", null,
+                "JOB_TYPE_ID", Constants.JTX_TABLE_JTX_JOB_TYPES_TABLE);
+            AddTable(schema, Constants.JTX_TABLE_JTX_PROP_RELATIONSHIPS_TABLE,
+                "ID", Constants.FIELD_JTX_PROP_RELATIONSHIPS_NAME, null,
+                "JOB_TYPE_ID", Constants.JTX_TABLE_JTX_JOB_TYPES_TABLE);
+
+            // Notifications
+            AddTable(schema, Constants.JTX_TABLE_JTX_NOTIFICATIONS, "ID", "NAME", null);
+            AddTable(schema, Constants.JTX_TABLE_JTX_NOTIFICATION_SUBSCRIBERS, null, null, null,
+                "NOTIFICATION_ID", Constants.JTX_TABLE_JTX_NOTIFICATIONS);
+
+            // Queries, filters, and reports
+            AddTable(schema, Constants.JTX_TABLE_JTX_QUERY_CONTAINERS_TABLE, "ID", "NAME", null,
+                "PARENT_ID", Constants.JTX_TABLE_JTX_QUERY_CONTAINERS_TABLE);
+            AddTable(schema, Constants.JTX_TABLE_JTX_JOB_QUERIES_TABLE, "ID", "NAME", null,
+                "CONTAINER_ID", Constants.JTX_TABLE_JTX_QUERY_CONTAINERS_TABLE);
+            AddTable(schema, Constants.JTX_TABLE_JTX_QUERY_OWNERS_TABLE, null, null, null,
+                "QUERY_ID", Constants.JTX_TABLE_JTX_JOB_QUERIES_TABLE,
+                "CONTAINER_ID", Constants.JTX_TABLE_JTX_QUERY_CONTAINERS_TABLE);
+            AddTable(schema, Constants.JTX_TABLE_JTX_JOB_FILTERS_TABLE, "ID", "NAME", null);
+            AddTable(schema, Constants.JTX_TABLE_JTX_JOB_FILTER_XREF_TABLE, null, null, null,
+                "FILTER_ID", Constants.JTX_TABLE_JTX_JOB_FILTERS_TABLE,
+                "JOB_TYPE_ID", Constants.JTX_TABLE_JTX_JOB_TYPES_TABLE);
+            AddTable(schema, Constants.JTX_TABLE_JTX_USER_GROUP_JOB_FILTERS_TABLE, null, null, null,
+                "FILTER_ID", Constants.JTX_TABLE_JTX_JOB_FILTERS_TABLE,
+                "GROUP_ID", Constants.JTX_TABLE_JTX_USER_GROUPS_TABLE);
+            AddTable(schema, Constants.JTX_TABLE_JTX_REPORTS_TABLE, "ID", "NAME", null);
+            AddTable(schema, Constants.JTX_TABLE_JTX_REPORT_QUERIES_TABLE, null, null, null,
+                "REPORT_ID", Constants.JTX_TABLE_JTX_REPORTS_TABLE,
+                "QUERY_ID", Constants.JTX_TABLE_JTX_JOB_QUERIES_TABLE);
+
+            return schema;
+        }
+
+        /// <summary>
+        /// Returns the key under which an object's name or ID is stored in an IdIndex
+        /// </summary>
+        /// <param name="table">The table containing the object</param>
+        /// <param name="value">The object's name or ID</param>
+        /// <returns>The key</returns>
+        private string IndexKey(string table, string value)
+        {
+            return table.ToUpperInvariant() + "/" + value;
+        }
+
+        /// <summary>
+        /// Returns true if a field's name suggests that it holds an ID
+        /// </summary>
+        /// <param name="fieldName">The name of the attribute or child element</param>
+        /// <returns>True if the field looks like an ID</returns>
+        private bool IsIdLike(string fieldName)
+        {
+            return fieldName.EndsWith(C_ID_SUFFIX, StringComparison.OrdinalIgnoreCase);
+        }
+
+        /// <summary>
+        /// Returns true if a child element holds a single value (i.e., it has no
+        /// attributes or child elements of its own)
+        /// </summary>
+        /// <param name="node">The child element</param>
+        /// <returns>True if the element holds only text</returns>
+        private bool IsValueElement(XmlNode node)
+        {
+            if (node.NodeType != XmlNodeType.Element || node.Attributes.Count > 0)
+            {
+                return false;
+            }
+            foreach (XmlNode child in node.ChildNodes)
+            {
+                if (child.NodeType != XmlNodeType.Text && child.NodeType != XmlNodeType.CDATA)
+                {
+                    return false;
+                }
+            }
+            return true;
+        }
+
+        /// <summary>
+        /// Replaces a reference to another object's ID with that object's name, so
+        /// that the same reference compares equal in both databases.  Values that
+        /// aren't references are returned unchanged.
+        /// </summary>
+        /// <param name="schema">The schema of the object's table, or null if it isn't in the schema</param>
+        /// <param name="fieldName">The name of the attribute or child element</param>
+        /// <param name="value">The value of the field</param>
+        /// <param name="index">The IDs of the objects in the file</param>
+        /// <returns>The normalized value</returns>
+        private string NormalizeReference(TableSchema schema, string fieldName, string value, IdIndex index)
+        {
+            string table = null;
+            string name = null;
+            if (schema != null && schema.References.TryGetValue(fieldName, out table) &&
+                index.Names.TryGetValue(IndexKey(table, value), out name))
+            {
+                return "@" + name;
+            }
+            return value;
+        }
+
+        /// <summary>
+        /// Returns true if a field holds the ID of the object itself
+        /// </summary>
+        /// <param name="schema">The schema of the object's table, or null if it isn't in the schema</param>
+        /// <param name="fieldName">The name of the attribute or child element</param>
+        /// <returns>True if the field is the object's ID</returns>
+        private bool IsOwnIdField(TableSchema schema, string fieldName)
+        {
+            return schema != null && schema.IdField != null &&
+                string.Equals(schema.IdField, fieldName, StringComparison.OrdinalIgnoreCase);
+        }
+
+        /// <summary>
+        /// Builds a canonical representation of an XML node, in which attributes
+        /// are sorted by name and insignificant whitespace and comments are ignored,
+        /// so that formatting differences (ex: from pretty-printing) don't cause an
+        /// object to be treated as changed.  For objects in the schema, the object's
+        /// own ID is left out, and references to other objects are replaced by their
+        /// names; fields nested deeper in an object are represented as they are.
+        /// </summary>
+        /// <param name="node">The node to represent</param>
+        /// <param name="schema">The schema of the object's table, if the node is an object in the schema; otherwise null</param>
+        /// <param name="index">The IDs of the objects in the file</param>
+        /// <param name="sb">The builder to which the representation is appended</param>
+        private void AppendCanonicalXml(XmlNode node, TableSchema schema, IdIndex index, StringBuilder sb)
+        {
+            if (node.NodeType == XmlNodeType.Text || node.NodeType == XmlNodeType.CDATA)
+            {
+                string text = node.Value.Trim();
+                if (text.Length > 0)
+                {
+                    sb.Append(System.Security.SecurityElement.Escape(text));
+                }
+                return;
+            }
+            if (node.NodeType != XmlNodeType.Element)
+            {
+                return;
+            }
+
+            SortedDictionary<string, string> attributes = new SortedDictionary<string, string>(StringComparer.Ordinal);
+            foreach (XmlAttribute attribute in node.Attributes)
+            {
+                if (IsOwnIdField(schema, attribute.Name))
+                {
+                    continue;
+                }
+                attributes[attribute.Name] = NormalizeReference(schema, attribute.Name, attribute.Value, index);
+            }
+
+            sb.Append("<").Append(node.Name);
+            foreach (KeyValuePair<string, string> attribute in attributes)
+            {
+                sb.Append(" ").Append(attribute.Key).Append("=\"");
+                sb.Append(System.Security.SecurityElement.Escape(attribute.Value)).Append("\"");
+            }
+            sb.Append(">");
+            foreach (XmlNode child in node.ChildNodes)
+            {
+                if (schema != null && IsValueElement(child))
+                {
+                    if (IsOwnIdField(schema, child.Name))
+                    {
+                        continue;
+                    }
+                    string value = child.InnerText.Trim();
+                    string normalized = NormalizeReference(schema, child.Name, value, index);
+                    if (normalized != value)
+                    {
+                        sb.Append("<").Append(child.Name).Append(">");
+                        sb.Append(System.Security.SecurityElement.Escape(normalized));
+                        sb.Append("</").Append(child.Name).Append(">");
+                        continue;
+                    }
+                }
+                AppendCanonicalXml(child, null, index, sb);
+            }
+            sb.Append("</").Append(node.Name).Append(">");
+        }
+
+        /// <summary>
+        /// Returns the value of the first of the given attributes or child elements
+        /// found on a configuration object, or null if it has none of them
+        /// </summary>
+        /// <param name="node">The XML element describing the object</param>
+        /// <param name="fieldNames">The names of the fields to look for, in order of preference</param>
+        /// <returns>The field's value</returns>
+        private string GetFieldValue(XmlNode node, params string[] fieldNames)
+        {
+            foreach (string fieldName in fieldNames)
+            {
+                if (fieldName == null)
+                {
+                    continue;
+                }
+                XmlAttribute attribute = node.Attributes[fieldName];
+                if (attribute != null && !string.IsNullOrEmpty(attribute.Value))
+                {
+                    return attribute.Value;
+                }
+                foreach (XmlNode child in node.ChildNodes)
+                {
+                    if (child.NodeType == XmlNodeType.Element && child.Name == fieldName &&
+                        !string.IsNullOrEmpty(child.InnerText.Trim()))
+                    {
+                        return child.InnerText.Trim();
+                    }
+                }
+            }
+            return null;
+        }
+
+        /// <summary>
+        /// Returns the name (or, failing that, the ID) identifying a configuration
+        /// object, or null if it has neither
+        /// </summary>
+        /// <param name="configObject">The object</param>
+        /// <returns>The object's name or ID</returns>
+        private string GetIdentity(ConfigObject configObject)
+        {
+            if (configObject.Schema == null)
+            {
+                return GetFieldValue(configObject.Node, C_IDENTITY_NAMES);
+            }
+            return GetFieldValue(configObject.Node, configObject.Schema.NameField, configObject.Schema.IdField);
+        }
+
+        /// <summary>
+        /// Reads the XML nodes of the configuration objects in a JXL file, one at
+        /// a time.  The reader must be positioned on the file's root element.  An
+        /// element named after one of the tables in the schema is read as a row of
+        /// that table, wherever it appears; any other element directly below the
+        /// root is a section, whose children are read as objects.
+        /// </summary>
+        /// <param name="reader">The reader from which the JXL file is read</param>
+        /// <param name="doc">The document used to build the objects' XML nodes</param>
+        /// <returns>The configuration objects in the file, with only their sections, nodes, and schemas set</returns>
+        private IEnumerable<ConfigObject> ReadObjectNodes(XmlReader reader, XmlDocument doc)
+        {
+            string section = string.Empty;
+            while (!reader.EOF)
+            {
+                TableSchema schema = null;
+                if (reader.NodeType == XmlNodeType.Element && reader.Depth >= 1 &&
+                    (C_SCHEMA.TryGetValue(reader.Name, out schema) || reader.Depth == 2))
+                {
+                    ConfigObject configObject = new ConfigObject();
+                    configObject.Section = reader.Depth == 1 ? string.Empty : section;
+                    configObject.Schema = schema;
+
+                    // Reading the node moves the reader past the end of the element
+                    configObject.Node = doc.ReadNode(reader);
+
+                    yield return configObject;
+                    continue;
+                }
+                if (reader.NodeType == XmlNodeType.Element && reader.Depth == 1)
+                {
+                    section = reader.Name;
+                }
+                reader.Read();
+            }
+        }
+
+        /// <summary>
+        /// Reads the configuration objects from a JXL file, one at a time.  The
+        /// reader must be positioned on the file's root element.
+        /// </summary>
+        /// <param name="reader">The reader from which the JXL file is read</param>
+        /// <param name="doc">The document used to build the objects' XML nodes</param>
+        /// <param name="hasher">The hash algorithm used to compare objects' contents</param>
+        /// <param name="index">The IDs of the objects in the file</param>
+        /// <returns>The configuration objects in the file</returns>
+        private IEnumerable<ConfigObject> ReadConfigObjects(XmlReader reader, XmlDocument doc, HashAlgorithm hasher, IdIndex index)
+        {
+            foreach (ConfigObject configObject in ReadObjectNodes(reader, doc))
+            {
+                XmlNode node = configObject.Node;
+                string section = configObject.Section;
+
+                StringBuilder sb = new StringBuilder();
+                AppendCanonicalXml(node, configObject.Schema, index, sb);
+                byte[] hash = hasher.ComputeHash(Encoding.UTF8.GetBytes(sb.ToString()));
+                configObject.Hash = BitConverter.ToString(hash);
+
+                // Objects without a name or ID (ex: the rows of a cross-reference
+                // table) can only be matched by their contents
+                string identity = GetIdentity(configObject);
+                if (identity == null)
+                {
+                    configObject.Key = section + "/" + node.Name + "#" + configObject.Hash;
+                    configObject.Description = node.Name + " (in " + section + ")";
+                }
+                else
+                {
+                    configObject.Key = section + "/" + node.Name + "/" + identity;
+                    configObject.Description = node.Name + " '" + identity + "'";
+                }
+
+                yield return configObject;
+            }
+        }
+
+        /// <summary>
+        /// Creates a reader for a JXL file, positioned on the file's root element
+        /// </summary>
+        /// <param name="textReader">The source of the JXL file</param>
+        /// <returns>The new reader</returns>
+        private XmlReader CreateJxlReader(TextReader textReader)
+        {
+            XmlReaderSettings settings = new XmlReaderSettings();
+            settings.IgnoreComments = true;
+            settings.IgnoreProcessingInstructions = true;
+            settings.IgnoreWhitespace = true;
+
+            XmlReader reader = XmlReader.Create(textReader, settings);
+            reader.MoveToContent();
+            return reader;
+        }
+
+        /// <summary>
+        /// Opens the target database's configuration, either from the JXL file
+        /// supplied or from a configuration exported from the database
+        /// </summary>
+        /// <param name="targetJxl">The configuration exported from the database, or null to read the target's JXL file</param>
+        /// <returns>A reader for the configuration</returns>
+        private TextReader OpenTargetJxl(string targetJxl)
+        {
+            if (targetJxl != null)
+            {
+                return new StringReader(targetJxl);
+            }
+            return new StreamReader(m_targetJxlPath, Encoding.UTF8, true);
+        }
+
+        /// <summary>
+        /// Reads the ID of each configuration object in a JXL file
+        /// </summary>
+        /// <param name="textReader">The source of the JXL file</param>
+        /// <returns>The IDs of the objects in the file</returns>
+        private IdIndex ReadIdIndex(TextReader textReader)
+        {
+            IdIndex index = new IdIndex();
+            using (XmlReader reader = CreateJxlReader(textReader))
+            {
+                XmlDocument doc = new XmlDocument();
+                foreach (ConfigObject configObject in ReadObjectNodes(reader, doc))
+                {
+                    if (configObject.Schema == null || configObject.Schema.IdField == null)
+                    {
+                        continue;
+                    }
+                    string table = configObject.Schema.Table;
+                    string id = GetFieldValue(configObject.Node, configObject.Schema.IdField);
+                    if (id == null)
+                    {
+                        continue;
+                    }
+                    string identity = GetIdentity(configObject);
+
+                    index.Names[IndexKey(table, id)] = identity;
+                    index.Ids[IndexKey(table, identity)] = id;
+                    index.Objects.Add(new KeyValuePair<string, string>(table, id));
+
+                    long numericId = 0;
+                    long maxId = 0;
+                    if (long.TryParse(id, out numericId) &&
+                        (!index.MaxIds.TryGetValue(table, out maxId) || numericId > maxId))
+                    {
+                        index.MaxIds[table] = numericId;
+                    }
+                }
+            }
+            return index;
+        }
+
+        /// <summary>
+        /// Chooses an ID in the target database for each object that is new in the
+        /// source.  Numeric IDs follow the highest ID in the target's table; GUIDs
+        /// are kept unless the target already uses them, in which case a new GUID
+        /// is generated.
+        /// </summary>
+        /// <param name="sourceIndex">The IDs of the source's objects</param>
+        /// <param name="targetIndex">The IDs of the target's objects</param>
+        /// <returns>A dictionary mapping the table and source ID of each new object to its ID in the target</returns>
+        private Dictionary<string, string> AssignNewIds(IdIndex sourceIndex, IdIndex targetIndex)
+        {
+            Dictionary<string, string> newIds = new Dictionary<string, string>();
+            Dictionary<string, long> maxIds = new Dictionary<string, long>(targetIndex.MaxIds, StringComparer.OrdinalIgnoreCase);
+            foreach (KeyValuePair<string, string> sourceObject in sourceIndex.Objects)
+            {
+                string table = sourceObject.Key;
+                string id = sourceObject.Value;
+                string sourceKey = IndexKey(table, id);
+                if (targetIndex.Ids.ContainsKey(IndexKey(table, sourceIndex.Names[sourceKey])) || newIds.ContainsKey(sourceKey))
+                {
+                    continue;
+                }
+
+                long numericId = 0;
+                Guid guid = Guid.Empty;
+                if (long.TryParse(id, out numericId))
+                {
+                    long maxId = 0;
+                    maxIds.TryGetValue(table, out maxId);
+                    maxIds[table] = maxId + 1;
+                    newIds[sourceKey] = (maxId + 1).ToString();
+                }
+                else if (Guid.TryParse(id, out guid) && targetIndex.Names.ContainsKey(sourceKey))
+                {
+                    string format = id.StartsWith("{") ? "B" : "D";
+                    string newId = Guid.NewGuid().ToString(format);
+                    newIds[sourceKey] = id.ToUpperInvariant() == id ? newId.ToUpperInvariant() : newId;
+                }
+            }
+            return newIds;
+        }
+
+        /// <summary>
+        /// Reads the hash of each configuration object in the target database's
+        /// configuration
+        /// </summary>
+        /// <param name="textReader">The source of the target's JXL file</param>
+        /// <param name="hasher">The hash algorithm used to compare objects' contents</param>
+        /// <param name="targetIndex">The IDs of the target's objects</param>
+        /// <param name="descriptions">Receives the description of each object</param>
+        /// <returns>A dictionary of object keys to hashes</returns>
+        private Dictionary<string, string> ReadTargetHashes(TextReader textReader, HashAlgorithm hasher, IdIndex targetIndex, Dictionary<string, string> descriptions)
+        {
+            Dictionary<string, string> hashes = new Dictionary<string, string>();
+            using (XmlReader reader = CreateJxlReader(textReader))
+            {
+                XmlDocument doc = new XmlDocument();
+                foreach (ConfigObject configObject in ReadConfigObjects(reader, doc, hasher, targetIndex))
+                {
+                    hashes[configObject.Key] = configObject.Hash;
+                    descriptions[configObject.Key] = configObject.Description;
+                }
+            }
+            return hashes;
+        }
+
+        /// <summary>
+        /// Translates a source object's ID, or the ID of an object to which it
+        /// refers, to the corresponding ID in the target database
+        /// </summary>
+        /// <param name="table">The table of the object whose ID is translated</param>
+        /// <param name="id">The ID in the source</param>
+        /// <param name="sourceIndex">The IDs of the source's objects</param>
+        /// <param name="targetIndex">The IDs of the target's objects</param>
+        /// <param name="newIds">The IDs chosen for the objects that are new in the source</param>
+        /// <param name="targetId">Receives the ID in the target</param>
+        /// <returns>False if the ID isn't in the source configuration</returns>
+        private bool TranslateId(
+            string table,
+            string id,
+            IdIndex sourceIndex,
+            IdIndex targetIndex,
+            Dictionary<string, string> newIds,
+            out string targetId)
+        {
+            targetId = id;
+            string name = null;
+            if (!sourceIndex.Names.TryGetValue(IndexKey(table, id), out name))
+            {
+                return false;
+            }
+            if (!targetIndex.Ids.TryGetValue(IndexKey(table, name), out targetId) &&
+                !newIds.TryGetValue(IndexKey(table, id), out targetId))
+            {
+                targetId = id;
+            }
+            return true;
+        }
+
+        /// <summary>
+        /// Translates one of the ID-like fields of an object being imported to the
+        /// target database's IDs.  Fields that can't be translated are left as
+        /// they are, and reported.
+        /// </summary>
+        /// <param name="fieldName">The name of the attribute or child element</param>
+        /// <param name="value">The value in the source</param>
+        /// <param name="configObject">The object being imported</param>
+        /// <param name="sourceIndex">The IDs of the source's objects</param>
+        /// <param name="targetIndex">The IDs of the target's objects</param>
+        /// <param name="newIds">The IDs chosen for the objects that are new in the source</param>
+        /// <param name="unresolved">Receives a description of each field that can't be translated</param>
+        /// <returns>The value in the target</returns>
+        private string RemapField(
+            string fieldName,
+            string value,
+            ConfigObject configObject,
+            IdIndex sourceIndex,
+            IdIndex targetIndex,
+            Dictionary<string, string> newIds,
+            List<string> unresolved)
+        {
+            TableSchema schema = configObject.Schema;
+            string table = null;
+            string targetId = null;
+            string name = null;
+
+            if (!IsIdLike(fieldName) || string.IsNullOrEmpty(value))
+            {
+                return value;
+            }
+            if (schema == null)
+            {
+                unresolved.Add(configObject.Description + ": field " + fieldName +
+                    " is in a table that the tool doesn't know how to translate");
+                return value;
+            }
+            if (IsOwnIdField(schema, fieldName))
+            {
+                TranslateId(schema.Table, value, sourceIndex, targetIndex, newIds, out targetId);
+                if (targetId == value && !targetIndex.Ids.ContainsKey(IndexKey(schema.Table, GetIdentity(configObject))) &&
+                    targetIndex.Names.TryGetValue(IndexKey(schema.Table, value), out name))
+                {
+                    unresolved.Add(configObject.Description + " has ID " + value +
+                        ", which the target database already uses for '" + name + "'");
+                }
+                return targetId;
+            }
+            if (schema.References.TryGetValue(fieldName, out table))
+            {
+                if (!TranslateId(table, value, sourceIndex, targetIndex, newIds, out targetId))
+                {
+                    unresolved.Add(configObject.Description + ": " + fieldName + " refers to " + table + " " +
+                        value + ", which is not in the source configuration");
+                }
+                return targetId;
+            }
+            if (!schema.OtherIdFields.Contains(fieldName))
+            {
+                unresolved.Add(configObject.Description + ": field " + fieldName +
+                    " looks like an ID, but the tool doesn't know what it refers to");
+            }
+            return value;
+        }
+
+        /// <summary>
+        /// Translates the ID-like fields of an object being imported (its own ID
+        /// and its references to other objects) to the target database's IDs
+        /// </summary>
+        /// <param name="configObject">The object being imported</param>
+        /// <param name="sourceIndex">The IDs of the source's objects</param>
+        /// <param name="targetIndex">The IDs of the target's objects</param>
+        /// <param name="newIds">The IDs chosen for the objects that are new in the source</param>
+        /// <param name="unresolved">Receives a description of each field that can't be translated</param>
+        private void RemapIds(
+            ConfigObject configObject,
+            IdIndex sourceIndex,
+            IdIndex targetIndex,
+            Dictionary<string, string> newIds,
+            List<string> unresolved)
+        {
+            XmlNode node = configObject.Node;
+            foreach (XmlAttribute attribute in node.Attributes)
+            {
+                attribute.Value = RemapField(
+                    attribute.Name, attribute.Value, configObject, sourceIndex, targetIndex, newIds, unresolved);
+            }
+            foreach (XmlNode child in node.ChildNodes)
+            {
+                if (IsValueElement(child))
+                {
+                    string value = child.InnerText.Trim();
+                    string targetValue = RemapField(
+                        child.Name, value, configObject, sourceIndex, targetIndex, newIds, unresolved);
+                    if (targetValue != value)
+                    {
+                        child.InnerText = targetValue;
+                    }
+                }
+            }
+        }
+
+        /// <summary>
+        /// Compares the source configuration with the target's, reporting each
+        /// difference.  Returns a JXL document containing only those objects that
+        /// are new in the source or that differ from the target's, with their IDs
+        /// translated to the target's; the document's sections appear in the same
+        /// order as in the source.
+        /// </summary>
+        /// <param name="textReader">The source of the source's JXL file</param>
+        /// <param name="hasher">The hash algorithm used to compare objects' contents</param>
+        /// <param name="sourceIndex">The IDs of the source's objects</param>
+        /// <param name="targetIndex">The IDs of the target's objects</param>
+        /// <param name="newIds">The IDs chosen for the objects that are new in the source</param>
+        /// <param name="targetHashes">The hash of each of the target's objects; the objects found in the source are removed</param>
+        /// <param name="unresolved">Receives a description of each ID that can't be translated</param>
+        /// <param name="msgs">The messages object to which differences are reported</param>
+        /// <returns>The JXL document containing the changed objects</returns>
+        private XmlDocument BuildChangesDocument(
+            TextReader textReader,
+            HashAlgorithm hasher,
+            IdIndex sourceIndex,
+            IdIndex targetIndex,
+            Dictionary<string, string> newIds,
+            Dictionary<string, string> targetHashes,
+            List<string> unresolved,
+            IGPMessages msgs)
+        {
+            XmlDocument changes = new XmlDocument();
+            using (XmlReader reader = CreateJxlReader(textReader))
+            {
+                // Copy the source's root element, along with its attributes
+                XmlElement root = changes.CreateElement(reader.Name);
+                if (reader.MoveToFirstAttribute())
+                {
+                    do
+                    {
+                        root.SetAttribute(reader.Name, reader.Value);
+                    }
+                    while (reader.MoveToNextAttribute());
+                    reader.MoveToElement();
+                }
+                changes.AppendChild(changes.CreateXmlDeclaration("1.0", "utf-8", null));
+                changes.AppendChild(root);
+
+                XmlElement sectionElement = null;
+                foreach (ConfigObject configObject in ReadConfigObjects(reader, changes, hasher, sourceIndex))
+                {
+                    string targetHash = null;
+                    if (targetHashes.TryGetValue(configObject.Key, out targetHash))
+                    {
+                        targetHashes.Remove(configObject.Key);
+                        if (targetHash == configObject.Hash)
+                        {
+                            continue;
+                        }
+                        msgs.AddMessage("Changed: " + configObject.Description);
+                    }
+                    else
+                    {
+                        msgs.AddMessage("New: " + configObject.Description);
+                    }
+
+                    RemapIds(configObject, sourceIndex, targetIndex, newIds, unresolved);
+                    m_numObjectsChanged++;
+
+                    // Rows of the tables in the schema may appear directly below the root
+                    if (configObject.Section.Length == 0)
+                    {
+                        root.AppendChild(configObject.Node);
+                        continue;
+                    }
+                    if (sectionElement == null || sectionElement.Name != configObject.Section)
+                    {
+                        sectionElement = root[configObject.Section];
+                        if (sectionElement == null)
+                        {
+                            sectionElement = changes.CreateElement(configObject.Section);
+                            root.AppendChild(sectionElement);
+                        }
+                    }
+                    sectionElement.AppendChild(configObject.Node);
+                }
+            }
+            return changes;
+        }
+        #endregion
+
+        /// <summary>
+        /// Required by IGPFunction2 interface.
+        /// </summary>
+        public override IArray ParameterInfo
+        {
+            get
+            {
+                m_parameters = new ArrayClass();
+
+                IGPParameterEdit3 paramEdit = null;
+                IGPCodedValueDomain cvDomain = null;
+
+                // JXL file parameters (the configuration to be promoted, and optionally
+                // a current export of the target database's configuration)
+                IGPFileDomain jxlFileDomain = new GPFileDomainClass();
+                jxlFileDomain.AddType("jxl");
+
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeRequired,
+                    Properties.Resources.DESC_PC_SOURCE_JXL,
+                    C_PARAM_SOURCE_JXL,
+                    new DEFileTypeClass() as IGPDataType,
+                    null);
+                paramEdit.Domain = jxlFileDomain as IGPDomain;
+                m_parameters.Add(paramEdit);
+
+                jxlFileDomain = new GPFileDomainClass();
+                jxlFileDomain.AddType("jxl");
+
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_PC_TARGET_JXL,
+                    C_PARAM_TARGET_JXL,
+                    new DEFileTypeClass() as IGPDataType,
+                    null);
+                paramEdit.Domain = jxlFileDomain as IGPDomain;
+                m_parameters.Add(paramEdit);
+
+                // Optional parameter indicating whether the changes should only be
+                // reported, rather than applied
+                cvDomain = new GPCodedValueDomainClass();
+                cvDomain.AddCode(GpTrue, C_OPT_DRY_RUN);
+                cvDomain.AddCode(GpFalse, C_OPT_APPLY_CHANGES);
+
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_PC_DRY_RUN,
+                    C_PARAM_DRY_RUN,
+                    GpBooleanType,
+                    ToGpBoolean(C_DEFAULT_DRY_RUN));
+                paramEdit.Domain = cvDomain as IGPDomain;
+                m_parameters.Add(paramEdit);
+
+                // Optional output JXL file containing only the changed objects
+                jxlFileDomain = new GPFileDomainClass();
+                jxlFileDomain.AddType("jxl");
+
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionOutput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_PC_CHANGES_JXL,
+                    C_PARAM_OUT_CHANGES_JXL,
+                    new DEFileTypeClass() as IGPDataType,
+                    null);
+                paramEdit.Domain = jxlFileDomain as IGPDomain;
+                m_parameters.Add(paramEdit);
+
+                // Parameter for specifying the WMX database
+                m_parameters.Add(BuildWmxDbParameter());
+
+                // Parameter indicating the number of configuration objects changed
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionOutput,
+                    esriGPParameterType.esriGPParameterTypeDerived,
+                    Properties.Resources.DESC_PC_NUM_OBJECTS_CHANGED,
+                    C_PARAM_OUT_NUM_CHANGED,
+                    new GPLongTypeClass(),
+                    null);
+                m_parameters.Add(paramEdit);
+
+                return m_parameters;
+            }
+        }
+
+        /// <summary>
+        /// Required by IGPFunction2 interface; this function is called when the GP tool is ready to be executed.
+        /// </summary>
+        /// <param name="paramValues"></param>
+        /// <param name="trackCancel"></param>
+        /// <param name="envMgr"></param>
+        /// <param name="msgs"></param>
+        public override void Execute(IArray paramValues, ITrackCancel trackCancel, IGPEnvironmentManager envMgr, IGPMessages msgs)
+        {
+            // Do some common error-checking
+            base.Execute(paramValues, trackCancel, envMgr, msgs);
+
+            m_numObjectsChanged = 0;
+            IJTXTransfer transfer = WmxDatabase as IJTXTransfer;
+
+            try
+            {
+                // Ensure that the current user has admin access to the current Workflow Manager DB
+                if (!m_dryRun && !CurrentUserIsWmxAdministrator())
+                {
+                    throw new WmauException(WmauErrorCodes.C_USER_NOT_ADMIN_ERROR);
+                }
+
+                // Read the target's current configuration, from the database unless
+                // an export was supplied
+                string targetJxl = null;
+                if (string.IsNullOrEmpty(m_targetJxlPath))
+                {
+                    msgs.AddMessage("Retrieving configuration from Workflow Manager database...");
+                    targetJxl = transfer.ExportConfiguration();
+                }
+
+                // Each file is read twice: once to find the objects' IDs, so that
+                // references between objects can be compared by name, and once to
+                // compare the objects themselves
+                Dictionary<string, string> targetDescriptions = new Dictionary<string, string>();
+                Dictionary<string, string> targetHashes = null;
+                List<string> unresolved = new List<string>();
+                XmlDocument changes = null;
+                using (SHA1 hasher = new SHA1CryptoServiceProvider())
+                {
+                    IdIndex targetIndex = null;
+                    using (TextReader targetReader = OpenTargetJxl(targetJxl))
+                    {
+                        targetIndex = ReadIdIndex(targetReader);
+                    }
+                    using (TextReader targetReader = OpenTargetJxl(targetJxl))
+                    {
+                        targetHashes = ReadTargetHashes(targetReader, hasher, targetIndex, targetDescriptions);
+                    }
+
+                    msgs.AddMessage("Comparing with " + m_sourceJxlPath + "...");
+                    IdIndex sourceIndex = null;
+                    using (StreamReader sourceReader = new StreamReader(m_sourceJxlPath, Encoding.UTF8, true))
+                    {
+                        sourceIndex = ReadIdIndex(sourceReader);
+                    }
+                    Dictionary<string, string> newIds = AssignNewIds(sourceIndex, targetIndex);
+                    using (StreamReader sourceReader = new StreamReader(m_sourceJxlPath, Encoding.UTF8, true))
+                    {
+                        changes = BuildChangesDocument(sourceReader, hasher, sourceIndex, targetIndex, newIds, targetHashes, unresolved, msgs);
+                    }
+                }
+
+                foreach (string problem in unresolved)
+                {
+                    msgs.AddWarning("Can't translate: " + problem);
+                }
+
+                // Objects missing from the source are left alone, since importing a
+                // configuration never removes anything from a database
+                foreach (string key in targetHashes.Keys)
+                {
+                    msgs.AddWarning("Only in target (not removed): " + targetDescriptions[key]);
+                }
+
+                msgs.AddMessage(m_numObjectsChanged.ToString() + " configuration object(s) new or changed; " +
+                    targetHashes.Count.ToString() + " only in target");
+
+                if (!string.IsNullOrEmpty(m_changesJxlPath))
+                {
+                    using (XmlTextWriter writer = new XmlTextWriter(m_changesJxlPath, Encoding.UTF8))
+                    {
+                        writer.Formatting = Formatting.Indented;
+                        changes.Save(writer);
+                    }
+                    msgs.AddMessage("Changes written to " + m_changesJxlPath);
+                }
+
+                if (m_dryRun)
+                {
+                    msgs.AddMessage("Dry run; no changes were made to the Workflow Manager database");
+                }
+                else if (unresolved.Count > 0)
+                {
+                    // Importing objects with IDs that may point at the wrong objects
+                    // (or at nothing) could corrupt the target's configuration
+                    throw new WmauException(WmauErrorCodes.C_CONFIG_UNRESOLVED_REFERENCE_ERROR);
+                }
+                else if (m_numObjectsChanged > 0)
+                {
+                    msgs.AddMessage("Importing changes into Workflow Manager database...");
+                    transfer.ImportConfiguration(changes.OuterXml);
+                }
+
+                // Set the output parameters
+                WmauParameterMap paramMap = new WmauParameterMap(paramValues);
+                IGPParameterEdit3 outParamEdit = paramMap.GetParamEdit(C_PARAM_OUT_NUM_CHANGED);
+                IGPLong outValue = new GPLongClass();
+                outValue.Value = m_numObjectsChanged;
+                outParamEdit.Value = outValue as IGPValue;
+
+                msgs.AddMessage(Properties.Resources.MSG_DONE);
+            }
+            catch (WmauException wmEx)
+            {
+                try
+                {
+                    msgs.AddError(wmEx.ErrorCodeAsInt, wmEx.Message);
+                }
+                catch
+                {
+                    // Catch anything else that possibly happens
+                }
+            }
+            catch (Exception ex)
+            {
+                try
+                {
+                    WmauError error = new WmauError(WmauErrorCodes.C_CONFIG_PROMOTION_ERROR);
+                    msgs.AddError(error.ErrorCodeAsInt, error.Message + "; " + ex.Message);
+                }
+                catch
+                {
+                    // Catch anything else that possibly happens
+                }
+            }
+        }
+    }
+}
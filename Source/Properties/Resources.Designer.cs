@@ -132,6 +132,87 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Folder containing a subfolder of files for each job.
+        /// </summary>
+        internal static string DESC_AAJS_ATTACHMENT_FOLDER {
+            get {
+                return ResourceManager.GetString("DESC_AAJS_ATTACHMENT_FOLDER", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Table listing the files to attach to each job.
+        /// </summary>
+        internal static string DESC_AAJS_ATTACHMENT_TABLE {
+            get {
+                return ResourceManager.GetString("DESC_AAJS_ATTACHMENT_TABLE", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to How the files should be attached to the jobs.
+        /// </summary>
+        internal static string DESC_AAJS_ATTACHMENT_TYPE {
+            get {
+                return ResourceManager.GetString("DESC_AAJS_ATTACHMENT_TYPE", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Number of jobs to load and update at a time.
+        /// </summary>
+        internal static string DESC_AAJS_BATCH_SIZE {
+            get {
+                return ResourceManager.GetString("DESC_AAJS_BATCH_SIZE", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Field in the table holding the job IDs.
+        /// </summary>
+        internal static string DESC_AAJS_JOB_ID_FIELD {
+            get {
+                return ResourceManager.GetString("DESC_AAJS_JOB_ID_FIELD", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Link to files whose contents have already been uploaded (or embed every file).
+        /// </summary>
+        internal static string DESC_AAJS_LINK_DUPLICATES {
+            get {
+                return ResourceManager.GetString("DESC_AAJS_LINK_DUPLICATES", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Number of attachments added (output).
+        /// </summary>
+        internal static string DESC_AAJS_NUM_ATTACHMENTS_ADDED {
+            get {
+                return ResourceManager.GetString("DESC_AAJS_NUM_ATTACHMENTS_ADDED", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Number of attachments that could not be added (output).
+        /// </summary>
+        internal static string DESC_AAJS_NUM_ATTACHMENTS_FAILED {
+            get {
+                return ResourceManager.GetString("DESC_AAJS_NUM_ATTACHMENTS_FAILED", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Field in the table holding the paths of the files.
+        /// </summary>
+        internal static string DESC_AAJS_PATH_FIELD {
+            get {
+                return ResourceManager.GetString("DESC_AAJS_PATH_FIELD", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to File to be attached to the job.
         /// </summary>
@@ -357,6 +438,69 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to User or group name of assignee.
+        /// </summary>
+        internal static string DESC_AJS_ASSIGNEE {
+            get {
+                return ResourceManager.GetString("DESC_AJS_ASSIGNEE", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Type of assignment to make.
+        /// </summary>
+        internal static string DESC_AJS_ASSIGNEE_TYPE {
+            get {
+                return ResourceManager.GetString("DESC_AJS_ASSIGNEE_TYPE", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Number of jobs to load and assign at a time.
+        /// </summary>
+        internal static string DESC_AJS_BATCH_SIZE {
+            get {
+                return ResourceManager.GetString("DESC_AJS_BATCH_SIZE", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to IDs of jobs to assign.
+        /// </summary>
+        internal static string DESC_AJS_JOB_IDS {
+            get {
+                return ResourceManager.GetString("DESC_AJS_JOB_IDS", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Number of jobs assigned (output).
+        /// </summary>
+        internal static string DESC_AJS_NUM_JOBS_ASSIGNED {
+            get {
+                return ResourceManager.GetString("DESC_AJS_NUM_JOBS_ASSIGNED", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Number of jobs that could not be assigned (output).
+        /// </summary>
+        internal static string DESC_AJS_NUM_JOBS_FAILED {
+            get {
+                return ResourceManager.GetString("DESC_AJS_NUM_JOBS_FAILED", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to SQL query selecting additional jobs to assign (runs against the JTX_JOBS table).
+        /// </summary>
+        internal static string DESC_AJS_SQL_QUERY_FILTER {
+            get {
+                return ResourceManager.GetString("DESC_AJS_SQL_QUERY_FILTER", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to User or group name of assignee.
         /// </summary>
@@ -555,6 +699,69 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Number of jobs to load and update at a time.
+        /// </summary>
+        internal static string DESC_CLJS_BATCH_SIZE {
+            get {
+                return ResourceManager.GetString("DESC_CLJS_BATCH_SIZE", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Close the jobs (or only add comments to them).
+        /// </summary>
+        internal static string DESC_CLJS_CLOSE_JOBS {
+            get {
+                return ResourceManager.GetString("DESC_CLJS_CLOSE_JOBS", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Comment to add to each job (optional).
+        /// </summary>
+        internal static string DESC_CLJS_COMMENT {
+            get {
+                return ResourceManager.GetString("DESC_CLJS_COMMENT", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to IDs of jobs to close (or comment on).
+        /// </summary>
+        internal static string DESC_CLJS_JOB_IDS {
+            get {
+                return ResourceManager.GetString("DESC_CLJS_JOB_IDS", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Number of jobs that could not be updated (output).
+        /// </summary>
+        internal static string DESC_CLJS_NUM_JOBS_FAILED {
+            get {
+                return ResourceManager.GetString("DESC_CLJS_NUM_JOBS_FAILED", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Number of jobs updated (output).
+        /// </summary>
+        internal static string DESC_CLJS_NUM_JOBS_UPDATED {
+            get {
+                return ResourceManager.GetString("DESC_CLJS_NUM_JOBS_UPDATED", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Name of a public query selecting additional jobs.
+        /// </summary>
+        internal static string DESC_CLJS_QUERY_NAME {
+            get {
+                return ResourceManager.GetString("DESC_CLJS_QUERY_NAME", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to ID of job that was closed (output).
         /// </summary>
@@ -708,6 +915,33 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to File listing the versions queued for deletion (optional).
+        /// </summary>
+        internal static string DESC_CUDJV_CLEANUP_QUEUE {
+            get {
+                return ResourceManager.GetString("DESC_CUDJV_CLEANUP_QUEUE", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Number of versions deleted (output).
+        /// </summary>
+        internal static string DESC_CUDJV_NUM_VERSIONS_DELETED {
+            get {
+                return ResourceManager.GetString("DESC_CUDJV_NUM_VERSIONS_DELETED", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Number of versions still queued for deletion (output).
+        /// </summary>
+        internal static string DESC_CUDJV_NUM_VERSIONS_REMAINING {
+            get {
+                return ResourceManager.GetString("DESC_CUDJV_NUM_VERSIONS_REMAINING", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to Name of data workspace to be deleted.
         /// </summary>
@@ -762,6 +996,78 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Number of jobs to load and delete at a time.
+        /// </summary>
+        internal static string DESC_DJBQ_BATCH_SIZE {
+            get {
+                return ResourceManager.GetString("DESC_DJBQ_BATCH_SIZE", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Path to {0} table (must match the default WMX DB location).
+        /// </summary>
+        internal static string DESC_DJBQ_JOBS_TABLE_1 {
+            get {
+                return ResourceManager.GetString("DESC_DJBQ_JOBS_TABLE_1", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Number of jobs deleted (output).
+        /// </summary>
+        internal static string DESC_DJBQ_NUM_JOBS_DELETED {
+            get {
+                return ResourceManager.GetString("DESC_DJBQ_NUM_JOBS_DELETED", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Number of jobs that could not be deleted (output).
+        /// </summary>
+        internal static string DESC_DJBQ_NUM_JOBS_FAILED {
+            get {
+                return ResourceManager.GetString("DESC_DJBQ_NUM_JOBS_FAILED", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Preview changes (list the matching jobs, but do not actually delete them).
+        /// </summary>
+        internal static string DESC_DJBQ_PREVIEW_CHANGES {
+            get {
+                return ResourceManager.GetString("DESC_DJBQ_PREVIEW_CHANGES", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to SQL query (runs against the {0} table); all matching jobs will be deleted.
+        /// </summary>
+        internal static string DESC_DJBQ_SQL_QUERY_FILTER_1 {
+            get {
+                return ResourceManager.GetString("DESC_DJBQ_SQL_QUERY_FILTER_1", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to File in which to queue the job's version (optional).
+        /// </summary>
+        internal static string DESC_DJ_CLEANUP_QUEUE {
+            get {
+                return ResourceManager.GetString("DESC_DJ_CLEANUP_QUEUE", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Queue the job's version to be deleted later (or delete it now).
+        /// </summary>
+        internal static string DESC_DJ_DEFER_VERSION_CLEANUP {
+            get {
+                return ResourceManager.GetString("DESC_DJ_DEFER_VERSION_CLEANUP", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to ID of job that was deleted (output).
         /// </summary>
@@ -798,6 +1104,15 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Use local cache.
+        /// </summary>
+        internal static string DESC_DMXD_USE_LOCAL_CACHE {
+            get {
+                return ResourceManager.GetString("DESC_DMXD_USE_LOCAL_CACHE", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to List of orphaned types for which to check.
         /// </summary>
@@ -834,6 +1149,15 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Use local cache.
+        /// </summary>
+        internal static string DESC_DTAM_USE_LOCAL_CACHE {
+            get {
+                return ResourceManager.GetString("DESC_DTAM_USE_LOCAL_CACHE", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to Target Workbook (path to output Task Assistant workbook XML file).
         /// </summary>
@@ -843,6 +1167,33 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Only export if the configuration has changed.
+        /// </summary>
+        internal static string DESC_ECS_ONLY_IF_CHANGED {
+            get {
+                return ResourceManager.GetString("DESC_ECS_ONLY_IF_CHANGED", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Snapshot updated.
+        /// </summary>
+        internal static string DESC_ECS_OUT_SNAPSHOT_UPDATED {
+            get {
+                return ResourceManager.GetString("DESC_ECS_OUT_SNAPSHOT_UPDATED", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Snapshot file.
+        /// </summary>
+        internal static string DESC_ECS_SNAPSHOT_FILE {
+            get {
+                return ResourceManager.GetString("DESC_ECS_SNAPSHOT_FILE", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to Target workbook (Microsoft Excel).
         /// </summary>
@@ -852,6 +1203,42 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Folder in which to write the exported files.
+        /// </summary>
+        internal static string DESC_EJFA_EXPORT_FOLDER {
+            get {
+                return ResourceManager.GetString("DESC_EJFA_EXPORT_FOLDER", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Path to {0} table (must match the default WMX DB location).
+        /// </summary>
+        internal static string DESC_EJFA_JOBS_TABLE_1 {
+            get {
+                return ResourceManager.GetString("DESC_EJFA_JOBS_TABLE_1", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Number of jobs exported (output).
+        /// </summary>
+        internal static string DESC_EJFA_NUM_JOBS_EXPORTED {
+            get {
+                return ResourceManager.GetString("DESC_EJFA_NUM_JOBS_EXPORTED", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to SQL query (runs against the {0} table); if not specified, all jobs will be exported.
+        /// </summary>
+        internal static string DESC_EJFA_SQL_QUERY_FILTER_1 {
+            get {
+                return ResourceManager.GetString("DESC_EJFA_SQL_QUERY_FILTER_1", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to ID of job to execute.
         /// </summary>
@@ -870,6 +1257,15 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to File of users and groups to use in place of the AD (LDIF or JSON) (optional).
+        /// </summary>
+        internal static string DESC_IADC_DIRECTORY_FILE {
+            get {
+                return ResourceManager.GetString("DESC_IADC_DIRECTORY_FILE", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to AD group containing the full list of Workflow Manager groups (which themselves contain user assignments).
         /// </summary>
@@ -906,6 +1302,15 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Only write the users, groups and memberships that differ from the AD (optional).
+        /// </summary>
+        internal static string DESC_IADC_SYNC_CHANGES_ONLY {
+            get {
+                return ResourceManager.GetString("DESC_IADC_SYNC_CHANGES_ONLY", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to AD group containing the full list of Workflow Manager users.
         /// </summary>
@@ -915,6 +1320,33 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Text file or job ID set (.npy) to which the job IDs will be written (optional).
+        /// </summary>
+        internal static string DESC_LJUQ_OUT_JOB_ID_FILE {
+            get {
+                return ResourceManager.GetString("DESC_LJUQ_OUT_JOB_ID_FILE", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Table to which the job IDs will be written (optional).
+        /// </summary>
+        internal static string DESC_LJUQ_OUT_JOB_ID_TABLE {
+            get {
+                return ResourceManager.GetString("DESC_LJUQ_OUT_JOB_ID_TABLE", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Summarize messages (log only the number of jobs found, rather than each job).
+        /// </summary>
+        internal static string DESC_LJUQ_SUMMARIZE_MESSAGES {
+            get {
+                return ResourceManager.GetString("DESC_LJUQ_SUMMARIZE_MESSAGES", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to Job ID List.
         /// </summary>
@@ -933,6 +1365,15 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Text file or job ID set (.npy) to which the job IDs will be written (optional).
+        /// </summary>
+        internal static string DESC_LJ_OUT_JOB_ID_FILE {
+            get {
+                return ResourceManager.GetString("DESC_LJ_OUT_JOB_ID_FILE", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to SQL query (runs against the {0} table).
         /// </summary>
@@ -1077,6 +1518,51 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to JXL file to which the new and changed configuration objects are written.
+        /// </summary>
+        internal static string DESC_PC_CHANGES_JXL {
+            get {
+                return ResourceManager.GetString("DESC_PC_CHANGES_JXL", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Report the changes without applying them.
+        /// </summary>
+        internal static string DESC_PC_DRY_RUN {
+            get {
+                return ResourceManager.GetString("DESC_PC_DRY_RUN", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Number of configuration objects new or changed (output).
+        /// </summary>
+        internal static string DESC_PC_NUM_OBJECTS_CHANGED {
+            get {
+                return ResourceManager.GetString("DESC_PC_NUM_OBJECTS_CHANGED", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to JXL file containing the configuration to be promoted.
+        /// </summary>
+        internal static string DESC_PC_SOURCE_JXL {
+            get {
+                return ResourceManager.GetString("DESC_PC_SOURCE_JXL", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to JXL file exported from the target database (if not specified, the target's configuration is exported from the database).
+        /// </summary>
+        internal static string DESC_PC_TARGET_JXL {
+            get {
+                return ResourceManager.GetString("DESC_PC_TARGET_JXL", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to List of potential problems for which to check.
         /// </summary>
@@ -1086,6 +1572,15 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Issues file (CSV or JSON lines) (optional).
+        /// </summary>
+        internal static string DESC_RPE_OUT_ISSUES_FILE {
+            get {
+                return ResourceManager.GetString("DESC_RPE_OUT_ISSUES_FILE", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to Location of a text file to which problem descriptions will be written.
         /// </summary>
@@ -1104,6 +1599,15 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Results file (optional).
+        /// </summary>
+        internal static string DESC_RPE_RESULTS_FILE {
+            get {
+                return ResourceManager.GetString("DESC_RPE_RESULTS_FILE", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to Default data workspace for this job type.
         /// </summary>
@@ -1311,6 +1815,15 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to The job ID or file path field was not found in the attachment table.
+        /// </summary>
+        internal static string ERROR_ATTACHMENT_FIELD_NOT_FOUND {
+            get {
+                return ResourceManager.GetString("ERROR_ATTACHMENT_FIELD_NOT_FOUND", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to The specified job cannot be closed at this time.
         /// </summary>
@@ -1320,6 +1833,42 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Problem reading or writing the deferred version cleanup queue.
+        /// </summary>
+        internal static string ERROR_CLEANUP_QUEUE {
+            get {
+                return ResourceManager.GetString("ERROR_CLEANUP_QUEUE", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Error promoting the Workflow Manager configuration.
+        /// </summary>
+        internal static string ERROR_CONFIG_PROMOTION {
+            get {
+                return ResourceManager.GetString("ERROR_CONFIG_PROMOTION", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Error taking a snapshot of the Workflow Manager configuration.
+        /// </summary>
+        internal static string ERROR_CONFIG_SNAPSHOT {
+            get {
+                return ResourceManager.GetString("ERROR_CONFIG_SNAPSHOT", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Some of the IDs in the configuration objects could not be translated to the target database's IDs; no changes were imported.
+        /// </summary>
+        internal static string ERROR_CONFIG_UNRESOLVED_REFERENCE {
+            get {
+                return ResourceManager.GetString("ERROR_CONFIG_UNRESOLVED_REFERENCE", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to Problem creating the job.
         /// </summary>
@@ -1365,6 +1914,15 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Error reading users and groups from the directory.
+        /// </summary>
+        internal static string ERROR_DIRECTORY_SOURCE {
+            get {
+                return ResourceManager.GetString("ERROR_DIRECTORY_SOURCE", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to Due date cannot be earlier than the start date.
         /// </summary>
@@ -1410,6 +1968,24 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Specified group not found in Workflow Manager database.
+        /// </summary>
+        internal static string ERROR_GROUP_NOT_FOUND {
+            get {
+                return ResourceManager.GetString("ERROR_GROUP_NOT_FOUND", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Batch size must be greater than zero.
+        /// </summary>
+        internal static string ERROR_INVALID_BATCH_SIZE {
+            get {
+                return ResourceManager.GetString("ERROR_INVALID_BATCH_SIZE", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to Specified Workflow Manager database is invalid or inaccessible.
         /// </summary>
@@ -1437,6 +2013,15 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Error exporting jobs.
+        /// </summary>
+        internal static string ERROR_JOB_EXPORT {
+            get {
+                return ResourceManager.GetString("ERROR_JOB_EXPORT", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to Could not get an int value from the retrieved job ID; is a Workflow Manager table corrupt?.
         /// </summary>
@@ -1509,6 +2094,15 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Either a table listing attachments or a folder of attachments must be specified.
+        /// </summary>
+        internal static string ERROR_NO_ATTACHMENTS_SPECIFIED {
+            get {
+                return ResourceManager.GetString("ERROR_NO_ATTACHMENTS_SPECIFIED", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to Current user does not have permission to close jobs.
         /// </summary>
@@ -1536,6 +2130,33 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Current user does not have permission to delete job versions.
+        /// </summary>
+        internal static string ERROR_NO_DELETE_VERSION_PRIVILEGE {
+            get {
+                return ResourceManager.GetString("ERROR_NO_DELETE_VERSION_PRIVILEGE", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Either a list of job IDs or a query selecting jobs must be specified.
+        /// </summary>
+        internal static string ERROR_NO_JOBS_SPECIFIED {
+            get {
+                return ResourceManager.GetString("ERROR_NO_JOBS_SPECIFIED", resourceCulture);
+            }
+        }
+        
+        /// <summary>
+        ///   Looks up a localized string similar to Either a comment must be specified or the jobs must be closed.
+        /// </summary>
+        internal static string ERROR_NO_JOB_CHANGES_SPECIFIED {
+            get {
+                return ResourceManager.GetString("ERROR_NO_JOB_CHANGES_SPECIFIED", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to Current user does not have permission to add/remove job attachments.
         /// </summary>
@@ -1707,6 +2328,15 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Add Attachments to Jobs.
+        /// </summary>
+        internal static string TOOL_ADD_ATTACHMENTS_TO_JOBS {
+            get {
+                return ResourceManager.GetString("TOOL_ADD_ATTACHMENTS_TO_JOBS", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to Add Attachment to Job.
         /// </summary>
@@ -1743,6 +2373,15 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Assign Jobs.
+        /// </summary>
+        internal static string TOOL_ASSIGN_JOBS {
+            get {
+                return ResourceManager.GetString("TOOL_ASSIGN_JOBS", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to Backup Workflow Manager Database.
         /// </summary>
@@ -1752,6 +2391,15 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Clean Up Deleted Job Versions.
+        /// </summary>
+        internal static string TOOL_CLEAN_UP_DELETED_JOB_VERSIONS {
+            get {
+                return ResourceManager.GetString("TOOL_CLEAN_UP_DELETED_JOB_VERSIONS", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to Close Job.
         /// </summary>
@@ -1761,6 +2409,15 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Close Jobs.
+        /// </summary>
+        internal static string TOOL_CLOSE_JOBS {
+            get {
+                return ResourceManager.GetString("TOOL_CLOSE_JOBS", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to Create Data Workspaces from Excel Spreadsheet.
         /// </summary>
@@ -1815,6 +2472,15 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Delete Jobs by Query.
+        /// </summary>
+        internal static string TOOL_DELETE_JOBS_BY_QUERY {
+            get {
+                return ResourceManager.GetString("TOOL_DELETE_JOBS_BY_QUERY", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to Delete Map Document.
         /// </summary>
@@ -1869,6 +2535,15 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Export Configuration Snapshot.
+        /// </summary>
+        internal static string TOOL_EXPORT_CONFIGURATION_SNAPSHOT {
+            get {
+                return ResourceManager.GetString("TOOL_EXPORT_CONFIGURATION_SNAPSHOT", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to Export Data Workspaces to Excel Spreadsheet.
         /// </summary>
@@ -1878,6 +2553,15 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Export Jobs for Analysis.
+        /// </summary>
+        internal static string TOOL_EXPORT_JOBS_FOR_ANALYSIS {
+            get {
+                return ResourceManager.GetString("TOOL_EXPORT_JOBS_FOR_ANALYSIS", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to Import Active Directory Configuration.
         /// </summary>
@@ -1959,6 +2643,15 @@ namespace WorkflowManagerAdministrationUtilities.Properties {
             }
         }
         
+        /// <summary>
+        ///   Looks up a localized string similar to Promote Workflow Manager Configuration.
+        /// </summary>
+        internal static string TOOL_PROMOTE_CONFIGURATION {
+            get {
+                return ResourceManager.GetString("TOOL_PROMOTE_CONFIGURATION", resourceCulture);
+            }
+        }
+        
         /// <summary>
         ///   Looks up a localized string similar to Report Possible Errors.
         /// </summary>
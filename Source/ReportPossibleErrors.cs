@@ -10,10 +10,14 @@
 //limitations under the License.​
 
 using System;
+using System.Collections.Concurrent;
 using System.Collections.Generic;
 using System.IO;
 using System.Linq;
+using System.Runtime.ExceptionServices;
 using System.Text;
+using System.Threading;
+using System.Threading.Tasks;
 
 using ESRI.ArcGIS.ADF;
 using ESRI.ArcGIS.DataSourcesFile;
@@ -28,10 +32,182 @@ namespace WorkflowManagerAdministrationUtilities
 {
     class ReportPossibleErrors : WmauAbstractGpFunction
     {
+        #region Helper classes
+        /// <summary>
+        /// Helper class used to store the details of a user that are checked
+        /// </summary>
+        private class UserInfo
+        {
+            public string Name = string.Empty;
+            public string FullName = string.Empty;
+            public string Email = string.Empty;
+            public int NumGroups = 0;
+        }
+
+        /// <summary>
+        /// Helper class used to store the details of a group that are checked
+        /// </summary>
+        private class GroupInfo
+        {
+            public string Name = string.Empty;
+            public string Email = string.Empty;
+            public int NumPrivileges = 0;
+            public int NumUsers = 0;
+        }
+
+        /// <summary>
+        /// Helper class used to store the details of a job type that are checked
+        /// </summary>
+        private class JobTypeInfo
+        {
+            public string Name = string.Empty;
+            public jtxAssignmentType AssignedType = jtxAssignmentType.jtxAssignmentTypeUnassigned;
+            public string AssignedTo = string.Empty;
+            public bool HasWorkflow = false;
+            public bool HasAoiMap = false;
+            public bool HasJobMap = false;
+            public jtxJobTypeState State = jtxJobTypeState.jtxJobTypeStateActive;
+        }
+
+        /// <summary>
+        /// Helper class used to store the details of a workflow step that are checked
+        /// </summary>
+        private class StepInfo
+        {
+            public int Id = 0;
+            public string Name = string.Empty;
+            public jtxAssignmentType AssignedType = jtxAssignmentType.jtxAssignmentTypeUnassigned;
+            public string AssignedTo = string.Empty;
+            public double DefaultPercComplete = 0.0;
+            public string StepTypeName = null;
+        }
+
+        /// <summary>
+        /// Helper class used to store the steps of a workflow
+        /// </summary>
+        private class WorkflowInfo
+        {
+            public string Name = string.Empty;
+            public List<StepInfo> Steps = new List<StepInfo>();
+        }
+
+        /// <summary>
+        /// Helper class used to store the fields of a job that are checked
+        /// </summary>
+        private class JobInfo
+        {
+            public int Id = 0;
+            public string Name = string.Empty;
+            public bool HasJobType = true;
+            public int ParentId = -1;
+            public jtxAssignmentType AssignedType = jtxAssignmentType.jtxAssignmentTypeUnassigned;
+            public string AssignedTo = string.Empty;
+            public int Stage = -1;
+        }
+
+        /// <summary>
+        /// A read-only copy of the parts of the Workflow Manager configuration that
+        /// are checked; safe to share between threads once it has been built.  The
+        /// items are sorted by name, to make the output easier to read/follow.
+        /// </summary>
+        private class ConfigurationSnapshot
+        {
+            public SortedList<string, UserInfo> Users = new SortedList<string, UserInfo>();
+            public SortedList<string, GroupInfo> Groups = new SortedList<string, GroupInfo>();
+            public SortedList<string, JobTypeInfo> JobTypes = new SortedList<string, JobTypeInfo>();
+            public SortedList<string, WorkflowInfo> Workflows = new SortedList<string, WorkflowInfo>();
+
+            // Used to look up assignments
+            public HashSet<string> UserNames = new HashSet<string>();
+            public HashSet<string> GroupNames = new HashSet<string>();
+        }
+
+        /// <summary>
+        /// Writes the issues found to a machine-readable file, one issue per line;
+        /// the file is written as CSV if its extension is ".csv", and as JSON lines
+        /// otherwise.  Issues are written as they're found, through a fixed-size
+        /// buffer.
+        /// </summary>
+        private class IssueWriter : IDisposable
+        {
+            private StreamWriter m_writer = null;
+            private bool m_isCsv = false;
+
+            public IssueWriter(string path)
+            {
+                m_isCsv = Path.GetExtension(path).Equals(C_EXT_CSV, StringComparison.OrdinalIgnoreCase);
+                m_writer = new StreamWriter(path, false, new UTF8Encoding(false), C_OUTPUT_BUFFER_SIZE);
+                if (m_isCsv)
+                {
+                    m_writer.WriteLine("STATUS,CHECK,ENTITY,MESSAGE");
+                }
+            }
+
+            /// <summary>
+            /// Writes a single issue
+            /// </summary>
+            /// <param name="status">
+            /// Whether the issue has been added, resolved or is unchanged since the
+            /// previous run; empty if not checking incrementally
+            /// </param>
+            /// <param name="issue">The issue</param>
+            public void Write(string status, Common.WmauCheckResults.Issue issue)
+            {
+                if (m_isCsv)
+                {
+                    m_writer.WriteLine(EscapeCsv(status) + "," + EscapeCsv(issue.Check) + "," +
+                        EscapeCsv(issue.EntityKey) + "," + EscapeCsv(issue.Message));
+                }
+                else
+                {
+                    m_writer.WriteLine("{\"status\": " + Common.WmauHelperFunctions.EscapeJson(status) + ", \"check\": " + Common.WmauHelperFunctions.EscapeJson(issue.Check) +
+                        ", \"entity\": " + Common.WmauHelperFunctions.EscapeJson(issue.EntityKey) + ", \"message\": " + Common.WmauHelperFunctions.EscapeJson(issue.Message) + "}");
+                }
+            }
+
+            public void Dispose()
+            {
+                m_writer.Close();
+            }
+
+            /// <summary>
+            /// Quotes a value for a CSV file, if needed
+            /// </summary>
+            /// <param name="value">The value to be written</param>
+            /// <returns>The value as it should appear in the file</returns>
+            private static string EscapeCsv(string value)
+            {
+                if (value.IndexOfAny(new char[] { ',', '"', '\r', '\n' }) < 0)
+                {
+                    return value;
+                }
+                return "\"" + value.Replace("\"", "\"\"") + "\"";
+            }
+        }
+        #endregion
+
         #region Constants
         private const string C_PARAM_CHECKLIST = "in_mvString_checklist";
         private const string C_PARAM_OUT_LOG_FILE_PATH = "out_file_logFilePath";
         private const string C_PARAM_OUT_ISSUES_FOUND = "out_long_numIssuesFound";
+        private const string C_PARAM_RESULTS_FILE = "in_file_resultsFile";
+        private const string C_PARAM_OUT_ISSUES_FILE = "out_file_issuesFile";
+
+        private const string C_FIELD_PARENT_JOB = "PARENT_JOB";
+        private const string C_FIELD_ASSIGNED_TYPE = "ASSIGNED_TYPE";
+        private const string C_FIELD_ASSIGNED_TO = "ASSIGNED_TO";
+
+        private const string C_EXT_CSV = ".csv";
+        private const string C_STATUS_ADDED = "ADDED";
+        private const string C_STATUS_RESOLVED = "RESOLVED";
+        private const string C_STATUS_UNCHANGED = "UNCHANGED";
+
+        // Limits on how much is held in memory at once
+        private const int C_ISSUE_QUEUE_CAPACITY = 1000;
+        private const int C_QUEUE_POLL_INTERVAL_MS = 100;
+        private const int C_OUTPUT_BUFFER_SIZE = 65536;
+        private const int C_MAX_ISSUE_MESSAGES = 1000;
+        private const int C_PROGRESS_INTERVAL = 10000;
 
         private const string C_OPT_DIFF_STEP_NAMES = "DIFFERING_STEP_NAMES";
         private const string C_OPT_GROUPS_WITHOUT_EMAILS = "GROUPS_WITHOUT_EMAILS";
@@ -90,6 +266,27 @@ namespace WorkflowManagerAdministrationUtilities
         private bool m_flagZeroPctSteps;
 
         private string m_logFilePath = string.Empty;
+        private string m_resultsFilePath = string.Empty;
+        private string m_issuesFilePath = string.Empty;
+
+        // State shared by the checks while the tool runs
+        private ConfigurationSnapshot m_snapshot = null;
+        private BlockingCollection<Common.WmauCheckResults.Issue> m_issueQueue = null;
+        private CancellationTokenSource m_cancelSource = null;
+        private IssueWriter m_issuesWriter = null;
+        private int m_numIssuesFound = 0;
+        private int m_numIssueMessages = 0;
+        private bool m_cancelled = false;
+
+        // State used when only the entities that have changed since the previous
+        // run are checked; null when every entity is checked
+        private Common.WmauCheckResults m_previousResults = null;
+        private Common.WmauCheckResults m_currentResults = null;
+        private Dictionary<string, List<Common.WmauCheckResults.Issue>> m_previousIssuesByEntity = null;
+        private HashSet<string> m_changedPrincipals = null;
+        private int m_numEntitiesChecked = 0;
+        private int m_numEntitiesSkipped = 0;
+        private object m_resultsLock = new object();
         #endregion
 
         #region SimpleAccessors
@@ -231,204 +428,624 @@ namespace WorkflowManagerAdministrationUtilities
 
             param = paramMap.GetParam(C_PARAM_OUT_LOG_FILE_PATH);
             m_logFilePath = param.Value.GetAsText();
+
+            param = paramMap.GetParam(C_PARAM_RESULTS_FILE);
+            m_resultsFilePath = param.Value.GetAsText();
+
+            param = paramMap.GetParam(C_PARAM_OUT_ISSUES_FILE);
+            m_issuesFilePath = param.Value.GetAsText();
         }
 
         /// <summary>
-        /// Helper function that runs all of those checks that operate on each user group;
-        /// intended to make the checks slightly more efficient by running them all at once
-        /// rather than looping through all of the elements multiple times
+        /// Builds a string describing the database and the checks being run, so
+        /// that the results of runs with different options aren't compared
         /// </summary>
-        /// <param name="msgs">Add any GP messages to this object</param>
-        /// <param name="errorCount">Counter used to track the number of problems found</param>
-        /// <param name="logFileWriter">Object used to write error descriptions to a text file</param>
-        private void ExecuteGroupChecks(IGPMessages msgs, ref int errorCount, StreamWriter logFileWriter)
+        /// <returns>The description</returns>
+        private string GetResultsOptions()
         {
-            // Check for groups w/o privileges
-            if (!m_flagGroupsWithoutPrivileges &&
-                !m_flagGroupsWithoutEmails &&
-                !m_flagGroupsWithoutUsers)
-            {
-                return;
-            }
+            List<string> checks = new List<string>();
+            if (m_flagDifferingStepNames) { checks.Add(C_OPT_DIFF_STEP_NAMES); }
+            if (m_flagGroupsWithoutEmails) { checks.Add(C_OPT_GROUPS_WITHOUT_EMAILS); }
+            if (m_flagGroupsWithoutPrivileges) { checks.Add(C_OPT_GROUPS_WITHOUT_PRIVILEGES); }
+            if (m_flagGroupsWithoutUsers) { checks.Add(C_OPT_GROUPS_WITHOUT_USERS); }
+            if (m_flagInvalidJobAssign) { checks.Add(C_OPT_INVALID_JOB_ASSIGN); }
+            if (m_flagInvalidJobTypeAssign) { checks.Add(C_OPT_INVALID_JOB_TYPE_ASSIGN); }
+            if (m_flagInvalidStepAssign) { checks.Add(C_OPT_INVALID_STEP_ASSIGN); }
+            if (m_flagIsSelfParent) { checks.Add(C_OPT_IS_SELF_PARENT); }
+            if (m_flagJobsWithoutTypes) { checks.Add(C_OPT_JOBS_WITHOUT_TYPES); }
+            if (m_flagJobTypesWithoutWorkflows) { checks.Add(C_OPT_JOB_TYPES_WITHOUT_WORKFLOWS); }
+            if (m_flagMissingAoiMxds) { checks.Add(C_OPT_MISSING_AOI_MXDS); }
+            if (m_flagMissingBaseMxds) { checks.Add(C_OPT_MISSING_BASE_MXDS); }
+            if (m_flagNonActiveJobTypes) { checks.Add(C_OPT_NON_ACTIVE_JOB_TYPES); }
+            if (m_flagUnassignedSteps) { checks.Add(C_OPT_UNASSIGNED_STEPS); }
+            if (m_flagUsersWithoutEmails) { checks.Add(C_OPT_USERS_WITHOUT_EMAILS); }
+            if (m_flagUsersWithoutGroups) { checks.Add(C_OPT_USERS_WITHOUT_GROUPS); }
+            if (m_flagZeroPctSteps) { checks.Add(C_OPT_ZERO_PCT_STEPS); }
+
+            return this.WmxDatabase.Alias + "|" + string.Join(",", checks.ToArray());
+        }
 
+        /// <summary>
+        /// Takes a copy of those parts of the Workflow Manager configuration that are
+        /// checked.  The Workflow Manager objects can only be used from the thread
+        /// on which the tool runs, so the checks against the configuration work from
+        /// this copy instead, which lets them run on other threads.
+        /// </summary>
+        /// <returns>The snapshot</returns>
+        private ConfigurationSnapshot TakeConfigurationSnapshot()
+        {
             IJTXConfiguration3 configMgr = this.WmxDatabase.ConfigurationManager as IJTXConfiguration3;
-            IJTXConfigurationEdit2 configEdit = configMgr as IJTXConfigurationEdit2;
+            ConfigurationSnapshot snapshot = new ConfigurationSnapshot();
+
+            // The users and groups are always needed, to look up assignments
+            IJTXUserSet allUsers = configMgr.Users;
+            for (int i = 0; i < allUsers.Count; i++)
+            {
+                IJTXUser3 user = allUsers.get_Item(i) as IJTXUser3;
+                UserInfo info = new UserInfo();
+                info.Name = user.UserName;
+                info.FullName = user.FullName;
+                info.Email = user.Email;
+                info.NumGroups = user.Groups.Count;
+                snapshot.Users[info.Name] = info;
+                snapshot.UserNames.Add(info.Name);
+            }
 
-            // Put the items into a sorted list in order to make the output easier to
-            // read/follow
             IJTXUserGroupSet allGroups = configMgr.UserGroups;
-            SortedList<string, IJTXUserGroup2> allGroupsSorted = new SortedList<string, IJTXUserGroup2>();
             for (int i = 0; i < allGroups.Count; i++)
             {
-                allGroupsSorted[allGroups.get_Item(i).Name] = allGroups.get_Item(i) as IJTXUserGroup2;
+                IJTXUserGroup2 group = allGroups.get_Item(i) as IJTXUserGroup2;
+                GroupInfo info = new GroupInfo();
+                info.Name = group.Name;
+                info.Email = group.Email;
+                info.NumPrivileges = group.Privileges.Count;
+                info.NumUsers = group.Users.Count;
+                snapshot.Groups[info.Name] = info;
+                snapshot.GroupNames.Add(info.Name);
             }
 
-            // Iterate over each group, performing the specified checks
-            foreach (IJTXUserGroup2 group in allGroupsSorted.Values)
+            if (m_flagInvalidJobTypeAssign ||
+                m_flagJobTypesWithoutWorkflows ||
+                m_flagMissingAoiMxds ||
+                m_flagMissingBaseMxds ||
+                m_flagNonActiveJobTypes)
             {
-                if (m_flagGroupsWithoutPrivileges)
+                IJTXJobTypeSet allJobTypes = configMgr.JobTypes;
+                for (int i = 0; i < allJobTypes.Count; i++)
                 {
-                    if (group.Privileges.Count < 1)
+                    IJTXJobType3 jobType = allJobTypes.get_Item(i) as IJTXJobType3;
+                    JobTypeInfo info = new JobTypeInfo();
+                    info.Name = jobType.Name;
+                    info.AssignedType = jobType.DefaultAssignedType;
+                    info.AssignedTo = jobType.DefaultAssignedTo;
+                    info.HasWorkflow = jobType.Workflow != null;
+                    info.HasAoiMap = jobType.AOIMap != null;
+                    info.HasJobMap = jobType.JobMap != null;
+                    info.State = jobType.State;
+                    snapshot.JobTypes[info.Name] = info;
+                }
+            }
+
+            if (m_flagInvalidStepAssign ||
+                m_flagUnassignedSteps ||
+                m_flagZeroPctSteps ||
+                m_flagDifferingStepNames)
+            {
+                Dictionary<int, string> stepTypeNames = new Dictionary<int, string>();
+                IJTXWorkflowSet allWorkflows = configMgr.Workflows;
+                for (int i = 0; i < allWorkflows.Count; i++)
+                {
+                    IJTXWorkflow workflow = allWorkflows.get_Item(i);
+                    IJTXWorkflowConfiguration workflowCfg = workflow as IJTXWorkflowConfiguration;
+                    WorkflowInfo info = new WorkflowInfo();
+                    info.Name = workflow.Name;
+
+                    foreach (int j in workflowCfg.GetAllSteps())
                     {
-                        string message = "Group '" + group.Name + "' has no associated privileges";
-                        RecordMessage(message, msgs, logFileWriter);
-                        errorCount++;
+                        IJTXStep3 step = workflowCfg.GetStep(j) as IJTXStep3;
+                        StepInfo stepInfo = new StepInfo();
+                        stepInfo.Id = j;
+                        stepInfo.Name = step.StepName;
+                        stepInfo.AssignedType = step.AssignedType;
+                        stepInfo.AssignedTo = step.AssignedTo;
+                        stepInfo.DefaultPercComplete = step.DefaultPercComplete;
+
+                        string stepTypeName = null;
+                        if (!stepTypeNames.TryGetValue(step.StepTypeID, out stepTypeName))
+                        {
+                            IJTXStepType2 stepType = configMgr.GetStepTypeByID(step.StepTypeID) as IJTXStepType2;
+                            stepTypeName = stepType == null ? null : stepType.Name;
+                            stepTypeNames[step.StepTypeID] = stepTypeName;
+                        }
+                        stepInfo.StepTypeName = stepTypeName;
+                        info.Steps.Add(stepInfo);
                     }
+                    snapshot.Workflows[info.Name] = info;
                 }
+            }
 
-                if (m_flagGroupsWithoutEmails)
+            return snapshot;
+        }
+
+        /// <summary>
+        /// Prepares to check only the entities that have changed since the run that
+        /// produced the results file.  The users and groups that have been added or
+        /// removed since then are noted, so that anything assigned to them can be
+        /// checked again.
+        /// </summary>
+        /// <param name="msgs">Add any GP messages to this object</param>
+        private void BeginIncrementalCheck(IGPMessages msgs)
+        {
+            m_currentResults = new Common.WmauCheckResults();
+            m_currentResults.Options = GetResultsOptions();
+
+            foreach (string userName in m_snapshot.UserNames)
+            {
+                m_currentResults.Principals.Add(Common.WmauCheckResults.PrincipalKey(false, userName));
+            }
+            foreach (string groupName in m_snapshot.GroupNames)
+            {
+                m_currentResults.Principals.Add(Common.WmauCheckResults.PrincipalKey(true, groupName));
+            }
+
+            m_previousResults = Common.WmauCheckResults.Load(m_resultsFilePath);
+            if (m_previousResults == null)
+            {
+                msgs.AddMessage("No previous results found; checking everything");
+                m_previousResults = new Common.WmauCheckResults();
+            }
+            else if (m_previousResults.Options != m_currentResults.Options)
+            {
+                msgs.AddMessage("Previous results were for a different database or set of checks; checking everything");
+                m_previousResults = new Common.WmauCheckResults();
+            }
+
+            m_previousIssuesByEntity = m_previousResults.GetIssuesByEntity();
+            m_changedPrincipals = new HashSet<string>(m_currentResults.Principals);
+            m_changedPrincipals.SymmetricExceptWith(m_previousResults.Principals);
+        }
+
+        /// <summary>
+        /// Builds the key identifying the user or group to which something is
+        /// assigned, if it's assigned to either
+        /// </summary>
+        /// <param name="assignedType">The type of assignment</param>
+        /// <param name="assignedTo">The name of the user or group</param>
+        /// <returns>The key; null if not assigned to a user or group</returns>
+        private string GetAssigneeKey(jtxAssignmentType assignedType, string assignedTo)
+        {
+            if (assignedType == jtxAssignmentType.jtxAssignmentTypeUser)
+            {
+                return Common.WmauCheckResults.PrincipalKey(false, assignedTo);
+            }
+            else if (assignedType == jtxAssignmentType.jtxAssignmentTypeGroup)
+            {
+                return Common.WmauCheckResults.PrincipalKey(true, assignedTo);
+            }
+            return null;
+        }
+
+        /// <summary>
+        /// Determines whether an assignment refers to a user or group that doesn't exist
+        /// </summary>
+        /// <param name="assignedType">The type of assignment</param>
+        /// <param name="assignedTo">The name of the user or group</param>
+        /// <returns>
+        /// "user" or "group" if the assignment is to an unknown user or group; null if
+        /// the assignment is valid
+        /// </returns>
+        private string GetUnknownAssigneeType(jtxAssignmentType assignedType, string assignedTo)
+        {
+            if (assignedType == jtxAssignmentType.jtxAssignmentTypeUser && !m_snapshot.UserNames.Contains(assignedTo))
+            {
+                return "user";
+            }
+            else if (assignedType == jtxAssignmentType.jtxAssignmentTypeGroup && !m_snapshot.GroupNames.Contains(assignedTo))
+            {
+                return "group";
+            }
+            return null;
+        }
+
+        /// <summary>
+        /// Determines whether an entity must be checked.  When checking incrementally,
+        /// an entity is skipped if its fingerprint is the same as in the previous run
+        /// and none of the users or groups to which it's assigned have been added or
+        /// removed since then; its earlier findings from the given checks are carried
+        /// forward instead.  May be called from any of the threads running checks.
+        /// </summary>
+        /// <param name="entityKey">The key identifying the entity</param>
+        /// <param name="state">A string describing everything about the entity that is checked</param>
+        /// <param name="assigneeKeys">The keys of the users and groups to which the entity is assigned</param>
+        /// <param name="checks">The checks that would be run against the entity</param>
+        /// <returns>True if the entity must be checked, false otherwise</returns>
+        private bool NeedsCheck(string entityKey, string state, ICollection<string> assigneeKeys, string[] checks)
+        {
+            if (m_currentResults == null)
+            {
+                return true;
+            }
+
+            string fingerprint = Common.WmauCheckResults.ComputeFingerprint(state);
+            lock (m_resultsLock)
+            {
+                m_currentResults.Fingerprints[entityKey] = fingerprint;
+
+                string previousFingerprint = null;
+                bool changed = !m_previousResults.Fingerprints.TryGetValue(entityKey, out previousFingerprint) ||
+                    previousFingerprint != fingerprint;
+                if (!changed)
                 {
-                    if (group.Email == null || group.Email.Equals(string.Empty))
+                    foreach (string assigneeKey in assigneeKeys)
                     {
-                        string message = "Group '" + group.Name + "' has no associated e-mail address";
-                        RecordMessage(message, msgs, logFileWriter);
-                        errorCount++;
+                        if (assigneeKey != null && m_changedPrincipals.Contains(assigneeKey))
+                        {
+                            changed = true;
+                            break;
+                        }
                     }
                 }
 
-                if (m_flagGroupsWithoutUsers)
+                if (changed)
+                {
+                    m_numEntitiesChecked++;
+                    return true;
+                }
+
+                List<Common.WmauCheckResults.Issue> previousIssues = null;
+                if (m_previousIssuesByEntity.TryGetValue(entityKey, out previousIssues))
                 {
-                    if (group.Users.Count <= 0)
+                    foreach (Common.WmauCheckResults.Issue issue in previousIssues)
                     {
-                        string message = "Group '" + group.Name + "' has no users assigned to it";
-                        RecordMessage(message, msgs, logFileWriter);
-                        errorCount++;
+                        if (Array.IndexOf(checks, issue.Check) >= 0)
+                        {
+                            m_currentResults.Issues.Add(issue);
+                        }
                     }
                 }
+                m_numEntitiesSkipped++;
+                return false;
             }
         }
 
         /// <summary>
-        /// Helper function that runs all of those checks that operate on each job; intended
-        /// to make the checks slightly more efficient by running through them all at once
-        /// rather than looping through all of the elements multiple times
+        /// Passes an issue found by one of the checks running on another thread back
+        /// to the tool's thread.  Blocks if the tool's thread has fallen behind, so
+        /// that the number of issues waiting to be reported stays bounded.
         /// </summary>
-        /// <param name="msgs">Add any GP messages to this object</param>
-        /// <param name="errorCount">Counter used to track the number of problems found</param>
-        /// <param name="logFileWriter">Object used to write error descriptions to a text file</param>
-        private void ExecuteJobChecks(IGPMessages msgs, ref int errorCount, StreamWriter logFileWriter)
+        /// <param name="check">The check that found the issue</param>
+        /// <param name="entityKey">The key identifying the entity with the issue</param>
+        /// <param name="message">A description of the issue</param>
+        private void QueueIssue(string check, string entityKey, string message)
         {
-            // Only continue executing this function if needed
-            if (!m_flagInvalidJobAssign &&
-                !m_flagIsSelfParent &&
-                !m_flagJobsWithoutTypes)
+            m_issueQueue.Add(new Common.WmauCheckResults.Issue(check, entityKey, message), m_cancelSource.Token);
+        }
+
+        /// <summary>
+        /// Reports an issue found by one of the checks.  When checking incrementally,
+        /// the issue is only recorded here, and reported later (see ReportChanges()),
+        /// once it's known whether it was found by the previous run.
+        /// </summary>
+        /// <param name="issue">The issue</param>
+        /// <param name="msgs">The IGPMessages object to which the message will be written</param>
+        /// <param name="writer">An optional StreamWriter object (opened log file)</param>
+        private void ReportIssue(Common.WmauCheckResults.Issue issue, IGPMessages msgs, StreamWriter writer)
+        {
+            if (m_currentResults != null)
             {
+                lock (m_resultsLock)
+                {
+                    m_currentResults.Issues.Add(issue);
+                }
                 return;
             }
-            
-            IJTXConfiguration3 configMgr = this.WmxDatabase.ConfigurationManager as IJTXConfiguration3;
-            IJTXConfigurationEdit2 configEdit = configMgr as IJTXConfigurationEdit2;
-            IJTXJobManager jobMgr = this.WmxDatabase.JobManager;
 
-            // Use a database query as an alternate way of finding certain specific
-            // problems with jobs.  Declare some of these ComReleaser objects to help
-            // ensure that cursors, etc., are immediately released after they go out
-            // of scope.
+            m_numIssuesFound++;
+            if (m_issuesWriter != null)
+            {
+                m_issuesWriter.Write(string.Empty, issue);
+            }
+            RecordIssueMessage(issue.Message, msgs, writer);
+        }
 
-            // Check for jobs without any job types set (should be a DB error)
-            if (m_flagJobsWithoutTypes)
+        /// <summary>
+        /// Reports any issues that the checks running on other threads have found so
+        /// far, without waiting for any more
+        /// </summary>
+        /// <param name="msgs">The IGPMessages object to which the messages will be written</param>
+        /// <param name="writer">An optional StreamWriter object (opened log file)</param>
+        private void ReportQueuedIssues(IGPMessages msgs, StreamWriter writer)
+        {
+            Common.WmauCheckResults.Issue issue = null;
+            while (m_issueQueue.TryTake(out issue))
             {
-                using (ComReleaser cr1 = new ComReleaser(), cr2 = new ComReleaser())
+                ReportIssue(issue, msgs, writer);
+            }
+        }
+
+        /// <summary>
+        /// Reports the issues found by the checks running on other threads as they
+        /// arrive, until all of those checks have finished
+        /// </summary>
+        /// <param name="tasks">The checks running on other threads</param>
+        /// <param name="msgs">The IGPMessages object to which the messages will be written</param>
+        /// <param name="writer">An optional StreamWriter object (opened log file)</param>
+        private void WaitForChecks(List<Task> tasks, IGPMessages msgs, StreamWriter writer)
+        {
+            while (true)
+            {
+                Common.WmauCheckResults.Issue issue = null;
+                if (m_issueQueue.TryTake(out issue, C_QUEUE_POLL_INTERVAL_MS))
                 {
-                    IFeatureWorkspace featureWorkspace = this.WmxDatabase.JTXWorkspace as IFeatureWorkspace;
+                    ReportIssue(issue, msgs, writer);
+                    continue;
+                }
 
-                    // Get the name of the correct table from the jobs workspace, so
-                    // that the table doesn't have to be owned by the connecting user.
-                    string tableName = Common.WmauHelperFunctions.GetQualifiedTableName(Constants.JTX_TABLE_JTX_JOBS_TABLE, this.WmxDatabase.JTXWorkspace);
+                // Each check queues its issues before it finishes, so once they've
+                // all finished, the queue only needs to be emptied
+                bool allFinished = true;
+                foreach (Task task in tasks)
+                {
+                    allFinished = allFinished && task.IsCompleted;
+                }
+                if (allFinished && m_issueQueue.Count == 0)
+                {
+                    break;
+                }
+            }
 
-                    ITable jobsTable = featureWorkspace.OpenTable(tableName);
-                    cr1.ManageLifetime(jobsTable);
+            // Pass along the first error from any check that failed
+            try
+            {
+                Task.WaitAll(tasks.ToArray());
+            }
+            catch (AggregateException aggEx)
+            {
+                ExceptionDispatchInfo.Capture(aggEx.Flatten().InnerExceptions[0]).Throw();
+            }
+        }
 
-                    IQueryFilter query = new QueryFilterClass();
-                    query.WhereClause = Constants.FIELD_JOBTYPEID + " IS NULL";
-                    ICursor searchCursor = jobsTable.Search(query, true);
-                    cr2.ManageLifetime(searchCursor);
+        /// <summary>
+        /// Writes the message describing an issue.  If the issues are also being
+        /// written to an output file, only the first few are added to the GP messages,
+        /// so that the messages don't grow without bound; all of them are still
+        /// written to the log file.
+        /// </summary>
+        /// <param name="message">The message to be written</param>
+        /// <param name="msgs">The IGPMessages object to which the message will be written</param>
+        /// <param name="writer">An optional StreamWriter object (opened log file)</param>
+        private void RecordIssueMessage(string message, IGPMessages msgs, StreamWriter writer)
+        {
+            m_numIssueMessages++;
+            if (m_issuesWriter != null && m_numIssueMessages > C_MAX_ISSUE_MESSAGES)
+            {
+                msgs = null;
+            }
+            RecordMessage(message, msgs, writer);
+        }
 
-                    // Store the ID and name of each job matching this query
-                    int idIndex = jobsTable.FindField(Constants.FIELD_JOBID);
-                    int nameIndex = jobsTable.FindField(Constants.FIELD_JOBNAME);
-                    IRow row = null;
-                    while ((row = searchCursor.NextRow()) != null)
+        /// <summary>
+        /// Reports the issues that are new since the previous run and those that have
+        /// been resolved.  Issues that are unchanged are only counted, other than in
+        /// the log file and the output file.
+        /// </summary>
+        /// <param name="msgs">The IGPMessages object to which the messages will be written</param>
+        /// <param name="writer">An optional StreamWriter object (opened log file)</param>
+        private void ReportChanges(IGPMessages msgs, StreamWriter writer)
+        {
+            HashSet<string> previousKeys = new HashSet<string>();
+            foreach (Common.WmauCheckResults.Issue issue in m_previousResults.Issues)
+            {
+                previousKeys.Add(issue.Key);
+            }
+            HashSet<string> currentKeys = new HashSet<string>();
+            foreach (Common.WmauCheckResults.Issue issue in m_currentResults.Issues)
+            {
+                currentKeys.Add(issue.Key);
+            }
+
+            int numAdded = 0;
+            int numUnchanged = 0;
+            int numResolved = 0;
+            foreach (Common.WmauCheckResults.Issue issue in m_currentResults.Issues)
+            {
+                if (previousKeys.Contains(issue.Key))
+                {
+                    if (writer != null)
                     {
-                        string idStr = row.get_Value(idIndex).ToString();
-                        string nameStr = row.get_Value(nameIndex).ToString();
-                        string msg = "Job " + idStr + " (" + nameStr + ") has no associated job type";
-                        RecordMessage(msg, msgs, logFileWriter);
-                        errorCount++;
+                        writer.WriteLine("Unchanged: " + issue.Message);
                     }
+                    if (m_issuesWriter != null)
+                    {
+                        m_issuesWriter.Write(C_STATUS_UNCHANGED, issue);
+                    }
+                    numUnchanged++;
+                }
+                else
+                {
+                    if (m_issuesWriter != null)
+                    {
+                        m_issuesWriter.Write(C_STATUS_ADDED, issue);
+                    }
+                    RecordIssueMessage("Added: " + issue.Message, msgs, writer);
+                    numAdded++;
                 }
             }
-
-            // Check for jobs that are their own parent job
-            if (m_flagIsSelfParent)
+            foreach (Common.WmauCheckResults.Issue issue in m_previousResults.Issues)
             {
-                using (ComReleaser cr1 = new ComReleaser(), cr2 = new ComReleaser())
+                if (!currentKeys.Contains(issue.Key))
                 {
-                    IFeatureWorkspace featureWorkspace = this.WmxDatabase.JTXWorkspace as IFeatureWorkspace;
+                    if (m_issuesWriter != null)
+                    {
+                        m_issuesWriter.Write(C_STATUS_RESOLVED, issue);
+                    }
+                    RecordIssueMessage("Resolved: " + issue.Message, msgs, writer);
+                    numResolved++;
+                }
+            }
+
+            msgs.AddMessage(String.Format("Checked {0} changed item(s); skipped {1} unchanged item(s)",
+                m_numEntitiesChecked, m_numEntitiesSkipped));
+            msgs.AddMessage(String.Format("{0} issue(s) added, {1} resolved, {2} unchanged",
+                numAdded, numResolved, numUnchanged));
+        }
 
-                    // Get the name of the correct table from the jobs workspace, so
-                    // that the table doesn't have to be owned by the connecting user.
-                    string tableName = Common.WmauHelperFunctions.GetQualifiedTableName(Constants.JTX_TABLE_JTX_JOBS_TABLE, this.WmxDatabase.JTXWorkspace);
+        /// <summary>
+        /// Helper function that runs all of those checks that operate on each group;
+        /// intended to make the checks slightly more efficient by running through them all
+        /// at once rather than looping through all of the elements multiple times.  Runs
+        /// on its own thread, against the configuration snapshot.
+        /// </summary>
+        private void ExecuteGroupChecks()
+        {
+            // Iterate over each group, performing the specified checks
+            string[] groupChecks = { C_OPT_GROUPS_WITHOUT_PRIVILEGES, C_OPT_GROUPS_WITHOUT_EMAILS, C_OPT_GROUPS_WITHOUT_USERS };
+            foreach (GroupInfo group in m_snapshot.Groups.Values)
+            {
+                string entityKey = Common.WmauCheckResults.PrincipalKey(true, group.Name);
+                string state = group.NumPrivileges.ToString() + "|" + group.Email + "|" + group.NumUsers.ToString();
+                if (!NeedsCheck(entityKey, state, new string[0], groupChecks))
+                {
+                    continue;
+                }
 
-                    ITable jobsTable = featureWorkspace.OpenTable(tableName);
-                    cr1.ManageLifetime(jobsTable);
+                if (m_flagGroupsWithoutPrivileges)
+                {
+                    if (group.NumPrivileges < 1)
+                    {
+                        string message = "Group '" + group.Name + "' has no associated privileges";
+                        QueueIssue(C_OPT_GROUPS_WITHOUT_PRIVILEGES, entityKey, message);
+                    }
+                }
 
-                    const string C_FIELD_PARENT_JOB = "PARENT_JOB";
-                    IQueryFilter query = new QueryFilterClass();
-                    query.WhereClause = Constants.FIELD_JOBID + " = " + C_FIELD_PARENT_JOB;
-                    ICursor searchCursor = jobsTable.Search(query, true);
-                    cr2.ManageLifetime(searchCursor);
+                if (m_flagGroupsWithoutEmails)
+                {
+                    if (group.Email == null || group.Email.Equals(string.Empty))
+                    {
+                        string message = "Group '" + group.Name + "' has no associated e-mail address";
+                        QueueIssue(C_OPT_GROUPS_WITHOUT_EMAILS, entityKey, message);
+                    }
+                }
 
-                    // Store the ID and name of each job matching this query
-                    int idIndex = jobsTable.FindField(Constants.FIELD_JOBID);
-                    int nameIndex = jobsTable.FindField(Constants.FIELD_JOBNAME);
-                    IRow row = null;
-                    while ((row = searchCursor.NextRow()) != null)
+                if (m_flagGroupsWithoutUsers)
+                {
+                    if (group.NumUsers <= 0)
                     {
-                        string idStr = row.get_Value(idIndex).ToString();
-                        string nameStr = row.get_Value(nameIndex).ToString();
-                        string msg = "Job " + idStr + " (" + nameStr + ") is its own parent";
-                        RecordMessage(msg, msgs, logFileWriter);
-                        errorCount++;
+                        string message = "Group '" + group.Name + "' has no users assigned to it";
+                        QueueIssue(C_OPT_GROUPS_WITHOUT_USERS, entityKey, message);
                     }
                 }
             }
+        }
 
-            // See if there are any checks selected for which we should iterate through
-            // all of the jobs using the WMX interfaces
+        /// <summary>
+        /// Helper function that runs all of those checks that operate on each job; intended
+        /// to make the checks slightly more efficient by running through them all at once
+        /// rather than looping through all of the elements multiple times.<br/>
+        /// <br/>
+        /// The JOBS table is read directly, once, in job ID order, using a recycling
+        /// cursor over only those fields that are checked; the jobs themselves are not
+        /// loaded.  Runs on the tool's thread, reporting the issues found by the other
+        /// checks as it goes.
+        /// </summary>
+        /// <param name="trackCancel">Used to see whether the user has cancelled the tool</param>
+        /// <param name="msgs">Add any GP messages to this object</param>
+        /// <param name="logFileWriter">Object used to write error descriptions to a text file</param>
+        private void ExecuteJobChecks(ITrackCancel trackCancel, IGPMessages msgs, StreamWriter logFileWriter)
+        {
+            // Only continue executing this function if needed
+            if (!m_flagInvalidJobAssign &&
+                !m_flagIsSelfParent &&
+                !m_flagJobsWithoutTypes)
+            {
+                return;
+            }
+
+            // Only read those jobs that could have one of the problems being checked
+            // for; closed jobs are never flagged for invalid assignments
+            List<string> conditions = new List<string>();
             if (m_flagInvalidJobAssign)
             {
-                // Put the items into a sorted list in order to make the output easier to
-                // read/follow
-                IJTXJobSet allJobs = jobMgr.GetAllJobs();
-                SortedList<int, IJTXJob3> allJobsSorted = new SortedList<int, IJTXJob3>();
-                for (int i = 0; i < allJobs.Count; i++)
-                {
-                    allJobsSorted[allJobs.get_Item(i).ID] = allJobs.get_Item(i) as IJTXJob3;
-                }
+                conditions.Add(Constants.FIELD_STAGE + " IS NULL");
+                conditions.Add(Constants.FIELD_STAGE + " <> " + ((int)jtxJobStage.jtxJobStageClosed).ToString());
+            }
+            if (m_flagJobsWithoutTypes)
+            {
+                conditions.Add(Constants.FIELD_JOBTYPEID + " IS NULL");
+            }
+            if (m_flagIsSelfParent)
+            {
+                conditions.Add(Constants.FIELD_JOBID + " = " + C_FIELD_PARENT_JOB);
+            }
+
+            string[] fieldNames = {
+                Constants.FIELD_JOBID, Constants.FIELD_JOBNAME, Constants.FIELD_JOBTYPEID, C_FIELD_PARENT_JOB,
+                C_FIELD_ASSIGNED_TYPE, C_FIELD_ASSIGNED_TO, Constants.FIELD_STAGE };
 
-                // Iterate over all of the jobs
-                foreach (IJTXJob3 job in allJobsSorted.Values)
+            // Declare some of these ComReleaser objects to help ensure that cursors, etc.,
+            // are immediately released after they go out of scope.
+            using (ComReleaser cr1 = new ComReleaser(), cr2 = new ComReleaser())
+            {
+                IFeatureWorkspace featureWorkspace = this.WmxDatabase.JTXWorkspace as IFeatureWorkspace;
+
+                // Get the name of the correct table from the jobs workspace, so
+                // that the table doesn't have to be owned by the connecting user.
+                string tableName = Common.WmauHelperFunctions.GetQualifiedTableName(Constants.JTX_TABLE_JTX_JOBS_TABLE, this.WmxDatabase.JTXWorkspace);
+
+                ITable jobsTable = featureWorkspace.OpenTable(tableName);
+                cr1.ManageLifetime(jobsTable);
+
+                IQueryFilter query = new QueryFilterClass();
+                IQueryFilterDefinition queryDef = query as IQueryFilterDefinition;
+                query.SubFields = string.Join(",", fieldNames);
+                query.WhereClause = string.Join(" OR ", conditions.ToArray());
+                queryDef.PostfixClause = "ORDER BY " + Constants.FIELD_JOBID;
+
+                ICursor searchCursor = jobsTable.Search(query, true);
+                cr2.ManageLifetime(searchCursor);
+
+                int idIndex = searchCursor.FindField(Constants.FIELD_JOBID);
+                int nameIndex = searchCursor.FindField(Constants.FIELD_JOBNAME);
+                int jobTypeIndex = searchCursor.FindField(Constants.FIELD_JOBTYPEID);
+                int parentIndex = searchCursor.FindField(C_FIELD_PARENT_JOB);
+                int assignedTypeIndex = searchCursor.FindField(C_FIELD_ASSIGNED_TYPE);
+                int assignedToIndex = searchCursor.FindField(C_FIELD_ASSIGNED_TO);
+                int stageIndex = searchCursor.FindField(Constants.FIELD_STAGE);
+
+                int numJobsChecked = 0;
+                IRow row = null;
+                while ((row = searchCursor.NextRow()) != null)
                 {
-                    string assignedTo = job.AssignedTo;
+                    // NOTE: Have seen cases where the JTX_JOBS table contained a row with
+                    // nothing but null attributes; skip these
+                    object idValue = row.get_Value(idIndex);
+                    if (idValue == null || idValue is DBNull)
+                    {
+                        continue;
+                    }
 
-                    // Check for any existing jobs with an invalid job assignment.  NOTE: only
-                    // want to flag jobs that are not closed
-                    if (m_flagInvalidJobAssign && job.Stage != jtxJobStage.jtxJobStageClosed)
+                    JobInfo job = new JobInfo();
+                    job.Id = Convert.ToInt32(idValue);
+                    job.Name = row.get_Value(nameIndex).ToString();
+                    job.HasJobType = !(row.get_Value(jobTypeIndex) is DBNull);
+                    job.ParentId = ToInt(row.get_Value(parentIndex), -1);
+                    job.AssignedType = (jtxAssignmentType)ToInt(row.get_Value(assignedTypeIndex), (int)jtxAssignmentType.jtxAssignmentTypeUnassigned);
+                    job.AssignedTo = row.get_Value(assignedToIndex).ToString();
+                    job.Stage = ToInt(row.get_Value(stageIndex), -1);
+                    CheckJob(job, msgs, logFileWriter);
+
+                    // Keep up with the checks running on other threads
+                    ReportQueuedIssues(msgs, logFileWriter);
+
+                    numJobsChecked++;
+                    if (numJobsChecked % C_PROGRESS_INTERVAL == 0)
                     {
-                        if (job.AssignedType == jtxAssignmentType.jtxAssignmentTypeUser && configMgr.GetUser(assignedTo) == null)
+                        msgs.AddMessage("Checked " + numJobsChecked.ToString() + " job(s)");
+                        if (trackCancel != null && !trackCancel.Continue())
                         {
-                            string message = "Job '" + job.ID.ToString() +
-                                "' assigned to unknown user '" + assignedTo + "'";
-                            RecordMessage(message, msgs, logFileWriter);
-                            errorCount++;
-                        }
-                        else if (job.AssignedType == jtxAssignmentType.jtxAssignmentTypeGroup && configMgr.GetUserGroup(assignedTo) == null)
-                        {
-                            string message = "Job '" + job.ID.ToString() +
-                                "' assigned to unknown group '" + assignedTo + "'";
-                            RecordMessage(message, msgs, logFileWriter);
-                            errorCount++;
+                            msgs.AddWarning("Cancelled; only the first " + numJobsChecked.ToString() + " job(s) were checked");
+                            m_cancelled = true;
+                            break;
                         }
                     }
                 }
@@ -436,86 +1053,125 @@ namespace WorkflowManagerAdministrationUtilities
         }
 
         /// <summary>
-        /// Helper function that runs all of those checks that operate on each job type;
-        /// intended to make the checks slightly more efficient by running through them all
-        /// at once rather than looping through all of the elements multiple times
+        /// Runs the selected checks against a single job
         /// </summary>
+        /// <param name="job">The job, as read from the JOBS table</param>
         /// <param name="msgs">Add any GP messages to this object</param>
-        /// <param name="errorCount">Counter used to track the number of problems found</param>
         /// <param name="logFileWriter">Object used to write error descriptions to a text file</param>
-        private void ExecuteJobTypeChecks(IGPMessages msgs, ref int errorCount, StreamWriter logFileWriter)
+        private void CheckJob(JobInfo job, IGPMessages msgs, StreamWriter logFileWriter)
         {
-            if (!m_flagInvalidJobTypeAssign &&
-                !m_flagJobTypesWithoutWorkflows &&
-                !m_flagMissingAoiMxds &&
-                !m_flagMissingBaseMxds &&
-                !m_flagNonActiveJobTypes)
+            string idStr = job.Id.ToString();
+            string entityKey = "JOB:" + idStr;
+            string state = job.Stage.ToString() + "|" + job.AssignedType.ToString() + "|" + job.AssignedTo + "|" +
+                job.HasJobType.ToString() + "|" + job.ParentId.ToString();
+            string[] jobChecks = { C_OPT_INVALID_JOB_ASSIGN, C_OPT_JOBS_WITHOUT_TYPES, C_OPT_IS_SELF_PARENT };
+            if (!NeedsCheck(entityKey, state, new string[] { GetAssigneeKey(job.AssignedType, job.AssignedTo) }, jobChecks))
             {
                 return;
             }
 
-            IJTXConfiguration3 configMgr = this.WmxDatabase.ConfigurationManager as IJTXConfiguration3;
-            IJTXConfigurationEdit2 configEdit = configMgr as IJTXConfigurationEdit2;
+            // Check for jobs without any job types set (should be a DB error)
+            if (m_flagJobsWithoutTypes && !job.HasJobType)
+            {
+                string message = "Job " + idStr + " (" + job.Name + ") has no associated job type";
+                ReportIssue(new Common.WmauCheckResults.Issue(C_OPT_JOBS_WITHOUT_TYPES, entityKey, message), msgs, logFileWriter);
+            }
+
+            // Check for jobs that are their own parent job
+            if (m_flagIsSelfParent && job.ParentId == job.Id)
+            {
+                string message = "Job " + idStr + " (" + job.Name + ") is its own parent";
+                ReportIssue(new Common.WmauCheckResults.Issue(C_OPT_IS_SELF_PARENT, entityKey, message), msgs, logFileWriter);
+            }
+
+            // Check for any existing jobs with an invalid job assignment.  NOTE: only
+            // want to flag jobs that are not closed
+            if (m_flagInvalidJobAssign && job.Stage != (int)jtxJobStage.jtxJobStageClosed)
+            {
+                string unknownType = GetUnknownAssigneeType(job.AssignedType, job.AssignedTo);
+                if (unknownType != null)
+                {
+                    string message = "Job '" + idStr + "' assigned to unknown " + unknownType + " '" + job.AssignedTo + "'";
+                    ReportIssue(new Common.WmauCheckResults.Issue(C_OPT_INVALID_JOB_ASSIGN, entityKey, message), msgs, logFileWriter);
+                }
+            }
+        }
 
-            // Put the items into a sorted list in order to make the output easier to
-            // read/follow
-            IJTXJobTypeSet allJobTypes = configMgr.JobTypes;
-            SortedList<string, IJTXJobType3> allJobTypesSorted = new SortedList<string, IJTXJobType3>();
-            for (int i = 0; i < allJobTypes.Count; i++)
+        /// <summary>
+        /// Converts a value read from a table into an integer
+        /// </summary>
+        /// <param name="value">The value from the row</param>
+        /// <param name="defaultValue">The value to use if the field is null</param>
+        /// <returns>The value as an integer</returns>
+        private static int ToInt(object value, int defaultValue)
+        {
+            if (value == null || value is DBNull)
             {
-                allJobTypesSorted[allJobTypes.get_Item(i).Name] = allJobTypes.get_Item(i) as IJTXJobType3;
+                return defaultValue;
             }
+            return Convert.ToInt32(value);
+        }
 
+        /// <summary>
+        /// Helper function that runs all of those checks that operate on each job type;
+        /// intended to make the checks slightly more efficient by running through them all
+        /// at once rather than looping through all of the elements multiple times.  Runs
+        /// on its own thread, against the configuration snapshot.
+        /// </summary>
+        private void ExecuteJobTypeChecks()
+        {
             // Iterate through each item
-            foreach (IJTXJobType3 jobType in allJobTypesSorted.Values)
+            string[] jobTypeChecks = {
+                C_OPT_INVALID_JOB_TYPE_ASSIGN, C_OPT_JOB_TYPES_WITHOUT_WORKFLOWS, C_OPT_MISSING_AOI_MXDS,
+                C_OPT_MISSING_BASE_MXDS, C_OPT_NON_ACTIVE_JOB_TYPES };
+            foreach (JobTypeInfo jobType in m_snapshot.JobTypes.Values)
             {
+                string entityKey = "JOB_TYPE:" + jobType.Name;
+                string state = jobType.AssignedType.ToString() + "|" + jobType.AssignedTo + "|" +
+                    (!jobType.HasWorkflow).ToString() + "|" + (!jobType.HasAoiMap).ToString() + "|" +
+                    (!jobType.HasJobMap).ToString() + "|" + jobType.State.ToString();
+                string assigneeKey = GetAssigneeKey(jobType.AssignedType, jobType.AssignedTo);
+                if (!NeedsCheck(entityKey, state, new string[] { assigneeKey }, jobTypeChecks))
+                {
+                    continue;
+                }
+
                 if (m_flagInvalidJobTypeAssign)
                 {
-                    string assignedTo = jobType.DefaultAssignedTo;
-                    if (jobType.DefaultAssignedType == jtxAssignmentType.jtxAssignmentTypeUser && configMgr.GetUser(assignedTo) == null)
-                    {
-                        string message = "Job Type '" + jobType.Name +
-                            "' assigned to unknown user '" + assignedTo + "'";
-                        RecordMessage(message, msgs, logFileWriter);
-                        errorCount++;
-                    }
-                    else if (jobType.DefaultAssignedType == jtxAssignmentType.jtxAssignmentTypeGroup && configMgr.GetUserGroup(assignedTo) == null)
+                    string unknownType = GetUnknownAssigneeType(jobType.AssignedType, jobType.AssignedTo);
+                    if (unknownType != null)
                     {
                         string message = "Job Type '" + jobType.Name +
-                            "' assigned to unknown group '" + assignedTo + "'";
-                        RecordMessage(message, msgs, logFileWriter);
-                        errorCount++;
+                            "' assigned to unknown " + unknownType + " '" + jobType.AssignedTo + "'";
+                        QueueIssue(C_OPT_INVALID_JOB_TYPE_ASSIGN, entityKey, message);
                     }
                 }
 
                 if (m_flagJobTypesWithoutWorkflows)
                 {
-                    if (jobType.Workflow == null)
+                    if (!jobType.HasWorkflow)
                     {
                         string message = "Job Type '" + jobType.Name + "' has no workflow defined";
-                        RecordMessage(message, msgs, logFileWriter);
-                        errorCount++;
+                        QueueIssue(C_OPT_JOB_TYPES_WITHOUT_WORKFLOWS, entityKey, message);
                     }
                 }
 
                 if (m_flagMissingAoiMxds)
                 {
-                    if (jobType.AOIMap == null)
+                    if (!jobType.HasAoiMap)
                     {
                         string message = "Job Type '" + jobType.Name + "' has no AOI map defined";
-                        RecordMessage(message, msgs, logFileWriter);
-                        errorCount++;
+                        QueueIssue(C_OPT_MISSING_AOI_MXDS, entityKey, message);
                     }
                 }
 
                 if (m_flagMissingBaseMxds)
                 {
-                    if (jobType.JobMap == null)
+                    if (!jobType.HasJobMap)
                     {
                         string message = "Job Type '" + jobType.Name +
                             "' has no job map (a.k.a. basemap) defined";
-                        RecordMessage(message, msgs, logFileWriter);
-                        errorCount++;
+                        QueueIssue(C_OPT_MISSING_BASE_MXDS, entityKey, message);
                     }
                 }
 
@@ -524,8 +1180,7 @@ namespace WorkflowManagerAdministrationUtilities
                     if (jobType.State != jtxJobTypeState.jtxJobTypeStateActive)
                     {
                         string message = "Job Type '" + jobType.Name + "' is not active";
-                        RecordMessage(message, msgs, logFileWriter);
-                        errorCount++;
+                        QueueIssue(C_OPT_NON_ACTIVE_JOB_TYPES, entityKey, message);
                     }
                 }
             }
@@ -535,54 +1190,38 @@ namespace WorkflowManagerAdministrationUtilities
         /// Helper function that runs all of those checks that operate on each user in
         /// the database; intended to make the checks slightly more efficient by running
         /// through them all at once rather than looping through all of the elements
-        /// multiple times
+        /// multiple times.  Runs on its own thread, against the configuration snapshot.
         /// </summary>
-        /// <param name="msgs">Add any GP messages to this object</param>
-        /// <param name="errorCount">Counter used to track the number of problems found</param>
-        /// <param name="logFileWriter">Object used to write error descriptions to a text file</param>
-        private void ExecuteUserChecks(IGPMessages msgs, ref int errorCount, StreamWriter logFileWriter)
+        private void ExecuteUserChecks()
         {
-            // Only continue executing this function if needed
-            if (!m_flagUsersWithoutEmails &&
-                !m_flagUsersWithoutGroups)
-            {
-                return;
-            }
-
-            IJTXConfiguration3 configMgr = this.WmxDatabase.ConfigurationManager as IJTXConfiguration3;
-            IJTXConfigurationEdit2 configEdit = configMgr as IJTXConfigurationEdit2;
-
-            // Put the items into a sorted list in order to make the output easier to
-            // read/follow
-            IJTXUserSet allUsers = configMgr.Users;
-            SortedList<string, IJTXUser3> allUsersSorted = new SortedList<string, IJTXUser3>();
-            for (int i = 0; i < allUsers.Count; i++)
-            {
-                allUsersSorted[allUsers.get_Item(i).UserName] = allUsers.get_Item(i) as IJTXUser3;
-            }
-
             // Iterate through each item
-            foreach (IJTXUser3 user in allUsersSorted.Values)
+            string[] userChecks = { C_OPT_USERS_WITHOUT_EMAILS, C_OPT_USERS_WITHOUT_GROUPS };
+            foreach (UserInfo user in m_snapshot.Users.Values)
             {
+                string entityKey = Common.WmauCheckResults.PrincipalKey(false, user.Name);
+                string state = user.Email + "|" + user.FullName + "|" + user.NumGroups.ToString();
+                if (!NeedsCheck(entityKey, state, new string[0], userChecks))
+                {
+                    continue;
+                }
+
                 if (m_flagUsersWithoutEmails)
                 {
                     if (user.Email == null || user.Email.Equals(string.Empty))
                     {
-                        string message = "User '" + user.UserName + "' (" + user.FullName +
+                        string message = "User '" + user.Name + "' (" + user.FullName +
                             ") does not have an e-mail address configured";
-                        RecordMessage(message, msgs, logFileWriter);
-                        errorCount++;
+                        QueueIssue(C_OPT_USERS_WITHOUT_EMAILS, entityKey, message);
                     }
                 }
 
                 if (m_flagUsersWithoutGroups)
                 {
-                    if (user.Groups.Count < 1)
+                    if (user.NumGroups < 1)
                     {
-                        string message = "User '" + user.UserName + "' (" + user.FullName +
+                        string message = "User '" + user.Name + "' (" + user.FullName +
                             ") does not belong to any groups";
-                        RecordMessage(message, msgs, logFileWriter);
-                        errorCount++;
+                        QueueIssue(C_OPT_USERS_WITHOUT_GROUPS, entityKey, message);
                     }
                 }
             }
@@ -592,60 +1231,46 @@ namespace WorkflowManagerAdministrationUtilities
         /// Helper function that runs all of those checks that operate on each step in
         /// every workflow; intended to make the checks slightly more efficient by running
         /// through them all at once rather than looping through all of the elements
-        /// multiple times
+        /// multiple times.  Runs on its own thread, against the configuration snapshot.
         /// </summary>
-        /// <param name="msgs">Add any GP messages to this object</param>
-        /// <param name="errorCount">Counter used to track the number of problems found</param>
-        /// <param name="logFileWriter">Object used to write error descriptions to a text file</param>
-        private void ExecuteWorkflowStepChecks(IGPMessages msgs, ref int errorCount, StreamWriter logFileWriter)
+        private void ExecuteWorkflowStepChecks()
         {
-            // Only continue executing this function if needed
-            if (!m_flagInvalidStepAssign &&
-                !m_flagUnassignedSteps &&
-                !m_flagZeroPctSteps &&
-                !m_flagDifferingStepNames)
-            {
-                return;
-            }
-
-            IJTXConfiguration3 configMgr = this.WmxDatabase.ConfigurationManager as IJTXConfiguration3;
-            IJTXConfigurationEdit2 configEdit = configMgr as IJTXConfigurationEdit2;
-
-            // Put the items into a sorted list in order to make the output easier to
-            // read/follow
-            IJTXWorkflowSet allWorkflows = configMgr.Workflows;
-            SortedList<string, IJTXWorkflow> allWorkflowsSorted = new SortedList<string, IJTXWorkflow>();
-            for (int i = 0; i < allWorkflows.Count; i++)
-            {
-                allWorkflowsSorted[allWorkflows.get_Item(i).Name] = allWorkflows.get_Item(i);
-            }
-
             // Iterate through each item
-            foreach (IJTXWorkflow workflow in allWorkflowsSorted.Values)
+            string[] workflowChecks = { C_OPT_INVALID_STEP_ASSIGN, C_OPT_UNASSIGNED_STEPS, C_OPT_ZERO_PCT_STEPS, C_OPT_DIFF_STEP_NAMES };
+            foreach (WorkflowInfo workflow in m_snapshot.Workflows.Values)
             {
-                IJTXWorkflowConfiguration workflowCfg = workflow as IJTXWorkflowConfiguration;
-                int[] allStepIds = workflowCfg.GetAllSteps();
-                foreach (int j in allStepIds)
+                // A workflow's state covers all of its steps, along with the names of
+                // their step types
+                string entityKey = "WORKFLOW:" + workflow.Name;
+                if (m_currentResults != null)
                 {
-                    IJTXStep3 step = workflowCfg.GetStep(j) as IJTXStep3;
-                    string assignedTo = step.AssignedTo;
+                    StringBuilder state = new StringBuilder();
+                    List<string> assigneeKeys = new List<string>();
+                    foreach (StepInfo step in workflow.Steps)
+                    {
+                        state.Append(step.Id).Append("|").Append(step.Name).Append("|");
+                        state.Append(step.AssignedType.ToString()).Append("|").Append(step.AssignedTo).Append("|");
+                        state.Append(step.DefaultPercComplete).Append("|");
+                        state.Append(step.StepTypeName).Append("\n");
+                        assigneeKeys.Add(GetAssigneeKey(step.AssignedType, step.AssignedTo));
+                    }
+                    if (!NeedsCheck(entityKey, state.ToString(), assigneeKeys, workflowChecks))
+                    {
+                        continue;
+                    }
+                }
 
+                foreach (StepInfo step in workflow.Steps)
+                {
                     // Check for any default step types with an invalid step assignment
                     if (m_flagInvalidStepAssign)
                     {
-                        if (step.AssignedType == jtxAssignmentType.jtxAssignmentTypeUser && configMgr.GetUser(assignedTo) == null)
-                        {
-                            string message = "Workflow '" + workflow.Name + "', step '" +
-                                step.StepName + "' assigned to unknown user '" + assignedTo + "'";
-                            RecordMessage(message, msgs, logFileWriter);
-                            errorCount++;
-                        }
-                        else if (step.AssignedType == jtxAssignmentType.jtxAssignmentTypeGroup && configMgr.GetUserGroup(assignedTo) == null)
+                        string unknownType = GetUnknownAssigneeType(step.AssignedType, step.AssignedTo);
+                        if (unknownType != null)
                         {
                             string message = "Workflow '" + workflow.Name + "', step '" +
-                                step.StepName + "' assigned to unknown group '" + assignedTo + "'";
-                            RecordMessage(message, msgs, logFileWriter);
-                            errorCount++;
+                                step.Name + "' assigned to unknown " + unknownType + " '" + step.AssignedTo + "'";
+                            QueueIssue(C_OPT_INVALID_STEP_ASSIGN, entityKey, message);
                         }
                     }
 
@@ -655,9 +1280,8 @@ namespace WorkflowManagerAdministrationUtilities
                         if (step.AssignedType == jtxAssignmentType.jtxAssignmentTypeUnassigned)
                         {
                             string message = "Workflow '" + workflow.Name + "', step '" +
-                                step.StepName + "' is unassigned";
-                            RecordMessage(message, msgs, logFileWriter);
-                            errorCount++;
+                                step.Name + "' is unassigned";
+                            QueueIssue(C_OPT_UNASSIGNED_STEPS, entityKey, message);
                         }
                     }
 
@@ -667,9 +1291,8 @@ namespace WorkflowManagerAdministrationUtilities
                         if (step.DefaultPercComplete < double.Epsilon)
                         {
                             string message = "Workflow '" + workflow.Name + "', step '" +
-                                step.StepName + "' sets percent complete to 0";
-                            RecordMessage(message, msgs, logFileWriter);
-                            errorCount++;
+                                step.Name + "' sets percent complete to 0";
+                            QueueIssue(C_OPT_ZERO_PCT_STEPS, entityKey, message);
                         }
                     }
 
@@ -677,13 +1300,11 @@ namespace WorkflowManagerAdministrationUtilities
                     // the underlying step type name
                     if (m_flagDifferingStepNames)
                     {
-                        IJTXStepType2 stepType = configMgr.GetStepTypeByID(step.StepTypeID) as IJTXStepType2;
-                        if (!step.StepName.Equals(stepType.Name))
+                        if (step.StepTypeName != null && !step.Name.Equals(step.StepTypeName))
                         {
                             string message = "Workflow '" + workflow.Name + "', step name '" +
-                                step.StepName + "' does not match step type name '" + stepType.Name + "'";
-                            RecordMessage(message, msgs, logFileWriter);
-                            errorCount++;
+                                step.Name + "' does not match step type name '" + step.StepTypeName + "'";
+                            QueueIssue(C_OPT_DIFF_STEP_NAMES, entityKey, message);
                         }
                     }
                 } // end for each step
@@ -795,6 +1416,33 @@ namespace WorkflowManagerAdministrationUtilities
                     null);
                 m_parameters.Add(paramEdit);
 
+                // Optional parameter indicating the file in which the results of each
+                // run are kept, so that the next run only checks what has changed
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionInput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_RPE_RESULTS_FILE,
+                    C_PARAM_RESULTS_FILE,
+                    new DEFileTypeClass() as IGPDataType,
+                    null);
+                m_parameters.Add(paramEdit);
+
+                // Optional parameter indicating a machine-readable (CSV or JSON lines)
+                // file to which the issues found should be written
+                IGPFileDomain issuesFileDomain = new GPFileDomainClass();
+                issuesFileDomain.AddType("csv");
+                issuesFileDomain.AddType("jsonl");
+
+                paramEdit = BuildParameter(
+                    esriGPParameterDirection.esriGPParameterDirectionOutput,
+                    esriGPParameterType.esriGPParameterTypeOptional,
+                    Properties.Resources.DESC_RPE_OUT_ISSUES_FILE,
+                    C_PARAM_OUT_ISSUES_FILE,
+                    new DEFileTypeClass() as IGPDataType,
+                    null);
+                paramEdit.Domain = issuesFileDomain as IGPDomain;
+                m_parameters.Add(paramEdit);
+
                 return m_parameters;
             }
         }
@@ -811,6 +1459,7 @@ namespace WorkflowManagerAdministrationUtilities
             // Do some common error-checking
             base.Execute(paramValues, trackCancel, envMgr, msgs);
             StreamWriter logFileWriter = null;
+            List<Task> tasks = new List<Task>();
 
             try
             {
@@ -820,30 +1469,83 @@ namespace WorkflowManagerAdministrationUtilities
                 {
                     logFileWriter = new StreamWriter(m_logFilePath);
                 }
-
-                IJTXConfiguration3 configMgr = this.WmxDatabase.ConfigurationManager as IJTXConfiguration3;
-                IJTXConfigurationEdit2 configEdit = configMgr as IJTXConfigurationEdit2;
-                IJTXJobManager jobMgr = this.WmxDatabase.JobManager;
+                if (!string.IsNullOrEmpty(m_issuesFilePath))
+                {
+                    m_issuesWriter = new IssueWriter(m_issuesFilePath);
+                }
 
                 // Workflow Manager intentionally caches the data workspaces in the system.  To ensure
                 // that we have the most current list of data workspaces, invalidate this cache
                 // before attempting to retrieve the list from the system.
                 this.WmxDatabase.InvalidateDataWorkspaceNames();
 
-                // Run checks against users
-                ExecuteUserChecks(msgs, ref errorCount, logFileWriter);
+                m_snapshot = TakeConfigurationSnapshot();
+                m_numIssuesFound = 0;
+                m_numIssueMessages = 0;
+                m_cancelled = false;
+
+                // If a results file was given, only check what has changed since the
+                // previous run
+                m_previousResults = null;
+                m_currentResults = null;
+                m_numEntitiesChecked = 0;
+                m_numEntitiesSkipped = 0;
+                if (!string.IsNullOrEmpty(m_resultsFilePath))
+                {
+                    BeginIncrementalCheck(msgs);
+                }
 
-                // Run checks against groups
-                ExecuteGroupChecks(msgs, ref errorCount, logFileWriter);
+                // The checks against users, groups, job types and workflows only use the
+                // snapshot, so each runs on its own thread.  The job checks read the
+                // database, so they run on this thread in the meantime, which is also
+                // where the issues found by the other checks are reported.
+                m_issueQueue = new BlockingCollection<Common.WmauCheckResults.Issue>(C_ISSUE_QUEUE_CAPACITY);
+                m_cancelSource = new CancellationTokenSource();
+                if (m_flagUsersWithoutEmails || m_flagUsersWithoutGroups)
+                {
+                    tasks.Add(Task.Factory.StartNew(new Action(ExecuteUserChecks), m_cancelSource.Token));
+                }
+                if (m_flagGroupsWithoutPrivileges || m_flagGroupsWithoutEmails || m_flagGroupsWithoutUsers)
+                {
+                    tasks.Add(Task.Factory.StartNew(new Action(ExecuteGroupChecks), m_cancelSource.Token));
+                }
+                if (m_snapshot.JobTypes.Count > 0)
+                {
+                    tasks.Add(Task.Factory.StartNew(new Action(ExecuteJobTypeChecks), m_cancelSource.Token));
+                }
+                if (m_snapshot.Workflows.Count > 0)
+                {
+                    tasks.Add(Task.Factory.StartNew(new Action(ExecuteWorkflowStepChecks), m_cancelSource.Token));
+                }
 
-                // Run checks against any existing jobs
-                ExecuteJobChecks(msgs, ref errorCount, logFileWriter);
+                ExecuteJobChecks(trackCancel, msgs, logFileWriter);
+                WaitForChecks(tasks, msgs, logFileWriter);
 
-                // Check for any template job types with an invalid default assignment
-                ExecuteJobTypeChecks(msgs, ref errorCount, logFileWriter);
+                // Report what has changed since the previous run, and save the results
+                // for the next one
+                if (m_currentResults != null)
+                {
+                    ReportChanges(msgs, logFileWriter);
+                    if (m_cancelled)
+                    {
+                        msgs.AddWarning("The results file was not updated, since not every job was checked");
+                    }
+                    else
+                    {
+                        m_currentResults.Save(m_resultsFilePath);
+                    }
+                    errorCount = m_currentResults.Issues.Count;
+                }
+                else
+                {
+                    errorCount = m_numIssuesFound;
+                }
 
-                // Check the workflow steps for problems
-                ExecuteWorkflowStepChecks(msgs, ref errorCount, logFileWriter);
+                if (m_issuesWriter != null && m_numIssueMessages > C_MAX_ISSUE_MESSAGES)
+                {
+                    msgs.AddMessage("Only the first " + C_MAX_ISSUE_MESSAGES.ToString() +
+                        " issue(s) are listed here; see " + m_issuesFilePath + " for the rest");
+                }
 
                 // Set the output parameter
                 WmauParameterMap paramMap = new WmauParameterMap(paramValues);
@@ -879,11 +1581,40 @@ namespace WorkflowManagerAdministrationUtilities
             }
             finally
             {
+                // Stop any checks still waiting to report an issue
+                if (m_cancelSource != null)
+                {
+                    m_cancelSource.Cancel();
+                }
+
+                // ...and wait for them to stop before the state they share is released
+                try
+                {
+                    Task.WaitAll(tasks.ToArray());
+                }
+                catch (AggregateException)
+                {
+                    // Any errors from the checks have already been reported, or are
+                    // the result of cancelling them
+                }
+
                 // Release any COM objects here!
                 if (logFileWriter != null)
                 {
                     logFileWriter.Close();
                 }
+                if (m_issuesWriter != null)
+                {
+                    m_issuesWriter.Dispose();
+                }
+                m_issuesWriter = null;
+                m_snapshot = null;
+                m_issueQueue = null;
+                m_cancelSource = null;
+                m_previousResults = null;
+                m_currentResults = null;
+                m_previousIssuesByEntity = null;
+                m_changedPrincipals = null;
             }
         }
     }
@@ -295,7 +295,10 @@ namespace WorkflowManagerAdministrationUtilities
                 }
 
                 // Save the changes to the job type
-                jobType.Store();
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_STORE))
+                {
+                    jobType.Store();
+                }
 
                 // Set the output parameter
                 WmauParameterMap paramMap = new WmauParameterMap(paramValues);
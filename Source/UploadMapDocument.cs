@@ -221,8 +221,12 @@ namespace WorkflowManagerAdministrationUtilities
                 wmxMapDoc.Directory = string.Empty;
                 wmxMapDoc.FileName = string.Empty;
                 wmxMapDoc.MapDocument = mapDoc;
-                wmxMapDoc.Store();
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_STORE))
+                {
+                    wmxMapDoc.Store();
+                }
                 mapDoc.Close();
+                Common.WmauArtifactCache.InvalidateMapDocument(WmxDatabase.Alias, this.m_targetName);
 
                 // Update the output parameter
                 WmauParameterMap paramMap = new WmauParameterMap(paramValues);
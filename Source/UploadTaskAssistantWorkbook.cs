@@ -198,6 +198,7 @@ namespace WorkflowManagerAdministrationUtilities
                     msgs.AddMessage("Adding Task Assistant workbook '" + m_targetName + "' to database...");
                     defaultDbReadonly.AddTaskAssistantWorkflowRecord(this.m_targetName, this.m_xmlFilePath, styleFileName);
                 }
+                Common.WmauArtifactCache.InvalidateTamWorkbook(WmxDatabase.Alias, this.m_targetName);
 
                 // Update the output parameter
                 WmauParameterMap paramMap = new WmauParameterMap(paramValues);
@@ -31,10 +31,21 @@ namespace WorkflowManagerAdministrationUtilities
         private const string C_PARAM_WMX_DATABASE_ALIAS = "in_string_wmxDatabaseAlias";
 
         private const string C_ENV_VAR_DEFAULT_WMX_DB = "DEFAULT_JTX_DB";
+
+        // If set, Workflow Manager database connections are shared by every tool run
+        // in the process; the value is the number of seconds for which the database's
+        // configuration cache may be reused before it is reloaded.
+        private const string C_ENV_VAR_SHARE_DB_CONNECTIONS = "WMAU_SHARE_DB_CONNECTIONS";
         #endregion
 
         #region Class Variables
         private static IAoInitialize m_aoInit = null;
+
+        // Connections shared between tool runs, when C_ENV_VAR_SHARE_DB_CONNECTIONS
+        // is set (ex: by a long-running process such as AdminDaemon.py)
+        private static Dictionary<string, IJTXDatabase3> m_sharedWmxDbInfo = new Dictionary<string, IJTXDatabase3>();
+        private static IJTXDatabase3 m_sharedCachedWmxDb = null;
+        private static DateTime m_sharedCacheTime = DateTime.MinValue;
         #endregion
 
         #region Member Variables
@@ -45,6 +56,8 @@ namespace WorkflowManagerAdministrationUtilities
         private string m_wmxDbAlias = string.Empty;
         private HashSet<string> m_dependentParamNames = new HashSet<string>();
         private Dictionary<string, IJTXDatabase3> m_wmxDbInfo = new Dictionary<string, IJTXDatabase3>();
+        private bool m_shareDbConnections = false;
+        private double m_maxCacheAgeSecs = 0.0;
 
         private IGPBoolean m_gpTrue = null;
         private IGPBoolean m_gpFalse = null;
@@ -91,6 +104,18 @@ namespace WorkflowManagerAdministrationUtilities
             }
             // END WORKAROUND
 
+            // Reuse the database connections from earlier tool runs, if requested
+            string maxCacheAge = System.Environment.GetEnvironmentVariable(C_ENV_VAR_SHARE_DB_CONNECTIONS);
+            if (!string.IsNullOrEmpty(maxCacheAge))
+            {
+                m_shareDbConnections = true;
+                m_wmxDbInfo = WmauAbstractGpFunction.m_sharedWmxDbInfo;
+                if (!double.TryParse(maxCacheAge, out m_maxCacheAgeSecs) || m_maxCacheAgeSecs < 0.0)
+                {
+                    m_maxCacheAgeSecs = 0.0;
+                }
+            }
+
             m_gpTrue = new GPBooleanClass();
             m_gpTrue.Value = true;
             m_gpFalse = new GPBooleanClass();
@@ -121,15 +146,33 @@ namespace WorkflowManagerAdministrationUtilities
                 {
                     IJTXDatabase3 retVal = m_wmxDbInfo[m_wmxDbAlias];
 
+                    // When connections are shared, the cache may have been initialized by
+                    // an earlier tool run; reuse it unless it has become too old.
+                    bool reuseSharedCache = false;
+                    if (m_shareDbConnections)
+                    {
+                        reuseSharedCache = retVal == WmauAbstractGpFunction.m_sharedCachedWmxDb &&
+                            (DateTime.Now - WmauAbstractGpFunction.m_sharedCacheTime).TotalSeconds <= m_maxCacheAgeSecs;
+                        if (reuseSharedCache)
+                        {
+                            m_previousWmxDb = retVal;
+                        }
+                    }
+
                     if (retVal != m_previousWmxDb)
                     {
                         // If the database in use has changed, invalidate and reinitialize the
                         // configuration cache.  This is used internally by various Workflow
                         // Manager items; if it is not initialized, some of them will (right
                         // or wrong) throw errors.
-                        ESRI.ArcGIS.JTXUI.ConfigurationCache.InvalidateCache();
-                        ESRI.ArcGIS.JTXUI.ConfigurationCache.InitializeCache(m_wmxDbInfo[m_wmxDbAlias]);
+                        using (Common.WmauExecutionTrace.TimePhase(Common.WmauExecutionTrace.C_PHASE_DB_RESOLUTION))
+                        {
+                            ESRI.ArcGIS.JTXUI.ConfigurationCache.InvalidateCache();
+                            ESRI.ArcGIS.JTXUI.ConfigurationCache.InitializeCache(m_wmxDbInfo[m_wmxDbAlias]);
+                        }
                         m_previousWmxDb = retVal;
+                        WmauAbstractGpFunction.m_sharedCachedWmxDb = retVal;
+                        WmauAbstractGpFunction.m_sharedCacheTime = DateTime.Now;
                     }
 
                     return retVal;
@@ -144,6 +187,21 @@ namespace WorkflowManagerAdministrationUtilities
                 }
             }
         }
+
+        protected string WmxDatabaseAlias
+        {
+            get
+            {
+                if (this.IsWorkflowManagerDatabaseSet())
+                {
+                    return m_wmxDbAlias;
+                }
+                else
+                {
+                    return null;
+                }
+            }
+        }
         #endregion
 
         /// <summary>
@@ -297,7 +355,12 @@ namespace WorkflowManagerAdministrationUtilities
         protected void UpdateMessagesCommon(IArray paramValues, IGPEnvironmentManager pEnvMgr, IGPMessages msgs)
         {
             // Ensure that a Workflow Manager database is set.
-            if (!IsWorkflowManagerDatabaseSet())
+            bool isDatabaseSet = false;
+            using (Common.WmauExecutionTrace.TimePhase(Common.WmauExecutionTrace.C_PHASE_DB_RESOLUTION))
+            {
+                isDatabaseSet = IsWorkflowManagerDatabaseSet();
+            }
+            if (!isDatabaseSet)
             {
                 if (msgs.Count > 0)
                 {
@@ -344,21 +407,24 @@ namespace WorkflowManagerAdministrationUtilities
             WmauParameterMap paramMap = new WmauParameterMap(paramValues);
             IGPParameter3 param = null;
 
-            // Update the internal values of whatever parameters the parent class
-            // is maintaining
-            param = paramMap.GetParam(C_PARAM_WMX_DATABASE_ALIAS);
-            string newDbAlias = param.Value.GetAsText();
-
-            // If the WMX database has changed, update it.
-            if (!newDbAlias.Equals(m_wmxDbAlias))
+            using (Common.WmauExecutionTrace.TimePhase(Common.WmauExecutionTrace.C_PHASE_DB_RESOLUTION))
             {
-                ChangeWmxDatabase(newDbAlias, paramMap);
-            }
+                // Update the internal values of whatever parameters the parent class
+                // is maintaining
+                param = paramMap.GetParam(C_PARAM_WMX_DATABASE_ALIAS);
+                string newDbAlias = param.Value.GetAsText();
 
-            // Ensure that the default Workflow Manager database is set.
-            if (!IsWorkflowManagerDatabaseSet())
-            {
-                throw new WmxDefaultDbNotSetException();
+                // If the WMX database has changed, update it.
+                if (!newDbAlias.Equals(m_wmxDbAlias))
+                {
+                    ChangeWmxDatabase(newDbAlias, paramMap);
+                }
+
+                // Ensure that the default Workflow Manager database is set.
+                if (!IsWorkflowManagerDatabaseSet())
+                {
+                    throw new WmxDefaultDbNotSetException();
+                }
             }
             if (paramValues == null || pEnvMgr == null)
             {
@@ -414,7 +480,12 @@ namespace WorkflowManagerAdministrationUtilities
         public virtual void Execute(IArray paramValues, ITrackCancel trackCancel, IGPEnvironmentManager envMgr, IGPMessages msgs)
         {
             // Basic error checking; ensure a Workflow Manager database is defined
-            if (!IsWorkflowManagerDatabaseSet())
+            bool isDatabaseSet = false;
+            using (Common.WmauExecutionTrace.TimePhase(Common.WmauExecutionTrace.C_PHASE_DB_RESOLUTION))
+            {
+                isDatabaseSet = IsWorkflowManagerDatabaseSet();
+            }
+            if (!isDatabaseSet)
             {
                 WmauError error = new WmauError(WmauErrorCodes.C_INVALID_WMX_DB_ERROR);
                 msgs.AddError(error.ErrorCodeAsInt, error.Message);
@@ -422,9 +493,85 @@ namespace WorkflowManagerAdministrationUtilities
             }
 
             // Update the internal parameters used by this GP tool
-            this.ExtractParameters(paramValues);
+            using (Common.WmauExecutionTrace.TimePhase(Common.WmauExecutionTrace.C_PHASE_EXTRACT_PARAMETERS))
+            {
+                this.ExtractParameters(paramValues);
+            }
         }
 
+        #region Traced entry points
+        // The GP framework calls the tools through the IGPFunction2 interface.  Implementing
+        // these members explicitly allows every call to a tool's entry points to be traced
+        // (see Common.WmauExecutionTrace) without changes to the tools themselves; the
+        // tools continue to override the public virtual functions above.
+
+        /// <summary>
+        /// Traced wrapper around UpdateMessages
+        /// </summary>
+        void IGPFunction2.UpdateMessages(IArray paramValues, IGPEnvironmentManager pEnvMgr, IGPMessages msgs)
+        {
+            Common.WmauExecutionTrace trace = Common.WmauExecutionTrace.Begin(
+                this.Name,
+                Common.WmauExecutionTrace.C_METHOD_UPDATE_MESSAGES,
+                Common.WmauExecutionTrace.C_PHASE_VALIDATION);
+            try
+            {
+                this.UpdateMessages(paramValues, pEnvMgr, msgs);
+            }
+            finally
+            {
+                if (trace != null)
+                {
+                    trace.End(msgs);
+                }
+            }
+        }
+
+        /// <summary>
+        /// Traced wrapper around UpdateParameters
+        /// </summary>
+        void IGPFunction2.UpdateParameters(IArray paramValues, IGPEnvironmentManager pEnvMgr)
+        {
+            Common.WmauExecutionTrace trace = Common.WmauExecutionTrace.Begin(
+                this.Name,
+                Common.WmauExecutionTrace.C_METHOD_UPDATE_PARAMETERS,
+                Common.WmauExecutionTrace.C_PHASE_BUILD_DOMAINS);
+            try
+            {
+                this.UpdateParameters(paramValues, pEnvMgr);
+            }
+            finally
+            {
+                if (trace != null)
+                {
+                    trace.End(null);
+                }
+            }
+        }
+
+        /// <summary>
+        /// Traced wrapper around Execute
+        /// </summary>
+        void IGPFunction2.Execute(IArray paramValues, ITrackCancel trackCancel, IGPEnvironmentManager envMgr, IGPMessages msgs)
+        {
+            Common.WmauExecutionTrace trace = Common.WmauExecutionTrace.Begin(
+                this.Name,
+                Common.WmauExecutionTrace.C_METHOD_EXECUTE,
+                Common.WmauExecutionTrace.C_PHASE_CORE);
+            try
+            {
+                this.Execute(paramValues, trackCancel, envMgr, msgs);
+            }
+            finally
+            {
+                if (trace != null)
+                {
+                    trace.End(msgs);
+                }
+            }
+        }
+        #endregion
+
         /// <summary>
         /// This is the name of the (.xml) file containing the default metadata for this function tool. 
         /// The metadata file is used to supply the parameter descriptions in the help panel in the dialog. 
@@ -690,7 +837,11 @@ namespace WorkflowManagerAdministrationUtilities
             string username = ESRI.ArcGIS.JTXUI.ConfigurationCache.GetCurrentSystemUser(ESRI.ArcGIS.JTXUI.ConfigurationCache.UseUserDomain);
             if (this.WmxDatabase != null)
             {
-                IJTXUser3 user = this.WmxDatabase.ConfigurationManager.GetUser(username) as IJTXUser3;
+                IJTXUser3 user = null;
+                using (Common.WmauExecutionTrace.TimeCall(Common.WmauExecutionTrace.C_CALL_GET_USER))
+                {
+                    user = this.WmxDatabase.ConfigurationManager.GetUser(username) as IJTXUser3;
+                }
                 if (user != null)
                 {
                     retVal = user.IsAdministrator;
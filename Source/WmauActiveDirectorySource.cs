@@ -0,0 +1,140 @@
+﻿//Copyright 2015 Esri
+//Licensed under the Apache License, Version 2.0 (the "License");
+//you may not use this file except in compliance with the License.
+//You may obtain a copy of the License at
+//    http://www.apache.org/licenses/LICENSE-2.0
+//Unless required by applicable law or agreed to in writing, software
+//distributed under the License is distributed on an "AS IS" BASIS,
+//WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//See the License for the specific language governing permissions and
+//limitations under the License.​
+
+using System;
+using System.Collections.Generic;
+using System.DirectoryServices.AccountManagement;
+using System.Linq;
+using System.Text;
+
+
+namespace WorkflowManagerAdministrationUtilities.Common
+{
+    /// <summary>
+    /// Reads the users and groups to be synchronized with a Workflow Manager
+    /// database from Active Directory.
+    /// </summary>
+    class WmauActiveDirectorySource : IWmauDirectorySource
+    {
+        private string m_domain = string.Empty;
+        private string m_username = string.Empty;
+        private string m_password = string.Empty;
+        private string m_namePrefix = string.Empty;
+
+        /// <summary>
+        /// Constructor
+        /// </summary>
+        /// <param name="domain">The domain to be searched</param>
+        /// <param name="username">
+        /// The account with which to connect to the domain; if empty, the account
+        /// running the tool is used
+        /// </param>
+        /// <param name="password">The password for the account</param>
+        /// <param name="namePrefix">
+        /// Text to prepend to each account name (ex: "DOMAIN\") to form the name of
+        /// the Workflow Manager user
+        /// </param>
+        public WmauActiveDirectorySource(string domain, string username, string password, string namePrefix)
+        {
+            m_domain = domain;
+            m_username = username;
+            m_password = password;
+            m_namePrefix = namePrefix;
+        }
+
+        /// <summary>
+        /// Reads the users and groups from the directory
+        /// </summary>
+        /// <param name="userGroup">The group whose members are the Workflow Manager users</param>
+        /// <param name="groupGroup">The group whose member groups are the Workflow Manager groups</param>
+        /// <returns>The users and groups</returns>
+        public WmauDirectoryContents GetContents(string userGroup, string groupGroup)
+        {
+            WmauDirectoryContents contents = new WmauDirectoryContents();
+
+            PrincipalContext context = null;
+            if (string.IsNullOrEmpty(m_username))
+            {
+                context = new PrincipalContext(ContextType.Domain, m_domain);
+            }
+            else
+            {
+                context = new PrincipalContext(ContextType.Domain, m_domain, m_username, m_password);
+            }
+
+            using (context)
+            {
+                // Every user in the user group (or in any group nested within it)
+                using (GroupPrincipal usersGroup = FindGroup(context, userGroup))
+                {
+                    foreach (Principal member in usersGroup.GetMembers(true))
+                    {
+                        UserPrincipal user = member as UserPrincipal;
+                        if (user != null)
+                        {
+                            WmauDirectoryContents.UserInfo info = new WmauDirectoryContents.UserInfo(m_namePrefix + user.SamAccountName);
+                            info.FirstName = user.GivenName;
+                            info.LastName = user.Surname;
+                            info.FullName = user.DisplayName;
+                            info.Email = user.EmailAddress;
+                            contents.AddUser(info);
+                        }
+                        member.Dispose();
+                    }
+                }
+
+                // Each group directly within the group of groups, along with those of
+                // its members that are also users
+                using (GroupPrincipal groupsGroup = FindGroup(context, groupGroup))
+                {
+                    foreach (Principal member in groupsGroup.GetMembers(false))
+                    {
+                        GroupPrincipal group = member as GroupPrincipal;
+                        if (group != null)
+                        {
+                            HashSet<string> members = contents.AddGroup(group.SamAccountName);
+                            foreach (Principal groupMember in group.GetMembers(true))
+                            {
+                                string userName = m_namePrefix + groupMember.SamAccountName;
+                                if (groupMember is UserPrincipal && contents.Users.ContainsKey(userName))
+                                {
+                                    members.Add(userName);
+                                }
+                                groupMember.Dispose();
+                            }
+                        }
+                        member.Dispose();
+                    }
+                }
+            }
+
+            return contents;
+        }
+
+        /// <summary>
+        /// Looks up a group in the directory
+        /// </summary>
+        /// <param name="context">The directory being searched</param>
+        /// <param name="groupName">The name of the group</param>
+        /// <returns>The group</returns>
+        private GroupPrincipal FindGroup(PrincipalContext context, string groupName)
+        {
+            GroupPrincipal group = GroupPrincipal.FindByIdentity(context, groupName);
+            if (group == null)
+            {
+                throw new WmauException(
+                    WmauErrorCodes.C_DIRECTORY_SOURCE_ERROR,
+                    new KeyNotFoundException("Group '" + groupName + "' not found in domain '" + m_domain + "'"));
+            }
+            return group;
+        }
+    }
+}
@@ -0,0 +1,577 @@
+﻿//Copyright 2015 Esri
+//Licensed under the Apache License, Version 2.0 (the "License");
+//you may not use this file except in compliance with the License.
+//You may obtain a copy of the License at
+//    http://www.apache.org/licenses/LICENSE-2.0
+//Unless required by applicable law or agreed to in writing, software
+//distributed under the License is distributed on an "AS IS" BASIS,
+//WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//See the License for the specific language governing permissions and
+//limitations under the License.​
+
+
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
+using System.Security.Cryptography;
+using System.Text;
+
+
+namespace WorkflowManagerAdministrationUtilities.Common
+{
+    /// <summary>
+    /// A local, read-through cache of the artifacts (map documents and Task
+    /// Assistant workbooks) stored in Workflow Manager databases, so that
+    /// downloading the same artifact again is a local file copy.
+    /// </summary>
+    /// <remarks>
+    /// <para>
+    /// The contents of each artifact are stored once, in a file named for the
+    /// SHA-256 hash of its contents.  An index file maps each artifact (by
+    /// database, type and name) to the contents it had when it was downloaded,
+    /// along with a "change marker" read from the database; a cached copy is
+    /// only used while the artifact's change marker is the same.
+    /// </para>
+    /// <para>
+    /// The cache is limited in size; once it grows too large, the artifacts that
+    /// were used least recently are removed.  Files are written under a
+    /// temporary name and then renamed, so that other processes sharing the
+    /// cache never see a partly-written file.
+    /// </para>
+    /// </remarks>
+    class WmauArtifactCache
+    {
+        #region Helper classes
+        /// <summary>
+        /// Helper class used to store an individual entry in the cache's index.
+        /// </summary>
+        private class Entry
+        {
+            public string Key = string.Empty;
+            public string Marker = string.Empty;
+            public string Hash = string.Empty;
+            public long Size = 0;
+            public DateTime DateVerified = DateTime.Now;
+            public DateTime DateLastUsed = DateTime.Now;
+
+            /// <summary>
+            /// Formats this entry as a line in the index file
+            /// </summary>
+            /// <returns>The entry, without a line terminator</returns>
+            public string ToLine()
+            {
+                return string.Join(C_SEPARATOR, new string[] {
+                    C_LINE_ENTRY,
+                    Key,
+                    Marker,
+                    Hash,
+                    Size.ToString(),
+                    DateVerified.ToString(C_DATE_FORMAT),
+                    DateLastUsed.ToString(C_DATE_FORMAT)
+                });
+            }
+
+            /// <summary>
+            /// Parses a line from the index file
+            /// </summary>
+            /// <param name="fields">The fields of the line</param>
+            /// <returns>The entry; null if the line is not a complete entry</returns>
+            public static Entry FromFields(string[] fields)
+            {
+                Entry entry = new Entry();
+                if (fields.Length != C_NUM_ENTRY_FIELDS ||
+                    !long.TryParse(fields[4], out entry.Size) ||
+                    !DateTime.TryParseExact(fields[5], C_DATE_FORMAT, null, System.Globalization.DateTimeStyles.None, out entry.DateVerified) ||
+                    !DateTime.TryParseExact(fields[6], C_DATE_FORMAT, null, System.Globalization.DateTimeStyles.None, out entry.DateLastUsed))
+                {
+                    return null;
+                }
+
+                entry.Key = fields[1];
+                entry.Marker = fields[2];
+                entry.Hash = fields[3];
+                return entry;
+            }
+        }
+        #endregion
+
+        #region Constants
+        public const string C_TYPE_MAP_DOCUMENT = "MXD";
+        public const string C_TYPE_TAM_WORKFLOW = "TAM_WORKFLOW";
+        public const string C_TYPE_TAM_STYLE = "TAM_STYLE";
+
+        private const string C_SEPARATOR = "\t";
+        private const string C_LINE_ENTRY = "ENTRY";
+        private const string C_LINE_STATS = "STATS";
+        private const int C_NUM_ENTRY_FIELDS = 7;
+        private const int C_NUM_STATS_FIELDS = 4;
+        private const string C_DATE_FORMAT = "yyyy-MM-ddTHH:mm:ss";
+        private const string C_DEFAULT_CACHE_FOLDER = "WorkflowManagerAdministrationUtilities";
+        private const string C_DEFAULT_CACHE_SUBFOLDER = "ArtifactCache";
+        private const string C_INDEX_FILE = "index.txt";
+        private const string C_LOCK_FILE = "index.lock";
+        private const string C_CONTENTS_FOLDER = "contents";
+        private const string C_TEMP_SUFFIX = ".tmp";
+
+        // The cached copy of an artifact is downloaded again once it is this old,
+        // in case the artifact was changed in a way that its change marker doesn't
+        // show (ex: by a client other than these tools)
+        private const int C_DEFAULT_MAX_AGE_HOURS = 24;
+        private const long C_DEFAULT_MAX_BYTES = 1024L * 1024L * 1024L;
+
+        // The cache may be used by several ArcGIS processes at once, so retry for
+        // a short while if another process is updating the index
+        private const int C_MAX_LOCK_ATTEMPTS = 50;
+        private const int C_LOCK_RETRY_DELAY_MS = 100;
+        #endregion
+
+        #region Member variables
+        private string m_cachePath;
+        private long m_maxBytes;
+        private TimeSpan m_maxAge;
+        private long m_hits = 0;
+        private long m_misses = 0;
+        private long m_bytesSaved = 0;
+        #endregion
+
+        #region Accessors
+        /// <summary>
+        /// The cache folder used when none is specified; located in the current
+        /// user's local application data folder
+        /// </summary>
+        public static string DefaultCachePath
+        {
+            get
+            {
+                return Path.Combine(
+                    Environment.GetFolderPath(Environment.SpecialFolder.LocalApplicationData),
+                    C_DEFAULT_CACHE_FOLDER,
+                    C_DEFAULT_CACHE_SUBFOLDER);
+            }
+        }
+
+        /// <summary>
+        /// The number of times an artifact has been read from the cache (since the
+        /// cache was created, as of the last call to this object)
+        /// </summary>
+        public long Hits { get { return m_hits; } }
+
+        /// <summary>
+        /// The number of times an artifact has had to be downloaded
+        /// </summary>
+        public long Misses { get { return m_misses; } }
+
+        /// <summary>
+        /// The total size of the artifacts that were read from the cache rather
+        /// than downloaded
+        /// </summary>
+        public long BytesSaved { get { return m_bytesSaved; } }
+        #endregion
+
+        /// <summary>
+        /// Constructor
+        /// </summary>
+        /// <param name="cachePath">The folder in which the cache is kept</param>
+        public WmauArtifactCache(string cachePath)
+            : this(cachePath, C_DEFAULT_MAX_BYTES, TimeSpan.FromHours(C_DEFAULT_MAX_AGE_HOURS))
+        {
+        }
+
+        /// <summary>
+        /// Constructor
+        /// </summary>
+        /// <param name="cachePath">The folder in which the cache is kept</param>
+        /// <param name="maxBytes">The largest total size of the artifacts in the cache</param>
+        /// <param name="maxAge">How long a cached copy may be used before it is downloaded again</param>
+        public WmauArtifactCache(string cachePath, long maxBytes, TimeSpan maxAge)
+        {
+            m_cachePath = cachePath;
+            m_maxBytes = maxBytes;
+            m_maxAge = maxAge;
+        }
+
+        #region Helper functions
+        /// <summary>
+        /// Replaces any characters that would break up a line of the index
+        /// </summary>
+        /// <param name="value">The value to be written</param>
+        /// <returns>The value, with any tabs or line breaks replaced by spaces</returns>
+        private static string Clean(string value)
+        {
+            if (value == null)
+            {
+                return string.Empty;
+            }
+            return value.Replace('\t', ' ').Replace('\r', ' ').Replace('\n', ' ');
+        }
+
+        /// <summary>
+        /// Returns the path to the file holding the contents with the given hash
+        /// </summary>
+        private string GetContentsPath(string hash)
+        {
+            return Path.Combine(m_cachePath, C_CONTENTS_FOLDER, hash);
+        }
+
+        /// <summary>
+        /// Computes the SHA-256 hash of a file's contents
+        /// </summary>
+        /// <param name="path">The path to the file; null for an empty artifact</param>
+        /// <returns>The hash, as a hexadecimal string</returns>
+        private static string ComputeHash(string path)
+        {
+            using (SHA256 hasher = SHA256.Create())
+            {
+                byte[] hash = null;
+                if (path == null)
+                {
+                    hash = hasher.ComputeHash(new byte[0]);
+                }
+                else
+                {
+                    using (FileStream stream = new FileStream(path, FileMode.Open, FileAccess.Read, FileShare.Read))
+                    {
+                        hash = hasher.ComputeHash(stream);
+                    }
+                }
+                return BitConverter.ToString(hash).Replace("-", string.Empty).ToLowerInvariant();
+            }
+        }
+
+        /// <summary>
+        /// Takes the lock on the cache's index, waiting for any other process that
+        /// is updating it
+        /// </summary>
+        /// <returns>A stream that holds the lock until it is closed</returns>
+        private FileStream LockIndex()
+        {
+            Directory.CreateDirectory(Path.Combine(m_cachePath, C_CONTENTS_FOLDER));
+
+            string lockPath = Path.Combine(m_cachePath, C_LOCK_FILE);
+            for (int attempt = 1; ; attempt++)
+            {
+                try
+                {
+                    return new FileStream(lockPath, FileMode.OpenOrCreate, FileAccess.ReadWrite, FileShare.None);
+                }
+                catch (IOException)
+                {
+                    if (attempt >= C_MAX_LOCK_ATTEMPTS)
+                    {
+                        throw;
+                    }
+                    System.Threading.Thread.Sleep(C_LOCK_RETRY_DELAY_MS);
+                }
+            }
+        }
+
+        /// <summary>
+        /// Reads the cache's index (the lock must be held), along with the running
+        /// totals of hits and misses
+        /// </summary>
+        /// <returns>The entries in the index, by key</returns>
+        private Dictionary<string, Entry> ReadIndex()
+        {
+            Dictionary<string, Entry> entries = new Dictionary<string, Entry>();
+            m_hits = 0;
+            m_misses = 0;
+            m_bytesSaved = 0;
+
+            string indexPath = Path.Combine(m_cachePath, C_INDEX_FILE);
+            if (!File.Exists(indexPath))
+            {
+                return entries;
+            }
+
+            foreach (string line in File.ReadLines(indexPath, Encoding.UTF8))
+            {
+                // Unrecognized lines are skipped
+                string[] fields = line.Split(C_SEPARATOR[0]);
+                if (fields[0] == C_LINE_ENTRY)
+                {
+                    Entry entry = Entry.FromFields(fields);
+                    if (entry != null)
+                    {
+                        entries[entry.Key] = entry;
+                    }
+                }
+                else if (fields[0] == C_LINE_STATS && fields.Length == C_NUM_STATS_FIELDS)
+                {
+                    long.TryParse(fields[1], out m_hits);
+                    long.TryParse(fields[2], out m_misses);
+                    long.TryParse(fields[3], out m_bytesSaved);
+                }
+            }
+
+            return entries;
+        }
+
+        /// <summary>
+        /// Replaces the cache's index (the lock must be held)
+        /// </summary>
+        /// <param name="entries">The entries to be written</param>
+        private void WriteIndex(Dictionary<string, Entry> entries)
+        {
+            string indexPath = Path.Combine(m_cachePath, C_INDEX_FILE);
+            string tempPath = indexPath + C_TEMP_SUFFIX;
+
+            using (StreamWriter writer = new StreamWriter(tempPath, false, Encoding.UTF8))
+            {
+                writer.WriteLine(string.Join(C_SEPARATOR, new string[] {
+                    C_LINE_STATS, m_hits.ToString(), m_misses.ToString(), m_bytesSaved.ToString() }));
+                foreach (Entry entry in entries.Values)
+                {
+                    writer.WriteLine(entry.ToLine());
+                }
+            }
+
+            if (File.Exists(indexPath))
+            {
+                File.Replace(tempPath, indexPath, null);
+            }
+            else
+            {
+                File.Move(tempPath, indexPath);
+            }
+        }
+
+        /// <summary>
+        /// Orders entries from least to most recently used
+        /// </summary>
+        private static int CompareLastUse(Entry e1, Entry e2)
+        {
+            return e1.DateLastUsed.CompareTo(e2.DateLastUsed);
+        }
+
+        /// <summary>
+        /// Removes the least recently used entries until the cache is no larger
+        /// than its limit, then deletes any contents no longer in use (the lock
+        /// must be held)
+        /// </summary>
+        /// <param name="entries">The entries in the index</param>
+        private void Evict(Dictionary<string, Entry> entries)
+        {
+            // Contents shared by several artifacts are only counted once
+            Dictionary<string, long> sizes = new Dictionary<string, long>();
+            Dictionary<string, int> useCounts = new Dictionary<string, int>();
+            List<Entry> byLastUse = new List<Entry>();
+            foreach (Entry entry in entries.Values)
+            {
+                int useCount = 0;
+                useCounts.TryGetValue(entry.Hash, out useCount);
+                useCounts[entry.Hash] = useCount + 1;
+                sizes[entry.Hash] = entry.Size;
+                byLastUse.Add(entry);
+            }
+            long totalBytes = 0;
+            foreach (long size in sizes.Values)
+            {
+                totalBytes += size;
+            }
+
+            byLastUse.Sort(CompareLastUse);
+            foreach (Entry entry in byLastUse)
+            {
+                if (totalBytes <= m_maxBytes)
+                {
+                    break;
+                }
+                entries.Remove(entry.Key);
+                useCounts[entry.Hash]--;
+                if (useCounts[entry.Hash] == 0)
+                {
+                    totalBytes -= entry.Size;
+                }
+            }
+
+            // Delete the contents that no entry refers to any longer (including any
+            // left behind by a process that exited before updating the index)
+            HashSet<string> hashesInUse = new HashSet<string>();
+            foreach (Entry entry in entries.Values)
+            {
+                hashesInUse.Add(entry.Hash);
+            }
+            foreach (string contentsPath in Directory.GetFiles(Path.Combine(m_cachePath, C_CONTENTS_FOLDER)))
+            {
+                string name = Path.GetFileName(contentsPath);
+                if (!hashesInUse.Contains(name) && !name.EndsWith(C_TEMP_SUFFIX))
+                {
+                    File.Delete(contentsPath);
+                }
+            }
+        }
+        #endregion
+
+        /// <summary>
+        /// Builds the key identifying an artifact in the cache
+        /// </summary>
+        /// <param name="wmxDbAlias">The alias of the Workflow Manager database</param>
+        /// <param name="artifactType">The type of artifact (ex: C_TYPE_MAP_DOCUMENT)</param>
+        /// <param name="artifactName">The name of the artifact</param>
+        /// <returns>The key</returns>
+        public static string BuildKey(string wmxDbAlias, string artifactType, string artifactName)
+        {
+            return Clean(wmxDbAlias + "|" + artifactType + "|" + artifactName);
+        }
+
+        /// <summary>
+        /// Copies an artifact out of the cache, if the cached copy is still current
+        /// </summary>
+        /// <param name="key">The key identifying the artifact (see BuildKey())</param>
+        /// <param name="marker">The artifact's current change marker</param>
+        /// <param name="destPath">
+        /// The path to which the artifact should be copied; nothing is written if the
+        /// artifact is empty
+        /// </param>
+        /// <returns>True if the artifact was copied from the cache; false if it must be downloaded</returns>
+        public bool TryGet(string key, string marker, string destPath)
+        {
+            using (FileStream lockStream = LockIndex())
+            {
+                Dictionary<string, Entry> entries = ReadIndex();
+
+                Entry entry = null;
+                bool isCurrent =
+                    entries.TryGetValue(key, out entry) &&
+                    entry.Marker == Clean(marker) &&
+                    DateTime.Now - entry.DateVerified < m_maxAge &&
+                    (entry.Size == 0 || File.Exists(GetContentsPath(entry.Hash)));
+
+                if (isCurrent)
+                {
+                    if (entry.Size > 0)
+                    {
+                        File.Copy(GetContentsPath(entry.Hash), destPath, true);
+                    }
+                    entry.DateLastUsed = DateTime.Now;
+                    m_hits++;
+                    m_bytesSaved += entry.Size;
+                }
+                else
+                {
+                    m_misses++;
+                }
+
+                WriteIndex(entries);
+                return isCurrent;
+            }
+        }
+
+        /// <summary>
+        /// Adds a newly-downloaded artifact to the cache, replacing any earlier copy
+        /// </summary>
+        /// <param name="key">The key identifying the artifact (see BuildKey())</param>
+        /// <param name="marker">The artifact's change marker, as of the download</param>
+        /// <param name="sourcePath">The downloaded file; null if the artifact is empty</param>
+        public void Put(string key, string marker, string sourcePath)
+        {
+            string hash = ComputeHash(sourcePath);
+            long size = sourcePath == null ? 0 : new FileInfo(sourcePath).Length;
+
+            using (FileStream lockStream = LockIndex())
+            {
+                // Identical contents (ex: the same map document stored under two
+                // names) are only stored once
+                string contentsPath = GetContentsPath(hash);
+                if (size > 0 && !File.Exists(contentsPath))
+                {
+                    string tempPath = contentsPath + C_TEMP_SUFFIX;
+                    File.Copy(sourcePath, tempPath, true);
+                    File.Move(tempPath, contentsPath);
+                }
+
+                Dictionary<string, Entry> entries = ReadIndex();
+                Entry entry = new Entry();
+                entry.Key = key;
+                entry.Marker = Clean(marker);
+                entry.Hash = hash;
+                entry.Size = size;
+                entries[key] = entry;
+
+                Evict(entries);
+                WriteIndex(entries);
+            }
+        }
+
+        /// <summary>
+        /// Removes an artifact from the cache (ex: once it has been replaced or
+        /// deleted in the database), so that it is downloaded again next time
+        /// </summary>
+        /// <param name="key">The key identifying the artifact (see BuildKey())</param>
+        public void Invalidate(string key)
+        {
+            if (!Directory.Exists(m_cachePath))
+            {
+                return;
+            }
+
+            using (FileStream lockStream = LockIndex())
+            {
+                Dictionary<string, Entry> entries = ReadIndex();
+                if (entries.Remove(key))
+                {
+                    Evict(entries);
+                    WriteIndex(entries);
+                }
+            }
+        }
+
+        /// <summary>
+        /// Removes a map document from the default cache, once it has been replaced or
+        /// deleted.  Any problem with the cache is ignored; the cached copy will be
+        /// replaced once it is too old to be used, in any case.
+        /// </summary>
+        /// <param name="wmxDbAlias">The alias of the Workflow Manager database</param>
+        /// <param name="mapName">The name of the map document</param>
+        public static void InvalidateMapDocument(string wmxDbAlias, string mapName)
+        {
+            try
+            {
+                WmauArtifactCache cache = new WmauArtifactCache(DefaultCachePath);
+                cache.Invalidate(BuildKey(wmxDbAlias, C_TYPE_MAP_DOCUMENT, mapName));
+            }
+            catch (IOException)
+            {
+            }
+            catch (UnauthorizedAccessException)
+            {
+            }
+        }
+
+        /// <summary>
+        /// Removes a Task Assistant workbook from the default cache, once it has been
+        /// replaced or deleted (see InvalidateMapDocument())
+        /// </summary>
+        /// <param name="wmxDbAlias">The alias of the Workflow Manager database</param>
+        /// <param name="workbookName">The name of the workbook</param>
+        public static void InvalidateTamWorkbook(string wmxDbAlias, string workbookName)
+        {
+            try
+            {
+                WmauArtifactCache cache = new WmauArtifactCache(DefaultCachePath);
+                cache.Invalidate(BuildKey(wmxDbAlias, C_TYPE_TAM_WORKFLOW, workbookName));
+                cache.Invalidate(BuildKey(wmxDbAlias, C_TYPE_TAM_STYLE, workbookName));
+            }
+            catch (IOException)
+            {
+            }
+            catch (UnauthorizedAccessException)
+            {
+            }
+        }
+
+        /// <summary>
+        /// Describes how much the cache has saved so far
+        /// </summary>
+        /// <returns>A one-line summary of the cache's hits and misses</returns>
+        public string DescribeStatistics()
+        {
+            return String.Format(
+                "Local cache: {0} hit(s), {1} miss(es); {2:0.0} MB read locally instead of downloaded",
+                m_hits,
+                m_misses,
+                m_bytesSaved / (1024.0 * 1024.0));
+        }
+    }
+}
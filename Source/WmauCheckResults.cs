@@ -0,0 +1,252 @@
+﻿//Copyright 2015 Esri
+//Licensed under the Apache License, Version 2.0 (the "License");
+//you may not use this file except in compliance with the License.
+//You may obtain a copy of the License at
+//    http://www.apache.org/licenses/LICENSE-2.0
+//Unless required by applicable law or agreed to in writing, software
+//distributed under the License is distributed on an "AS IS" BASIS,
+//WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//See the License for the specific language governing permissions and
+//limitations under the License.​
+
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
+using System.Security.Cryptography;
+using System.Text;
+
+
+namespace WorkflowManagerAdministrationUtilities.Common
+{
+    /// <summary>
+    /// The findings of a "Report Possible Errors" run, saved so that the next run
+    /// can check only what has changed.  Along with the issues found, the file
+    /// records a fingerprint of each entity checked (ex: a job or a workflow), and
+    /// the users and groups that existed at the time.
+    /// </summary>
+    /// <remarks>
+    /// The file is written as tab-separated lines; it is replaced in a single
+    /// step when saved, so that an interrupted run leaves the previous results
+    /// intact.
+    /// </remarks>
+    class WmauCheckResults
+    {
+        #region Helper classes
+        /// <summary>
+        /// Helper class used to store an individual issue
+        /// </summary>
+        public class Issue
+        {
+            private string m_check = string.Empty;
+            private string m_entityKey = string.Empty;
+            private string m_message = string.Empty;
+
+            public Issue(string check, string entityKey, string message)
+            {
+                m_check = Clean(check);
+                m_entityKey = Clean(entityKey);
+                m_message = Clean(message);
+            }
+
+            #region Accessors
+            public string Check { get { return m_check; } }
+            public string EntityKey { get { return m_entityKey; } }
+            public string Message { get { return m_message; } }
+
+            /// <summary>
+            /// Identifies the issue when comparing the results of two runs
+            /// </summary>
+            public string Key { get { return m_check + C_SEPARATOR + m_entityKey + C_SEPARATOR + m_message; } }
+            #endregion
+        }
+        #endregion
+
+        private const string C_SEPARATOR = "\t";
+        private const string C_FILE_HEADER = "WMAU_CHECK_RESULTS";
+        private const string C_FILE_VERSION = "1";
+        private const string C_LINE_OPTIONS = "OPTIONS";
+        private const string C_LINE_PRINCIPAL = "PRINCIPAL";
+        private const string C_LINE_ENTITY = "ENTITY";
+        private const string C_LINE_ISSUE = "ISSUE";
+        private const string C_TEMP_SUFFIX = ".tmp";
+
+        #region MemberVariables
+        private string m_options = string.Empty;
+        private HashSet<string> m_principals = new HashSet<string>();
+        private Dictionary<string, string> m_fingerprints = new Dictionary<string, string>();
+        private List<Issue> m_issues = new List<Issue>();
+        #endregion
+
+        #region Accessors
+        /// <summary>
+        /// Describes the database and checks that produced these results; results
+        /// are only comparable between runs with the same options
+        /// </summary>
+        public string Options
+        {
+            get { return m_options; }
+            set { m_options = value == null ? string.Empty : value; }
+        }
+
+        /// <summary>
+        /// The keys of the users and groups that existed (see PrincipalKey())
+        /// </summary>
+        public HashSet<string> Principals { get { return m_principals; } }
+
+        /// <summary>
+        /// The fingerprint of each entity checked, by entity key
+        /// </summary>
+        public Dictionary<string, string> Fingerprints { get { return m_fingerprints; } }
+
+        /// <summary>
+        /// The issues found, in the order in which they were found
+        /// </summary>
+        public List<Issue> Issues { get { return m_issues; } }
+        #endregion
+
+        /// <summary>
+        /// Builds the key identifying a user or group
+        /// </summary>
+        /// <param name="isGroup">True for a group, false for a user</param>
+        /// <param name="name">The name of the user or group</param>
+        /// <returns>The key</returns>
+        public static string PrincipalKey(bool isGroup, string name)
+        {
+            return (isGroup ? "GROUP:" : "USER:") + name;
+        }
+
+        /// <summary>
+        /// Computes a compact fingerprint of an entity's state
+        /// </summary>
+        /// <param name="state">A string describing everything about the entity that is checked</param>
+        /// <returns>The fingerprint</returns>
+        public static string ComputeFingerprint(string state)
+        {
+            using (SHA1 hasher = new SHA1CryptoServiceProvider())
+            {
+                return Convert.ToBase64String(hasher.ComputeHash(Encoding.UTF8.GetBytes(state)));
+            }
+        }
+
+        /// <summary>
+        /// Returns the issues found for each entity
+        /// </summary>
+        /// <returns>A dictionary of entity keys to issues</returns>
+        public Dictionary<string, List<Issue>> GetIssuesByEntity()
+        {
+            Dictionary<string, List<Issue>> issuesByEntity = new Dictionary<string, List<Issue>>();
+            foreach (Issue issue in m_issues)
+            {
+                if (!issuesByEntity.ContainsKey(issue.EntityKey))
+                {
+                    issuesByEntity[issue.EntityKey] = new List<Issue>();
+                }
+                issuesByEntity[issue.EntityKey].Add(issue);
+            }
+            return issuesByEntity;
+        }
+
+        /// <summary>
+        /// Replaces any characters that would break up a line of the file
+        /// </summary>
+        /// <param name="value">The value to be written</param>
+        /// <returns>The value, with any tabs or line breaks replaced by spaces</returns>
+        private static string Clean(string value)
+        {
+            if (value == null)
+            {
+                return string.Empty;
+            }
+            return value.Replace('\t', ' ').Replace('\r', ' ').Replace('\n', ' ');
+        }
+
+        /// <summary>
+        /// Loads the results of an earlier run
+        /// </summary>
+        /// <param name="path">The path to the results file</param>
+        /// <returns>The results; null if the file doesn't exist or isn't a results file</returns>
+        public static WmauCheckResults Load(string path)
+        {
+            if (!File.Exists(path))
+            {
+                return null;
+            }
+
+            WmauCheckResults results = new WmauCheckResults();
+            bool headerFound = false;
+            foreach (string line in File.ReadLines(path, Encoding.UTF8))
+            {
+                string[] fields = line.Split(C_SEPARATOR[0]);
+                if (!headerFound)
+                {
+                    if (fields.Length != 2 || fields[0] != C_FILE_HEADER || fields[1] != C_FILE_VERSION)
+                    {
+                        return null;
+                    }
+                    headerFound = true;
+                }
+                else if (fields[0] == C_LINE_OPTIONS && fields.Length == 2)
+                {
+                    results.Options = fields[1];
+                }
+                else if (fields[0] == C_LINE_PRINCIPAL && fields.Length == 2)
+                {
+                    results.Principals.Add(fields[1]);
+                }
+                else if (fields[0] == C_LINE_ENTITY && fields.Length == 3)
+                {
+                    results.Fingerprints[fields[1]] = fields[2];
+                }
+                else if (fields[0] == C_LINE_ISSUE && fields.Length == 4)
+                {
+                    results.Issues.Add(new Issue(fields[1], fields[2], fields[3]));
+                }
+            }
+
+            return headerFound ? results : null;
+        }
+
+        /// <summary>
+        /// Saves these results, replacing the file's previous contents
+        /// </summary>
+        /// <param name="path">The path to the results file</param>
+        public void Save(string path)
+        {
+            string folder = Path.GetDirectoryName(Path.GetFullPath(path));
+            if (!Directory.Exists(folder))
+            {
+                Directory.CreateDirectory(folder);
+            }
+
+            string tempPath = path + C_TEMP_SUFFIX;
+            using (StreamWriter writer = new StreamWriter(tempPath, false, new UTF8Encoding(false)))
+            {
+                writer.WriteLine(C_FILE_HEADER + C_SEPARATOR + C_FILE_VERSION);
+                writer.WriteLine(C_LINE_OPTIONS + C_SEPARATOR + Clean(m_options));
+                foreach (string principal in m_principals)
+                {
+                    writer.WriteLine(C_LINE_PRINCIPAL + C_SEPARATOR + Clean(principal));
+                }
+                foreach (KeyValuePair<string, string> fingerprint in m_fingerprints)
+                {
+                    writer.WriteLine(C_LINE_ENTITY + C_SEPARATOR + Clean(fingerprint.Key) + C_SEPARATOR + fingerprint.Value);
+                }
+                foreach (Issue issue in m_issues)
+                {
+                    writer.WriteLine(C_LINE_ISSUE + C_SEPARATOR + issue.Check + C_SEPARATOR +
+                        issue.EntityKey + C_SEPARATOR + issue.Message);
+                }
+            }
+
+            if (File.Exists(path))
+            {
+                File.Replace(tempPath, path, null);
+            }
+            else
+            {
+                File.Move(tempPath, path);
+            }
+        }
+    }
+}
@@ -0,0 +1,335 @@
+﻿//Copyright 2015 Esri
+//Licensed under the Apache License, Version 2.0 (the "License");
+//you may not use this file except in compliance with the License.
+//You may obtain a copy of the License at
+//    http://www.apache.org/licenses/LICENSE-2.0
+//Unless required by applicable law or agreed to in writing, software
+//distributed under the License is distributed on an "AS IS" BASIS,
+//WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//See the License for the specific language governing permissions and
+//limitations under the License.​
+
+
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
+using System.Text;
+
+using ESRI.ArcGIS.JTX;
+
+
+namespace WorkflowManagerAdministrationUtilities.Common
+{
+    /// <summary>
+    /// A snapshot of the parts of a Workflow Manager database's configuration that
+    /// scripts most often need to look up: users, groups and their members and
+    /// privileges, job types, data workspaces, map documents and Task Assistant
+    /// workbooks.  The snapshot is saved as a single tab-separated file, sorted by
+    /// name within each section, that "ConfigSnapshot.py" can load and index.
+    /// </summary>
+    /// <remarks>
+    /// Along with the configuration, the file records a "stamp" computed from the
+    /// underlying tables (see WmauHelperFunctions.ComputeConfigurationStamp()),
+    /// so that a snapshot can be checked against the live database without
+    /// reading the configuration again.
+    /// </remarks>
+    class WmauConfigSnapshot
+    {
+        #region Constants
+        private const string C_SEPARATOR = "\t";
+        private const string C_FILE_HEADER = "WMAU_CONFIG_SNAPSHOT";
+        private const string C_FILE_VERSION = "1";
+        private const string C_DATE_FORMAT = "yyyy-MM-ddTHH:mm:ss";
+        private const string C_LINE_DATABASE = "DATABASE";
+        private const string C_LINE_STAMP = "STAMP";
+        private const string C_LINE_CREATED = "CREATED";
+        private const string C_LINE_USER = "USER";
+        private const string C_LINE_GROUP = "GROUP";
+        private const string C_LINE_MEMBER = "MEMBER";
+        private const string C_LINE_PRIVILEGE = "PRIVILEGE";
+        private const string C_LINE_GRANT = "GRANT";
+        private const string C_LINE_JOB_TYPE = "JOB_TYPE";
+        private const string C_LINE_WORKSPACE = "WORKSPACE";
+        private const string C_LINE_MAP_DOCUMENT = "MAP_DOCUMENT";
+        private const string C_LINE_TAM_WORKBOOK = "TAM_WORKBOOK";
+        private const string C_TEMP_SUFFIX = ".tmp";
+        #endregion
+
+        #region MemberVariables
+        private string m_wmxDbAlias = string.Empty;
+        private string m_stamp = string.Empty;
+        private DateTime m_dateCreated = DateTime.Now;
+        private SortedList<string, string[]> m_users = new SortedList<string, string[]>(StringComparer.Ordinal);
+        private SortedList<string, SortedSet<string>> m_groupMembers = new SortedList<string, SortedSet<string>>(StringComparer.Ordinal);
+        private SortedList<string, SortedSet<string>> m_groupPrivileges = new SortedList<string, SortedSet<string>>(StringComparer.Ordinal);
+        private SortedSet<string> m_privileges = new SortedSet<string>(StringComparer.Ordinal);
+        private SortedList<string, string> m_jobTypes = new SortedList<string, string>(StringComparer.Ordinal);
+        private SortedList<string, string> m_workspaces = new SortedList<string, string>(StringComparer.Ordinal);
+        private SortedList<string, string> m_mapDocuments = new SortedList<string, string>(StringComparer.Ordinal);
+        private SortedSet<string> m_tamWorkbooks = new SortedSet<string>(StringComparer.Ordinal);
+        #endregion
+
+        #region Accessors
+        /// <summary>
+        /// The stamp of the database's configuration when the snapshot was taken; empty
+        /// if it could not be determined
+        /// </summary>
+        public string Stamp { get { return m_stamp; } }
+
+        /// <summary>
+        /// A short description of the contents of the snapshot
+        /// </summary>
+        public string Summary
+        {
+            get
+            {
+                return String.Format(
+                    "{0} user(s), {1} group(s), {2} privilege(s), {3} job type(s), {4} data workspace(s), " +
+                    "{5} map document(s), {6} Task Assistant workbook(s)",
+                    m_users.Count, m_groupMembers.Count, m_privileges.Count, m_jobTypes.Count,
+                    m_workspaces.Count, m_mapDocuments.Count, m_tamWorkbooks.Count);
+            }
+        }
+        #endregion
+
+        #region Helper functions
+        /// <summary>
+        /// Replaces any characters that would break up a line of the file
+        /// </summary>
+        /// <param name="value">The value to be written</param>
+        /// <returns>The value, with any tabs or line breaks replaced by spaces</returns>
+        private static string Clean(string value)
+        {
+            if (value == null)
+            {
+                return string.Empty;
+            }
+            return value.Replace('\t', ' ').Replace('\r', ' ').Replace('\n', ' ');
+        }
+
+        /// <summary>
+        /// Writes a single line of the file
+        /// </summary>
+        /// <param name="writer">The file being written</param>
+        /// <param name="lineType">The type of line</param>
+        /// <param name="values">The values on the line</param>
+        private static void WriteLine(TextWriter writer, string lineType, params string[] values)
+        {
+            writer.Write(lineType);
+            foreach (string value in values)
+            {
+                writer.Write(C_SEPARATOR);
+                writer.Write(Clean(value));
+            }
+            writer.Write('\n');
+        }
+        #endregion
+
+        /// <summary>
+        /// Takes a snapshot of a Workflow Manager database's configuration
+        /// </summary>
+        /// <param name="wmxDb">A reference to the active Workflow Manager database</param>
+        /// <param name="stamp">
+        /// The stamp of the configuration (see WmauHelperFunctions.ComputeConfigurationStamp());
+        /// this should be computed before the configuration is read, so that any
+        /// changes made in the meantime are caught by the next staleness check
+        /// </param>
+        /// <returns>The snapshot</returns>
+        public static WmauConfigSnapshot Read(IJTXDatabase3 wmxDb, string stamp)
+        {
+            WmauConfigSnapshot snapshot = new WmauConfigSnapshot();
+            snapshot.m_wmxDbAlias = wmxDb.Alias;
+            snapshot.m_stamp = stamp == null ? string.Empty : stamp;
+
+            IJTXConfiguration3 configMgr = wmxDb.ConfigurationManager as IJTXConfiguration3;
+
+            IJTXUserSet allUsers = configMgr.Users;
+            for (int i = 0; i < allUsers.Count; i++)
+            {
+                IJTXUser3 user = allUsers.get_Item(i) as IJTXUser3;
+                snapshot.m_users[user.UserName] = new string[] { user.FullName, user.Email };
+            }
+
+            IJTXUserGroupSet allGroups = configMgr.UserGroups;
+            for (int i = 0; i < allGroups.Count; i++)
+            {
+                IJTXUserGroup2 group = allGroups.get_Item(i) as IJTXUserGroup2;
+                SortedSet<string> members = new SortedSet<string>(StringComparer.Ordinal);
+                for (int j = 0; j < group.Users.Count; j++)
+                {
+                    members.Add(group.Users.get_Item(j).UserName);
+                }
+                snapshot.m_groupMembers[group.Name] = members;
+
+                SortedSet<string> privileges = new SortedSet<string>(StringComparer.Ordinal);
+                IJTXPrivilegeSet groupPrivileges = group.Privileges;
+                for (int j = 0; j < groupPrivileges.Count; j++)
+                {
+                    privileges.Add((groupPrivileges.get_Item(j) as IJTXPrivilege2).Name);
+                }
+                snapshot.m_groupPrivileges[group.Name] = privileges;
+            }
+
+            IJTXPrivilegeSet allPrivileges = configMgr.Privileges;
+            for (int i = 0; i < allPrivileges.Count; i++)
+            {
+                snapshot.m_privileges.Add((allPrivileges.get_Item(i) as IJTXPrivilege2).Name);
+            }
+
+            IJTXJobTypeSet allJobTypes = configMgr.JobTypes;
+            for (int i = 0; i < allJobTypes.Count; i++)
+            {
+                IJTXJobType3 jobType = allJobTypes.get_Item(i) as IJTXJobType3;
+                snapshot.m_jobTypes[jobType.Name] = jobType.State.ToString();
+            }
+
+            // Workflow Manager intentionally caches the data workspaces, so make sure
+            // that the list is current
+            wmxDb.InvalidateDataWorkspaceNames();
+            IJTXDataWorkspaceNameSet allWorkspaces = wmxDb.GetDataWorkspaceNames(null);
+            for (int i = 0; i < allWorkspaces.Count; i++)
+            {
+                IJTXDataWorkspaceName workspace = allWorkspaces.get_Item(i);
+                snapshot.m_workspaces[workspace.Name] = workspace.DatabaseID;
+            }
+
+            IJTXMapSet allMaps = configMgr.JTXMaps;
+            for (int i = 0; i < allMaps.Count; i++)
+            {
+                IJTXMap map = allMaps.get_Item(i);
+                snapshot.m_mapDocuments[map.Name] = map.Category;
+            }
+
+            IJTXTaskAssistantWorkflowRecordSet allWorkbooks = configMgr.TaskAssistantWorkflowRecords;
+            for (int i = 0; i < allWorkbooks.Count; i++)
+            {
+                snapshot.m_tamWorkbooks.Add(allWorkbooks.get_Item(i).Alias);
+            }
+
+            return snapshot;
+        }
+
+        /// <summary>
+        /// Reads the stamp of a snapshot file, without reading the rest of the file
+        /// </summary>
+        /// <param name="path">The path to the snapshot file</param>
+        /// <param name="wmxDbAlias">The alias of the database the snapshot should be for</param>
+        /// <returns>
+        /// The stamp; null if the file doesn't exist, isn't a snapshot file, is for a
+        /// different database, or has no stamp
+        /// </returns>
+        public static string ReadStamp(string path, string wmxDbAlias)
+        {
+            if (!File.Exists(path))
+            {
+                return null;
+            }
+
+            string alias = null;
+            string stamp = null;
+            bool headerFound = false;
+            foreach (string line in File.ReadLines(path, Encoding.UTF8))
+            {
+                string[] fields = line.Split(C_SEPARATOR[0]);
+                if (!headerFound)
+                {
+                    if (fields.Length != 2 || fields[0] != C_FILE_HEADER || fields[1] != C_FILE_VERSION)
+                    {
+                        return null;
+                    }
+                    headerFound = true;
+                }
+                else if (fields[0] == C_LINE_DATABASE && fields.Length == 2)
+                {
+                    alias = fields[1];
+                }
+                else if (fields[0] == C_LINE_STAMP && fields.Length == 2)
+                {
+                    stamp = fields[1];
+                }
+                else
+                {
+                    // The header lines all come before the configuration itself
+                    break;
+                }
+            }
+
+            if (alias != Clean(wmxDbAlias) || string.IsNullOrEmpty(stamp))
+            {
+                return null;
+            }
+            return stamp;
+        }
+
+        /// <summary>
+        /// Saves this snapshot, replacing the file's previous contents
+        /// </summary>
+        /// <param name="path">The path to the snapshot file</param>
+        public void Save(string path)
+        {
+            string folder = Path.GetDirectoryName(Path.GetFullPath(path));
+            if (!Directory.Exists(folder))
+            {
+                Directory.CreateDirectory(folder);
+            }
+
+            // Write the snapshot under a temporary name first, so that a script reading
+            // the snapshot never sees a partly-written file
+            string tempPath = path + C_TEMP_SUFFIX;
+            using (StreamWriter writer = new StreamWriter(tempPath, false, new UTF8Encoding(false)))
+            {
+                WriteLine(writer, C_FILE_HEADER, C_FILE_VERSION);
+                WriteLine(writer, C_LINE_DATABASE, m_wmxDbAlias);
+                WriteLine(writer, C_LINE_STAMP, m_stamp);
+                WriteLine(writer, C_LINE_CREATED, m_dateCreated.ToString(C_DATE_FORMAT));
+
+                foreach (KeyValuePair<string, string[]> user in m_users)
+                {
+                    WriteLine(writer, C_LINE_USER, user.Key, user.Value[0], user.Value[1]);
+                }
+                foreach (KeyValuePair<string, SortedSet<string>> group in m_groupMembers)
+                {
+                    WriteLine(writer, C_LINE_GROUP, group.Key);
+                    foreach (string member in group.Value)
+                    {
+                        WriteLine(writer, C_LINE_MEMBER, group.Key, member);
+                    }
+                    foreach (string privilege in m_groupPrivileges[group.Key])
+                    {
+                        WriteLine(writer, C_LINE_GRANT, group.Key, privilege);
+                    }
+                }
+                foreach (string privilege in m_privileges)
+                {
+                    WriteLine(writer, C_LINE_PRIVILEGE, privilege);
+                }
+                foreach (KeyValuePair<string, string> jobType in m_jobTypes)
+                {
+                    WriteLine(writer, C_LINE_JOB_TYPE, jobType.Key, jobType.Value);
+                }
+                foreach (KeyValuePair<string, string> workspace in m_workspaces)
+                {
+                    WriteLine(writer, C_LINE_WORKSPACE, workspace.Key, workspace.Value);
+                }
+                foreach (KeyValuePair<string, string> map in m_mapDocuments)
+                {
+                    WriteLine(writer, C_LINE_MAP_DOCUMENT, map.Key, map.Value);
+                }
+                foreach (string workbook in m_tamWorkbooks)
+                {
+                    WriteLine(writer, C_LINE_TAM_WORKBOOK, workbook);
+                }
+            }
+
+            if (File.Exists(path))
+            {
+                File.Replace(tempPath, path, null);
+            }
+            else
+            {
+                File.Move(tempPath, path);
+            }
+        }
+    }
+}
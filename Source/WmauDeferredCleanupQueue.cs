@@ -0,0 +1,271 @@
+﻿//Copyright 2015 Esri
+//Licensed under the Apache License, Version 2.0 (the "License");
+//you may not use this file except in compliance with the License.
+//You may obtain a copy of the License at
+//    http://www.apache.org/licenses/LICENSE-2.0
+//Unless required by applicable law or agreed to in writing, software
+//distributed under the License is distributed on an "AS IS" BASIS,
+//WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//See the License for the specific language governing permissions and
+//limitations under the License.​
+
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
+using System.Text;
+
+
+namespace WorkflowManagerAdministrationUtilities.Common
+{
+    /// <summary>
+    /// A durable, file-based queue of job versions that are left to be deleted
+    /// after their jobs have been deleted.  Each entry is a single tab-separated
+    /// line, appended and flushed to disk as soon as it is queued, so that the
+    /// versions of deleted jobs are not forgotten if ArcGIS exits unexpectedly.
+    /// </summary>
+    /// <remarks>
+    /// The queue is processed by moving the queue file aside (see
+    /// BeginProcessing()), so that jobs can continue to be deleted, and their
+    /// versions queued, while the versions already in the queue are cleaned up.
+    /// </remarks>
+    class WmauDeferredCleanupQueue
+    {
+        #region Helper classes
+        /// <summary>
+        /// Helper class used to store an individual entry in the queue.
+        /// </summary>
+        public class Entry
+        {
+            private string m_wmxDbAlias = string.Empty;
+            private int m_jobId = -1;
+            private string m_dataWorkspaceId = string.Empty;
+            private string m_versionName = string.Empty;
+            private DateTime m_dateQueued = DateTime.Now;
+
+            public Entry() { }
+
+            #region Accessors
+            public string WmxDatabaseAlias
+            {
+                get { return m_wmxDbAlias; }
+                set { m_wmxDbAlias = value == null ? string.Empty : value; }
+            }
+
+            public int JobId
+            {
+                get { return m_jobId; }
+                set { m_jobId = value; }
+            }
+
+            public string DataWorkspaceId
+            {
+                get { return m_dataWorkspaceId; }
+                set { m_dataWorkspaceId = value == null ? string.Empty : value; }
+            }
+
+            public string VersionName
+            {
+                get { return m_versionName; }
+                set { m_versionName = value == null ? string.Empty : value; }
+            }
+
+            public DateTime DateQueued
+            {
+                get { return m_dateQueued; }
+                set { m_dateQueued = value; }
+            }
+            #endregion
+
+            /// <summary>
+            /// Formats this entry as a line in the queue file
+            /// </summary>
+            /// <returns>The entry, without a line terminator</returns>
+            public string ToLine()
+            {
+                return string.Join(C_SEPARATOR, new string[] {
+                    m_wmxDbAlias,
+                    m_jobId.ToString(),
+                    m_dataWorkspaceId,
+                    m_versionName,
+                    m_dateQueued.ToString(C_DATE_FORMAT)
+                });
+            }
+
+            /// <summary>
+            /// Parses a line from the queue file
+            /// </summary>
+            /// <param name="line">The line to parse</param>
+            /// <returns>The entry; null if the line is not a complete entry</returns>
+            public static Entry FromLine(string line)
+            {
+                string[] fields = line.Split(C_SEPARATOR[0]);
+                int jobId = 0;
+                DateTime dateQueued;
+                if (fields.Length != C_NUM_FIELDS ||
+                    !int.TryParse(fields[1], out jobId) ||
+                    !DateTime.TryParseExact(fields[4], C_DATE_FORMAT, null, System.Globalization.DateTimeStyles.None, out dateQueued))
+                {
+                    return null;
+                }
+
+                Entry entry = new Entry();
+                entry.WmxDatabaseAlias = fields[0];
+                entry.JobId = jobId;
+                entry.DataWorkspaceId = fields[2];
+                entry.VersionName = fields[3];
+                entry.DateQueued = dateQueued;
+                return entry;
+            }
+        }
+        #endregion
+
+        private const string C_SEPARATOR = "\t";
+        private const int C_NUM_FIELDS = 5;
+        private const string C_DATE_FORMAT = "yyyy-MM-ddTHH:mm:ss";
+        private const string C_PROCESSING_SUFFIX = ".processing";
+        private const string C_DEFAULT_QUEUE_FOLDER = "WorkflowManagerAdministrationUtilities";
+        private const string C_DEFAULT_QUEUE_FILE = "DeferredVersionCleanup.txt";
+
+        // The queue may be written by several ArcGIS processes at once, so retry
+        // for a short while if another process has the file open
+        private const int C_MAX_OPEN_ATTEMPTS = 20;
+        private const int C_OPEN_RETRY_DELAY_MS = 100;
+
+        /// <summary>
+        /// The queue file used when none is specified; located in the current
+        /// user's local application data folder
+        /// </summary>
+        public static string DefaultQueuePath
+        {
+            get
+            {
+                return Path.Combine(
+                    Environment.GetFolderPath(Environment.SpecialFolder.LocalApplicationData),
+                    C_DEFAULT_QUEUE_FOLDER,
+                    C_DEFAULT_QUEUE_FILE);
+            }
+        }
+
+        /// <summary>
+        /// Opens a queue file for appending, waiting for any other process that
+        /// is writing to it
+        /// </summary>
+        /// <param name="queuePath">The path to the queue file</param>
+        /// <returns>A stream positioned at the end of the file</returns>
+        private static FileStream OpenForAppend(string queuePath)
+        {
+            string folder = Path.GetDirectoryName(Path.GetFullPath(queuePath));
+            if (!Directory.Exists(folder))
+            {
+                Directory.CreateDirectory(folder);
+            }
+
+            for (int attempt = 1; ; attempt++)
+            {
+                try
+                {
+                    FileStream stream = new FileStream(queuePath, FileMode.OpenOrCreate, FileAccess.ReadWrite, FileShare.Read);
+                    stream.Seek(0, SeekOrigin.End);
+                    return stream;
+                }
+                catch (IOException)
+                {
+                    if (attempt >= C_MAX_OPEN_ATTEMPTS)
+                    {
+                        throw;
+                    }
+                    System.Threading.Thread.Sleep(C_OPEN_RETRY_DELAY_MS);
+                }
+            }
+        }
+
+        /// <summary>
+        /// Appends entries to the queue, and flushes them to disk before returning
+        /// </summary>
+        /// <param name="queuePath">The path to the queue file</param>
+        /// <param name="entries">The entries to add</param>
+        public static void Enqueue(string queuePath, IEnumerable<Entry> entries)
+        {
+            using (FileStream stream = OpenForAppend(queuePath))
+            {
+                // Entries are always written starting on a new line, so that a line left
+                // incomplete by an earlier crash doesn't swallow the first new entry
+                StringBuilder lines = new StringBuilder();
+                if (stream.Length > 0)
+                {
+                    stream.Seek(-1, SeekOrigin.End);
+                    if (stream.ReadByte() != '\n')
+                    {
+                        lines.Append('\n');
+                    }
+                }
+                foreach (Entry entry in entries)
+                {
+                    lines.Append(entry.ToLine());
+                    lines.Append('\n');
+                }
+
+                byte[] bytes = Encoding.UTF8.GetBytes(lines.ToString());
+                stream.Write(bytes, 0, bytes.Length);
+                stream.Flush(true);
+            }
+        }
+
+        /// <summary>
+        /// Takes the current contents of the queue for processing.  New entries
+        /// may be queued while these are being processed; EndProcessing() must be
+        /// called to put back any entries that were not processed.
+        /// </summary>
+        /// <remarks>
+        /// If an earlier run stopped without calling EndProcessing(), the entries
+        /// it was processing are returned again, so that none are lost.
+        /// </remarks>
+        /// <param name="queuePath">The path to the queue file</param>
+        /// <returns>The entries in the queue, in the order in which they were queued</returns>
+        public static List<Entry> BeginProcessing(string queuePath)
+        {
+            string processingPath = queuePath + C_PROCESSING_SUFFIX;
+            if (!File.Exists(processingPath) && File.Exists(queuePath))
+            {
+                File.Move(queuePath, processingPath);
+            }
+
+            List<Entry> entries = new List<Entry>();
+            if (File.Exists(processingPath))
+            {
+                foreach (string line in File.ReadLines(processingPath, Encoding.UTF8))
+                {
+                    // Blank or partially-written lines are skipped
+                    Entry entry = Entry.FromLine(line);
+                    if (entry != null)
+                    {
+                        entries.Add(entry);
+                    }
+                }
+            }
+
+            return entries;
+        }
+
+        /// <summary>
+        /// Finishes processing the queue, returning any entries that are still
+        /// outstanding to the queue
+        /// </summary>
+        /// <param name="queuePath">The path to the queue file</param>
+        /// <param name="remainingEntries">The entries that were not processed</param>
+        public static void EndProcessing(string queuePath, IEnumerable<Entry> remainingEntries)
+        {
+            if (remainingEntries.Any())
+            {
+                Enqueue(queuePath, remainingEntries);
+            }
+
+            string processingPath = queuePath + C_PROCESSING_SUFFIX;
+            if (File.Exists(processingPath))
+            {
+                File.Delete(processingPath);
+            }
+        }
+    }
+}
@@ -0,0 +1,133 @@
+﻿//Copyright 2015 Esri
+//Licensed under the Apache License, Version 2.0 (the "License");
+//you may not use this file except in compliance with the License.
+//You may obtain a copy of the License at
+//    http://www.apache.org/licenses/LICENSE-2.0
+//Unless required by applicable law or agreed to in writing, software
+//distributed under the License is distributed on an "AS IS" BASIS,
+//WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//See the License for the specific language governing permissions and
+//limitations under the License.​
+
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+
+
+namespace WorkflowManagerAdministrationUtilities.Common
+{
+    /// <summary>
+    /// The users and groups that should exist in a Workflow Manager database, along
+    /// with the members of each group.  Filled in by an IWmauDirectorySource (or
+    /// from the Workflow Manager database itself), and compared by WmauDirectorySync.
+    /// </summary>
+    /// <remarks>
+    /// User and group names are compared without regard to case.
+    /// </remarks>
+    class WmauDirectoryContents
+    {
+        #region Helper classes
+        /// <summary>
+        /// Helper class used to store information about an individual user.
+        /// </summary>
+        public class UserInfo
+        {
+            private string m_userName = string.Empty;
+            private string m_firstName = string.Empty;
+            private string m_lastName = string.Empty;
+            private string m_fullName = string.Empty;
+            private string m_email = string.Empty;
+
+            public UserInfo(string userName)
+            {
+                m_userName = userName;
+            }
+
+            #region Accessors
+            public string UserName
+            {
+                get { return m_userName; }
+            }
+
+            public string FirstName
+            {
+                get { return m_firstName; }
+                set { m_firstName = value == null ? string.Empty : value; }
+            }
+
+            public string LastName
+            {
+                get { return m_lastName; }
+                set { m_lastName = value == null ? string.Empty : value; }
+            }
+
+            public string FullName
+            {
+                get { return m_fullName; }
+                set { m_fullName = value == null ? string.Empty : value; }
+            }
+
+            public string Email
+            {
+                get { return m_email; }
+                set { m_email = value == null ? string.Empty : value; }
+            }
+            #endregion
+
+            /// <summary>
+            /// Determines whether the details of two users are the same
+            /// </summary>
+            /// <param name="other">The user to compare against</param>
+            /// <returns>True if every detail matches, false otherwise</returns>
+            public bool HasSameDetails(UserInfo other)
+            {
+                return m_firstName.Equals(other.FirstName) &&
+                    m_lastName.Equals(other.LastName) &&
+                    m_fullName.Equals(other.FullName) &&
+                    m_email.Equals(other.Email);
+            }
+        }
+        #endregion
+
+        private Dictionary<string, UserInfo> m_users = new Dictionary<string, UserInfo>(StringComparer.OrdinalIgnoreCase);
+        private Dictionary<string, HashSet<string>> m_groups = new Dictionary<string, HashSet<string>>(StringComparer.OrdinalIgnoreCase);
+
+        #region Accessors
+        /// <summary>
+        /// The users, keyed by user name
+        /// </summary>
+        public Dictionary<string, UserInfo> Users { get { return m_users; } }
+
+        /// <summary>
+        /// The names of the users in each group, keyed by group name
+        /// </summary>
+        public Dictionary<string, HashSet<string>> Groups { get { return m_groups; } }
+        #endregion
+
+        /// <summary>
+        /// Adds a user, replacing any user with the same name
+        /// </summary>
+        /// <param name="user">The user to add</param>
+        public void AddUser(UserInfo user)
+        {
+            m_users[user.UserName] = user;
+        }
+
+        /// <summary>
+        /// Adds a group (with no members), if it doesn't already exist
+        /// </summary>
+        /// <param name="groupName">The name of the group</param>
+        /// <returns>The names of the group's members</returns>
+        public HashSet<string> AddGroup(string groupName)
+        {
+            HashSet<string> members = null;
+            if (!m_groups.TryGetValue(groupName, out members))
+            {
+                members = new HashSet<string>(StringComparer.OrdinalIgnoreCase);
+                m_groups[groupName] = members;
+            }
+            return members;
+        }
+    }
+}
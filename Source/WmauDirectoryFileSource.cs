@@ -0,0 +1,412 @@
+﻿//Copyright 2015 Esri
+//Licensed under the Apache License, Version 2.0 (the "License");
+//you may not use this file except in compliance with the License.
+//You may obtain a copy of the License at
+//    http://www.apache.org/licenses/LICENSE-2.0
+//Unless required by applicable law or agreed to in writing, software
+//distributed under the License is distributed on an "AS IS" BASIS,
+//WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//See the License for the specific language governing permissions and
+//limitations under the License.​
+
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
+using System.Text;
+using System.Web.Script.Serialization;
+
+
+namespace WorkflowManagerAdministrationUtilities.Common
+{
+    /// <summary>
+    /// Reads the users and groups to be synchronized with a Workflow Manager
+    /// database from a file, in place of Active Directory.  Useful for testing
+    /// a synchronization (or measuring how long it takes) without a directory
+    /// server.<br/>
+    /// <br/>
+    /// Two formats are supported:
+    /// <list type="bullet">
+    /// <item>
+    /// LDIF (ex: as exported by "ldifde"), if the file's extension is ".ldf" or
+    /// ".ldif".  Entries whose objectClass is "group" or "groupOfNames" are
+    /// groups, and list their members by DN in "member" attributes; other entries
+    /// with an objectClass of "user", "person" or "inetOrgPerson" are users.
+    /// Names are taken from "sAMAccountName" (or "uid", or "cn").
+    /// </item>
+    /// <item>
+    /// JSON, otherwise: an object with a "users" array (each with "userName",
+    /// "firstName", "lastName", "fullName" and "email") and a "groups" array (each
+    /// with a "name" and a "members" array listing users or other groups by name).
+    /// </item>
+    /// </list>
+    /// Groups are nested and resolved in the same way as in Active Directory.
+    /// </summary>
+    class WmauDirectoryFileSource : IWmauDirectorySource
+    {
+        #region Helper classes
+        /// <summary>
+        /// Helper class used to store a single user or group read from the file
+        /// </summary>
+        private class DirectoryEntry
+        {
+            public bool IsGroup = false;
+            public string Name = string.Empty;
+            public WmauDirectoryContents.UserInfo User = null;
+            public List<string> MemberIds = new List<string>();
+        }
+        #endregion
+
+        private const string C_EXT_LDF = ".ldf";
+        private const string C_EXT_LDIF = ".ldif";
+
+        private string m_path = string.Empty;
+
+        // The entries in the file, keyed by ID (the DN in an LDIF file), and the
+        // groups, keyed by name
+        private Dictionary<string, DirectoryEntry> m_entries = null;
+        private Dictionary<string, DirectoryEntry> m_groupsByName = null;
+
+        /// <summary>
+        /// Constructor
+        /// </summary>
+        /// <param name="path">The path to the LDIF or JSON file</param>
+        public WmauDirectoryFileSource(string path)
+        {
+            m_path = path;
+        }
+
+        /// <summary>
+        /// Reads the users and groups from the file
+        /// </summary>
+        /// <param name="userGroup">The group whose members are the Workflow Manager users</param>
+        /// <param name="groupGroup">The group whose member groups are the Workflow Manager groups</param>
+        /// <returns>The users and groups</returns>
+        public WmauDirectoryContents GetContents(string userGroup, string groupGroup)
+        {
+            if (m_entries == null)
+            {
+                m_entries = new Dictionary<string, DirectoryEntry>(StringComparer.OrdinalIgnoreCase);
+                m_groupsByName = new Dictionary<string, DirectoryEntry>(StringComparer.OrdinalIgnoreCase);
+                try
+                {
+                    string extension = Path.GetExtension(m_path);
+                    if (extension.Equals(C_EXT_LDF, StringComparison.OrdinalIgnoreCase) ||
+                        extension.Equals(C_EXT_LDIF, StringComparison.OrdinalIgnoreCase))
+                    {
+                        LoadLdif();
+                    }
+                    else
+                    {
+                        LoadJson();
+                    }
+                }
+                catch (Exception ex)
+                {
+                    m_entries = null;
+                    throw new WmauException(WmauErrorCodes.C_DIRECTORY_SOURCE_ERROR, ex);
+                }
+            }
+
+            WmauDirectoryContents contents = new WmauDirectoryContents();
+
+            // Every user in the user group (or in any group nested within it)
+            foreach (DirectoryEntry user in GetUsersInGroup(FindGroup(userGroup)))
+            {
+                contents.AddUser(user.User);
+            }
+
+            // Each group directly within the group of groups, along with those of its
+            // members that are also users
+            foreach (string memberId in FindGroup(groupGroup).MemberIds)
+            {
+                DirectoryEntry group = null;
+                if (m_entries.TryGetValue(memberId, out group) && group.IsGroup)
+                {
+                    HashSet<string> members = contents.AddGroup(group.Name);
+                    foreach (DirectoryEntry user in GetUsersInGroup(group))
+                    {
+                        if (contents.Users.ContainsKey(user.Name))
+                        {
+                            members.Add(user.Name);
+                        }
+                    }
+                }
+            }
+
+            return contents;
+        }
+
+        /// <summary>
+        /// Looks up a group by name
+        /// </summary>
+        /// <param name="groupName">The name of the group</param>
+        /// <returns>The group</returns>
+        private DirectoryEntry FindGroup(string groupName)
+        {
+            DirectoryEntry group = null;
+            if (!m_groupsByName.TryGetValue(groupName, out group))
+            {
+                throw new WmauException(
+                    WmauErrorCodes.C_DIRECTORY_SOURCE_ERROR,
+                    new KeyNotFoundException("Group '" + groupName + "' not found in " + m_path));
+            }
+            return group;
+        }
+
+        /// <summary>
+        /// Finds the users in a group, including those in any nested groups
+        /// </summary>
+        /// <param name="group">The group</param>
+        /// <returns>The users, each listed once</returns>
+        private List<DirectoryEntry> GetUsersInGroup(DirectoryEntry group)
+        {
+            List<DirectoryEntry> users = new List<DirectoryEntry>();
+            HashSet<DirectoryEntry> visited = new HashSet<DirectoryEntry>();
+            Stack<DirectoryEntry> pending = new Stack<DirectoryEntry>();
+
+            visited.Add(group);
+            pending.Push(group);
+            while (pending.Count > 0)
+            {
+                foreach (string memberId in pending.Pop().MemberIds)
+                {
+                    DirectoryEntry member = null;
+                    if (!m_entries.TryGetValue(memberId, out member) || !visited.Add(member))
+                    {
+                        continue;
+                    }
+                    if (member.IsGroup)
+                    {
+                        pending.Push(member);
+                    }
+                    else
+                    {
+                        users.Add(member);
+                    }
+                }
+            }
+
+            return users;
+        }
+
+        /// <summary>
+        /// Adds an entry read from the file
+        /// </summary>
+        /// <param name="id">The ID by which other entries refer to this one</param>
+        /// <param name="entry">The entry</param>
+        private void AddEntry(string id, DirectoryEntry entry)
+        {
+            m_entries[id] = entry;
+            if (entry.IsGroup)
+            {
+                m_groupsByName[entry.Name] = entry;
+            }
+        }
+
+        /// <summary>
+        /// Reads the entries from an LDIF file
+        /// </summary>
+        private void LoadLdif()
+        {
+            List<KeyValuePair<string, string>> record = new List<KeyValuePair<string, string>>();
+            StringBuilder currentLine = null;
+
+            foreach (string line in File.ReadLines(m_path, Encoding.UTF8))
+            {
+                // Lines beginning with a space continue the previous line
+                if (line.StartsWith(" ") && currentLine != null)
+                {
+                    currentLine.Append(line.Substring(1));
+                    continue;
+                }
+                if (currentLine != null)
+                {
+                    AddLdifAttribute(record, currentLine.ToString());
+                    currentLine = null;
+                }
+
+                if (line.Trim().Length == 0)
+                {
+                    AddLdifRecord(record);
+                    record.Clear();
+                }
+                else if (!line.StartsWith("#"))
+                {
+                    currentLine = new StringBuilder(line);
+                }
+            }
+            if (currentLine != null)
+            {
+                AddLdifAttribute(record, currentLine.ToString());
+            }
+            AddLdifRecord(record);
+        }
+
+        /// <summary>
+        /// Parses a single "attribute: value" line of an LDIF file
+        /// </summary>
+        /// <param name="record">The attributes of the record being read</param>
+        /// <param name="line">The line, with any continuations joined</param>
+        private void AddLdifAttribute(List<KeyValuePair<string, string>> record, string line)
+        {
+            int separator = line.IndexOf(':');
+            if (separator <= 0)
+            {
+                throw new FormatException("Invalid LDIF line: " + line);
+            }
+
+            string name = line.Substring(0, separator).Trim();
+            string value = line.Substring(separator + 1);
+            if (value.StartsWith(":"))
+            {
+                value = Encoding.UTF8.GetString(Convert.FromBase64String(value.Substring(1).Trim()));
+            }
+            else if (value.StartsWith("<"))
+            {
+                // Values loaded from URLs aren't needed for users and groups
+                return;
+            }
+            record.Add(new KeyValuePair<string, string>(name, value.Trim()));
+        }
+
+        /// <summary>
+        /// Adds the user or group described by a record in an LDIF file
+        /// </summary>
+        /// <param name="record">The attributes of the record</param>
+        private void AddLdifRecord(List<KeyValuePair<string, string>> record)
+        {
+            string dn = null;
+            bool isUser = false;
+            bool isGroup = false;
+            Dictionary<string, string> values = new Dictionary<string, string>(StringComparer.OrdinalIgnoreCase);
+            List<string> memberIds = new List<string>();
+
+            foreach (KeyValuePair<string, string> attribute in record)
+            {
+                string name = attribute.Key.ToLower();
+                if (name == "dn")
+                {
+                    dn = attribute.Value;
+                }
+                else if (name == "objectclass")
+                {
+                    string objectClass = attribute.Value.ToLower();
+                    isGroup = isGroup || objectClass == "group" || objectClass == "groupofnames";
+                    isUser = isUser || objectClass == "user" || objectClass == "person" || objectClass == "inetorgperson";
+                }
+                else if (name == "member")
+                {
+                    memberIds.Add(NormalizeDn(attribute.Value));
+                }
+                else if (!values.ContainsKey(name))
+                {
+                    values[name] = attribute.Value;
+                }
+            }
+
+            // Skip the version line, and anything that isn't a user or group
+            if (dn == null || (!isUser && !isGroup))
+            {
+                return;
+            }
+
+            DirectoryEntry entry = new DirectoryEntry();
+            entry.IsGroup = isGroup;
+            entry.Name = GetValue(values, "samaccountname", GetValue(values, "uid", GetValue(values, "cn", dn)));
+            entry.MemberIds = memberIds;
+            if (!isGroup)
+            {
+                entry.User = new WmauDirectoryContents.UserInfo(entry.Name);
+                entry.User.FirstName = GetValue(values, "givenname", string.Empty);
+                entry.User.LastName = GetValue(values, "sn", string.Empty);
+                entry.User.FullName = GetValue(values, "displayname", GetValue(values, "cn", string.Empty));
+                entry.User.Email = GetValue(values, "mail", string.Empty);
+            }
+            AddEntry(NormalizeDn(dn), entry);
+        }
+
+        /// <summary>
+        /// Puts a DN into a consistent form, so that references to an entry match
+        /// the entry's own DN
+        /// </summary>
+        /// <param name="dn">The DN</param>
+        /// <returns>The DN, without any spaces around its components</returns>
+        private static string NormalizeDn(string dn)
+        {
+            string[] components = dn.Split(',');
+            for (int i = 0; i < components.Length; i++)
+            {
+                components[i] = components[i].Trim();
+            }
+            return string.Join(",", components);
+        }
+
+        /// <summary>
+        /// Reads the entries from a JSON file
+        /// </summary>
+        private void LoadJson()
+        {
+            JavaScriptSerializer serializer = new JavaScriptSerializer();
+            serializer.MaxJsonLength = int.MaxValue;
+            Dictionary<string, object> root = serializer.DeserializeObject(File.ReadAllText(m_path, Encoding.UTF8)) as Dictionary<string, object>;
+            if (root == null)
+            {
+                throw new FormatException("Expected a JSON object with \"users\" and \"groups\" arrays");
+            }
+
+            // Users and groups are told apart by name, with groups taking precedence
+            object[] users = GetValue(root, "users", new object[0]) as object[];
+            object[] groups = GetValue(root, "groups", new object[0]) as object[];
+            HashSet<string> groupNames = new HashSet<string>(StringComparer.OrdinalIgnoreCase);
+            foreach (object item in groups)
+            {
+                groupNames.Add(GetValue(item as Dictionary<string, object>, "name", string.Empty).ToString());
+            }
+
+            foreach (object item in users)
+            {
+                Dictionary<string, object> values = item as Dictionary<string, object>;
+                DirectoryEntry entry = new DirectoryEntry();
+                entry.Name = GetValue(values, "userName", string.Empty).ToString();
+                entry.User = new WmauDirectoryContents.UserInfo(entry.Name);
+                entry.User.FirstName = GetValue(values, "firstName", string.Empty).ToString();
+                entry.User.LastName = GetValue(values, "lastName", string.Empty).ToString();
+                entry.User.FullName = GetValue(values, "fullName", string.Empty).ToString();
+                entry.User.Email = GetValue(values, "email", string.Empty).ToString();
+                AddEntry("user:" + entry.Name, entry);
+            }
+
+            foreach (object item in groups)
+            {
+                Dictionary<string, object> values = item as Dictionary<string, object>;
+                DirectoryEntry entry = new DirectoryEntry();
+                entry.IsGroup = true;
+                entry.Name = GetValue(values, "name", string.Empty).ToString();
+                foreach (object member in GetValue(values, "members", new object[0]) as object[])
+                {
+                    string memberName = member.ToString();
+                    entry.MemberIds.Add((groupNames.Contains(memberName) ? "group:" : "user:") + memberName);
+                }
+                AddEntry("group:" + entry.Name, entry);
+            }
+        }
+
+        /// <summary>
+        /// Gets a value from a set of attributes, if it's there
+        /// </summary>
+        /// <param name="values">The attributes</param>
+        /// <param name="name">The name of the attribute</param>
+        /// <param name="defaultValue">The value to return if the attribute is missing</param>
+        /// <returns>The attribute's value</returns>
+        private static T GetValue<T>(Dictionary<string, T> values, string name, T defaultValue)
+        {
+            T value = default(T);
+            if (values == null || !values.TryGetValue(name, out value) || value == null)
+            {
+                return defaultValue;
+            }
+            return value;
+        }
+    }
+}
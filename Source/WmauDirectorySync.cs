@@ -0,0 +1,308 @@
+﻿//Copyright 2015 Esri
+//Licensed under the Apache License, Version 2.0 (the "License");
+//you may not use this file except in compliance with the License.
+//You may obtain a copy of the License at
+//    http://www.apache.org/licenses/LICENSE-2.0
+//Unless required by applicable law or agreed to in writing, software
+//distributed under the License is distributed on an "AS IS" BASIS,
+//WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//See the License for the specific language governing permissions and
+//limitations under the License.​
+
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+
+using ESRI.ArcGIS.JTX;
+
+
+namespace WorkflowManagerAdministrationUtilities.Common
+{
+    /// <summary>
+    /// Works out the changes needed to bring the users and groups in a Workflow
+    /// Manager database into line with those in a directory (see
+    /// IWmauDirectorySource), and applies them.  Only the differences are written
+    /// to the database; users and groups that already match are left alone.
+    /// </summary>
+    class WmauDirectorySync
+    {
+        #region MemberVariables
+        private List<WmauDirectoryContents.UserInfo> m_usersToAdd = new List<WmauDirectoryContents.UserInfo>();
+        private List<WmauDirectoryContents.UserInfo> m_usersToUpdate = new List<WmauDirectoryContents.UserInfo>();
+        private List<string> m_usersToRemove = new List<string>();
+        private List<string> m_groupsToAdd = new List<string>();
+        private List<string> m_groupsToRemove = new List<string>();
+        private List<KeyValuePair<string, string>> m_membersToAdd = new List<KeyValuePair<string, string>>();
+        private List<KeyValuePair<string, string>> m_membersToRemove = new List<KeyValuePair<string, string>>();
+        #endregion
+
+        #region Accessors
+        /// <summary>
+        /// The users in the directory that aren't in the Workflow Manager database
+        /// </summary>
+        public List<WmauDirectoryContents.UserInfo> UsersToAdd { get { return m_usersToAdd; } }
+
+        /// <summary>
+        /// The users whose details (ex: e-mail address) have changed in the directory
+        /// </summary>
+        public List<WmauDirectoryContents.UserInfo> UsersToUpdate { get { return m_usersToUpdate; } }
+
+        /// <summary>
+        /// The names of the Workflow Manager users that are no longer in the directory
+        /// </summary>
+        public List<string> UsersToRemove { get { return m_usersToRemove; } }
+
+        /// <summary>
+        /// The names of the groups in the directory that aren't in the Workflow Manager database
+        /// </summary>
+        public List<string> GroupsToAdd { get { return m_groupsToAdd; } }
+
+        /// <summary>
+        /// The names of the Workflow Manager groups that are no longer in the directory
+        /// </summary>
+        public List<string> GroupsToRemove { get { return m_groupsToRemove; } }
+
+        /// <summary>
+        /// The users to be added to groups, as (group name, user name) pairs
+        /// </summary>
+        public List<KeyValuePair<string, string>> MembersToAdd { get { return m_membersToAdd; } }
+
+        /// <summary>
+        /// The users to be removed from groups, as (group name, user name) pairs
+        /// </summary>
+        public List<KeyValuePair<string, string>> MembersToRemove { get { return m_membersToRemove; } }
+
+        /// <summary>
+        /// True if the Workflow Manager database already matches the directory
+        /// </summary>
+        public bool IsEmpty
+        {
+            get
+            {
+                return m_usersToAdd.Count == 0 && m_usersToUpdate.Count == 0 && m_usersToRemove.Count == 0 &&
+                    m_groupsToAdd.Count == 0 && m_groupsToRemove.Count == 0 &&
+                    m_membersToAdd.Count == 0 && m_membersToRemove.Count == 0;
+            }
+        }
+        #endregion
+
+        /// <summary>
+        /// Constructor; compares the contents of the Workflow Manager database with
+        /// those of the directory.  The changes are sorted by name, to make the
+        /// output easier to read/follow.
+        /// </summary>
+        /// <param name="current">The users and groups currently in the Workflow Manager database</param>
+        /// <param name="directory">The users and groups in the directory</param>
+        /// <param name="preservedUserName">
+        /// The name of a user who should never be removed (ex: the user running the
+        /// tool), even if they're not in the directory; may be null
+        /// </param>
+        public WmauDirectorySync(WmauDirectoryContents current, WmauDirectoryContents directory, string preservedUserName)
+        {
+            foreach (WmauDirectoryContents.UserInfo user in directory.Users.Values)
+            {
+                WmauDirectoryContents.UserInfo existingUser = null;
+                if (!current.Users.TryGetValue(user.UserName, out existingUser))
+                {
+                    m_usersToAdd.Add(user);
+                }
+                else if (!user.HasSameDetails(existingUser))
+                {
+                    m_usersToUpdate.Add(user);
+                }
+            }
+            foreach (string userName in current.Users.Keys)
+            {
+                if (!directory.Users.ContainsKey(userName) &&
+                    !userName.Equals(preservedUserName, StringComparison.OrdinalIgnoreCase))
+                {
+                    m_usersToRemove.Add(userName);
+                }
+            }
+
+            HashSet<string> removedUsers = new HashSet<string>(m_usersToRemove, StringComparer.OrdinalIgnoreCase);
+            foreach (KeyValuePair<string, HashSet<string>> group in directory.Groups)
+            {
+                HashSet<string> existingMembers = null;
+                if (!current.Groups.TryGetValue(group.Key, out existingMembers))
+                {
+                    m_groupsToAdd.Add(group.Key);
+                    existingMembers = new HashSet<string>(StringComparer.OrdinalIgnoreCase);
+                }
+
+                foreach (string userName in group.Value)
+                {
+                    if (!existingMembers.Contains(userName))
+                    {
+                        m_membersToAdd.Add(new KeyValuePair<string, string>(group.Key, userName));
+                    }
+                }
+
+                // Users being removed altogether drop out of their groups anyway
+                foreach (string userName in existingMembers)
+                {
+                    if (!group.Value.Contains(userName) && !removedUsers.Contains(userName))
+                    {
+                        m_membersToRemove.Add(new KeyValuePair<string, string>(group.Key, userName));
+                    }
+                }
+            }
+            foreach (string groupName in current.Groups.Keys)
+            {
+                if (!directory.Groups.ContainsKey(groupName))
+                {
+                    m_groupsToRemove.Add(groupName);
+                }
+            }
+
+            m_usersToAdd.Sort(CompareUsers);
+            m_usersToUpdate.Sort(CompareUsers);
+            m_usersToRemove.Sort(StringComparer.OrdinalIgnoreCase);
+            m_groupsToAdd.Sort(StringComparer.OrdinalIgnoreCase);
+            m_groupsToRemove.Sort(StringComparer.OrdinalIgnoreCase);
+            m_membersToAdd.Sort(CompareMembers);
+            m_membersToRemove.Sort(CompareMembers);
+        }
+
+        /// <summary>
+        /// Reads the users and groups currently in a Workflow Manager database
+        /// </summary>
+        /// <param name="configMgr">The configuration of the Workflow Manager database</param>
+        /// <returns>The users and groups</returns>
+        public static WmauDirectoryContents ReadWorkflowManagerContents(IJTXConfiguration3 configMgr)
+        {
+            WmauDirectoryContents contents = new WmauDirectoryContents();
+
+            IJTXUserSet allUsers = configMgr.Users;
+            for (int i = 0; i < allUsers.Count; i++)
+            {
+                IJTXUser3 user = allUsers.get_Item(i) as IJTXUser3;
+                WmauDirectoryContents.UserInfo info = new WmauDirectoryContents.UserInfo(user.UserName);
+                info.FirstName = user.FirstName;
+                info.LastName = user.LastName;
+                info.FullName = user.FullName;
+                info.Email = user.Email;
+                contents.AddUser(info);
+            }
+
+            IJTXUserGroupSet allGroups = configMgr.UserGroups;
+            for (int i = 0; i < allGroups.Count; i++)
+            {
+                IJTXUserGroup2 group = allGroups.get_Item(i) as IJTXUserGroup2;
+                HashSet<string> members = contents.AddGroup(group.Name);
+                for (int j = 0; j < group.Users.Count; j++)
+                {
+                    members.Add(group.Users.get_Item(j).UserName);
+                }
+            }
+
+            return contents;
+        }
+
+        /// <summary>
+        /// Writes the changes to the Workflow Manager database.  Users and groups
+        /// are added before memberships are updated, and removed afterwards.
+        /// </summary>
+        /// <param name="configEdit">The configuration of the Workflow Manager database</param>
+        public void Apply(IJTXConfigurationEdit2 configEdit)
+        {
+            foreach (WmauDirectoryContents.UserInfo user in m_usersToAdd)
+            {
+                IJTXUserConfig newUser = configEdit.CreateUser() as IJTXUserConfig;
+                newUser.UserName_2 = user.UserName;
+                SetUserDetails(newUser, user);
+            }
+
+            foreach (WmauDirectoryContents.UserInfo user in m_usersToUpdate)
+            {
+                IJTXUserConfig existingUser = null;
+                using (WmauExecutionTrace.TimeCall(WmauExecutionTrace.C_CALL_GET_USER))
+                {
+                    existingUser = configEdit.GetUser(user.UserName) as IJTXUserConfig;
+                }
+                SetUserDetails(existingUser, user);
+            }
+
+            foreach (string groupName in m_groupsToAdd)
+            {
+                IJTXUserGroupConfig newGroup = configEdit.CreateUserGroup() as IJTXUserGroupConfig;
+                newGroup.Name_2 = groupName;
+                using (WmauExecutionTrace.TimeCall(WmauExecutionTrace.C_CALL_STORE))
+                {
+                    newGroup.Store();
+                }
+            }
+
+            foreach (KeyValuePair<string, string> member in m_membersToAdd)
+            {
+                using (WmauExecutionTrace.TimeCall(WmauExecutionTrace.C_CALL_STORE))
+                {
+                    configEdit.AddUserToGroup(member.Value, member.Key);
+                }
+            }
+
+            foreach (KeyValuePair<string, string> member in m_membersToRemove)
+            {
+                using (WmauExecutionTrace.TimeCall(WmauExecutionTrace.C_CALL_STORE))
+                {
+                    configEdit.DeleteUserFromGroup(member.Value, member.Key);
+                }
+            }
+
+            foreach (string groupName in m_groupsToRemove)
+            {
+                using (WmauExecutionTrace.TimeCall(WmauExecutionTrace.C_CALL_STORE))
+                {
+                    configEdit.DeleteUserGroup(configEdit.GetUserGroup(groupName).ID);
+                }
+            }
+
+            foreach (string userName in m_usersToRemove)
+            {
+                using (WmauExecutionTrace.TimeCall(WmauExecutionTrace.C_CALL_STORE))
+                {
+                    configEdit.DeleteUser(userName);
+                }
+            }
+        }
+
+        /// <summary>
+        /// Copies a user's details from the directory and saves them
+        /// </summary>
+        /// <param name="target">The Workflow Manager user to be updated</param>
+        /// <param name="source">The user's details from the directory</param>
+        private static void SetUserDetails(IJTXUserConfig target, WmauDirectoryContents.UserInfo source)
+        {
+            target.FirstName_2 = source.FirstName;
+            target.LastName_2 = source.LastName;
+            target.FullName_2 = source.FullName;
+            target.Email_2 = source.Email;
+            using (WmauExecutionTrace.TimeCall(WmauExecutionTrace.C_CALL_STORE))
+            {
+                target.Store();
+            }
+        }
+
+        /// <summary>
+        /// Sorts users by name
+        /// </summary>
+        private static int CompareUsers(WmauDirectoryContents.UserInfo a, WmauDirectoryContents.UserInfo b)
+        {
+            return StringComparer.OrdinalIgnoreCase.Compare(a.UserName, b.UserName);
+        }
+
+        /// <summary>
+        /// Sorts group memberships by group name, then by user name
+        /// </summary>
+        private static int CompareMembers(KeyValuePair<string, string> a, KeyValuePair<string, string> b)
+        {
+            int result = StringComparer.OrdinalIgnoreCase.Compare(a.Key, b.Key);
+            if (result == 0)
+            {
+                result = StringComparer.OrdinalIgnoreCase.Compare(a.Value, b.Value);
+            }
+            return result;
+        }
+    }
+}
@@ -30,6 +30,7 @@ namespace WorkflowManagerAdministrationUtilities
         C_USER_NOT_ADMIN_ERROR = 125003,
         C_USER_NOT_FOUND_ERROR = 125004,
         C_LICENSE_RELATED_ERROR = 125005,
+        C_GROUP_NOT_FOUND_ERROR = 125006,
         C_TAM_UPLOAD_ERROR = 125011,
         C_TAM_DOWNLOAD_ERROR = 125012,
         C_MXD_UPLOAD_ERROR = 125021,
@@ -42,6 +43,8 @@ namespace WorkflowManagerAdministrationUtilities
         C_DELETE_JOB_ERROR = 125051,
         C_DELETE_JOB_VERSION_ERROR = 125052,
         C_NO_DELETE_JOB_PRIV_ERROR = 125053,
+        C_CLEANUP_QUEUE_ERROR = 125054,
+        C_NO_DELETE_VERSION_PRIV_ERROR = 125055,
         C_CREATE_JOB_ERROR = 125061,
         C_JOB_ASSIGNMENT_IGNORED_ERROR = 125062,
         C_EXPECTED_ONE_SELECTED_FEATURE_ERROR = 125063,
@@ -63,13 +66,23 @@ namespace WorkflowManagerAdministrationUtilities
         C_DELETE_TAM_ERROR = 125131,
         C_NO_CLOSE_JOB_PRIV_ERROR = 125141,
         C_CANNOT_CLOSE_JOB_ERROR = 125142,
+        C_NO_JOB_CHANGES_SPECIFIED_ERROR = 125143,
         C_NO_ASSIGN_JOB_PRIV_ERROR = 125151,
+        C_NO_JOBS_SPECIFIED_ERROR = 125152,
         C_NO_MANAGE_ATTACHMENTS_PRIV_ERROR = 125161,
         C_NO_ADD_ATTACHMENTS_HELD_JOBS_ERROR = 125162,
+        C_NO_ATTACHMENTS_SPECIFIED_ERROR = 125163,
+        C_ATTACHMENT_FIELD_NOT_FOUND_ERROR = 125164,
         C_NO_ADD_COMMENTS_HELD_JOBS_ERROR = 125171,
         C_VERSION_LOOKUP_ERROR = 125181,
         C_JOB_ID_PARSE_ERROR = 125191,
         C_UNKNOWN_QUERY_ERROR = 125201,
+        C_INVALID_BATCH_SIZE_ERROR = 125211,
+        C_JOB_EXPORT_ERROR = 125221,
+        C_CONFIG_PROMOTION_ERROR = 125231,
+        C_CONFIG_UNRESOLVED_REFERENCE_ERROR = 125232,
+        C_DIRECTORY_SOURCE_ERROR = 125241,
+        C_CONFIG_SNAPSHOT_ERROR = 125251,
         C_NO_OR_MULTIPLE_STEPS_ERROR = 125501,
         C_JOB_EXECUTION_ERROR = 125502,
 
@@ -94,6 +107,7 @@ namespace WorkflowManagerAdministrationUtilities
             m_errorMsgs.Add(WmauErrorCodes.C_USER_NOT_ADMIN_ERROR, Properties.Resources.ERROR_USER_NOT_ADMIN);
             m_errorMsgs.Add(WmauErrorCodes.C_USER_NOT_FOUND_ERROR, Properties.Resources.ERROR_USER_NOT_FOUND);
             m_errorMsgs.Add(WmauErrorCodes.C_LICENSE_RELATED_ERROR, Properties.Resources.ERROR_LICENSE_RELATED);
+            m_errorMsgs.Add(WmauErrorCodes.C_GROUP_NOT_FOUND_ERROR, Properties.Resources.ERROR_GROUP_NOT_FOUND);
             m_errorMsgs.Add(WmauErrorCodes.C_TAM_UPLOAD_ERROR, Properties.Resources.ERROR_TAM_UPLOAD);
             m_errorMsgs.Add(WmauErrorCodes.C_TAM_DOWNLOAD_ERROR, Properties.Resources.ERROR_TAM_DOWNLOAD);
             m_errorMsgs.Add(WmauErrorCodes.C_MXD_UPLOAD_ERROR, Properties.Resources.ERROR_MXD_UPLOAD);
@@ -105,6 +119,8 @@ namespace WorkflowManagerAdministrationUtilities
             m_errorMsgs.Add(WmauErrorCodes.C_DELETE_JOB_ERROR, Properties.Resources.ERROR_DELETE_JOB);
             m_errorMsgs.Add(WmauErrorCodes.C_DELETE_JOB_VERSION_ERROR, Properties.Resources.ERROR_DELETE_JOB_VERSION);
             m_errorMsgs.Add(WmauErrorCodes.C_NO_DELETE_JOB_PRIV_ERROR, Properties.Resources.ERROR_NO_DELETE_JOB_PRIVILEGE);
+            m_errorMsgs.Add(WmauErrorCodes.C_CLEANUP_QUEUE_ERROR, Properties.Resources.ERROR_CLEANUP_QUEUE);
+            m_errorMsgs.Add(WmauErrorCodes.C_NO_DELETE_VERSION_PRIV_ERROR, Properties.Resources.ERROR_NO_DELETE_VERSION_PRIVILEGE);
             m_errorMsgs.Add(WmauErrorCodes.C_CREATE_JOB_ERROR, Properties.Resources.ERROR_CREATE_JOB);
             m_errorMsgs.Add(WmauErrorCodes.C_JOB_ASSIGNMENT_IGNORED_ERROR, Properties.Resources.ERROR_JOB_ASSIGNMENT_IGNORED);
             m_errorMsgs.Add(WmauErrorCodes.C_EXPECTED_ONE_SELECTED_FEATURE_ERROR, Properties.Resources.ERROR_EXPECTED_ONE_SELECTED_FEATURE);
@@ -126,13 +142,23 @@ namespace WorkflowManagerAdministrationUtilities
             m_errorMsgs.Add(WmauErrorCodes.C_DELETE_TAM_ERROR, Properties.Resources.ERROR_DELETE_TAM);
             m_errorMsgs.Add(WmauErrorCodes.C_NO_CLOSE_JOB_PRIV_ERROR, Properties.Resources.ERROR_NO_CLOSE_JOB_PRIVILEGE);
             m_errorMsgs.Add(WmauErrorCodes.C_CANNOT_CLOSE_JOB_ERROR, Properties.Resources.ERROR_CANNOT_CLOSE_JOB);
+            m_errorMsgs.Add(WmauErrorCodes.C_NO_JOB_CHANGES_SPECIFIED_ERROR, Properties.Resources.ERROR_NO_JOB_CHANGES_SPECIFIED);
             m_errorMsgs.Add(WmauErrorCodes.C_NO_ASSIGN_JOB_PRIV_ERROR, Properties.Resources.ERROR_NO_ASSIGN_JOB_PRIVILEGE);
+            m_errorMsgs.Add(WmauErrorCodes.C_NO_JOBS_SPECIFIED_ERROR, Properties.Resources.ERROR_NO_JOBS_SPECIFIED);
             m_errorMsgs.Add(WmauErrorCodes.C_NO_MANAGE_ATTACHMENTS_PRIV_ERROR, Properties.Resources.ERROR_NO_MANAGE_ATTACHMENTS_PRIVILEGE);
             m_errorMsgs.Add(WmauErrorCodes.C_NO_ADD_ATTACHMENTS_HELD_JOBS_ERROR, Properties.Resources.ERROR_NO_ADD_ATTACHMENTS_HELD_JOBS);
+            m_errorMsgs.Add(WmauErrorCodes.C_NO_ATTACHMENTS_SPECIFIED_ERROR, Properties.Resources.ERROR_NO_ATTACHMENTS_SPECIFIED);
+            m_errorMsgs.Add(WmauErrorCodes.C_ATTACHMENT_FIELD_NOT_FOUND_ERROR, Properties.Resources.ERROR_ATTACHMENT_FIELD_NOT_FOUND);
             m_errorMsgs.Add(WmauErrorCodes.C_NO_ADD_COMMENTS_HELD_JOBS_ERROR, Properties.Resources.ERROR_NO_ADD_COMMENTS_HELD_JOBS);
             m_errorMsgs.Add(WmauErrorCodes.C_VERSION_LOOKUP_ERROR, Properties.Resources.ERROR_VERSION_LOOKUP);
             m_errorMsgs.Add(WmauErrorCodes.C_JOB_ID_PARSE_ERROR, Properties.Resources.ERROR_JOB_ID_PARSE);
             m_errorMsgs.Add(WmauErrorCodes.C_UNKNOWN_QUERY_ERROR, Properties.Resources.ERROR_UNKNOWN_QUERY);
+            m_errorMsgs.Add(WmauErrorCodes.C_INVALID_BATCH_SIZE_ERROR, Properties.Resources.ERROR_INVALID_BATCH_SIZE);
+            m_errorMsgs.Add(WmauErrorCodes.C_JOB_EXPORT_ERROR, Properties.Resources.ERROR_JOB_EXPORT);
+            m_errorMsgs.Add(WmauErrorCodes.C_CONFIG_PROMOTION_ERROR, Properties.Resources.ERROR_CONFIG_PROMOTION);
+            m_errorMsgs.Add(WmauErrorCodes.C_CONFIG_UNRESOLVED_REFERENCE_ERROR, Properties.Resources.ERROR_CONFIG_UNRESOLVED_REFERENCE);
+            m_errorMsgs.Add(WmauErrorCodes.C_DIRECTORY_SOURCE_ERROR, Properties.Resources.ERROR_DIRECTORY_SOURCE);
+            m_errorMsgs.Add(WmauErrorCodes.C_CONFIG_SNAPSHOT_ERROR, Properties.Resources.ERROR_CONFIG_SNAPSHOT);
             m_errorMsgs.Add(WmauErrorCodes.C_NO_OR_MULTIPLE_STEPS_ERROR, Properties.Resources.ERROR_NO_OR_MULTIPLE_STEPS);
             m_errorMsgs.Add(WmauErrorCodes.C_JOB_EXECUTION_ERROR, Properties.Resources.ERROR_JOB_EXECUTION);
 
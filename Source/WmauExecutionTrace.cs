@@ -0,0 +1,360 @@
+﻿//Copyright 2015 Esri
+//Licensed under the Apache License, Version 2.0 (the "License");
+//you may not use this file except in compliance with the License.
+//You may obtain a copy of the License at
+//    http://www.apache.org/licenses/LICENSE-2.0
+//Unless required by applicable law or agreed to in writing, software
+//distributed under the License is distributed on an "AS IS" BASIS,
+//WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//See the License for the specific language governing permissions and
+//limitations under the License.​
+
+using System;
+using System.Collections.Generic;
+using System.Diagnostics;
+using System.Globalization;
+using System.IO;
+using System.Linq;
+using System.Text;
+
+using ESRI.ArcGIS.Geoprocessing;
+
+
+namespace WorkflowManagerAdministrationUtilities.Common
+{
+    /// <summary>
+    /// Opt-in instrumentation for the GP tools.  When the WMAU_TRACE_FILE environment
+    /// variable is set, each call to a tool's Execute, UpdateParameters, or UpdateMessages
+    /// function records the wall time spent in each phase of the call, along with the
+    /// number of (and time spent in) selected Workflow Manager calls.  One JSON object
+    /// per line is appended to the trace file when the call completes.
+    /// </summary>
+    /// <remarks>
+    /// A trace is tied to the thread running the tool, so code that wants to record a
+    /// phase or a call doesn't need a reference to the tool; it can simply use the
+    /// static TimePhase/TimeCall functions.  These return null when tracing is disabled
+    /// (or no trace is active), which is safe to use in a "using" statement.
+    /// </remarks>
+    class WmauExecutionTrace
+    {
+        #region Constants
+        private const string C_ENV_VAR_TRACE_FILE = "WMAU_TRACE_FILE";
+
+        public const string C_METHOD_EXECUTE = "Execute";
+        public const string C_METHOD_UPDATE_PARAMETERS = "UpdateParameters";
+        public const string C_METHOD_UPDATE_MESSAGES = "UpdateMessages";
+
+        public const string C_PHASE_DB_RESOLUTION = "dbResolution";
+        public const string C_PHASE_EXTRACT_PARAMETERS = "extractParameters";
+        public const string C_PHASE_BUILD_DOMAINS = "buildDomains";
+        public const string C_PHASE_VALIDATION = "validation";
+        public const string C_PHASE_CORE = "core";
+        public const string C_PHASE_STORE = "store";
+
+        public const string C_CALL_GET_JOB = "GetJob";
+        public const string C_CALL_GET_JOBS_BY_QUERY = "GetJobsByQuery";
+        public const string C_CALL_EVALUATE_QUERY = "EvaluateQuery";
+        public const string C_CALL_GET_USER = "GetUser";
+        public const string C_CALL_GET_ACTIVITY_TYPE = "GetActivityType";
+        public const string C_CALL_LOG_ACTION = "LogAction";
+        public const string C_CALL_ADD_ATTACHMENT = "AddAttachment";
+        public const string C_CALL_CREATE_JOBS = "CreateJobsFromDescription";
+        public const string C_CALL_DELETE_JOB = "DeleteJob";
+        public const string C_CALL_SEND_NOTIFICATION = "SendNotification";
+        public const string C_CALL_STORE = "Store";
+        #endregion
+
+        #region Class Variables
+        private static string m_traceFile = null;
+        private static object m_fileLock = new object();
+
+        [ThreadStatic]
+        private static WmauExecutionTrace m_current;
+        #endregion
+
+        #region Member Variables
+        private string m_toolName = string.Empty;
+        private string m_method = string.Empty;
+        private string m_remainderPhase = string.Empty;
+        private DateTime m_startTime;
+        private Stopwatch m_timer = null;
+        private string m_activePhase = null;
+        private WmauExecutionTrace m_previous = null;
+        private SortedList<string, double> m_phaseMs = new SortedList<string, double>();
+        private SortedList<string, int> m_callCounts = new SortedList<string, int>();
+        private SortedList<string, double> m_callMs = new SortedList<string, double>();
+        #endregion
+
+        #region Helper classes
+        /// <summary>
+        /// Times a phase or a call; the elapsed time is recorded when the object
+        /// is disposed.
+        /// </summary>
+        private class TraceScope : IDisposable
+        {
+            private WmauExecutionTrace m_trace = null;
+            private string m_name = string.Empty;
+            private bool m_isCall = false;
+            private bool m_ownsPhase = false;
+            private Stopwatch m_timer = null;
+
+            public TraceScope(WmauExecutionTrace trace, string name, bool isCall, bool ownsPhase)
+            {
+                m_trace = trace;
+                m_name = name;
+                m_isCall = isCall;
+                m_ownsPhase = ownsPhase;
+                m_timer = Stopwatch.StartNew();
+            }
+
+            public void Dispose()
+            {
+                if (m_timer == null)
+                {
+                    return;
+                }
+
+                m_timer.Stop();
+                m_trace.Record(m_name, m_isCall, m_ownsPhase, m_timer.Elapsed.TotalMilliseconds);
+                m_timer = null;
+            }
+        }
+        #endregion
+
+        /// <summary>
+        /// Static constructor; determines whether tracing is enabled for this process
+        /// </summary>
+        static WmauExecutionTrace()
+        {
+            string traceFile = System.Environment.GetEnvironmentVariable(C_ENV_VAR_TRACE_FILE);
+            if (!string.IsNullOrEmpty(traceFile))
+            {
+                m_traceFile = traceFile;
+            }
+        }
+
+        /// <summary>
+        /// Constructor; use Begin() to start a new trace
+        /// </summary>
+        private WmauExecutionTrace(string toolName, string method, string remainderPhase)
+        {
+            m_toolName = toolName;
+            m_method = method;
+            m_remainderPhase = remainderPhase;
+            m_startTime = DateTime.UtcNow;
+            m_timer = Stopwatch.StartNew();
+        }
+
+        #region Accessors
+        /// <summary>
+        /// Indicates whether tracing has been enabled for this process
+        /// </summary>
+        public static bool IsEnabled
+        {
+            get { return m_traceFile != null; }
+        }
+        #endregion
+
+        /// <summary>
+        /// Starts tracing a call to one of a GP tool's entry points.
+        /// </summary>
+        /// <param name="toolName">The name of the GP tool being run</param>
+        /// <param name="method">The entry point being called (one of the C_METHOD_* constants)</param>
+        /// <param name="remainderPhase">
+        /// The phase to which any time not recorded in another phase is attributed
+        /// (ex: the core operation, for Execute)
+        /// </param>
+        /// <returns>The new trace object; null if tracing is disabled</returns>
+        public static WmauExecutionTrace Begin(string toolName, string method, string remainderPhase)
+        {
+            if (!IsEnabled)
+            {
+                return null;
+            }
+
+            WmauExecutionTrace trace = new WmauExecutionTrace(toolName, method, remainderPhase);
+            trace.m_previous = m_current;
+            m_current = trace;
+
+            return trace;
+        }
+
+        /// <summary>
+        /// Times a phase of the current tool call.  Phases do not nest; if a phase is
+        /// already being timed, the time is left with the outer phase.
+        /// </summary>
+        /// <param name="phase">The name of the phase (one of the C_PHASE_* constants)</param>
+        /// <returns>An object that records the phase when disposed; null if no trace is active</returns>
+        public static IDisposable TimePhase(string phase)
+        {
+            WmauExecutionTrace trace = m_current;
+            if (trace == null || trace.m_activePhase != null)
+            {
+                return null;
+            }
+
+            trace.m_activePhase = phase;
+            return new TraceScope(trace, phase, false, true);
+        }
+
+        /// <summary>
+        /// Counts and times a single Workflow Manager call made by the current tool.
+        /// Time spent in "Store" calls is also attributed to the "store" phase.
+        /// </summary>
+        /// <param name="callName">The name of the call (ex: one of the C_CALL_* constants)</param>
+        /// <returns>An object that records the call when disposed; null if no trace is active</returns>
+        public static IDisposable TimeCall(string callName)
+        {
+            WmauExecutionTrace trace = m_current;
+            if (trace == null)
+            {
+                return null;
+            }
+
+            bool ownsPhase = false;
+            if (callName.Equals(C_CALL_STORE) && trace.m_activePhase == null)
+            {
+                trace.m_activePhase = C_PHASE_STORE;
+                ownsPhase = true;
+            }
+
+            return new TraceScope(trace, callName, true, ownsPhase);
+        }
+
+        /// <summary>
+        /// Helper function to add a timing to this trace
+        /// </summary>
+        private void Record(string name, bool isCall, bool ownsPhase, double elapsedMs)
+        {
+            if (isCall)
+            {
+                int count = 0;
+                double totalMs = 0.0;
+                m_callCounts.TryGetValue(name, out count);
+                m_callMs.TryGetValue(name, out totalMs);
+                m_callCounts[name] = count + 1;
+                m_callMs[name] = totalMs + elapsedMs;
+            }
+
+            if (ownsPhase)
+            {
+                string phase = m_activePhase;
+                double phaseMs = 0.0;
+                m_phaseMs.TryGetValue(phase, out phaseMs);
+                m_phaseMs[phase] = phaseMs + elapsedMs;
+                m_activePhase = null;
+            }
+        }
+
+        /// <summary>
+        /// Finishes this trace and appends it to the trace file.
+        /// </summary>
+        /// <param name="msgs">
+        /// The GP messages object used by the tool call (used to determine if the call
+        /// reported any errors); may be null
+        /// </param>
+        public void End(IGPMessages msgs)
+        {
+            m_timer.Stop();
+            if (m_current == this)
+            {
+                m_current = m_previous;
+            }
+
+            double totalMs = m_timer.Elapsed.TotalMilliseconds;
+            double remainderMs = totalMs;
+            foreach (double phaseMs in m_phaseMs.Values)
+            {
+                remainderMs -= phaseMs;
+            }
+            double tempMs = 0.0;
+            m_phaseMs.TryGetValue(m_remainderPhase, out tempMs);
+            m_phaseMs[m_remainderPhase] = tempMs + Math.Max(remainderMs, 0.0);
+
+            bool hasErrors = false;
+            try
+            {
+                hasErrors = msgs != null && msgs.MaxSeverity == esriGPMessageSeverity.esriGPMessageSeverityError;
+            }
+            catch
+            {
+                // Tracing should never interfere with the tool itself
+            }
+
+            WriteRecord(BuildRecord(totalMs, hasErrors));
+        }
+
+        /// <summary>
+        /// Helper function to build the JSON representation of this trace
+        /// </summary>
+        private string BuildRecord(double totalMs, bool hasErrors)
+        {
+            StringBuilder json = new StringBuilder();
+            json.Append("{\"tool\":").Append(WmauHelperFunctions.EscapeJson(m_toolName));
+            json.Append(",\"method\":").Append(WmauHelperFunctions.EscapeJson(m_method));
+            json.Append(",\"start\":").Append(WmauHelperFunctions.EscapeJson(m_startTime.ToString("o", CultureInfo.InvariantCulture)));
+            json.Append(",\"pid\":").Append(Process.GetCurrentProcess().Id);
+            json.Append(",\"totalMs\":").Append(ToJsonNumber(totalMs));
+            json.Append(",\"errors\":").Append(hasErrors ? "true" : "false");
+
+            json.Append(",\"phases\":{");
+            bool first = true;
+            foreach (KeyValuePair<string, double> phase in m_phaseMs)
+            {
+                json.Append(first ? string.Empty : ",");
+                json.Append(WmauHelperFunctions.EscapeJson(phase.Key)).Append(":").Append(ToJsonNumber(phase.Value));
+                first = false;
+            }
+            json.Append("}");
+
+            json.Append(",\"calls\":{");
+            first = true;
+            foreach (KeyValuePair<string, int> call in m_callCounts)
+            {
+                json.Append(first ? string.Empty : ",");
+                json.Append(WmauHelperFunctions.EscapeJson(call.Key));
+                json.Append(":{\"count\":").Append(call.Value);
+                json.Append(",\"ms\":").Append(ToJsonNumber(m_callMs[call.Key])).Append("}");
+                first = false;
+            }
+            json.Append("}}");
+
+            return json.ToString();
+        }
+
+        /// <summary>
+        /// Appends a line to the trace file.  Failures are ignored; tracing should never
+        /// cause a tool to fail.
+        /// </summary>
+        private static void WriteRecord(string record)
+        {
+            byte[] line = Encoding.UTF8.GetBytes(record + "\n");
+            lock (m_fileLock)
+            {
+                try
+                {
+                    // Write each line with a single call so that records from multiple
+                    // processes sharing a trace file are not interleaved
+                    using (FileStream stream = new FileStream(m_traceFile, FileMode.Append, FileAccess.Write, FileShare.ReadWrite))
+                    {
+                        stream.Write(line, 0, line.Length);
+                    }
+                }
+                catch (IOException)
+                {
+                }
+                catch (UnauthorizedAccessException)
+                {
+                }
+            }
+        }
+
+        /// <summary>
+        /// Helper function to format a number for a JSON document
+        /// </summary>
+        private static string ToJsonNumber(double value)
+        {
+            return value.ToString("0.###", CultureInfo.InvariantCulture);
+        }
+    }
+}
@@ -43,64 +43,149 @@ namespace WorkflowManagerAdministrationUtilities
         // Implementation of the Function Factory
         #region IGPFunctionFactory Members
 
-        private static SortedList<string, WmauAbstractGpFunction> wmxUtilityFunctions = null;
+        private const string C_ENV_VAR_STARTUP_TIMING = "WMAU_STARTUP_TIMING";
+
+        private static SortedList<string, WmauGpFunctionInfo> wmxUtilityFunctions = null;
 
 
         /// <summary>
         /// Default constructor; initializes a list with all of the GP functions available from this
-        /// factory
+        /// factory.
         /// </summary>
+        /// <remarks>
+        /// Only the type and static metadata of each tool is registered here; the tools
+        /// themselves are not created until they are requested through GetFunction().  Each
+        /// tool allocates several ArcObjects (GP utilities, GP values, etc.) when it's
+        /// constructed, so creating all of them whenever the toolbox is loaded is expensive.
+        /// </remarks>
         public WmauFunctionFactory()
         {
             if (WmauFunctionFactory.wmxUtilityFunctions == null)
             {
-                WmauFunctionFactory.wmxUtilityFunctions = new SortedList<string, WmauAbstractGpFunction>();
+                System.Diagnostics.Stopwatch timer = System.Diagnostics.Stopwatch.StartNew();
+                WmauFunctionFactory.wmxUtilityFunctions = new SortedList<string, WmauGpFunctionInfo>();
 
                 // Add the supported GP functions to this factory tool
-                this.AddGpFunction(new AddAreaEvaluatorToSpatialNotification());
-                this.AddGpFunction(new AddAttachmentToJob());
-                this.AddGpFunction(new AddCommentToJob());
-                this.AddGpFunction(new AddDatasetConditionToSpatialNotification());
-                this.AddGpFunction(new AssignJob());
-                this.AddGpFunction(new BackupWorkflowManagerDatabase());
-                this.AddGpFunction(new CloseJob());
-                this.AddGpFunction(new CreateDataWorkspacesFromExcel());
-                this.AddGpFunction(new CreateJob());
-                this.AddGpFunction(new CreateSpatialNotification());
-                this.AddGpFunction(new CreateSpatialNotification2());
-                this.AddGpFunction(new DeleteDataWorkspace());
-                this.AddGpFunction(new DeleteJob());
-                this.AddGpFunction(new DeleteMapDocument());
-                this.AddGpFunction(new DeleteOrphanedTypes());
-                this.AddGpFunction(new DeleteTaskAssistantWorkbook());
-                this.AddGpFunction(new DownloadMapDocument());
-                this.AddGpFunction(new DownloadTaskAssistantWorkbook());
-                this.AddGpFunction(new ExecuteJob());
-                this.AddGpFunction(new ExportDataWorkspacesToExcel());
-                this.AddGpFunction(new ImportActiveDirectoryConfiguration());
-                this.AddGpFunction(new ListAllDataWorkspaces());
-                this.AddGpFunction(new ListAllMapDocuments());
-                this.AddGpFunction(new ListAllTaskAssistantWorkbooks());
-                this.AddGpFunction(new ListJobs());
-                this.AddGpFunction(new ListJobsUsingQuery());
-                this.AddGpFunction(new ListUsers());
-                this.AddGpFunction(new ModifyAdministratorAccess());
-                this.AddGpFunction(new ModifyPrivilegeAssignment());
-                this.AddGpFunction(new ReportPossibleErrors());
-                this.AddGpFunction(new SendJobNotification());
-                this.AddGpFunction(new SetDefaultWorkspaceForJobType());
-                this.AddGpFunction(new UploadMapDocument());
-                this.AddGpFunction(new UploadTaskAssistantWorkbook());
+                //
+                // NOTE: The name, display name, and toolset here must match those returned
+                // by the tool itself.
+                this.AddGpFunction(typeof(AddAreaEvaluatorToSpatialNotification), "AddAreaEvaluatorToSN",
+                    Properties.Resources.TOOL_ADD_AREA_EVALUATOR_TO_SN, Properties.Resources.CAT_NOTIFICATION_UTILS);
+                this.AddGpFunction(typeof(AddAttachmentToJob), "AddAttachmentToJob",
+                    Properties.Resources.TOOL_ADD_ATTACHMENT_TO_JOB, Properties.Resources.CAT_JOB_UTILS);
+                this.AddGpFunction(typeof(AddAttachmentsToJobs), "AddAttachmentsToJobs",
+                    Properties.Resources.TOOL_ADD_ATTACHMENTS_TO_JOBS, Properties.Resources.CAT_JOB_UTILS);
+                this.AddGpFunction(typeof(AddCommentToJob), "AddCommentToJob",
+                    Properties.Resources.TOOL_ADD_COMMENT_TO_JOB, Properties.Resources.CAT_JOB_UTILS);
+                this.AddGpFunction(typeof(AddDatasetConditionToSpatialNotification), "AddDatasetConditionToSN",
+                    Properties.Resources.TOOL_ADD_DATASET_CONDITION_TO_SN, Properties.Resources.CAT_NOTIFICATION_UTILS);
+                this.AddGpFunction(typeof(AssignJob), "AssignJob",
+                    Properties.Resources.TOOL_ASSIGN_JOB, Properties.Resources.CAT_JOB_UTILS);
+                this.AddGpFunction(typeof(AssignJobs), "AssignJobs",
+                    Properties.Resources.TOOL_ASSIGN_JOBS, Properties.Resources.CAT_JOB_UTILS);
+                this.AddGpFunction(typeof(BackupWorkflowManagerDatabase), "BackupWorkflowManagerDatabase",
+                    Properties.Resources.TOOL_BACKUP_WORKFLOW_MANAGER_DB, Properties.Resources.CAT_WMX_DB_UTILS);
+                this.AddGpFunction(typeof(CleanUpDeletedJobVersions), "CleanUpDeletedJobVersions",
+                    Properties.Resources.TOOL_CLEAN_UP_DELETED_JOB_VERSIONS, Properties.Resources.CAT_JOB_UTILS);
+                this.AddGpFunction(typeof(CloseJob), "CloseJob",
+                    Properties.Resources.TOOL_CLOSE_JOB, Properties.Resources.CAT_JOB_UTILS);
+                this.AddGpFunction(typeof(CloseJobs), "CloseJobs",
+                    Properties.Resources.TOOL_CLOSE_JOBS, Properties.Resources.CAT_JOB_UTILS);
+                this.AddGpFunction(typeof(CreateDataWorkspacesFromExcel), "CreateDataWorkspacesFromExcel",
+                    Properties.Resources.TOOL_CREATE_DATA_WORKSPACES_FROM_SPREADSHEET, Properties.Resources.CAT_DATA_WORKSPACE_UTILS);
+                this.AddGpFunction(typeof(CreateJob), "CreateJob",
+                    Properties.Resources.TOOL_CREATE_JOB, Properties.Resources.CAT_JOB_UTILS);
+                this.AddGpFunction(typeof(CreateSpatialNotification), "CreateSpatialNotificationWithEmailNotifier",
+                    Properties.Resources.TOOL_CREATE_SPATIAL_NOTIFICATION_WITH_EMAIL, Properties.Resources.CAT_NOTIFICATION_UTILS);
+                this.AddGpFunction(typeof(CreateSpatialNotification2), "CreateSpatialNotificationWithEmailNotifier2",
+                    Properties.Resources.TOOL_CREATE_SPATIAL_NOTIFICATION_WITH_EMAIL_2, Properties.Resources.CAT_NOTIFICATION_UTILS);
+                this.AddGpFunction(typeof(DeleteDataWorkspace), "DeleteDataWorkspace",
+                    Properties.Resources.TOOL_DELETE_DATA_WORKSPACE, Properties.Resources.CAT_DATA_WORKSPACE_UTILS);
+                this.AddGpFunction(typeof(DeleteJob), "DeleteJob",
+                    Properties.Resources.TOOL_DELETE_JOB, Properties.Resources.CAT_JOB_UTILS);
+                this.AddGpFunction(typeof(DeleteJobsByQuery), "DeleteJobsByQuery",
+                    Properties.Resources.TOOL_DELETE_JOBS_BY_QUERY, Properties.Resources.CAT_JOB_UTILS);
+                this.AddGpFunction(typeof(DeleteMapDocument), "DeleteMapDocument",
+                    Properties.Resources.TOOL_DELETE_MAP_DOCUMENT, Properties.Resources.CAT_MXD_UTILS);
+                this.AddGpFunction(typeof(DeleteOrphanedTypes), "DeleteOrphanedTypes",
+                    Properties.Resources.TOOL_DELETE_ORPHANED_TYPES, Properties.Resources.CAT_WMX_DB_UTILS);
+                this.AddGpFunction(typeof(DeleteTaskAssistantWorkbook), "DeleteTaskAssistantWorkbook",
+                    Properties.Resources.TOOL_DELETE_TASK_ASSISTANT_WORKBOOK, Properties.Resources.CAT_TAM_UTILS);
+                this.AddGpFunction(typeof(DownloadMapDocument), "DownloadMapDocument",
+                    Properties.Resources.TOOL_DOWNLOAD_MAP_DOCUMENT, Properties.Resources.CAT_MXD_UTILS);
+                this.AddGpFunction(typeof(DownloadTaskAssistantWorkbook), "DownloadTaskAssistantWorkbook",
+                    Properties.Resources.TOOL_DOWNLOAD_TASK_ASSISTANT_WORKBOOK, Properties.Resources.CAT_TAM_UTILS);
+                this.AddGpFunction(typeof(ExecuteJob), "ExecuteJob",
+                    Properties.Resources.TOOL_EXECUTE_JOB, Properties.Resources.CAT_JOB_UTILS);
+                this.AddGpFunction(typeof(ExportConfigurationSnapshot), "ExportConfigurationSnapshot",
+                    Properties.Resources.TOOL_EXPORT_CONFIGURATION_SNAPSHOT, Properties.Resources.CAT_WMX_DB_UTILS);
+                this.AddGpFunction(typeof(ExportDataWorkspacesToExcel), "ExportDataWorkspacesToExcel",
+                    Properties.Resources.TOOL_EXPORT_DATA_WORKSPACES_TO_SPREADSHEET, Properties.Resources.CAT_DATA_WORKSPACE_UTILS);
+                this.AddGpFunction(typeof(ExportJobsForAnalysis), "ExportJobsForAnalysis",
+                    Properties.Resources.TOOL_EXPORT_JOBS_FOR_ANALYSIS, Properties.Resources.CAT_JOB_UTILS);
+                this.AddGpFunction(typeof(ImportActiveDirectoryConfiguration), "ImportActiveDirectoryConfiguration",
+                    Properties.Resources.TOOL_IMPORT_AD_CONFIG, Properties.Resources.CAT_SECURITY_UTILS);
+                this.AddGpFunction(typeof(ListAllDataWorkspaces), "ListAllDataWorkspaces",
+                    Properties.Resources.TOOL_LIST_ALL_DATA_WORKSPACES, Properties.Resources.CAT_DATA_WORKSPACE_UTILS);
+                this.AddGpFunction(typeof(ListAllMapDocuments), "ListAllMapDocuments",
+                    Properties.Resources.TOOL_LIST_ALL_MAP_DOCUMENTS, Properties.Resources.CAT_MXD_UTILS);
+                this.AddGpFunction(typeof(ListAllTaskAssistantWorkbooks), "ListAllTaskAssistantWorkbooks",
+                    Properties.Resources.TOOL_LIST_ALL_TASK_ASSISTANT_WORKBOOKS, Properties.Resources.CAT_TAM_UTILS);
+                this.AddGpFunction(typeof(ListJobs), "ListJobs",
+                    Properties.Resources.TOOL_LIST_JOBS, Properties.Resources.CAT_JOB_UTILS);
+                this.AddGpFunction(typeof(ListJobsUsingQuery), "ListJobsUsingQuery",
+                    Properties.Resources.TOOL_LIST_JOBS_USING_QUERY, Properties.Resources.CAT_JOB_UTILS);
+                this.AddGpFunction(typeof(ListUsers), "ListUsers",
+                    Properties.Resources.TOOL_LIST_USERS, Properties.Resources.CAT_SECURITY_UTILS);
+                this.AddGpFunction(typeof(ModifyAdministratorAccess), "ModifyAdministratorAccess",
+                    Properties.Resources.TOOL_MODIFY_ADMIN_ACCESS, Properties.Resources.CAT_SECURITY_UTILS);
+                this.AddGpFunction(typeof(ModifyPrivilegeAssignment), "ModifyPrivilegeAssignment",
+                    Properties.Resources.TOOL_MODIFY_PRIVILEGE_ASSIGNMENT, Properties.Resources.CAT_SECURITY_UTILS);
+                this.AddGpFunction(typeof(PromoteConfiguration), "PromoteConfiguration",
+                    Properties.Resources.TOOL_PROMOTE_CONFIGURATION, Properties.Resources.CAT_WMX_DB_UTILS);
+                this.AddGpFunction(typeof(ReportPossibleErrors), "ReportPossibleErrors",
+                    Properties.Resources.TOOL_REPORT_POSSIBLE_ERRORS, Properties.Resources.CAT_WMX_DB_UTILS);
+                this.AddGpFunction(typeof(SendJobNotification), "SendJobNotification",
+                    Properties.Resources.TOOL_SEND_JOB_NOTIFICATION, Properties.Resources.CAT_NOTIFICATION_UTILS);
+                this.AddGpFunction(typeof(SetDefaultWorkspaceForJobType), "SetDefaultWorkspaceForJobType",
+                    Properties.Resources.TOOL_SET_DEFAULT_WORKSPACE_FOR_JOB_TYPE, Properties.Resources.CAT_DATA_WORKSPACE_UTILS);
+                this.AddGpFunction(typeof(UploadMapDocument), "UploadMapDocument",
+                    Properties.Resources.TOOL_UPLOAD_MAP_DOCUMENT, Properties.Resources.CAT_MXD_UTILS);
+                this.AddGpFunction(typeof(UploadTaskAssistantWorkbook), "UploadTaskAssistantWorkbook",
+                    Properties.Resources.TOOL_UPLOAD_TASK_ASSISTANT_WORKBOOK, Properties.Resources.CAT_TAM_UTILS);
+
+                timer.Stop();
+                LogStartupTiming("Registered " + WmauFunctionFactory.wmxUtilityFunctions.Count + " tools", timer);
             }
         }
         
         /// <summary>
         /// Registers a GP function with the internal list maintained by this factory
         /// </summary>
-        /// <param name="gpFunc"></param>
-        private void AddGpFunction(WmauAbstractGpFunction gpFunc)
+        /// <param name="gpFuncType">The type of the GP function; must derive from WmauAbstractGpFunction</param>
+        /// <param name="name">The name of the GP function</param>
+        /// <param name="displayName">The name of the GP function as seen in ArcToolbox</param>
+        /// <param name="displayToolset">The toolset of the GP function as seen in ArcToolbox</param>
+        private void AddGpFunction(Type gpFuncType, string name, string displayName, string displayToolset)
+        {
+            WmauFunctionFactory.wmxUtilityFunctions.Add(
+                name, new WmauGpFunctionInfo(gpFuncType, name, displayName, displayToolset));
+        }
+
+        /// <summary>
+        /// Startup timing hook; if the WMAU_STARTUP_TIMING environment variable is set,
+        /// writes the time taken by a factory operation to the trace listeners (ex:
+        /// DebugView).  Used to measure what loading the toolbox costs.
+        /// </summary>
+        /// <param name="operation">A description of the operation that was timed</param>
+        /// <param name="timer">The stopwatch used to time the operation</param>
+        private static void LogStartupTiming(string operation, System.Diagnostics.Stopwatch timer)
         {
-            WmauFunctionFactory.wmxUtilityFunctions.Add(gpFunc.Name, gpFunc);
+            if (!string.IsNullOrEmpty(System.Environment.GetEnvironmentVariable(C_ENV_VAR_STARTUP_TIMING)))
+            {
+                System.Diagnostics.Trace.WriteLine(
+                    "WmauFunctionFactory: " + operation + " in " + timer.Elapsed.TotalMilliseconds.ToString("F3") + " ms");
+            }
         }
 
         // This is the name of the function factory. 
@@ -130,12 +215,22 @@ namespace WorkflowManagerAdministrationUtilities
         // This method will create and return a function object based upon the input name.
         public IGPFunction GetFunction(string Name)
         {
-            IGPFunction2 gpFunc = null;
+            WmauGpFunctionInfo funcInfo = null;
             
-            // Look up the item with the matching "Name" field
-            gpFunc = WmauFunctionFactory.wmxUtilityFunctions[Name];
-            if( gpFunc != null ) {
-                return Activator.CreateInstance((gpFunc as System.Object).GetType()) as IGPFunction2;
+            // Look up the item with the matching "Name" field; the tool itself is
+            // only created at this point
+            if (WmauFunctionFactory.wmxUtilityFunctions.TryGetValue(Name, out funcInfo))
+            {
+                System.Diagnostics.Stopwatch timer = System.Diagnostics.Stopwatch.StartNew();
+                WmauAbstractGpFunction gpFunc = funcInfo.CreateInstance();
+                timer.Stop();
+                LogStartupTiming("Created tool '" + Name + "'", timer);
+
+                System.Diagnostics.Debug.Assert(
+                    gpFunc.Name.Equals(funcInfo.Name),
+                    "Tool registered as '" + funcInfo.Name + "' reports its name as '" + gpFunc.Name + "'");
+
+                return gpFunc as IGPFunction2;
             }
 
             return null;
@@ -144,12 +239,14 @@ namespace WorkflowManagerAdministrationUtilities
         // Utility Function added to create the function names.
         private IGPFunctionName CreateGPFunctionName(string sName)
         {
+            WmauGpFunctionInfo funcInfo = WmauFunctionFactory.wmxUtilityFunctions[sName];
+
             GPFunctionNameClass pName = new GPFunctionNameClass();
-            pName.Category = WmauFunctionFactory.wmxUtilityFunctions[sName].DisplayToolset;
+            pName.Category = funcInfo.DisplayToolset;
             pName.Factory = (IGPFunctionFactory)this;
 
             pName.Description = string.Empty;
-            pName.DisplayName = WmauFunctionFactory.wmxUtilityFunctions[sName].DisplayName;
+            pName.DisplayName = funcInfo.DisplayName;
             pName.Name = sName;
 
             return pName;
@@ -164,11 +261,15 @@ namespace WorkflowManagerAdministrationUtilities
         // This method will create and return an enumeration of function names that the factory supports.
         public IEnumGPName GetFunctionNames()
         {
+            System.Diagnostics.Stopwatch timer = System.Diagnostics.Stopwatch.StartNew();
             IArray nameArray = new EnumGPNameClass();
             foreach (string s in WmauFunctionFactory.wmxUtilityFunctions.Keys)
             {
                 nameArray.Add(CreateGPFunctionName(s));
             }
+            timer.Stop();
+            LogStartupTiming("Enumerated " + nameArray.Count + " tool names", timer);
+
             return (IEnumGPName)nameArray;
         }
 
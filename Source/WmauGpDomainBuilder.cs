@@ -124,7 +124,11 @@ namespace WorkflowManagerAdministrationUtilities.Common
             string[] eligibleGroups = null;
 
             // Only proceed if the user exists in the Workflow Manager database
-            IJTXUser3 user = wmxDb.ConfigurationManager.GetUser(username) as IJTXUser3;
+            IJTXUser3 user = null;
+            using (WmauExecutionTrace.TimeCall(WmauExecutionTrace.C_CALL_GET_USER))
+            {
+                user = wmxDb.ConfigurationManager.GetUser(username) as IJTXUser3;
+            }
             if (user == null)
             {
                 return domain as IGPDomain;
@@ -236,7 +240,11 @@ namespace WorkflowManagerAdministrationUtilities.Common
             IGPCodedValueDomain domain = null;
 
             // Only proceed if the user exists in the Workflow Manager database
-            IJTXUser3 user = wmxDb.ConfigurationManager.GetUser(username) as IJTXUser3;
+            IJTXUser3 user = null;
+            using (WmauExecutionTrace.TimeCall(WmauExecutionTrace.C_CALL_GET_USER))
+            {
+                user = wmxDb.ConfigurationManager.GetUser(username) as IJTXUser3;
+            }
             if (user == null)
             {
                 return domain as IGPDomain;
@@ -0,0 +1,78 @@
+﻿//Copyright 2015 Esri
+//Licensed under the Apache License, Version 2.0 (the "License");
+//you may not use this file except in compliance with the License.
+//You may obtain a copy of the License at
+//    http://www.apache.org/licenses/LICENSE-2.0
+//Unless required by applicable law or agreed to in writing, software
+//distributed under the License is distributed on an "AS IS" BASIS,
+//WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//See the License for the specific language governing permissions and
+//limitations under the License.​
+
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+
+
+namespace WorkflowManagerAdministrationUtilities
+{
+    /// <summary>
+    /// Helper class used by the function factory to describe a GP tool without
+    /// having to instantiate it.  Holds the static metadata that ArcToolbox needs
+    /// to list a tool (name, display name, toolset) along with the type used to
+    /// create the tool on demand.
+    /// </summary>
+    class WmauGpFunctionInfo
+    {
+        private Type m_functionType = null;
+        private string m_name = string.Empty;
+        private string m_displayName = string.Empty;
+        private string m_displayToolset = string.Empty;
+
+        /// <summary>
+        /// Default constructor is not supported; the tool's type and metadata
+        /// must be passed in
+        /// </summary>
+        private WmauGpFunctionInfo()
+        {
+            throw new NotSupportedException();
+        }
+
+        /// <summary>
+        /// Constructor
+        /// </summary>
+        /// <param name="functionType">The type of the GP tool; must derive from WmauAbstractGpFunction</param>
+        /// <param name="name">The name of the tool, as returned by its "Name" property</param>
+        /// <param name="displayName">The name of the tool as seen in ArcToolbox</param>
+        /// <param name="displayToolset">The toolset in which the tool appears in ArcToolbox</param>
+        public WmauGpFunctionInfo(Type functionType, string name, string displayName, string displayToolset)
+        {
+            if (functionType == null || !typeof(WmauAbstractGpFunction).IsAssignableFrom(functionType))
+            {
+                throw new ArgumentException();
+            }
+
+            m_functionType = functionType;
+            m_name = name;
+            m_displayName = displayName;
+            m_displayToolset = displayToolset;
+        }
+
+        #region Accessors
+        public Type FunctionType { get { return m_functionType; } }
+        public string Name { get { return m_name; } }
+        public string DisplayName { get { return m_displayName; } }
+        public string DisplayToolset { get { return m_displayToolset; } }
+        #endregion
+
+        /// <summary>
+        /// Creates a new instance of the GP tool described by this object
+        /// </summary>
+        /// <returns>The newly-created GP tool</returns>
+        public WmauAbstractGpFunction CreateInstance()
+        {
+            return Activator.CreateInstance(m_functionType) as WmauAbstractGpFunction;
+        }
+    }
+}
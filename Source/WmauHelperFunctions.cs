@@ -14,16 +14,47 @@ using System.Collections.Generic;
 using System.Linq;
 using System.Text;
 
+using ESRI.ArcGIS.ADF;
 using ESRI.ArcGIS.esriSystem;
 using ESRI.ArcGIS.Geodatabase;
 using ESRI.ArcGIS.Geoprocessing;
 using ESRI.ArcGIS.JTX;
+using ESRI.ArcGIS.JTX.Utilities;
 
 
 namespace WorkflowManagerAdministrationUtilities.Common
 {
     class WmauHelperFunctions
     {
+        private const int C_INITIAL_JOB_ID_CAPACITY = 1024;
+        private const string C_FIELD_HOLD_RELEASE_DATE = "RELEASE_DATE";
+
+        // The Workflow Manager libraries don't define a constant for this table
+        private const string C_TABLE_MAPS = "JTX_MAPS";
+
+        // The fields holding the names of map documents and Task Assistant workbooks
+        private const string C_FIELD_MAP_NAME = "NAME";
+        private const string C_FIELD_TAM_WORKBOOK_ALIAS = "ALIAS";
+        private const string C_JOB_ID_SET_EXTENSION = ".npy";
+
+        // Text fields longer than this are assumed to hold an artifact's contents,
+        // rather than information about it
+        private const int C_MAX_MARKER_FIELD_LENGTH = 2000;
+
+        // The tables holding the parts of the configuration that are included in a
+        // configuration snapshot (see WmauConfigSnapshot)
+        private static readonly string[] C_SNAPSHOT_TABLES =
+        {
+            Constants.JTX_TABLE_JTX_USERS_TABLE,
+            Constants.JTX_TABLE_JTX_USER_GROUPS_TABLE,
+            Constants.JTX_TABLE_JTX_USER_GROUP_XREF_TABLE,
+            Constants.JTX_TABLE_JTX_PRIVILEGES_TABLE,
+            Constants.JTX_TABLE_JTX_PRIV_XREF_TABLE,
+            Constants.JTX_TABLE_JTX_JOB_TYPES_TABLE,
+            Constants.JTX_TABLE_JTX_DATABASES,
+            C_TABLE_MAPS,
+            Constants.JTX_TABLE_JTX_TABLE_TASK_ASSISTANT_WORKFLOWS
+        };
 
         /// <summary>
         /// Finds the first table matching a specified name in a workspace, returning the
@@ -55,6 +86,566 @@ namespace WorkflowManagerAdministrationUtilities.Common
             return tableNameStr;
         }
 
+        /// <summary>
+        /// Gets a list of the jobs stored in a Workflow Manager database that match the
+        /// specified query filter.  The JTX_JOBS table is queried directly, so the jobs
+        /// themselves are not loaded.
+        /// </summary>
+        /// <param name="wmxDb">A reference to the active Workflow Manager database</param>
+        /// <param name="filter">A where clause to run against the JTX_JOBS table</param>
+        /// <returns>A sorted list of the job IDs and names</returns>
+        public static SortedList<int, string> ListJobsMatchingQuery(IJTXDatabase3 wmxDb, string filter)
+        {
+            SortedList<int, string> jobIds = new SortedList<int, string>();
+
+            // Build up a query that will return the job IDs filtered by the provided query string
+            IQueryFilter query = new QueryFilterClass();
+            IQueryFilterDefinition queryDef = query as IQueryFilterDefinition;
+            query.WhereClause = filter;
+            queryDef.PostfixClause = "ORDER BY " + Constants.FIELD_JOBID;
+
+            IFeatureWorkspace featureWorkspace = wmxDb.JTXWorkspace as IFeatureWorkspace;
+
+            // Declare some of these ComReleaser objects to help ensure that cursors, etc., are
+            // immediately released after they go out of scope.
+            using (ComReleaser cr1 = new ComReleaser(), cr2 = new ComReleaser())
+            {
+                // Get the name of the correct table from the jobs workspace, so
+                // that the table doesn't have to be owned by the connecting user.
+                string tableName = GetQualifiedTableName(Constants.JTX_TABLE_JTX_JOBS_TABLE, wmxDb.JTXWorkspace);
+
+                ITable jobsTable = featureWorkspace.OpenTable(tableName);
+                cr1.ManageLifetime(jobsTable);
+                ICursor searchCursor = jobsTable.Search(query, true);
+                cr2.ManageLifetime(searchCursor);
+
+                // Store the ID and name of each job matching this query
+                int idIndex = jobsTable.FindField(Constants.FIELD_JOBID);
+                int nameIndex = jobsTable.FindField(Constants.FIELD_JOBNAME);
+                IRow row = null;
+                while ((row = searchCursor.NextRow()) != null)
+                {
+                    string targetIdxStr = row.get_Value(idIndex).ToString();
+                    int targetIdx = -1;
+                    try
+                    {
+                        // NOTE: Have seen cases where the JTX_JOBS table contained a row with
+                        // nothing but null attributes; since this function accesses the table
+                        // directly, try to protect against this error.
+                        targetIdx = int.Parse(targetIdxStr);
+                    }
+                    catch (Exception ex)
+                    {
+                        throw new WmauException(WmauErrorCodes.C_JOB_ID_PARSE_ERROR, ex);
+                    }
+                    string targetValStr = row.get_Value(nameIndex).ToString();
+                    jobIds[targetIdx] = targetValStr;
+                }
+            }
+
+            return jobIds;
+        }
+
+        /// <summary>
+        /// Helper function to build a list of all of the public job queries in a
+        /// query container (and its subcontainers), keyed by the full query path.
+        /// </summary>
+        private static void AddQueriesFromContainer(
+            IJTXJobQueryContainer container,
+            string prefix,
+            SortedList<string, IJTXJobQuery> queryList)
+        {
+            // Add the queries from the container at the current level
+            IJTXJobQuerySet querySet = container.Queries;
+            for (int i = 0; i < querySet.Count; i++)
+            {
+                IJTXJobQuery query = querySet.get_Item(i) as IJTXJobQuery;
+                queryList.Add(prefix + query.Name, query);
+            }
+
+            // Iterate through each of the subcontainers and add them as well
+            IJTXJobQueryContainerSet subcontainers = container.SubContainers;
+            for (int i = 0; i < subcontainers.Count; i++)
+            {
+                IJTXJobQueryContainer tempContainer = subcontainers.get_Item(i);
+                AddQueriesFromContainer(
+                    tempContainer,
+                    prefix + tempContainer.Name + Properties.Resources.CONST_JOB_QUERY_SEP,
+                    queryList);
+            }
+        }
+
+        /// <summary>
+        /// Helper function to extract a sorted array of job IDs from the XML string
+        /// returned by IJTXJobQuery.ExecuteXML().  The XML is read in a single
+        /// forward-only pass, rather than being loaded into a DOM, so that large
+        /// query results can be handled quickly.
+        /// </summary>
+        /// <param name="rawXml">The XML string returned by IJTXJobQuery.ExecuteXML()</param>
+        /// <returns>The job IDs contained in the XML query result, in ascending order</returns>
+        private static int[] ParseJobIdsFromXml(string rawXml)
+        {
+            // TODO: Remove this function once IJTXJobQuery.Execute() is fixed
+
+            int[] jobIds = new int[C_INITIAL_JOB_ID_CAPACITY];
+            int numJobIds = 0;
+            bool isSorted = true;
+
+            System.Xml.XmlReaderSettings settings = new System.Xml.XmlReaderSettings();
+            settings.IgnoreComments = true;
+            settings.IgnoreProcessingInstructions = true;
+            settings.IgnoreWhitespace = true;
+
+            using (System.IO.StringReader stringReader = new System.IO.StringReader(rawXml))
+            using (System.Xml.XmlReader reader = System.Xml.XmlReader.Create(stringReader, settings))
+            {
+                // Each "/RS/ROW" element describes one job; the job's ID is stored
+                // in the first child element of the row
+                while (reader.ReadToFollowing("ROW"))
+                {
+                    if (reader.IsEmptyElement || !reader.Read() ||
+                        reader.NodeType != System.Xml.XmlNodeType.Element)
+                    {
+                        continue;
+                    }
+
+                    int jobId = Int32.Parse(reader.ReadElementContentAsString());
+                    if (numJobIds == jobIds.Length)
+                    {
+                        Array.Resize(ref jobIds, jobIds.Length * 2);
+                    }
+                    if (numJobIds > 0 && jobId < jobIds[numJobIds - 1])
+                    {
+                        isSorted = false;
+                    }
+                    jobIds[numJobIds++] = jobId;
+                }
+            }
+
+            // Query results are usually already ordered by job ID, in which case
+            // there's no need to sort them again
+            Array.Resize(ref jobIds, numJobIds);
+            if (!isSorted)
+            {
+                Array.Sort(jobIds);
+            }
+
+            return jobIds;
+        }
+
+        /// <summary>
+        /// Runs one of the public job queries stored in a Workflow Manager database
+        /// and returns the IDs of the matching jobs.
+        /// </summary>
+        /// <param name="wmxDb">A reference to the active Workflow Manager database</param>
+        /// <param name="queryName">
+        /// The full name of the query, including the names of any containing folders
+        /// </param>
+        /// <returns>The IDs of the jobs matching the query, in ascending order</returns>
+        public static int[] ListJobsInPublicQuery(IJTXDatabase3 wmxDb, string queryName)
+        {
+            IJTXConfiguration3 configMgr = wmxDb.ConfigurationManager as IJTXConfiguration3;
+
+            // Find the requested query
+            SortedList<string, IJTXJobQuery> queryMap = new SortedList<string, IJTXJobQuery>();
+            AddQueriesFromContainer(configMgr.GetPublicQueryContainer(), string.Empty, queryMap);
+            if (!queryMap.Keys.Contains(queryName))
+            {
+                throw new WmauException(WmauErrorCodes.C_UNKNOWN_QUERY_ERROR);
+            }
+
+            // TODO: Change this to use ".Evaluate()" once it's fixed
+            string rawXml = null;
+            using (WmauExecutionTrace.TimeCall(WmauExecutionTrace.C_CALL_EVALUATE_QUERY))
+            {
+                rawXml = queryMap[queryName].EvaluateXML();
+            }
+
+            return ParseJobIdsFromXml(rawXml);
+        }
+
+        /// <summary>
+        /// Loads a group of jobs from a Workflow Manager database using a single query,
+        /// rather than loading each job individually.  Any jobs that do not exist are
+        /// omitted from the result.
+        /// </summary>
+        /// <param name="wmxDb">A reference to the active Workflow Manager database</param>
+        /// <param name="jobIds">The IDs of the jobs to load</param>
+        /// <returns>The jobs that were found</returns>
+        public static IJTXJobSet GetJobsById(IJTXDatabase3 wmxDb, IEnumerable<int> jobIds)
+        {
+            IQueryFilter query = new QueryFilterClass();
+            query.WhereClause = Constants.FIELD_JOBID + " IN (" + string.Join(",", jobIds) + ")";
+
+            using (WmauExecutionTrace.TimeCall(WmauExecutionTrace.C_CALL_GET_JOBS_BY_QUERY))
+            {
+                return wmxDb.JobManager.GetJobsByQuery(query);
+            }
+        }
+
+        /// <summary>
+        /// Determines which of a group of jobs have active holds on them, using a single query
+        /// against the job holds table rather than loading each job's holds separately.  Holds
+        /// that have already been released (i.e., that have a release date) are not counted.
+        /// </summary>
+        /// <param name="wmxDb">A reference to the active Workflow Manager database</param>
+        /// <param name="jobIds">The IDs of the jobs to check</param>
+        /// <returns>The IDs of the jobs that have holds</returns>
+        public static HashSet<int> ListJobsWithHolds(IJTXDatabase3 wmxDb, IEnumerable<int> jobIds)
+        {
+            HashSet<int> heldJobs = new HashSet<int>();
+            string idList = string.Join(",", jobIds);
+            if (idList.Length == 0)
+            {
+                return heldJobs;
+            }
+
+            IQueryFilter query = new QueryFilterClass();
+            query.SubFields = Constants.FIELD_JOBID;
+            query.WhereClause = Constants.FIELD_JOBID + " IN (" + idList + ") AND " +
+                C_FIELD_HOLD_RELEASE_DATE + " IS NULL";
+
+            IFeatureWorkspace featureWorkspace = wmxDb.JTXWorkspace as IFeatureWorkspace;
+            using (ComReleaser cr1 = new ComReleaser(), cr2 = new ComReleaser())
+            {
+                string tableName = GetQualifiedTableName(Constants.JTX_TABLE_JTX_JOB_HOLDS_TABLE, wmxDb.JTXWorkspace);
+
+                ITable holdsTable = featureWorkspace.OpenTable(tableName);
+                cr1.ManageLifetime(holdsTable);
+                ICursor searchCursor = holdsTable.Search(query, true);
+                cr2.ManageLifetime(searchCursor);
+
+                int idIndex = holdsTable.FindField(Constants.FIELD_JOBID);
+                IRow row = null;
+                while ((row = searchCursor.NextRow()) != null)
+                {
+                    heldJobs.Add(Convert.ToInt32(row.get_Value(idIndex)));
+                }
+            }
+
+            return heldJobs;
+        }
+
+        /// <summary>
+        /// Writes a list of job IDs to a file.  If the file has a ".npy" extension, the
+        /// IDs are written as a job ID set: a NumPy array of 32-bit integers, in ascending
+        /// order and without duplicates, which scripts can memory-map and combine with
+        /// other sets (see JobIdSet.py).  Otherwise, the IDs are written as text, one
+        /// ID per line, in the order given.
+        /// </summary>
+        /// <param name="jobIds">The job IDs to be written</param>
+        /// <param name="filePath">The path of the file to be written</param>
+        public static void WriteJobIdsToFile(int[] jobIds, string filePath)
+        {
+            if (System.IO.Path.GetExtension(filePath).Equals(C_JOB_ID_SET_EXTENSION, StringComparison.OrdinalIgnoreCase))
+            {
+                // Job IDs are usually already in order; only sort a copy if they aren't
+                int[] sortedIds = jobIds;
+                for (int i = 1; i < jobIds.Length; i++)
+                {
+                    if (jobIds[i] < jobIds[i - 1])
+                    {
+                        sortedIds = (int[])jobIds.Clone();
+                        Array.Sort(sortedIds);
+                        break;
+                    }
+                }
+
+                using (WmauNpyWriter writer = new WmauNpyWriter(filePath, WmauNpyWriter.C_DTYPE_INT32))
+                {
+                    for (int i = 0; i < sortedIds.Length; i++)
+                    {
+                        if (i == 0 || sortedIds[i] != sortedIds[i - 1])
+                        {
+                            writer.Write(sortedIds[i]);
+                        }
+                    }
+                }
+            }
+            else
+            {
+                using (System.IO.StreamWriter writer = new System.IO.StreamWriter(filePath, false, Encoding.ASCII))
+                {
+                    for (int i = 0; i < jobIds.Length; i++)
+                    {
+                        writer.WriteLine(jobIds[i]);
+                    }
+                }
+            }
+        }
+
+        /// <summary>
+        /// Lists the fields of a table other than those holding large contents (ex:
+        /// the map document itself, in the maps table)
+        /// </summary>
+        /// <param name="table">The table</param>
+        /// <returns>The names of the remaining fields</returns>
+        private static List<string> ListMarkerFields(ITable table)
+        {
+            List<string> fieldNames = new List<string>();
+            IFields fields = table.Fields;
+            for (int i = 0; i < fields.FieldCount; i++)
+            {
+                IField field = fields.get_Field(i);
+                if (field.Type == esriFieldType.esriFieldTypeBlob ||
+                    field.Type == esriFieldType.esriFieldTypeRaster ||
+                    field.Type == esriFieldType.esriFieldTypeGeometry ||
+                    field.Type == esriFieldType.esriFieldTypeXML ||
+                    (field.Type == esriFieldType.esriFieldTypeString && field.Length > C_MAX_MARKER_FIELD_LENGTH))
+                {
+                    continue;
+                }
+                fieldNames.Add(field.Name);
+            }
+
+            return fieldNames;
+        }
+
+        /// <summary>
+        /// Reads the rows of a Workflow Manager table directly, leaving out the fields
+        /// that hold large contents (see ListMarkerFields()).  Each row is returned as
+        /// a single string of its field names and values.
+        /// </summary>
+        /// <param name="wmxDb">A reference to the active Workflow Manager database</param>
+        /// <param name="unqualifiedTableName">The table to be read</param>
+        /// <param name="nameField">
+        /// If not null, only those rows whose value in this field matches "name" are returned
+        /// </param>
+        /// <param name="name">The value to match, if a name field is given</param>
+        /// <returns>The rows; null if the table (or the name field) can't be found</returns>
+        private static List<string> ReadMarkerRows(IJTXDatabase3 wmxDb, string unqualifiedTableName, string nameField, string name)
+        {
+            string tableName = GetQualifiedTableName(unqualifiedTableName, wmxDb.JTXWorkspace);
+            if (tableName == null)
+            {
+                return null;
+            }
+
+            List<string> rows = new List<string>();
+            IFeatureWorkspace featureWorkspace = wmxDb.JTXWorkspace as IFeatureWorkspace;
+            using (ComReleaser cr1 = new ComReleaser(), cr2 = new ComReleaser())
+            {
+                ITable markerTable = featureWorkspace.OpenTable(tableName);
+                cr1.ManageLifetime(markerTable);
+
+                List<string> fieldNames = ListMarkerFields(markerTable);
+                IQueryFilter query = new QueryFilterClass();
+                query.SubFields = string.Join(",", fieldNames);
+                if (nameField != null)
+                {
+                    if (markerTable.FindField(nameField) < 0)
+                    {
+                        return null;
+                    }
+                    query.WhereClause = nameField + " = '" + name.Replace("'", "''") + "'";
+                }
+                ICursor searchCursor = markerTable.Search(query, true);
+                cr2.ManageLifetime(searchCursor);
+
+                List<int> fieldIndexes = new List<int>();
+                foreach (string fieldName in fieldNames)
+                {
+                    fieldIndexes.Add(searchCursor.FindField(fieldName));
+                }
+                IRow row = null;
+                while ((row = searchCursor.NextRow()) != null)
+                {
+                    StringBuilder values = new StringBuilder();
+                    for (int i = 0; i < fieldIndexes.Count; i++)
+                    {
+                        object value = row.get_Value(fieldIndexes[i]);
+                        string valueStr = value == null || value is DBNull ?
+                            string.Empty :
+                            Convert.ToString(value, System.Globalization.CultureInfo.InvariantCulture);
+                        values.Append(fieldNames[i] + "=" + valueStr + ";");
+                    }
+                    rows.Add(values.ToString());
+                }
+            }
+
+            return rows;
+        }
+
+        /// <summary>
+        /// Builds a "change marker" for an artifact (ex: a map document) stored in a
+        /// Workflow Manager database, from every field of the artifact's row other
+        /// than those holding the artifact's contents.  The table is queried directly,
+        /// so the artifact itself is not downloaded.
+        /// </summary>
+        /// <param name="wmxDb">A reference to the active Workflow Manager database</param>
+        /// <param name="unqualifiedTableName">The table in which the artifacts are stored</param>
+        /// <param name="nameField">The field holding the artifacts' names</param>
+        /// <param name="artifactName">The name of the artifact</param>
+        /// <returns>
+        /// The change marker; null if the table or its name field can't be found, or if
+        /// exactly one row can't be found for the artifact
+        /// </returns>
+        private static string GetArtifactChangeMarker(IJTXDatabase3 wmxDb, string unqualifiedTableName, string nameField, string artifactName)
+        {
+            List<string> rows = ReadMarkerRows(wmxDb, unqualifiedTableName, nameField, artifactName);
+            if (rows == null || rows.Count != 1)
+            {
+                return null;
+            }
+
+            return rows[0];
+        }
+
+        /// <summary>
+        /// Builds a change marker for a map document stored in a Workflow Manager database
+        /// (see WmauArtifactCache)
+        /// </summary>
+        /// <param name="wmxDb">A reference to the active Workflow Manager database</param>
+        /// <param name="mapName">The name of the map document</param>
+        /// <returns>The change marker; null if none could be determined</returns>
+        public static string GetMapDocumentChangeMarker(IJTXDatabase3 wmxDb, string mapName)
+        {
+            return GetArtifactChangeMarker(wmxDb, C_TABLE_MAPS, C_FIELD_MAP_NAME, mapName);
+        }
+
+        /// <summary>
+        /// Builds a change marker for a Task Assistant workbook stored in a Workflow
+        /// Manager database (see WmauArtifactCache)
+        /// </summary>
+        /// <param name="wmxDb">A reference to the active Workflow Manager database</param>
+        /// <param name="workbookName">The name of the workbook</param>
+        /// <returns>The change marker; null if none could be determined</returns>
+        public static string GetTamWorkbookChangeMarker(IJTXDatabase3 wmxDb, string workbookName)
+        {
+            return GetArtifactChangeMarker(
+                wmxDb, Constants.JTX_TABLE_JTX_TABLE_TASK_ASSISTANT_WORKFLOWS, C_FIELD_TAM_WORKBOOK_ALIAS, workbookName);
+        }
+
+        /// <summary>
+        /// Computes a "stamp" for the parts of a Workflow Manager database's configuration
+        /// that are included in a configuration snapshot (users, groups, privileges, job
+        /// types, data workspaces, map documents and Task Assistant workbooks).  The
+        /// tables are read directly, leaving out the map documents and workbooks
+        /// themselves, so this is much faster than reading the configuration.
+        /// </summary>
+        /// <param name="wmxDb">A reference to the active Workflow Manager database</param>
+        /// <param name="missingTableName">The first table that couldn't be found, if any</param>
+        /// <returns>
+        /// The stamp, which changes whenever any of these tables does; null if any of
+        /// the tables can't be found
+        /// </returns>
+        public static string ComputeConfigurationStamp(IJTXDatabase3 wmxDb, out string missingTableName)
+        {
+            missingTableName = null;
+            StringBuilder state = new StringBuilder();
+            foreach (string tableName in C_SNAPSHOT_TABLES)
+            {
+                List<string> rows = ReadMarkerRows(wmxDb, tableName, null, null);
+                if (rows == null)
+                {
+                    missingTableName = tableName;
+                    return null;
+                }
+
+                // The order in which the rows are returned isn't guaranteed
+                rows.Sort(StringComparer.Ordinal);
+                state.Append(tableName + "\n");
+                foreach (string row in rows)
+                {
+                    state.Append(row + "\n");
+                }
+            }
+
+            return WmauCheckResults.ComputeFingerprint(state.ToString());
+        }
+
+        /// <summary>
+        /// Starts an edit session and edit operation on the Workflow Manager database's
+        /// own workspace, so that a group of jobs can be stored together rather than
+        /// committing each job separately.
+        /// </summary>
+        /// <param name="wmxDb">A reference to the active Workflow Manager database</param>
+        /// <returns>
+        /// The workspace being edited, which should be passed to StopJobEditOperation();
+        /// null if the workspace could not be edited (or was already being edited), in
+        /// which case each job will be stored as usual.
+        /// </returns>
+        public static IWorkspaceEdit StartJobEditOperation(IJTXDatabase3 wmxDb)
+        {
+            IWorkspaceEdit workspaceEdit = wmxDb.JTXWorkspace as IWorkspaceEdit;
+            if (workspaceEdit == null || workspaceEdit.IsBeingEdited())
+            {
+                return null;
+            }
+
+            // Enterprise geodatabases require a non-versioned edit session to be requested
+            // explicitly; other workspaces only need a session without undo/redo
+            IMultiuserWorkspaceEdit multiuserEdit = workspaceEdit as IMultiuserWorkspaceEdit;
+            if (multiuserEdit != null &&
+                multiuserEdit.SupportsMultiuserEditSessionMode(esriMultiuserEditSessionMode.esriMESMNonVersioned))
+            {
+                multiuserEdit.StartMultiuserEditing(esriMultiuserEditSessionMode.esriMESMNonVersioned);
+            }
+            else
+            {
+                workspaceEdit.StartEditing(false);
+            }
+
+            try
+            {
+                workspaceEdit.StartEditOperation();
+            }
+            catch
+            {
+                workspaceEdit.StopEditing(false);
+                throw;
+            }
+
+            return workspaceEdit;
+        }
+
+        /// <summary>
+        /// Ends an edit operation and edit session started by StartJobEditOperation().
+        /// If the edits can't be saved, the edit session is abandoned (so that a new one
+        /// can be started) and the exception is thrown again.
+        /// </summary>
+        /// <param name="workspaceEdit">The workspace being edited; may be null</param>
+        /// <param name="saveEdits">True to save the edits; false to discard them</param>
+        public static void StopJobEditOperation(IWorkspaceEdit workspaceEdit, bool saveEdits)
+        {
+            if (workspaceEdit == null)
+            {
+                return;
+            }
+
+            try
+            {
+                if (saveEdits)
+                {
+                    workspaceEdit.StopEditOperation();
+                }
+                else
+                {
+                    workspaceEdit.AbortEditOperation();
+                }
+
+                using (WmauExecutionTrace.TimeCall(WmauExecutionTrace.C_CALL_STORE))
+                {
+                    workspaceEdit.StopEditing(saveEdits);
+                }
+            }
+            catch
+            {
+                try
+                {
+                    if (workspaceEdit.IsBeingEdited())
+                    {
+                        workspaceEdit.StopEditing(false);
+                    }
+                }
+                catch
+                {
+                    // Report the original error, rather than this one
+                }
+                throw;
+            }
+        }
+
         /// <summary>
         /// Given the human-readable name of a data workspace, this function returns the
         /// unique ID string used by Workflow Manager to identify this workspace connection.
@@ -137,7 +728,10 @@ namespace WorkflowManagerAdministrationUtilities.Common
         /// <param name="job">The job for which to send the notification</param>
         public static void SendNotification(string notificationName, IJTXDatabase3 wmxDb, IJTXJob job)
         {
-            ESRI.ArcGIS.JTX.Utilities.JTXUtilities.SendNotification(notificationName, wmxDb, job, null);
+            using (WmauExecutionTrace.TimeCall(WmauExecutionTrace.C_CALL_SEND_NOTIFICATION))
+            {
+                ESRI.ArcGIS.JTX.Utilities.JTXUtilities.SendNotification(notificationName, wmxDb, job, null);
+            }
         }
 
         /// <summary>
@@ -151,5 +745,39 @@ namespace WorkflowManagerAdministrationUtilities.Common
             // (this is now handled elsewhere).
             ESRI.ArcGIS.JTXUI.JobUtilities.UpdateStatusOfJob(wmxDb, job, false);
         }
+
+        /// <summary>
+        /// Quotes and escapes a string for a JSON document
+        /// </summary>
+        /// <param name="value">The value to be written</param>
+        /// <returns>The value as a quoted JSON string</returns>
+        public static string EscapeJson(string value)
+        {
+            StringBuilder json = new StringBuilder("\"");
+            foreach (char c in value)
+            {
+                switch (c)
+                {
+                    case '"': json.Append("\\\""); break;
+                    case '\\': json.Append("\\\\"); break;
+                    case '\n': json.Append("\\n"); break;
+                    case '\r': json.Append("\\r"); break;
+                    case '\t': json.Append("\\t"); break;
+                    default:
+                        if (c < ' ')
+                        {
+                            json.Append("\\u").Append(((int)c).ToString("x4"));
+                        }
+                        else
+                        {
+                            json.Append(c);
+                        }
+                        break;
+                }
+            }
+            json.Append("\"");
+
+            return json.ToString();
+        }
     }
 }
@@ -0,0 +1,119 @@
+﻿//Copyright 2015 Esri
+//Licensed under the Apache License, Version 2.0 (the "License");
+//you may not use this file except in compliance with the License.
+//You may obtain a copy of the License at
+//    http://www.apache.org/licenses/LICENSE-2.0
+//Unless required by applicable law or agreed to in writing, software
+//distributed under the License is distributed on an "AS IS" BASIS,
+//WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//See the License for the specific language governing permissions and
+//limitations under the License.​
+
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
+using System.Text;
+
+
+namespace WorkflowManagerAdministrationUtilities.Common
+{
+    /// <summary>
+    /// Writes a one-dimensional array to a NumPy ".npy" file (format version 1.0),
+    /// one value at a time, so that the array never has to be held in memory.
+    /// The resulting files can be loaded with "numpy.load()", optionally using
+    /// "mmap_mode='r'" to memory-map them rather than reading them.
+    /// </summary>
+    /// <remarks>
+    /// The header is written with a fixed length so that it can be rewritten
+    /// with the final number of values once all of the values have been written.
+    /// </remarks>
+    class WmauNpyWriter : IDisposable
+    {
+        #region Constants
+        public const string C_DTYPE_INT32 = "<i4";
+        public const string C_DTYPE_DATETIME64_SECONDS = "<M8[s]";
+
+        // The value that NumPy uses to represent "not a time" in a datetime64 array
+        public const long C_NOT_A_TIME = long.MinValue;
+
+        private const int C_HEADER_LENGTH = 128;
+        private static readonly byte[] C_MAGIC = { 0x93, (byte)'N', (byte)'U', (byte)'M', (byte)'P', (byte)'Y', 1, 0 };
+        #endregion
+
+        #region MemberVariables
+        private string m_dtype = string.Empty;
+        private FileStream m_stream = null;
+        private BinaryWriter m_writer = null;
+        private long m_count = 0;
+        #endregion
+
+        /// <summary>
+        /// Creates (or overwrites) an .npy file
+        /// </summary>
+        /// <param name="path">The path to the file</param>
+        /// <param name="dtype">The NumPy type of the values; one of the C_DTYPE_* constants</param>
+        public WmauNpyWriter(string path, string dtype)
+        {
+            m_dtype = dtype;
+            m_stream = new FileStream(path, FileMode.Create, FileAccess.Write, FileShare.Read);
+            m_writer = new BinaryWriter(m_stream);
+            WriteHeader();
+        }
+
+        #region Accessors
+        public long Count { get { return m_count; } }
+        #endregion
+
+        /// <summary>
+        /// Writes the header, reflecting the number of values written so far
+        /// </summary>
+        private void WriteHeader()
+        {
+            string header = "{'descr': '" + m_dtype + "', 'fortran_order': False, 'shape': (" + m_count.ToString() + ",), }";
+
+            // The header must be padded with spaces and terminated by a newline
+            int headerLength = C_HEADER_LENGTH - C_MAGIC.Length - sizeof(ushort);
+            header = header.PadRight(headerLength - 1) + "\n";
+
+            m_writer.Seek(0, SeekOrigin.Begin);
+            m_writer.Write(C_MAGIC);
+            m_writer.Write((ushort)headerLength);
+            m_writer.Write(Encoding.ASCII.GetBytes(header));
+        }
+
+        /// <summary>
+        /// Appends a value to an array of type C_DTYPE_INT32
+        /// </summary>
+        /// <param name="value">The value to write</param>
+        public void Write(int value)
+        {
+            m_writer.Write(value);
+            m_count++;
+        }
+
+        /// <summary>
+        /// Appends a value to an array of type C_DTYPE_DATETIME64_SECONDS
+        /// </summary>
+        /// <param name="value">The number of seconds since 1970-01-01, or C_NOT_A_TIME</param>
+        public void Write(long value)
+        {
+            m_writer.Write(value);
+            m_count++;
+        }
+
+        /// <summary>
+        /// Updates the file's header with the final number of values and closes the file
+        /// </summary>
+        public void Dispose()
+        {
+            if (m_writer != null)
+            {
+                WriteHeader();
+                m_writer.Close();
+                m_writer = null;
+                m_stream = null;
+            }
+        }
+    }
+}
@@ -70,6 +70,10 @@ namespace WorkflowManagerAdministrationUtilities
         private IGPMessages m_gpMessages;
         private Application m_excelObj = null;
         private Workbook m_workbook = null;
+
+        // The worksheets in the workbook, keyed by name, so that they can be
+        // looked up without going through Excel each time
+        private Dictionary<string, Worksheet> m_worksheets = new Dictionary<string, Worksheet>(StringComparer.CurrentCultureIgnoreCase);
         #endregion
 
         #region Accessor methods
@@ -105,41 +109,21 @@ namespace WorkflowManagerAdministrationUtilities
             string headerStartCell = "A1";
             string headerEndCell = GetExcelColumnFromIndex(numColumns) + "1";
             Range headerRange = worksheet.get_Range(headerStartCell, headerEndCell);
+            object[,] headerValues = new object[1, numColumns];
             for (int i = 0; i < numColumns; i++)
             {
-                SetValueAsText(headerRange, i + 1, cellValues[i]);
+                headerValues[0, i] = cellValues[i];
             }
+            headerRange.Value2 = headerValues;
 
             // Apply some formatting to these cells (...no real reason)
             headerRange.Font.Bold = true;
             headerRange.HorizontalAlignment = XlHAlign.xlHAlignCenter;
             headerRange.VerticalAlignment = XlVAlign.xlVAlignCenter;
-            headerRange.EntireColumn.AutoFit();
 
             return headerRange;
         }
 
-        /// <summary>
-        /// 
-        /// </summary>
-        /// <param name="searchRange"></param>
-        /// <param name="text"></param>
-        /// <returns>Returns the first cell that contains a value matching the given text string</returns>
-        private Range FindCellMatchingText(Range searchRange, string text)
-        {
-            Range retVal = searchRange.Find(
-                text,
-                Type.Missing,
-                XlFindLookIn.xlValues,
-                XlLookAt.xlWhole,
-                XlSearchOrder.xlByColumns,
-                XlSearchDirection.xlNext,
-                true,
-                Type.Missing,
-                Type.Missing);
-            return retVal;
-        }
-
         /// <summary>
         /// Helper function to convert a 1-based column index to its Excel "column" notation
         /// (ex: "A", "D", "BF", etc.)
@@ -165,53 +149,79 @@ namespace WorkflowManagerAdministrationUtilities
         private Worksheet GetWorksheetByName(string worksheetName)
         {
             Worksheet worksheet = null;
+            m_worksheets.TryGetValue(worksheetName, out worksheet);
+            return worksheet;
+        }
 
-            foreach (Worksheet sheet in m_workbook.Worksheets)
+        /// <summary>
+        /// Replaces a worksheet (if it exists) with a new, empty worksheet
+        /// containing only a header row
+        /// </summary>
+        /// <param name="worksheetName">The name of the worksheet</param>
+        /// <param name="headerColumns">The names of the worksheet's columns</param>
+        /// <returns>The new worksheet</returns>
+        private Worksheet CreateWorksheet(string worksheetName, string[] headerColumns)
+        {
+            Worksheet worksheet = this.GetWorksheetByName(worksheetName);
+            if (worksheet != null)
             {
-                if (sheet.Name.Equals(worksheetName, StringComparison.CurrentCultureIgnoreCase))
-                {
-                    worksheet = sheet;
-                    break;
-                }
+                worksheet.Delete();
             }
 
+            worksheet = m_workbook.Worksheets.Add(
+                Type.Missing, Type.Missing, 1, XlWBATemplate.xlWBATWorksheet) as Worksheet;
+            worksheet.Name = worksheetName;
+            m_worksheets[worksheetName] = worksheet;
+            CreateHeaderRow(worksheet, headerColumns);
+
             return worksheet;
         }
 
         /// <summary>
-        /// Helper function to hide all these ridiculous "Missing" directives
+        /// Writes the contents of a worksheet (below its header row) in a single
+        /// call, rather than cell by cell, and sizes the columns to fit
         /// </summary>
-        /// <param name="excelObj"></param>
-        /// <returns></returns>
-        private Workbook OpenWorkbook(Application excelObj)
+        /// <param name="worksheet">The worksheet to be filled in</param>
+        /// <param name="values">The values of the cells, by row and then by column</param>
+        private void WriteRows(Worksheet worksheet, object[,] values)
         {
-            Workbook retVal = excelObj.Workbooks.Add(XlWBATemplate.xlWBATWorksheet);
-            excelObj.WindowState = XlWindowState.xlMinimized;
-            return retVal;
+            int numRows = values.GetLength(0);
+            int numColumns = values.GetLength(1);
+            if (numRows > 0)
+            {
+                string startCell = "A2";
+                string endCell = GetExcelColumnFromIndex(numColumns) + (numRows + 1).ToString();
+                Range range = worksheet.get_Range(startCell, endCell);
+                range.Value2 = values;
+            }
+
+            string headerStartCell = "A1";
+            string headerEndCell = GetExcelColumnFromIndex(numColumns) + "1";
+            worksheet.get_Range(headerStartCell, headerEndCell).EntireColumn.AutoFit();
         }
 
         /// <summary>
-        /// Sets the value of a cell as a string
+        /// Encodes a password in base64 format so as to not end up putting binary
+        /// info into the Excel spreadsheet
         /// </summary>
-        /// <param name="cells">The range of cells that serve as the source</param>
-        /// <param name="row">The index of the row to set (1-based)</param>
-        /// <param name="col">The index of the column to set (1-based)</param>
-        /// <param name="value">The value to set for the specified cell</param>
-        private void SetValueAsText(Range cells, int row, int col, string value)
+        /// <param name="password">The password</param>
+        /// <returns>The encoded password</returns>
+        private string EncodePassword(string password)
         {
-            Range cell = cells[row, col] as Range;
-            cell.Value2 = value;
+            byte[] passwordAsBytes = System.Text.UTF8Encoding.UTF8.GetBytes(password);
+            return System.Convert.ToBase64String(passwordAsBytes);
         }
 
         /// <summary>
-        /// Sets the value of a cell as a string; assumes a range with a single row
+        /// Helper function to hide all these ridiculous "Missing" directives
         /// </summary>
-        /// <param name="cells">A single row of cells containing the target cell</param>
-        /// <param name="col">The index of the column to set (1-based)</param>
-        /// <param name="value">The value to set for the specified cell</param>
-        private void SetValueAsText(Range cells, int col, string value)
+        /// <param name="excelObj"></param>
+        /// <returns></returns>
+        private Workbook OpenWorkbook(Application excelObj)
         {
-            SetValueAsText(cells, 1, col, value);
+            Workbook retVal = excelObj.Workbooks.Add(XlWBATemplate.xlWBATWorksheet);
+            excelObj.WindowState = XlWindowState.xlMinimized;
+            return retVal;
         }
 
         /// <summary>
@@ -232,54 +242,29 @@ namespace WorkflowManagerAdministrationUtilities
             {
                 throw new Exception("Failed to open Excel workbook");
             }
-            Worksheet worksheet = this.GetWorksheetByName(worksheetName);
-            if (worksheet != null)
-            {
-                worksheet.Delete();
-            }
 
             // Create a new worksheet with the appropriate name
-            worksheet = m_workbook.Worksheets.Add(
-                Type.Missing, Type.Missing, 1, XlWBATemplate.xlWBATWorksheet) as Worksheet;
-            worksheet.Name = worksheetName;
-            Range headerRange = CreateHeaderRow(worksheet, C_LOGIN_HEADER_COLUMNS);
-
-            // Get a mapping of which attribute name maps to which excel column
-            Dictionary<string, int> columnMap = new Dictionary<string, int>();
-            for (int i = 0; i < C_LOGIN_HEADER_COLUMNS.Length; i++)
-            {
-                Range tempRange = FindCellMatchingText(headerRange, C_LOGIN_HEADER_COLUMNS[i]);
-                columnMap[C_LOGIN_HEADER_COLUMNS[i]] = tempRange.Column;
-            }
+            Worksheet worksheet = CreateWorksheet(worksheetName, C_LOGIN_HEADER_COLUMNS);
 
             // Fill in the contents of the worksheet based on the info for each of the
-            // workspaces
-            int currentRow = 2;
+            // logins; the columns are in the same order as the header row
+            int wmxUsernameCol = Array.IndexOf(C_LOGIN_HEADER_COLUMNS, C_WMX_USERNAME);
+            int dbUsernameCol = Array.IndexOf(C_LOGIN_HEADER_COLUMNS, C_DB_USERNAME);
+            int dbPasswordCol = Array.IndexOf(C_LOGIN_HEADER_COLUMNS, C_DB_PASSWORD);
+            int isEncryptedCol = Array.IndexOf(C_LOGIN_HEADER_COLUMNS, C_IS_ENCRYPTED);
+
+            object[,] values = new object[loginList.Count, C_LOGIN_HEADER_COLUMNS.Length];
+            int currentRow = 0;
             foreach (Common.WorkspaceInfo.LoginInfo login in loginList)
             {
-                // Get a handle to the correct range
-                string startCell = "A" + currentRow.ToString();
-                string endCell = GetExcelColumnFromIndex(C_LOGIN_HEADER_COLUMNS.Length) + currentRow.ToString();
-                Range tempRange = worksheet.get_Range(startCell, endCell);
-
-                // Set the values of the cells within the range
-                SetValueAsText(tempRange, columnMap[C_WMX_USERNAME], login.WmxUsername);
-                SetValueAsText(tempRange, columnMap[C_DB_USERNAME], login.DatabaseUsername);
-
-                // Save out the password in base64 format so as to not end up putting binary
-                // info into the Excel spreadsheet
-                byte[] passwordAsBytes = System.Text.UTF8Encoding.UTF8.GetBytes(login.DatabasePassword);
-                string password64 = System.Convert.ToBase64String(passwordAsBytes);
-                SetValueAsText(tempRange, columnMap[C_DB_PASSWORD], password64);
-
-                SetValueAsText(tempRange, columnMap[C_IS_ENCRYPTED], login.IsPasswordEncrypted.ToString());
-
-                // This "auto fit" shouldn't really be done in here, but the range already
-                // exists, so...
-                tempRange.EntireColumn.AutoFit();
-
+                values[currentRow, wmxUsernameCol] = login.WmxUsername;
+                values[currentRow, dbUsernameCol] = login.DatabaseUsername;
+                values[currentRow, dbPasswordCol] = EncodePassword(login.DatabasePassword);
+                values[currentRow, isEncryptedCol] = login.IsPasswordEncrypted.ToString();
                 currentRow++;
             }
+
+            WriteRows(worksheet, values);
         }
         #endregion
 
@@ -315,6 +300,11 @@ namespace WorkflowManagerAdministrationUtilities
                 {
                     m_excelObj = new Application();
                     m_workbook = OpenWorkbook(m_excelObj);
+                    m_worksheets.Clear();
+                    foreach (Worksheet worksheet in m_workbook.Worksheets)
+                    {
+                        m_worksheets[worksheet.Name] = worksheet;
+                    }
                     m_isOpen = true;
                 }
                 catch (NullReferenceException nullEx)
@@ -392,6 +382,7 @@ namespace WorkflowManagerAdministrationUtilities
                 m_excelObj = null;
             }
 
+            m_worksheets.Clear();
             m_isOpen = false;
 
             return true;
@@ -403,78 +394,66 @@ namespace WorkflowManagerAdministrationUtilities
         /// <param name="workspaceInfo">A list containing the information for each workspace</param>
         public void SaveWorkspacesToSpreadsheet(IList<Common.WorkspaceInfo> workspaceInfo)
         {
-            // Error checking: delete the required worksheet if it already exists
+            // Error checking: make sure that the workbook can be opened
             if (!this.Open())
             {
                 WmauError error = new WmauError(WmauErrorCodes.C_EXCEL_WORKBOOK_ERROR);
                 m_gpMessages.AddError(error.ErrorCodeAsInt, error.Message);
                 throw new Exception(error.Message);
             }
-            Worksheet worksheet = this.GetWorksheetByName(C_DB_WORKSHEET_NAME);
-            if (worksheet != null)
-            {
-                worksheet.Delete();
-            }
 
             // Create a new worksheet with the appropriate header row
-            worksheet = m_workbook.Worksheets.Add(
-                Type.Missing, Type.Missing, 1, XlWBATemplate.xlWBATWorksheet) as Worksheet;
-            worksheet.Name = C_DB_WORKSHEET_NAME;
-            Range headerRange = CreateHeaderRow(worksheet, C_HEADER_COLUMNS);
+            Worksheet worksheet = CreateWorksheet(C_DB_WORKSHEET_NAME, C_HEADER_COLUMNS);
 
-            // Get a mapping of which attribute name maps to which excel column
+            // Work out which attribute maps to which column; the columns are in the
+            // same order as the header row
             Dictionary<string, int> columnMap = new Dictionary<string, int>();
             for (int i = 0; i < C_HEADER_COLUMNS.Length; i++)
             {
-                Range tempRange = FindCellMatchingText(headerRange, C_HEADER_COLUMNS[i]);
-                columnMap[C_HEADER_COLUMNS[i]] = tempRange.Column;
+                columnMap[C_HEADER_COLUMNS[i]] = i;
             }
 
             // Fill in the contents of the worksheet based on the info for each of the
-            // workspaces
-            int currentRow = 2;
+            // workspaces.  The whole sheet is built up in memory and handed to Excel
+            // at once, since every cell written separately is another call to Excel.
+            object[,] values = new object[workspaceInfo.Count, C_HEADER_COLUMNS.Length];
+            List<Common.WorkspaceInfo> individualLoginWorkspaces = new List<Common.WorkspaceInfo>();
+            int currentRow = 0;
             foreach (Common.WorkspaceInfo workspace in workspaceInfo)
             {
-                // Get a handle to the correct range
-                string startCell = "A" + currentRow.ToString();
-                string endCell = GetExcelColumnFromIndex(C_HEADER_COLUMNS.Length) + currentRow.ToString();
-                Range tempRange = worksheet.get_Range(startCell, endCell);
-                
-                // Set the values of the cells within the range
-                SetValueAsText(tempRange, columnMap[C_DB_ALIAS], workspace.Name);
-                SetValueAsText(tempRange, columnMap[C_SERVER], workspace.Server);
-                SetValueAsText(tempRange, columnMap[C_INSTANCE], workspace.Instance);
-                SetValueAsText(tempRange, columnMap[C_DATABASE], workspace.Database);
-                SetValueAsText(tempRange, columnMap[C_VERSION], workspace.Version);
-                SetValueAsText(tempRange, columnMap[C_OS_AUTH], workspace.UseOsAuthentication.ToString());
-                SetValueAsText(tempRange, columnMap[C_INDIVIDUAL_LOGINS], workspace.UseIndividualLogins.ToString());
+                values[currentRow, columnMap[C_DB_ALIAS]] = workspace.Name;
+                values[currentRow, columnMap[C_SERVER]] = workspace.Server;
+                values[currentRow, columnMap[C_INSTANCE]] = workspace.Instance;
+                values[currentRow, columnMap[C_DATABASE]] = workspace.Database;
+                values[currentRow, columnMap[C_VERSION]] = workspace.Version;
+                values[currentRow, columnMap[C_OS_AUTH]] = workspace.UseOsAuthentication.ToString();
+                values[currentRow, columnMap[C_INDIVIDUAL_LOGINS]] = workspace.UseIndividualLogins.ToString();
                 if (!workspace.UseOsAuthentication && !workspace.UseIndividualLogins)
                 {
                     if (workspace.Logins.Count > 0)
                     {
                         Common.WorkspaceInfo.LoginInfo tempLogin = workspace.Logins.ElementAt(0);
-                        SetValueAsText(tempRange, columnMap[C_USERNAME], tempLogin.DatabaseUsername);
-
-                        // Save out the password in base64 format so as to not end up putting binary
-                        // info into the Excel spreadsheet
-                        byte[] passwordAsBytes = System.Text.UTF8Encoding.UTF8.GetBytes(tempLogin.DatabasePassword);
-                        string password64 = System.Convert.ToBase64String(passwordAsBytes);
-                        SetValueAsText(tempRange, columnMap[C_PASSWORD], password64);
-
-                        SetValueAsText(tempRange, columnMap[C_IS_ENCRYPTED], true.ToString());
+                        values[currentRow, columnMap[C_USERNAME]] = tempLogin.DatabaseUsername;
+                        values[currentRow, columnMap[C_PASSWORD]] = EncodePassword(tempLogin.DatabasePassword);
+                        values[currentRow, columnMap[C_IS_ENCRYPTED]] = true.ToString();
                     }
                 }
                 else if (workspace.UseIndividualLogins)
                 {
-                    SaveLoginInfoToSpreadsheet(workspace.Name, workspace.Logins);
+                    individualLoginWorkspaces.Add(workspace);
                 }
 
-                // This "auto fit" shouldn't really be done in here, but the range already
-                // exists, so...
-                tempRange.EntireColumn.AutoFit();
-
                 currentRow++;
             }
+            WriteRows(worksheet, values);
+
+            // Each workspace with individual logins gets a worksheet of its own.  These
+            // are created in the same order as before, so the sheets end up in the same
+            // order in the workbook.
+            foreach (Common.WorkspaceInfo workspace in individualLoginWorkspaces)
+            {
+                SaveLoginInfoToSpreadsheet(workspace.Name, workspace.Logins);
+            }
 
             Save();
         }
@@ -0,0 +1,231 @@
+# ---------------------------------------------------------------------------
+# AnalyzeJobExport.py
+#
+# Summarizes the jobs exported by the "Export Jobs for Analysis" GP tool.
+# Each exported field is memory-mapped from its NumPy array file rather than
+# read into memory, and all of the statistics are computed with vectorized
+# NumPy operations, so that exports containing millions of jobs can be
+# summarized in seconds without connecting to the Workflow Manager database.
+#
+# Requires NumPy (installed with ArcGIS); runs with any Python 2.7 or later
+# interpreter.
+# ---------------------------------------------------------------------------
+
+import datetime
+import io
+import optparse
+import os
+import sys
+
+import numpy
+
+
+# Function that prints an explanation of how to use this script
+def printUsage():
+    print("""
+Summarizes the jobs in a folder written by the "Export Jobs for Analysis" GP
+tool: the number of jobs for each value of one or more fields, and the ages
+of the jobs.
+
+Usage:
+  AnalyzeJobExport.py [options] exportFolder
+
+Options:
+  -g LIST, --group-by=LIST  Comma-separated list of fields by which to count
+                            the jobs (default: JOB_TYPE_ID,STATUS,ASSIGNED_TO)
+  -o, --open-only           Only include jobs that are not closed
+  -r DATE, --reference-date=DATE
+                            Date (YYYY-MM-DD) from which job ages are measured
+                            (default: today)
+  -n COUNT, --top=COUNT     Number of values to list for each field (default:
+                            20; 0 lists all values)
+""")
+
+
+# The files and field types written by the GP tool
+MANIFEST_FILE = "manifest.txt"
+ARRAY_EXT = ".npy"
+DICTIONARY_EXT = ".dict.txt"
+KIND_TEXT = "text"
+KIND_DATE = "datetime"
+
+# The value stored in a text field's array when the field is null
+NULL_CODE = -1
+
+# The name of the stage of a closed job, as written to the STAGE dictionary
+STAGE_FIELD = "STAGE"
+CLOSED_STAGE = "Closed"
+
+# Fields used to compute job ages and overdue jobs
+CREATED_DATE_FIELD = "CREATED_DATE"
+DUE_DATE_FIELD = "DUE_DATE"
+
+# The lower bound (in days) of each age range reported
+AGE_BUCKETS = [0, 8, 31, 91, 366]
+
+
+# Reads a text file written by the GP tool, which may start with a byte-order
+# mark, and returns its lines
+def readLines(path):
+    f = io.open(path, "r", encoding="utf-8-sig")
+    try:
+        return [line.rstrip("\r\n") for line in f]
+    finally:
+        f.close()
+
+
+# Loads the exported fields.  Returns a dictionary of field names to
+# (kind, array, values) tuples, where "values" lists the distinct values of a
+# text field (and is None for other fields).
+def loadExport(exportFolder):
+    fields = {}
+    for line in readLines(os.path.join(exportFolder, MANIFEST_FILE)):
+        parts = line.split("\t")
+        if len(parts) != 2:
+            continue
+        (name, kind) = parts
+        array = numpy.load(os.path.join(exportFolder, name + ARRAY_EXT), mmap_mode="r")
+        values = None
+        if kind == KIND_TEXT:
+            values = readLines(os.path.join(exportFolder, name + DICTIONARY_EXT))
+        fields[name] = (kind, array, values)
+    return fields
+
+
+# Returns a boolean mask selecting the jobs that are not closed
+def openJobsMask(fields):
+    (kind, codes, values) = fields[STAGE_FIELD]
+    if CLOSED_STAGE not in values:
+        return numpy.ones(len(codes), dtype=bool)
+    return codes != values.index(CLOSED_STAGE)
+
+
+# Returns a boolean mask selecting the non-null values of a date field.  The
+# values are compared as integers, since older versions of NumPy (as installed
+# with some releases of ArcGIS) don't provide numpy.isnat().
+def validDatesMask(dates):
+    return dates.view(numpy.int64) != numpy.iinfo(numpy.int64).min
+
+
+# Counts the jobs for each value of a text field.  Returns a list of
+# (value, count) tuples, from the most to the least common; null values are
+# reported as "<null>".
+def countByValue(codes, values):
+    # Shift the codes up by one so that nulls are counted in the first bin
+    counts = numpy.bincount(numpy.asarray(codes, dtype=numpy.int64) - NULL_CODE, minlength=len(values) + 1)
+    results = []
+    if counts[0] > 0:
+        results.append(("<null>", int(counts[0])))
+    for i in numpy.nonzero(counts[1:])[0]:
+        results.append((values[i], int(counts[i + 1])))
+    results.sort(key=lambda r: (-r[1], r[0]))
+    return results
+
+
+# Counts the jobs created within each age range, as of the reference date.
+# Returns a list of (label, count) tuples, followed by the number of jobs
+# without a creation date.
+def countByAge(createdDates, referenceDate):
+    valid = validDatesMask(createdDates)
+    ages = (referenceDate - createdDates[valid]).astype("timedelta64[D]").astype(numpy.int64)
+    buckets = numpy.digitize(ages, AGE_BUCKETS)
+    counts = numpy.bincount(buckets, minlength=len(AGE_BUCKETS) + 1)
+
+    results = []
+    for i in range(len(AGE_BUCKETS)):
+        if i + 1 < len(AGE_BUCKETS):
+            label = "%d-%d days" % (AGE_BUCKETS[i], AGE_BUCKETS[i + 1] - 1)
+        else:
+            label = "%d+ days" % AGE_BUCKETS[i]
+        results.append((label, int(counts[i + 1])))
+
+    # Jobs created after the reference date fall below the first bucket
+    if counts[0] > 0:
+        results.append(("created after reference date", int(counts[0])))
+    results.append(("no creation date", int(numpy.count_nonzero(~valid))))
+    return results
+
+
+# Prints a list of (label, count) tuples, optionally limited to the first few
+def printCounts(title, counts, total, top):
+    print(title)
+    shown = counts
+    if top > 0:
+        shown = counts[:top]
+    width = max([len(label) for (label, count) in shown] + [1])
+    for (label, count) in shown:
+        pct = 0.0
+        if total > 0:
+            pct = 100.0 * count / total
+        print("  %-*s  %10d  (%5.1f%%)" % (width, label, count, pct))
+    if len(shown) < len(counts):
+        print("  ... %d more value(s)" % (len(counts) - len(shown)))
+    print("")
+
+
+# Script entry point
+def main():
+    parser = optparse.OptionParser(add_help_option=False)
+    parser.add_option("-g", "--group-by", dest="groupBy", default="JOB_TYPE_ID,STATUS,ASSIGNED_TO")
+    parser.add_option("-o", "--open-only", dest="openOnly", action="store_true", default=False)
+    parser.add_option("-r", "--reference-date", dest="referenceDate", default=None)
+    parser.add_option("-n", "--top", dest="top", type="int", default=20)
+    parser.add_option("-h", "--help", dest="help", action="store_true", default=False)
+    (options, args) = parser.parse_args()
+
+    if options.help or len(args) != 1:
+        printUsage()
+        return 1
+
+    if options.referenceDate == None:
+        referenceDate = numpy.datetime64(datetime.datetime.now().replace(microsecond=0), "s")
+    else:
+        try:
+            datetime.datetime.strptime(options.referenceDate, "%Y-%m-%d")
+        except ValueError:
+            printUsage()
+            return 1
+        referenceDate = numpy.datetime64(options.referenceDate + "T00:00:00", "s")
+
+    fields = loadExport(args[0])
+    groupBy = [f.strip() for f in options.groupBy.split(",") if len(f.strip()) > 0]
+    for name in groupBy:
+        if name not in fields or fields[name][0] != KIND_TEXT:
+            sys.stderr.write("Field '" + name + "' is not an exported text field\n")
+            return 1
+
+    # Select the jobs to be summarized; the arrays themselves stay memory-mapped
+    # until they are indexed by the mask
+    mask = None
+    if options.openOnly and STAGE_FIELD in fields:
+        mask = openJobsMask(fields)
+
+    def selected(name):
+        array = fields[name][1]
+        if mask is None:
+            return array
+        return array[mask]
+
+    anyField = list(fields.keys())[0]
+    total = len(selected(anyField))
+    print("%d job(s)%s in %s" % (total, options.openOnly and " not closed" or "", args[0]))
+    print("")
+
+    for name in groupBy:
+        printCounts("Jobs by " + name + ":", countByValue(selected(name), fields[name][2]), total, options.top)
+
+    if CREATED_DATE_FIELD in fields:
+        printCounts("Jobs by age (as of " + str(referenceDate) + "):",
+            countByAge(selected(CREATED_DATE_FIELD), referenceDate), total, 0)
+
+    if DUE_DATE_FIELD in fields and STAGE_FIELD in fields:
+        dueDates = fields[DUE_DATE_FIELD][1]
+        overdue = openJobsMask(fields) & validDatesMask(dueDates) & (dueDates < referenceDate)
+        print("%d open job(s) past their due date" % numpy.count_nonzero(overdue))
+
+    return 0
+
+
+# Entry point for the script
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+# ---------------------------------------------------------------------------
+# AnalyzeToolTraces.py
+#
+# Summarizes the trace files written by the Workflow Manager Administration
+# Utilities when the WMAU_TRACE_FILE environment variable is set.  Each line
+# of a trace file describes one call to a GP tool's Execute, UpdateParameters,
+# or UpdateMessages function; this script aggregates these into per-tool
+# latency percentiles, per-phase averages, and Workflow Manager call counts.
+#
+# Does not require ArcGIS; runs with any Python 2.7 or later interpreter.
+# ---------------------------------------------------------------------------
+
+import json
+import math
+import optparse
+import sys
+
+
+# Function that prints an explanation of how to use this script
+def printUsage():
+    print("""
+Summarizes one or more Workflow Manager Administration Utilities trace files
+(as written when the WMAU_TRACE_FILE environment variable is set).
+
+Usage:
+  AnalyzeToolTraces.py [options] traceFile [traceFile ...]
+
+Options:
+  -t TOOL, --tool=TOOL      Only report on the named tool
+  -m METHOD, --method=METHOD
+                            Only report on the named entry point (Execute,
+                            UpdateParameters, or UpdateMessages)
+  -p LIST, --percentiles=LIST
+                            Comma-separated list of percentiles to report
+                            (default: 50,90,99)
+""")
+
+
+# Computes the given percentile (0-100) of a sorted list using the
+# nearest-rank method
+def percentile(sortedValues, pct):
+    if len(sortedValues) == 0:
+        return 0.0
+    rank = int(math.ceil(pct / 100.0 * len(sortedValues))) - 1
+    rank = max(0, min(rank, len(sortedValues) - 1))
+    return sortedValues[rank]
+
+
+# Reads the trace records from a file, skipping any lines that can't be
+# parsed (ex: a line that was being written when a process was killed)
+def readTraceRecords(traceFile, toolFilter, methodFilter):
+    records = []
+    badLines = 0
+    f = open(traceFile, "r")
+    try:
+        for line in f:
+            line = line.strip()
+            if len(line) == 0:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                badLines += 1
+                continue
+            if toolFilter != None and record.get("tool") != toolFilter:
+                continue
+            if methodFilter != None and record.get("method") != methodFilter:
+                continue
+            records.append(record)
+    finally:
+        f.close()
+
+    if badLines > 0:
+        sys.stderr.write("Skipped " + str(badLines) + " unreadable line(s) in " + traceFile + "\n")
+
+    return records
+
+
+# Groups the trace records by tool and entry point, and computes the summary
+# statistics for each group
+def summarize(records, percentiles):
+    groups = {}
+    for record in records:
+        key = (record.get("tool", "?"), record.get("method", "?"))
+        groups.setdefault(key, []).append(record)
+
+    summaries = []
+    for key in sorted(groups.keys()):
+        group = groups[key]
+        totals = sorted([float(r.get("totalMs", 0.0)) for r in group])
+
+        phaseTotals = {}
+        callCounts = {}
+        callTimes = {}
+        errors = 0
+        for r in group:
+            if r.get("errors"):
+                errors += 1
+            for (phase, ms) in r.get("phases", {}).items():
+                phaseTotals[phase] = phaseTotals.get(phase, 0.0) + float(ms)
+            for (call, info) in r.get("calls", {}).items():
+                callCounts[call] = callCounts.get(call, 0) + int(info.get("count", 0))
+                callTimes[call] = callTimes.get(call, 0.0) + float(info.get("ms", 0.0))
+
+        n = float(len(group))
+        summary = {
+            "tool": key[0],
+            "method": key[1],
+            "count": len(group),
+            "errors": errors,
+            "mean": sum(totals) / n,
+            "max": totals[-1],
+            "percentiles": [(p, percentile(totals, p)) for p in percentiles],
+            "phases": sorted([(phase, ms / n) for (phase, ms) in phaseTotals.items()], key=lambda x: -x[1]),
+            "calls": sorted([(call, callCounts[call] / n, callTimes[call] / n) for call in callCounts], key=lambda x: -x[2]),
+        }
+        summaries.append(summary)
+
+    return summaries
+
+
+# Prints the summaries in a human-readable format
+def printSummaries(summaries):
+    for s in summaries:
+        pctStr = "  ".join(["p%g=%.1f" % (p, v) for (p, v) in s["percentiles"]])
+        print("%s.%s: %d call(s), %d with errors" % (s["tool"], s["method"], s["count"], s["errors"]))
+        print("  total ms: mean=%.1f  %s  max=%.1f" % (s["mean"], pctStr, s["max"]))
+        if len(s["phases"]) > 0:
+            print("  mean ms per phase:")
+            for (phase, ms) in s["phases"]:
+                print("    %-20s %10.1f" % (phase, ms))
+        if len(s["calls"]) > 0:
+            print("  Workflow Manager calls (per tool call):")
+            for (call, count, ms) in s["calls"]:
+                print("    %-26s %8.1f calls %10.1f ms" % (call, count, ms))
+        print("")
+
+
+def main():
+    parser = optparse.OptionParser(add_help_option=False)
+    parser.add_option("-t", "--tool", dest="tool", default=None)
+    parser.add_option("-m", "--method", dest="method", default=None)
+    parser.add_option("-p", "--percentiles", dest="percentiles", default="50,90,99")
+    parser.add_option("-h", "--help", dest="help", action="store_true", default=False)
+    (options, args) = parser.parse_args()
+
+    if options.help or len(args) == 0:
+        printUsage()
+        return 1
+
+    try:
+        percentiles = [float(p) for p in options.percentiles.split(",")]
+    except ValueError:
+        printUsage()
+        return 1
+
+    records = []
+    for traceFile in args:
+        records.extend(readTraceRecords(traceFile, options.tool, options.method))
+
+    if len(records) == 0:
+        print("No trace records found")
+        return 0
+
+    printSummaries(summarize(records, percentiles))
+    return 0
+
+
+# Entry point for the script
+if __name__ == "__main__":
+    sys.exit(main())
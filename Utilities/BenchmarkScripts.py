@@ -0,0 +1,223 @@
+# ---------------------------------------------------------------------------
+# BenchmarkScripts.py
+#
+# Measures the throughput of the bulk scripts in "ArcToolbox\Scripts" by
+# running them against the stand-in arcpy module in the "FakeArcpy"
+# directory.  For each operation (create, delete, notify, upload) and each
+# size, the in-memory Workflow Manager store is seeded with the necessary
+# jobs, features, queries, or files; the script's main() function is then
+# timed and the number of items processed per second is reported.  Giving
+# the simulated database a limited capacity shows how the scripts respond to
+# an overloaded database.
+#
+# When the scripts may make several calls at once, they make them in worker
+# processes, each with its own copy of the in-memory store.  The calls made
+# by the workers are not included in the "calls/item" and "peak calls"
+# columns, and the capacity applies to each worker separately, so these runs
+# only measure the cost of handing the calls to the workers; they say
+# nothing about how a real Workflow Manager database would cope with the
+# extra load.
+#
+# The scripts being measured use Python 2 syntax, so this script must be run
+# with a Python 2.7 interpreter.  Does not require ArcGIS.
+# ---------------------------------------------------------------------------
+
+import imp
+import optparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+
+C_UTILITIES_DIR = os.path.dirname(os.path.abspath(__file__))
+C_SCRIPTS_DIR = os.path.join(os.path.dirname(C_UTILITIES_DIR), "ArcToolbox", "Scripts")
+C_FAKE_ARCPY_DIR = os.path.join(C_UTILITIES_DIR, "FakeArcpy")
+
+C_JOB_TYPE = "Data Edits"
+C_QUERY_NAME = "Benchmark Jobs"
+C_NOTIFICATION_NAME = "BenchmarkNotification"
+C_FEATURE_CLASS = "Parcels"
+
+# Make sure that the scripts pick up the stand-in arcpy module, and any
+# modules installed alongside them
+sys.path.insert(0, C_FAKE_ARCPY_DIR)
+sys.path.insert(1, C_SCRIPTS_DIR)
+import arcpy
+
+
+# Function that prints an explanation of how to use this script
+def printUsage():
+    print("""
+Measures the throughput of the scripts in ArcToolbox\\Scripts against an
+in-memory stand-in for arcpy and the Workflow Manager database.
+
+Usage:
+  BenchmarkScripts.py [options]
+
+Options:
+  -o LIST, --operations=LIST
+                            Comma-separated list of operations to measure:
+                            create, delete, notify, upload
+                            (default: create,delete,notify,upload)
+  -s LIST, --sizes=LIST     Comma-separated list of item counts
+                            (default: 1000,10000,100000)
+  -l MS, --latency=MS       Simulated latency of each GP tool call, in
+                            milliseconds (default: 0)
+  -j, --journal             Have the create, delete, and notify scripts
+                            record their progress in a journal file
+  -w N, --workers=N         Maximum number of concurrent calls the scripts
+                            may make, each in a worker process (default: 1)
+  -c N, --capacity=N        Number of concurrent calls the simulated
+                            database can handle before slowing down; 0 for
+                            no limit (default: 0)
+  -v, --verbose             Print the scripts' messages
+""")
+
+
+# Loads a fresh copy of one of the scripts as a module
+def loadScript(scriptName):
+    path = os.path.join(C_SCRIPTS_DIR, scriptName)
+    moduleName = "benchmark_" + os.path.splitext(scriptName)[0]
+    return imp.load_source(moduleName, path)
+
+
+# Counts the items in a semicolon-delimited output parameter
+def countOutputItems(paramIndex):
+    output = arcpy.getOutputParameter(paramIndex)
+    if output == None or len(output) == 0:
+        return 0
+    return len(output.split(";"))
+
+
+# Sets up the "create" benchmark; returns (script, input parameters,
+# whether the script supports a journal, position of the "maximum concurrent
+# calls" parameter relative to the output parameter)
+def setUpCreate(size, workDir):
+    arcpy.wmx.addFeatureClass(C_FEATURE_CLASS, size)
+    return ("CreateJobsBasedOnFC.py", [C_FEATURE_CLASS, "", C_JOB_TYPE, "", "", "", "", "", "", "", "", "", ""], True, 7)
+
+
+# Sets up the "delete" benchmark
+def setUpDelete(size, workDir):
+    arcpy.wmx.addJobs(size, C_JOB_TYPE)
+    return ("DeleteJobsMatchingCriteria.py", ["JTX_JOBS", "JOB_TYPE_NAME = '" + C_JOB_TYPE + "'", ""], True, 5)
+
+
+# Sets up the "notify" benchmark
+def setUpNotify(size, workDir):
+    arcpy.wmx.addJobs(size, C_JOB_TYPE)
+    arcpy.wmx.addQuery(C_QUERY_NAME, "STATUS <> 'Closed'")
+    return ("SendNotificationForJobsInQuery.py", [C_QUERY_NAME, C_NOTIFICATION_NAME, ""], True, 3)
+
+
+# Sets up the "upload" benchmark
+def setUpUpload(size, workDir):
+    for i in range(size):
+        f = open(os.path.join(workDir, "Workbook%06d.xml" % i), "w")
+        f.write("<?xml version=\"1.0\"?><TaskAssistantWorkbook id=\"%d\" />" % i)
+        f.close()
+    return ("UploadAllTaskAssistantWorkbooks.py", [workDir, "true", ""], False, 1)
+
+
+C_OPERATIONS = {
+    "create": setUpCreate,
+    "delete": setUpDelete,
+    "notify": setUpNotify,
+    "upload": setUpUpload,
+}
+
+
+# Runs one benchmark, returning (items processed, seconds, tool calls, peak
+# concurrent calls, error)
+def runBenchmark(operation, size, latencyMs, useJournal, maxWorkers, capacity, verbose):
+    arcpy.reset()
+    arcpy.setCallLatency(latencyMs / 1000.0)
+    arcpy.setDatabaseCapacity(capacity)
+    arcpy.setEchoMessages(verbose)
+    workDir = tempfile.mkdtemp(prefix="wmau_benchmark_")
+    try:
+        (scriptName, params, supportsJournal, workersOffset) = C_OPERATIONS[operation](size, workDir)
+
+        # The output parameter follows the inputs, and is followed by the
+        # optional parameters (the journal parameters first, if supported)
+        outputIndex = len(params)
+        optionalParams = [""] * workersOffset
+        if useJournal and supportsJournal:
+            optionalParams[0:2] = [os.path.join(workDir, "benchmark.journal"), "false"]
+        optionalParams[workersOffset - 1] = str(maxWorkers)
+        params = params + [""] + optionalParams
+        arcpy.setParameters(params)
+        script = loadScript(scriptName)
+
+        start = time.time()
+        script.main()
+        elapsed = time.time() - start
+
+        error = None
+        if arcpy.getScriptMessageCount(arcpy.C_SEVERITY_ERROR) > 0:
+            errors = [m[1] for m in arcpy.getScriptMessages() if m[0] == arcpy.C_SEVERITY_ERROR]
+            error = errors[-1] if len(errors) > 0 else "unknown error"
+
+        toolCalls = sum(arcpy.getCallCounts().values())
+        return (countOutputItems(outputIndex), elapsed, toolCalls, arcpy.getPeakCallsInProgress(), error)
+    finally:
+        shutil.rmtree(workDir, True)
+
+
+def main():
+    parser = optparse.OptionParser(add_help_option=False)
+    parser.add_option("-o", "--operations", dest="operations", default="create,delete,notify,upload")
+    parser.add_option("-s", "--sizes", dest="sizes", default="1000,10000,100000")
+    parser.add_option("-l", "--latency", dest="latency", default="0")
+    parser.add_option("-j", "--journal", dest="journal", action="store_true", default=False)
+    parser.add_option("-w", "--workers", dest="workers", default="1")
+    parser.add_option("-c", "--capacity", dest="capacity", default="0")
+    parser.add_option("-v", "--verbose", dest="verbose", action="store_true", default=False)
+    parser.add_option("-h", "--help", dest="help", action="store_true", default=False)
+    (options, args) = parser.parse_args()
+
+    if options.help or len(args) > 0:
+        printUsage()
+        return 1
+
+    try:
+        operations = [o.strip().lower() for o in options.operations.split(",")]
+        sizes = [int(s) for s in options.sizes.split(",")]
+        latencyMs = float(options.latency)
+        maxWorkers = int(options.workers)
+        capacity = int(options.capacity)
+    except ValueError:
+        printUsage()
+        return 1
+
+    for operation in operations:
+        if operation not in C_OPERATIONS:
+            print("Unknown operation: " + operation)
+            printUsage()
+            return 1
+
+    if sys.version_info[0] >= 3:
+        print("The scripts in ArcToolbox\\Scripts require Python 2.7")
+        return 1
+
+    print("%-8s %10s %10s %12s %12s %12s" % ("op", "items", "seconds", "items/sec", "calls/item", "peak calls"))
+    retVal = 0
+    for operation in operations:
+        for size in sizes:
+            (items, elapsed, toolCalls, peakCalls, error) = runBenchmark(
+                operation, size, latencyMs, options.journal, maxWorkers, capacity, options.verbose)
+            rate = items / elapsed if elapsed > 0 else 0.0
+            callsPerItem = float(toolCalls) / items if items > 0 else 0.0
+            print("%-8s %10d %10.2f %12.1f %12.2f %12d" % (operation, items, elapsed, rate, callsPerItem, peakCalls))
+            if error != None or items != size:
+                print("  FAILED: expected " + str(size) + " item(s); last error: " + str(error))
+                retVal = 1
+
+    return retVal
+
+
+# Entry point for the script
+if __name__ == "__main__":
+    sys.exit(main())
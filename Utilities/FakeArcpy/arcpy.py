@@ -0,0 +1,1314 @@
+# ---------------------------------------------------------------------------
+# arcpy.py
+#
+# A stand-in for the parts of the "arcpy" module used by the scripts in the
+# "ArcToolbox\Scripts" and "Documentation" directories.  Emulates messages,
+# progressors, parameters, licensing, feature layers, search cursors, and
+# the "*_WMXAdminUtils" tools over an in-memory Workflow Manager job and
+# configuration store, so that the scripts can be run (and timed) on a
+# machine without ArcGIS or a Workflow Manager database.  Tools may be called
+# from several threads at once; the store can be given a limited capacity,
+# so that it slows down (and eventually times out) when overloaded.
+#
+# To use it, put the directory containing this file at the front of the
+# module search path (ex: set PYTHONPATH) before importing a script.  The
+# in-memory store is reached through the "wmx" object; the functions in the
+# "Stand-in control functions" section below seed data, supply script
+# parameters, and set the simulated latency of each tool call.
+#
+# Does not require ArcGIS; runs with any Python 2.7 or later interpreter.
+# ---------------------------------------------------------------------------
+
+import collections
+import fnmatch
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+
+
+C_TOOLBOX_NAME = "Workflow Manager Administration Tools.tbx"
+C_JOBS_TABLE_NAME = "JTX_JOBS"
+C_JOBS_AOI_NAME = "JTX_JOBS_AOI"
+C_ENV_VAR_LATENCY_MS = "FAKE_ARCPY_LATENCY_MS"
+C_MAX_SCRIPT_MESSAGES = 10000
+
+# Once the calls in progress exceed the store's capacity by this factor, any
+# further calls fail with a lock timeout
+C_LOCK_TIMEOUT_LOAD = 3.0
+
+# Severity levels, as used by arcpy.GetSeverity() and friends
+C_SEVERITY_MESSAGE = 0
+C_SEVERITY_WARNING = 1
+C_SEVERITY_ERROR = 2
+
+
+# ---------------------------------------------------------------------------
+# Exceptions
+# ---------------------------------------------------------------------------
+
+# Raised when a GP tool fails, as with the real arcpy
+class ExecuteError(Exception):
+    pass
+
+
+# Raised when a GP tool succeeds with warnings (only if requested)
+class ExecuteWarning(Exception):
+    pass
+
+
+# ---------------------------------------------------------------------------
+# Geometry
+# ---------------------------------------------------------------------------
+
+class Point(object):
+    def __init__(self, X=0.0, Y=0.0):
+        self.X = float(X)
+        self.Y = float(Y)
+
+
+class Array(list):
+    def add(self, item):
+        self.append(item)
+
+
+class Extent(object):
+    def __init__(self, XMin=0.0, YMin=0.0, XMax=0.0, YMax=0.0):
+        self.XMin = float(XMin)
+        self.YMin = float(YMin)
+        self.XMax = float(XMax)
+        self.YMax = float(YMax)
+
+    @property
+    def width(self):
+        return self.XMax - self.XMin
+
+    @property
+    def height(self):
+        return self.YMax - self.YMin
+
+
+# A single-ring polygon; enough to stand in for a job's area of interest
+class Polygon(object):
+    def __init__(self, inputs, spatial_reference=None):
+        self.points = [Point(p.X, p.Y) for p in inputs]
+        self.spatialReference = spatial_reference
+        xs = [p.X for p in self.points]
+        ys = [p.Y for p in self.points]
+        self.extent = Extent(min(xs), min(ys), max(xs), max(ys))
+        self.type = "polygon"
+
+    @property
+    def pointCount(self):
+        return len(self.points)
+
+    @property
+    def WKT(self):
+        coords = ["%.10g %.10g" % (p.X, p.Y) for p in self.points + self.points[:1]]
+        return "POLYGON ((" + ", ".join(coords) + "))"
+
+    def equals(self, other):
+        return other != None and self.WKT == other.WKT
+
+
+# Helper to build a rectangular polygon
+def _rectangle(xMin, yMin, xMax, yMax):
+    return Polygon([Point(xMin, yMin), Point(xMin, yMax), Point(xMax, yMax), Point(xMax, yMin)])
+
+
+# ---------------------------------------------------------------------------
+# Where clauses
+#
+# Supports the subset of SQL used against JTX_JOBS and feature classes by the
+# scripts: comparisons (=, <>, !=, <, <=, >, >=), LIKE, IN, IS [NOT] NULL,
+# NOT, AND, OR, and parentheses.  Field names are case-insensitive.
+# ---------------------------------------------------------------------------
+
+_TOKEN_PATTERN = re.compile(
+    r"\s*(?:(?P<num>-?\d+(?:\.\d+)?)"
+    r"|(?P<str>'(?:[^']|'')*')"
+    r"|(?P<op><>|!=|<=|>=|=|<|>)"
+    r"|(?P<punct>[(),])"
+    r"|(?P<word>[A-Za-z_][A-Za-z0-9_.]*))")
+
+_KEYWORDS = set(["AND", "OR", "NOT", "IN", "IS", "NULL", "LIKE"])
+
+
+class _WhereClause(object):
+    def __init__(self, text):
+        self.text = text
+        self.tokens = self._tokenize(text)
+        self.pos = 0
+        self.equalsField = None
+        self.equalsValue = None
+        if len(self.tokens) == 0:
+            self.predicate = lambda row: True
+        else:
+            self.predicate = self._parseOr()
+            if self.pos != len(self.tokens):
+                raise ExecuteError("Invalid where clause: " + text)
+            # Remember simple "FIELD = value" clauses so that callers can
+            # use an index rather than scanning every row
+            if len(self.tokens) == 3 and self.tokens[1] == ("op", "="):
+                self.equalsField = self.tokens[0][1]
+                self.equalsValue = self.tokens[2][1]
+
+    def matches(self, row):
+        return self.predicate(row)
+
+    def _tokenize(self, text):
+        tokens = []
+        pos = 0
+        text = text or ""
+        while pos < len(text):
+            if text[pos:].strip() == "":
+                break
+            m = _TOKEN_PATTERN.match(text, pos)
+            if m == None or m.end() == pos:
+                raise ExecuteError("Invalid where clause: " + text)
+            pos = m.end()
+            if m.group("num") != None:
+                num = m.group("num")
+                tokens.append(("lit", float(num) if "." in num else int(num)))
+            elif m.group("str") != None:
+                tokens.append(("lit", m.group("str")[1:-1].replace("''", "'")))
+            elif m.group("op") != None:
+                tokens.append(("op", m.group("op")))
+            elif m.group("punct") != None:
+                tokens.append(("punct", m.group("punct")))
+            elif m.group("word").upper() in _KEYWORDS:
+                tokens.append(("kw", m.group("word").upper()))
+            else:
+                tokens.append(("field", m.group("word").upper()))
+        return tokens
+
+    def _peek(self):
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos]
+        return (None, None)
+
+    def _next(self, expectedKind=None, expectedValue=None):
+        token = self._peek()
+        if token[0] == None or (expectedKind != None and token[0] != expectedKind) or \
+                (expectedValue != None and token[1] != expectedValue):
+            raise ExecuteError("Invalid where clause: " + self.text)
+        self.pos += 1
+        return token
+
+    def _parseOr(self):
+        terms = [self._parseAnd()]
+        while self._peek() == ("kw", "OR"):
+            self._next()
+            terms.append(self._parseAnd())
+        if len(terms) == 1:
+            return terms[0]
+        return lambda row: any(t(row) for t in terms)
+
+    def _parseAnd(self):
+        terms = [self._parseNot()]
+        while self._peek() == ("kw", "AND"):
+            self._next()
+            terms.append(self._parseNot())
+        if len(terms) == 1:
+            return terms[0]
+        return lambda row: all(t(row) for t in terms)
+
+    def _parseNot(self):
+        if self._peek() == ("kw", "NOT"):
+            self._next()
+            inner = self._parseNot()
+            return lambda row: not inner(row)
+        if self._peek() == ("punct", "("):
+            self._next()
+            inner = self._parseOr()
+            self._next("punct", ")")
+            return inner
+        return self._parseComparison()
+
+    def _parseComparison(self):
+        field = self._next("field")[1]
+        token = self._next()
+        negate = False
+        if token == ("kw", "NOT"):
+            negate = True
+            token = self._next()
+
+        if token == ("kw", "IS"):
+            isNot = False
+            if self._peek() == ("kw", "NOT"):
+                self._next()
+                isNot = True
+            self._next("kw", "NULL")
+            return lambda row: (row.get(field) == None) != isNot
+        elif token == ("kw", "IN"):
+            self._next("punct", "(")
+            values = [self._next("lit")[1]]
+            while self._peek() == ("punct", ","):
+                self._next()
+                values.append(self._next("lit")[1])
+            self._next("punct", ")")
+            return lambda row: any(_compare(row.get(field), "=", v) for v in values) != negate
+        elif token == ("kw", "LIKE"):
+            pattern = self._next("lit")[1]
+            regex = re.compile("^" + re.escape(str(pattern)).replace("\\%", ".*").replace("%", ".*")
+                               .replace("\\_", ".").replace("_", ".") + "$", re.DOTALL)
+            return lambda row: (row.get(field) != None and regex.match(str(row.get(field))) != None) != negate
+        elif token[0] == "op" and not negate:
+            op = token[1]
+            value = self._next("lit")[1]
+            return lambda row: _compare(row.get(field), op, value)
+
+        raise ExecuteError("Invalid where clause: " + self.text)
+
+
+# Compares a field value against a literal, coercing numeric strings
+def _compare(fieldValue, op, literal):
+    if fieldValue == None:
+        return False
+    if isinstance(literal, (int, float)) and not isinstance(fieldValue, (int, float)):
+        try:
+            fieldValue = float(fieldValue)
+        except (TypeError, ValueError):
+            return False
+    elif not isinstance(literal, (int, float)) and isinstance(fieldValue, (int, float)):
+        fieldValue = str(fieldValue)
+
+    if op == "=":
+        return fieldValue == literal
+    elif op == "<>" or op == "!=":
+        return fieldValue != literal
+    elif op == "<":
+        return fieldValue < literal
+    elif op == "<=":
+        return fieldValue <= literal
+    elif op == ">":
+        return fieldValue > literal
+    return fieldValue >= literal
+
+
+_whereClauseCache = {}
+
+
+# Returns the parsed form of a where clause, reusing previously-parsed ones
+def _getWhereClause(text):
+    text = text or ""
+    clause = _whereClauseCache.get(text)
+    if clause == None:
+        clause = _WhereClause(text)
+        if len(_whereClauseCache) > 1000:
+            _whereClauseCache.clear()
+        _whereClauseCache[text] = clause
+    return clause
+
+
+# ---------------------------------------------------------------------------
+# In-memory Workflow Manager store
+# ---------------------------------------------------------------------------
+
+class _FeatureClass(object):
+    def __init__(self, name):
+        self.name = name
+        self.rows = []
+        self.rowsByOid = {}
+
+    def addRow(self, row):
+        self.rows.append(row)
+        self.rowsByOid[row["OBJECTID"]] = row
+
+    # Returns the object IDs of the rows matching a where clause, in order
+    def select(self, whereClause, candidateOids=None):
+        clause = _getWhereClause(whereClause)
+        if clause.equalsField == "OBJECTID":
+            row = self.rowsByOid.get(clause.equalsValue)
+            if row == None or (candidateOids != None and row["OBJECTID"] not in candidateOids):
+                return []
+            return [row["OBJECTID"]]
+
+        if candidateOids == None:
+            rows = self.rows
+        else:
+            rows = [self.rowsByOid[oid] for oid in candidateOids if oid in self.rowsByOid]
+        return [row["OBJECTID"] for row in rows if clause.matches(row)]
+
+
+# A read-only view of the jobs in the store as the JTX_JOBS table, so that the
+# table can be read with a search cursor
+class _JobsTable(object):
+    def __init__(self, store):
+        self.name = C_JOBS_TABLE_NAME
+        self.rowsByOid = store.jobs
+        self.store = store
+
+    def select(self, whereClause, candidateOids=None):
+        jobIds = self.store.findJobs(whereClause)
+        if candidateOids != None:
+            jobIds = [jobId for jobId in jobIds if jobId in candidateOids]
+        return jobIds
+
+
+class _FeatureLayer(object):
+    def __init__(self, name, featureClass, oids):
+        self.name = name
+        self.featureClass = featureClass
+        self.oids = oids
+        self.oidSet = set(oids)
+        self.selection = None
+
+    # Returns the object IDs that a tool or cursor would operate on
+    def activeOids(self):
+        if self.selection != None:
+            return self.selection
+        return self.oids
+
+
+class FakeWorkflowManager(object):
+    def __init__(self):
+        self.reset()
+
+    # Clears all jobs, configuration, data, and statistics
+    def reset(self):
+        self.jobs = {}
+        self.nextJobId = 1
+        self.queries = {}
+        self.notifications = []
+        self.comments = []
+        self.attachments = []
+        self.executions = []
+        self.taWorkbooks = {}
+        self.mapDocuments = {}
+        self.users = {}
+        self.groups = {}
+        self.dataWorkspaces = {}
+        self.featureClasses = {}
+        self.layers = {}
+        self.latency = {}
+        self.callCounts = {}
+        self.capacity = 0
+        self.callsInProgress = 0
+        self.peakCallsInProgress = 0
+
+    # Adds a job to the store, returning its ID
+    def addJob(self, jobType="Default Job", **fields):
+        jobId = self.nextJobId
+        self.nextJobId += 1
+        job = {
+            "JOB_ID": jobId,
+            "JOB_NAME": jobType + " " + str(jobId),
+            "JOB_TYPE_NAME": jobType,
+            "CREATED_BY": "wmxadmin",
+            "CREATED_DATE": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "ASSIGNED_TYPE": "UNASSIGNED",
+            "ASSIGNED_TO": None,
+            "STATUS": "Created",
+            "STAGE": 1,
+            "PRIORITY": 0,
+            "START_DATE": None,
+            "DUE_DATE": None,
+            "PARENT_JOB": None,
+            "DATA_WORKSPACE_ID": None,
+            "PARENT_VERSION": None,
+            "VERSION_NAME": None,
+            "MXD_NAME": None,
+            "AOI": None,
+        }
+        for (key, value) in fields.items():
+            job[key.upper()] = value
+        self.jobs[jobId] = job
+        return jobId
+
+    # Adds "count" jobs to the store, returning their IDs
+    def addJobs(self, count, jobType="Default Job", **fields):
+        return [self.addJob(jobType, **fields) for i in range(count)]
+
+    # Defines a saved job query, as used by ListJobsUsingQuery
+    def addQuery(self, queryName, whereClause):
+        _getWhereClause(whereClause)
+        self.queries[queryName] = whereClause
+
+    # Adds a user, optionally as a member of one or more groups
+    def addUser(self, userName, groups=None):
+        self.users[userName] = {"USER_NAME": userName}
+        for group in groups or []:
+            self.groups.setdefault(group, set()).add(userName)
+
+    # Adds a feature class.  "rows" is a list of attribute dictionaries; if
+    # omitted, "count" features are generated on a grid of 10x10 squares.
+    def addFeatureClass(self, name, count=0, rows=None):
+        fc = _FeatureClass(name)
+        if rows == None:
+            rows = []
+            for i in range(count):
+                x = (i % 1000) * 10.0
+                y = (i // 1000) * 10.0
+                rows.append({"SHAPE": _rectangle(x, y, x + 10.0, y + 10.0)})
+        for (i, attributes) in enumerate(rows):
+            row = {"OBJECTID": i + 1}
+            for (key, value) in attributes.items():
+                row[key.upper()] = value
+            fc.addRow(row)
+        self.featureClasses[name] = fc
+        return fc
+
+    # Returns the IDs of the jobs matching a where clause, in ID order
+    def findJobs(self, whereClause):
+        clause = _getWhereClause(whereClause)
+        if clause.equalsField == "JOB_ID":
+            if clause.equalsValue in self.jobs:
+                return [clause.equalsValue]
+            return []
+        return sorted([jobId for (jobId, job) in self.jobs.items() if clause.matches(job)])
+
+    # Returns the job with the given ID, or raises an ExecuteError
+    def getJob(self, jobId):
+        try:
+            job = self.jobs.get(int(jobId))
+        except (TypeError, ValueError):
+            job = None
+        if job == None:
+            raise ExecuteError("Job '" + str(jobId) + "' does not exist")
+        return job
+
+
+wmx = FakeWorkflowManager()
+
+
+# ---------------------------------------------------------------------------
+# Stand-in control functions (not part of the real arcpy API)
+# ---------------------------------------------------------------------------
+
+_parameters = None
+_outputParameters = {}
+_scriptMessages = collections.deque(maxlen=C_MAX_SCRIPT_MESSAGES)
+_scriptMessageCounts = [0, 0, 0]
+_toolMessages = []
+_echoMessages = False
+_progressor = {"type": None, "label": "", "min": 0, "max": 0, "position": 0}
+_installDir = None
+
+# Held while a tool runs, so that tools called from different threads don't
+# interfere with each other (or with the messages of the last tool run)
+_toolLock = threading.RLock()
+_callCountLock = threading.Lock()
+
+
+# Clears the store, parameters, messages, and progressor
+def reset():
+    global _parameters
+    wmx.reset()
+    _parameters = None
+    _outputParameters.clear()
+    _scriptMessages.clear()
+    for i in range(len(_scriptMessageCounts)):
+        _scriptMessageCounts[i] = 0
+    del _toolMessages[:]
+    ResetProgressor()
+
+
+# Supplies the values returned by GetParameterAsText; when not set, the
+# command-line arguments are used, as with the real arcpy
+def setParameters(values):
+    global _parameters
+    _parameters = [str(v) if v != None else "" for v in values]
+    _outputParameters.clear()
+
+
+# Returns the value set for a parameter with SetParameterAsText
+def getOutputParameter(index):
+    return _outputParameters.get(index)
+
+
+# Sets the simulated latency (in seconds) of each call to a GP tool, or to
+# the named tool only (ex: "CreateJob_WMXAdminUtils")
+def setCallLatency(seconds, toolName=None):
+    wmx.latency[toolName] = float(seconds)
+
+
+# Sets the number of tool calls that the store can handle at once without
+# slowing down; beyond that, each call's latency grows in proportion to the
+# number of calls in progress, and calls fail with a lock timeout once there
+# are more than C_LOCK_TIMEOUT_LOAD times as many.  0 means no limit.
+def setDatabaseCapacity(calls):
+    wmx.capacity = int(calls)
+
+
+# Returns a dictionary of GP tool names and the number of times each was run
+def getCallCounts():
+    return dict(wmx.callCounts)
+
+
+# Returns the largest number of tool calls that were in progress at once
+def getPeakCallsInProgress():
+    return wmx.peakCallsInProgress
+
+
+# Returns the most recent script messages as (severity, text) tuples
+def getScriptMessages():
+    return list(_scriptMessages)
+
+
+# Returns the number of script messages at the given severity
+def getScriptMessageCount(severity):
+    return _scriptMessageCounts[severity]
+
+
+# Determines whether script messages are also printed to stdout
+def setEchoMessages(echo):
+    global _echoMessages
+    _echoMessages = echo
+
+
+# Returns the current state of the progressor
+def getProgressor():
+    return dict(_progressor)
+
+
+def _addScriptMessage(severity, msg):
+    msg = str(msg)
+    _scriptMessages.append((severity, msg))
+    _scriptMessageCounts[severity] += 1
+    if _echoMessages:
+        prefix = ["", "WARNING: ", "ERROR: "][severity]
+        print(prefix + msg)
+
+
+# ---------------------------------------------------------------------------
+# Messages
+# ---------------------------------------------------------------------------
+
+def AddMessage(message):
+    _addScriptMessage(C_SEVERITY_MESSAGE, message)
+
+
+def AddWarning(message):
+    _addScriptMessage(C_SEVERITY_WARNING, message)
+
+
+def AddError(message):
+    _addScriptMessage(C_SEVERITY_ERROR, message)
+
+
+def AddReturnMessage(index):
+    (severity, msg) = _toolMessages[index]
+    _addScriptMessage(severity, msg)
+
+
+def GetMessageCount():
+    return len(_toolMessages)
+
+
+def GetMessage(index):
+    return _toolMessages[index][1]
+
+
+def GetSeverity(index):
+    return _toolMessages[index][0]
+
+
+def GetMaxSeverity():
+    if len(_toolMessages) == 0:
+        return C_SEVERITY_MESSAGE
+    return max([m[0] for m in _toolMessages])
+
+
+def GetMessages(severity=0):
+    return "\n".join([m[1] for m in _toolMessages if m[0] >= severity])
+
+
+# ---------------------------------------------------------------------------
+# Progressors
+# ---------------------------------------------------------------------------
+
+def SetProgressor(type, message="", min_range=0, max_range=100, step_value=1):
+    _progressor["type"] = type
+    _progressor["label"] = message
+    _progressor["min"] = min_range
+    _progressor["max"] = max_range
+    _progressor["position"] = min_range
+
+
+def SetProgressorLabel(label):
+    _progressor["label"] = label
+
+
+def SetProgressorPosition(position=None):
+    if position == None:
+        _progressor["position"] += 1
+    else:
+        _progressor["position"] = position
+
+
+def ResetProgressor():
+    _progressor["type"] = None
+    _progressor["label"] = ""
+    _progressor["min"] = 0
+    _progressor["max"] = 0
+    _progressor["position"] = 0
+
+
+# ---------------------------------------------------------------------------
+# Parameters
+# ---------------------------------------------------------------------------
+
+def _getParameterList():
+    if _parameters != None:
+        return _parameters
+    return sys.argv[1:]
+
+
+def GetArgumentCount():
+    return len(_getParameterList())
+
+
+# Like the real arcpy, raises an error for a parameter the tool doesn't define
+def GetParameterAsText(index):
+    params = _getParameterList()
+    if index < len(params):
+        return params[index]
+    raise RuntimeError("Object: Error in getting parameter as text")
+
+
+def GetParameter(index):
+    return GetParameterAsText(index)
+
+
+def SetParameterAsText(index, text):
+    _outputParameters[index] = text
+
+
+def SetParameter(index, value):
+    _outputParameters[index] = value
+
+
+# ---------------------------------------------------------------------------
+# Installation and licensing
+# ---------------------------------------------------------------------------
+
+class _Env(object):
+    def __init__(self):
+        self.workspace = None
+        self.scratchWorkspace = None
+        self.overwriteOutput = False
+
+
+env = _Env()
+
+
+# Returns a directory laid out like an ArcGIS install that contains a
+# (placeholder) copy of the Workflow Manager Administration Tools toolbox
+def _getInstallDir():
+    global _installDir
+    if _installDir == None:
+        installDir = os.path.join(tempfile.gettempdir(), "fake_arcpy_install")
+        toolboxDir = os.path.join(installDir, "ArcToolbox", "Toolboxes")
+        if not os.path.isdir(toolboxDir):
+            os.makedirs(toolboxDir)
+        tbx = os.path.join(toolboxDir, C_TOOLBOX_NAME)
+        if not os.path.exists(tbx):
+            open(tbx, "w").close()
+        _installDir = installDir
+    return _installDir
+
+
+def ListInstallations():
+    return ["desktop"]
+
+
+def GetInstallInfo(product=None):
+    return {"InstallDir": _getInstallDir() + os.sep, "ProductName": "Desktop", "Version": "10.2"}
+
+
+def SetProduct(product):
+    return "CheckedOut"
+
+
+def CheckProduct(product):
+    return "Available"
+
+
+def CheckExtension(extension):
+    return "Available"
+
+
+def CheckOutExtension(extension):
+    return "CheckedOut"
+
+
+def CheckInExtension(extension):
+    return "CheckedIn"
+
+
+# ---------------------------------------------------------------------------
+# Tool execution
+# ---------------------------------------------------------------------------
+
+class Result(object):
+    def __init__(self, toolName, outputs):
+        self.toolName = toolName
+        self.outputs = outputs
+        self.messages = list(_toolMessages)
+        self.status = 4
+
+    @property
+    def outputCount(self):
+        return len(self.outputs)
+
+    @property
+    def messageCount(self):
+        return len(self.messages)
+
+    def getOutput(self, index):
+        return self.outputs[index]
+
+    def getMessages(self, severity=0):
+        return "\n".join([m[1] for m in self.messages if m[0] >= severity])
+
+    def getMessageCount(self):
+        return len(self.messages)
+
+    def getMessage(self, index):
+        return self.messages[index][1]
+
+    def getSeverity(self, index):
+        return self.messages[index][0]
+
+
+# Runs a tool function the way the geoprocessor would: waits for the
+# configured latency, records the tool's messages, and raises ExecuteError
+# if the tool fails
+def _runTool(toolName, toolFunction, args, kwargs):
+    _callCountLock.acquire()
+    wmx.callCounts[toolName] = wmx.callCounts.get(toolName, 0) + 1
+    wmx.callsInProgress += 1
+    callsInProgress = wmx.callsInProgress
+    wmx.peakCallsInProgress = max(wmx.peakCallsInProgress, callsInProgress)
+    _callCountLock.release()
+
+    try:
+        # An overloaded store slows down, and eventually times out
+        latency = wmx.latency.get(toolName, wmx.latency.get(None, 0.0))
+        if wmx.capacity > 0:
+            if callsInProgress > wmx.capacity * C_LOCK_TIMEOUT_LOAD:
+                raise ExecuteError("Underlying DBMS error [Lock request time out period exceeded.]\n" +
+                                   "Failed to execute (" + toolName.split("_")[0] + ").")
+            latency *= max(1.0, float(callsInProgress) / wmx.capacity)
+        if latency > 0:
+            time.sleep(latency)
+
+        _toolLock.acquire()
+        try:
+            return _runToolFunction(toolName, toolFunction, args, kwargs)
+        finally:
+            _toolLock.release()
+
+    finally:
+        _callCountLock.acquire()
+        wmx.callsInProgress -= 1
+        _callCountLock.release()
+
+
+def _runToolFunction(toolName, toolFunction, args, kwargs):
+    del _toolMessages[:]
+    _toolMessages.append((C_SEVERITY_MESSAGE, "Executing: " + toolName))
+    try:
+        outputs = toolFunction(*args, **kwargs)
+    except ExecuteError as ex:
+        _toolMessages.append((C_SEVERITY_ERROR, str(ex)))
+        _toolMessages.append((C_SEVERITY_ERROR, "Failed to execute (" + toolName.split("_")[0] + ")."))
+        raise ExecuteError("\n".join([m[1] for m in _toolMessages if m[0] == C_SEVERITY_ERROR]))
+    _toolMessages.append((C_SEVERITY_MESSAGE, "Succeeded."))
+
+    if outputs == None:
+        outputs = []
+    return Result(toolName, [o if o == None else str(o) for o in outputs])
+
+
+# Wraps a tool function so that it can be called as "<Name>_<alias>"
+def _makeTool(toolName, toolFunction):
+    def tool(*args, **kwargs):
+        return _runTool(toolName, toolFunction, args, kwargs)
+    tool.__name__ = toolName
+    return tool
+
+
+def _toolMessage(msg):
+    _toolMessages.append((C_SEVERITY_MESSAGE, msg))
+
+
+def _isTrue(value, trueOption):
+    return str(value).lower() in ("true", "1", trueOption.lower())
+
+
+# ---------------------------------------------------------------------------
+# Data management tools
+# ---------------------------------------------------------------------------
+
+# Resolves a feature class or layer name to (featureClass, layer)
+def _getDataset(name):
+    name = str(name)
+    if name in wmx.layers:
+        layer = wmx.layers[name]
+        return (layer.featureClass, layer)
+    if name in wmx.featureClasses:
+        return (wmx.featureClasses[name], None)
+    baseName = os.path.basename(name)
+    if baseName in wmx.featureClasses:
+        return (wmx.featureClasses[baseName], None)
+    if baseName.upper().split(".")[-1] == C_JOBS_TABLE_NAME:
+        return (_JobsTable(wmx), None)
+    if baseName.upper().split(".")[-1] == C_JOBS_AOI_NAME:
+        return (_jobAoiFeatureClass(), None)
+    raise ExecuteError("Dataset " + name + " does not exist or is not supported")
+
+
+# Builds a feature class containing the AOI of each job that has one, as in
+# the JTX_JOBS_AOI feature class
+def _jobAoiFeatureClass():
+    fc = _FeatureClass(C_JOBS_AOI_NAME)
+    for jobId in sorted(wmx.jobs.keys()):
+        aoi = wmx.jobs[jobId].get("AOI")
+        if aoi != None:
+            fc.addRow({"OBJECTID": jobId, "JOB_ID": jobId, "SHAPE": aoi})
+    return fc
+
+
+def _makeFeatureLayer(in_features, out_layer, where_clause=None, workspace=None, field_info=None):
+    (fc, parentLayer) = _getDataset(in_features)
+    if str(out_layer) in wmx.layers and not env.overwriteOutput:
+        raise ExecuteError("Output " + str(out_layer) + " already exists")
+    candidates = None
+    if parentLayer != None:
+        candidates = parentLayer.activeOids()
+    wmx.layers[str(out_layer)] = _FeatureLayer(str(out_layer), fc, fc.select(where_clause, candidates))
+    return [out_layer]
+
+
+def _selectLayerByAttribute(in_layer_or_view, selection_type="NEW_SELECTION", where_clause=None):
+    layer = wmx.layers.get(str(in_layer_or_view))
+    if layer == None:
+        raise ExecuteError("Layer " + str(in_layer_or_view) + " does not exist")
+
+    selectionType = str(selection_type).upper()
+    current = layer.selection or []
+    if selectionType == "CLEAR_SELECTION":
+        layer.selection = None
+    elif selectionType == "NEW_SELECTION":
+        layer.selection = layer.featureClass.select(where_clause, layer.oidSet)
+    elif selectionType == "ADD_TO_SELECTION":
+        added = set(current) | set(layer.featureClass.select(where_clause, layer.oidSet))
+        layer.selection = [oid for oid in layer.oids if oid in added]
+    elif selectionType == "SUBSET_SELECTION":
+        layer.selection = layer.featureClass.select(where_clause, set(current))
+    elif selectionType == "REMOVE_FROM_SELECTION":
+        removed = set(layer.featureClass.select(where_clause, set(current)))
+        layer.selection = [oid for oid in current if oid not in removed]
+    elif selectionType == "SWITCH_SELECTION":
+        selected = set(current)
+        layer.selection = [oid for oid in layer.oids if oid not in selected]
+    else:
+        raise ExecuteError("Invalid selection type: " + str(selection_type))
+    return [in_layer_or_view]
+
+
+def _getCount(in_rows):
+    (fc, layer) = _getDataset(in_rows)
+    if layer != None:
+        return [len(layer.activeOids())]
+    return [len(fc.rows)]
+
+
+def _delete(in_data, data_type=None):
+    name = str(in_data)
+    if name in wmx.layers:
+        del wmx.layers[name]
+    elif name in wmx.featureClasses:
+        del wmx.featureClasses[name]
+    else:
+        raise ExecuteError("Dataset " + name + " does not exist or is not supported")
+    return ["true"]
+
+
+MakeFeatureLayer_management = _makeTool("MakeFeatureLayer_management", _makeFeatureLayer)
+SelectLayerByAttribute_management = _makeTool("SelectLayerByAttribute_management", _selectLayerByAttribute)
+GetCount_management = _makeTool("GetCount_management", _getCount)
+Delete_management = _makeTool("Delete_management", _delete)
+
+
+def Exists(dataset):
+    return str(dataset) in wmx.layers or str(dataset) in wmx.featureClasses
+
+
+class _Describe(object):
+    def __init__(self, name, isTable):
+        self.name = name
+        self.dataType = "Table" if isTable else "FeatureClass"
+        self.shapeFieldName = None if isTable else "SHAPE"
+        self.spatialReference = None
+
+
+def Describe(value):
+    (fc, layer) = _getDataset(value)
+    return _Describe(str(value), isinstance(fc, _JobsTable))
+
+
+def ListFeatureClasses(wild_card=None, feature_type=None, feature_dataset=None):
+    names = sorted(wmx.featureClasses.keys())
+    if wild_card:
+        names = [n for n in names if fnmatch.fnmatch(n.lower(), wild_card.lower())]
+    return names
+
+
+# The fields of the JTX_JOBS table, as reported by ListFields()
+_JOB_FIELD_TYPES = [
+    ("JOB_ID", "Integer"), ("JOB_NAME", "String"), ("JOB_TYPE_NAME", "String"),
+    ("CREATED_BY", "String"), ("CREATED_DATE", "Date"), ("ASSIGNED_TYPE", "String"),
+    ("ASSIGNED_TO", "String"), ("STATUS", "String"), ("STAGE", "SmallInteger"),
+    ("PRIORITY", "Integer"), ("START_DATE", "Date"), ("DUE_DATE", "Date"),
+    ("PARENT_JOB", "Integer"), ("DATA_WORKSPACE_ID", "String"),
+    ("PARENT_VERSION", "String"), ("VERSION_NAME", "String"), ("MXD_NAME", "String"),
+    ("AOI", "Geometry")]
+
+
+class Field(object):
+    def __init__(self, name, type):
+        self.name = name
+        self.type = type
+
+
+def ListFields(dataset, wild_card=None, field_type=None):
+    (fc, layer) = _getDataset(dataset)
+    if isinstance(fc, _JobsTable):
+        fields = [Field(name, type) for (name, type) in _JOB_FIELD_TYPES]
+    else:
+        names = set(["OBJECTID"])
+        for row in fc.rows:
+            names.update(row.keys())
+        fields = []
+        for name in sorted(names):
+            if name == "OBJECTID":
+                fields.append(Field(name, "OID"))
+            elif name == "SHAPE":
+                fields.append(Field(name, "Geometry"))
+            else:
+                fields.append(Field(name, "String"))
+    if wild_card:
+        fields = [f for f in fields if fnmatch.fnmatch(f.name.lower(), wild_card.lower())]
+    return fields
+
+
+# ---------------------------------------------------------------------------
+# Cursors
+# ---------------------------------------------------------------------------
+
+class Row(object):
+    def __init__(self, values):
+        self._values = values
+
+    def getValue(self, field_name):
+        return self._values.get(field_name.upper())
+
+    def isNull(self, field_name):
+        return self._values.get(field_name.upper()) == None
+
+
+class _SearchCursor(object):
+    def __init__(self, dataset, where_clause=None):
+        (fc, layer) = _getDataset(dataset)
+        candidates = None
+        if layer != None:
+            candidates = set(layer.activeOids())
+        self._rows = [fc.rowsByOid[oid] for oid in fc.select(where_clause, candidates)]
+        self._index = 0
+
+    def __iter__(self):
+        return self
+
+    def next(self):
+        if self._index >= len(self._rows):
+            raise StopIteration
+        row = Row(self._rows[self._index])
+        self._index += 1
+        return row
+
+    __next__ = next
+
+    def reset(self):
+        self._index = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, tb):
+        return False
+
+
+def SearchCursor(dataset, where_clause=None, spatial_reference=None, fields=None, sort_fields=None):
+    return _SearchCursor(dataset, where_clause)
+
+
+# ---------------------------------------------------------------------------
+# Workflow Manager Administration Utilities
+# ---------------------------------------------------------------------------
+
+def _createJob(jobType, owner="", assigneeType="", assignee="", aoiLayer="",
+               startDate="", dueDate="", priority="", parentJobId="",
+               dataWorkspace="", parentVersion="", wmxDbAlias=""):
+    if not jobType:
+        raise ExecuteError("A job type must be specified")
+
+    aoi = None
+    if aoiLayer:
+        (fc, layer) = _getDataset(aoiLayer)
+        oids = layer.activeOids() if layer != None else [r["OBJECTID"] for r in fc.rows]
+        if len(oids) != 1:
+            raise ExecuteError("Expected exactly one selected feature in '" + str(aoiLayer) +
+                               "'; found " + str(len(oids)))
+        aoi = fc.rowsByOid[oids[0]].get("SHAPE")
+
+    if parentJobId:
+        wmx.getJob(parentJobId)
+
+    fields = {"AOI": aoi}
+    if owner:
+        fields["CREATED_BY"] = owner
+    if assigneeType:
+        fields["ASSIGNED_TYPE"] = assigneeType
+        fields["ASSIGNED_TO"] = assignee or None
+    if startDate:
+        fields["START_DATE"] = startDate
+    if dueDate:
+        fields["DUE_DATE"] = dueDate
+    if priority:
+        fields["PRIORITY"] = int(priority)
+    if parentJobId:
+        fields["PARENT_JOB"] = int(parentJobId)
+    if dataWorkspace:
+        fields["DATA_WORKSPACE_ID"] = dataWorkspace
+    if parentVersion:
+        fields["PARENT_VERSION"] = parentVersion
+
+    jobId = wmx.addJob(str(jobType), **fields)
+    _toolMessage("Created job " + str(jobId))
+    return [jobId]
+
+
+def _deleteJob(jobId, wmxDbAlias=""):
+    job = wmx.getJob(jobId)
+    del wmx.jobs[job["JOB_ID"]]
+    return [job["JOB_ID"]]
+
+
+def _listJobs(jobsTable="JTX_JOBS", sqlQuery="", wmxDbAlias=""):
+    return [";".join([str(j) for j in wmx.findJobs(sqlQuery)])]
+
+
+def _listJobsUsingQuery(queryName, wmxDbAlias="", summarizeMessages="", jobIdTable="", jobIdFile=""):
+    if queryName not in wmx.queries:
+        raise ExecuteError("Query '" + str(queryName) + "' does not exist")
+    jobIds = [str(j) for j in wmx.findJobs(wmx.queries[queryName])]
+
+    # As with the real tool, the job ID list is left empty if the IDs are
+    # written elsewhere
+    if jobIdFile:
+        f = open(str(jobIdFile), "w")
+        try:
+            for jobId in jobIds:
+                f.write(jobId + "\n")
+        finally:
+            f.close()
+    if jobIdTable or jobIdFile:
+        return [""]
+    return [";".join(jobIds)]
+
+
+def _sendJobNotification(jobId, notificationName, wmxDbAlias=""):
+    job = wmx.getJob(jobId)
+    wmx.notifications.append((job["JOB_ID"], str(notificationName)))
+    return [job["JOB_ID"]]
+
+
+def _assignJob(jobId, assigneeType="UNASSIGNED", assignee="", wmxDbAlias=""):
+    job = wmx.getJob(jobId)
+    if job["STATUS"] == "Closed":
+        raise ExecuteError("Job " + str(jobId) + " is closed")
+    job["ASSIGNED_TYPE"] = assigneeType
+    job["ASSIGNED_TO"] = assignee or None
+    return [job["JOB_ID"]]
+
+
+def _closeJob(jobId, wmxDbAlias=""):
+    job = wmx.getJob(jobId)
+    if job["STATUS"] == "Closed":
+        raise ExecuteError("Job " + str(jobId) + " is already closed")
+    job["STATUS"] = "Closed"
+    return [job["JOB_ID"]]
+
+
+def _addCommentToJob(jobId, comment, wmxDbAlias=""):
+    job = wmx.getJob(jobId)
+    wmx.comments.append((job["JOB_ID"], str(comment)))
+    return [job["JOB_ID"]]
+
+
+def _addAttachmentToJob(jobId, attachment, attachmentType="EMBEDDED", wmxDbAlias=""):
+    job = wmx.getJob(jobId)
+    if not os.path.isfile(str(attachment)):
+        raise ExecuteError("File '" + str(attachment) + "' does not exist")
+    wmx.attachments.append((job["JOB_ID"], str(attachment), str(attachmentType)))
+    return [job["JOB_ID"]]
+
+
+def _executeJob(jobId, wmxDbAlias=""):
+    job = wmx.getJob(jobId)
+    wmx.executions.append(job["JOB_ID"])
+    job["STAGE"] = job.get("STAGE", 1) + 1
+    return [job["JOB_ID"]]
+
+
+# Reads a file that is being uploaded to the database
+def _readUpload(path):
+    if not os.path.isfile(str(path)):
+        raise ExecuteError("File '" + str(path) + "' does not exist")
+    f = open(str(path), "rb")
+    try:
+        return f.read()
+    finally:
+        f.close()
+
+
+# Writes a file that is being downloaded from the database
+def _writeDownload(path, contents):
+    f = open(str(path), "wb")
+    try:
+        f.write(contents)
+    finally:
+        f.close()
+
+
+def _uploadTaskAssistantWorkbook(xmlFile, targetName, overwrite="NO_OVERWRITE", wmxDbAlias=""):
+    if targetName in wmx.taWorkbooks and not _isTrue(overwrite, "OVERWRITE"):
+        raise ExecuteError("Task Assistant workbook '" + str(targetName) + "' already exists")
+    wmx.taWorkbooks[str(targetName)] = _readUpload(xmlFile)
+    return [targetName]
+
+
+def _downloadTaskAssistantWorkbook(sourceName, xmlFile, wmxDbAlias=""):
+    if sourceName not in wmx.taWorkbooks:
+        raise ExecuteError("Task Assistant workbook '" + str(sourceName) + "' does not exist")
+    _writeDownload(xmlFile, wmx.taWorkbooks[sourceName])
+    return [xmlFile]
+
+
+def _deleteTaskAssistantWorkbook(sourceName, wmxDbAlias=""):
+    if sourceName not in wmx.taWorkbooks:
+        raise ExecuteError("Task Assistant workbook '" + str(sourceName) + "' does not exist")
+    del wmx.taWorkbooks[sourceName]
+    return [sourceName]
+
+
+def _listAllTaskAssistantWorkbooks(wmxDbAlias=""):
+    return [";".join(sorted(wmx.taWorkbooks.keys()))]
+
+
+def _uploadMapDocument(mxdFile, targetName, targetCategory="", description="",
+                       overwrite="NO_OVERWRITE", wmxDbAlias=""):
+    if targetName in wmx.mapDocuments and not _isTrue(overwrite, "OVERWRITE"):
+        raise ExecuteError("Map document '" + str(targetName) + "' already exists")
+    wmx.mapDocuments[str(targetName)] = _readUpload(mxdFile)
+    return [targetName]
+
+
+def _downloadMapDocument(sourceName, mxdFile, wmxDbAlias=""):
+    if sourceName not in wmx.mapDocuments:
+        raise ExecuteError("Map document '" + str(sourceName) + "' does not exist")
+    _writeDownload(mxdFile, wmx.mapDocuments[sourceName])
+    return [mxdFile]
+
+
+def _deleteMapDocument(sourceName, wmxDbAlias=""):
+    if sourceName not in wmx.mapDocuments:
+        raise ExecuteError("Map document '" + str(sourceName) + "' does not exist")
+    del wmx.mapDocuments[sourceName]
+    return [sourceName]
+
+
+def _listAllMapDocuments(wmxDbAlias=""):
+    return [";".join(sorted(wmx.mapDocuments.keys()))]
+
+
+def _listUsers(groupName="", wmxDbAlias=""):
+    if groupName:
+        users = wmx.groups.get(groupName, set())
+    else:
+        users = wmx.users.keys()
+    return [";".join(sorted(users))]
+
+
+def _listAllDataWorkspaces(wmxDbAlias=""):
+    return [";".join(sorted(wmx.dataWorkspaces.keys()))]
+
+
+def _backupWorkflowManagerDatabase(jxlFile, prettyPrint="DEFAULT_FORMATTING", wmxDbAlias=""):
+    _writeDownload(jxlFile, b"<?xml version=\"1.0\" encoding=\"utf-8\"?><JTXWorkspace />")
+    return [jxlFile]
+
+
+# Placeholder for the tools that have no in-memory equivalent; records
+# the call and succeeds
+def _noOp(*args, **kwargs):
+    return []
+
+
+_WMX_TOOLS = {
+    "AddAreaEvaluatorToSN": _noOp,
+    "AddAttachmentToJob": _addAttachmentToJob,
+    "AddCommentToJob": _addCommentToJob,
+    "AddDatasetConditionToSN": _noOp,
+    "AssignJob": _assignJob,
+    "BackupWorkflowManagerDatabase": _backupWorkflowManagerDatabase,
+    "CloseJob": _closeJob,
+    "CreateDataWorkspacesFromExcel": _noOp,
+    "CreateJob": _createJob,
+    "CreateSpatialNotificationWithEmailNotifier": _noOp,
+    "DeleteDataWorkspace": _noOp,
+    "DeleteJob": _deleteJob,
+    "DeleteMapDocument": _deleteMapDocument,
+    "DeleteOrphanedTypes": _noOp,
+    "DeleteTaskAssistantWorkbook": _deleteTaskAssistantWorkbook,
+    "DownloadMapDocument": _downloadMapDocument,
+    "DownloadTaskAssistantWorkbook": _downloadTaskAssistantWorkbook,
+    "ExecuteJob": _executeJob,
+    "ExportDataWorkspacesToExcel": _noOp,
+    "ImportActiveDirectoryConfiguration": _noOp,
+    "ListAllDataWorkspaces": _listAllDataWorkspaces,
+    "ListAllMapDocuments": _listAllMapDocuments,
+    "ListAllTaskAssistantWorkbooks": _listAllTaskAssistantWorkbooks,
+    "ListJobs": _listJobs,
+    "ListJobsUsingQuery": _listJobsUsingQuery,
+    "ListUsers": _listUsers,
+    "ModifyAdministratorAccess": _noOp,
+    "ModifyPrivilegeAssignment": _noOp,
+    "ReportPossibleErrors": _noOp,
+    "SendJobNotification": _sendJobNotification,
+    "SetDefaultWorkspaceForJobType": _noOp,
+    "UploadMapDocument": _uploadMapDocument,
+    "UploadTaskAssistantWorkbook": _uploadTaskAssistantWorkbook,
+}
+
+
+# Makes the Workflow Manager Administration Utilities available as
+# "<ToolName>_<alias>" functions of this module
+def ImportToolbox(input_file, module_name=None):
+    if not os.path.exists(str(input_file)):
+        raise IOError("Toolbox '" + str(input_file) + "' does not exist")
+    alias = module_name or "WMXAdminUtils"
+    module = sys.modules[__name__]
+    for (name, function) in _WMX_TOOLS.items():
+        setattr(module, name + "_" + alias, _makeTool(name + "_" + alias, function))
+    return module
+
+
+# Apply any latency requested through the environment
+if os.environ.get(C_ENV_VAR_LATENCY_MS):
+    setCallLatency(float(os.environ[C_ENV_VAR_LATENCY_MS]) / 1000.0)
@@ -0,0 +1,199 @@
+# ---------------------------------------------------------------------------
+# MakeDirectoryFixture.py
+#
+# Writes a file of users and groups that the "Import Active Directory
+# Configuration" tool can read in place of Active Directory (see its
+# "Directory file" parameter).  The file contains a group of users and a
+# group of groups, named "WMX Users" and "WMX Groups" by default, along with
+# the requested number of users and groups; each group is given a random
+# selection of the users as members.
+#
+# Running the tool against one fixture and then against a second one, made
+# with the same seed and a non-zero change percentage, measures how long an
+# incremental synchronization takes when only some of the users have
+# changed.
+#
+# The file is written as LDIF if its extension is ".ldf" or ".ldif", and as
+# JSON otherwise.
+# ---------------------------------------------------------------------------
+
+import base64
+import json
+import optparse
+import os
+import random
+import sys
+
+
+C_DN_SUFFIX = "OU=Workflow Manager,DC=example,DC=com"
+
+
+# Function that prints an explanation of how to use this script
+def printUsage():
+    print("""
+Writes an LDIF or JSON file of users and groups for the "Import Active
+Directory Configuration" tool to read in place of Active Directory.
+
+Usage:
+  MakeDirectoryFixture.py [options] <output file>
+
+Options:
+  -u N, --users=N           Number of users (default: 50000)
+  -g N, --groups=N          Number of groups (default: 50)
+  -m N, --members=N         Number of users in each group (default: 500)
+  -c PCT, --changes=PCT     Percentage of the users to change (removing
+                            some, changing the e-mail addresses of others,
+                            and adding others to groups) relative to a file
+                            made with the same seed and no changes
+                            (default: 0)
+  -s N, --seed=N            Random number seed (default: 1)
+  --user-group=NAME         Name of the group of users (default: WMX Users)
+  --group-group=NAME        Name of the group of groups (default: WMX Groups)
+""")
+
+
+# Builds the list of users, as dictionaries, and the members of each group
+def makeDirectory(numUsers, numGroups, numMembers, changePct, seed):
+    rand = random.Random(seed)
+    users = []
+    for i in range(numUsers):
+        users.append({
+            "userName": "user%06d" % i,
+            "firstName": "First%d" % i,
+            "lastName": "Last%d" % i,
+            "fullName": "First%d Last%d" % (i, i),
+            "email": "user%06d@example.com" % i,
+        })
+
+    groups = []
+    for i in range(numGroups):
+        members = rand.sample(range(numUsers), min(numMembers, numUsers))
+        groups.append(("Group%04d" % i, sorted(members)))
+
+    # Apply the changes with a separate generator, so that the unchanged
+    # fixture and the changed one start out identical
+    if changePct > 0:
+        changeRand = random.Random(seed + 1)
+        numChanged = int(numUsers * changePct / 100.0)
+        changed = changeRand.sample(range(numUsers), numChanged)
+        removed = set()
+        for n, i in enumerate(changed):
+            if n % 3 == 0:
+                removed.add(i)
+            elif n % 3 == 1:
+                users[i]["email"] = "changed.user%06d@example.com" % i
+            elif len(groups) > 0:
+                (name, members) = groups[changeRand.randrange(len(groups))]
+                if i not in members:
+                    members.append(i)
+        users = [u for (i, u) in enumerate(users) if i not in removed]
+        groups = [(name, [m for m in members if m not in removed]) for (name, members) in groups]
+
+    return (users, groups)
+
+
+# Writes a single LDIF attribute, base64-encoding the value if needed
+def ldifLine(name, value):
+    if len(value) == 0 or value[0] in " :<" or any(ord(c) < 32 or ord(c) > 126 for c in value):
+        return "%s:: %s\n" % (name, base64.b64encode(value.encode("utf-8")).decode("ascii"))
+    return "%s: %s\n" % (name, value)
+
+
+# Builds the DN of a user or group
+def userDn(userName):
+    return "CN=%s,%s" % (userName, C_DN_SUFFIX)
+
+
+def groupDn(groupName):
+    return "CN=%s,%s" % (groupName, C_DN_SUFFIX)
+
+
+# Writes the users and groups as LDIF
+def writeLdif(path, users, groups, userGroup, groupGroup):
+    f = open(path, "w")
+    f.write("version: 1\n\n")
+    for user in users:
+        f.write(ldifLine("dn", userDn(user["userName"])))
+        f.write("objectClass: top\nobjectClass: person\nobjectClass: user\n")
+        f.write(ldifLine("sAMAccountName", user["userName"]))
+        f.write(ldifLine("givenName", user["firstName"]))
+        f.write(ldifLine("sn", user["lastName"]))
+        f.write(ldifLine("displayName", user["fullName"]))
+        f.write(ldifLine("mail", user["email"]))
+        f.write("\n")
+
+    for (name, members) in groups:
+        f.write(ldifLine("dn", groupDn(name)))
+        f.write("objectClass: top\nobjectClass: group\n")
+        f.write(ldifLine("sAMAccountName", name))
+        for i in members:
+            f.write(ldifLine("member", userDn("user%06d" % i)))
+        f.write("\n")
+
+    f.write(ldifLine("dn", groupDn(userGroup)))
+    f.write("objectClass: top\nobjectClass: group\n")
+    f.write(ldifLine("sAMAccountName", userGroup))
+    for user in users:
+        f.write(ldifLine("member", userDn(user["userName"])))
+    f.write("\n")
+
+    f.write(ldifLine("dn", groupDn(groupGroup)))
+    f.write("objectClass: top\nobjectClass: group\n")
+    f.write(ldifLine("sAMAccountName", groupGroup))
+    for (name, members) in groups:
+        f.write(ldifLine("member", groupDn(name)))
+    f.close()
+
+
+# Writes the users and groups as JSON
+def writeJson(path, users, groups, userGroup, groupGroup):
+    allGroups = [{"name": name, "members": ["user%06d" % i for i in members]} for (name, members) in groups]
+    allGroups.append({"name": userGroup, "members": [u["userName"] for u in users]})
+    allGroups.append({"name": groupGroup, "members": [name for (name, members) in groups]})
+
+    f = open(path, "w")
+    json.dump({"users": users, "groups": allGroups}, f, indent=1, sort_keys=True)
+    f.close()
+
+
+def main():
+    parser = optparse.OptionParser(add_help_option=False)
+    parser.add_option("-u", "--users", dest="users", default="50000")
+    parser.add_option("-g", "--groups", dest="groups", default="50")
+    parser.add_option("-m", "--members", dest="members", default="500")
+    parser.add_option("-c", "--changes", dest="changes", default="0")
+    parser.add_option("-s", "--seed", dest="seed", default="1")
+    parser.add_option("--user-group", dest="userGroup", default="WMX Users")
+    parser.add_option("--group-group", dest="groupGroup", default="WMX Groups")
+    parser.add_option("-h", "--help", dest="help", action="store_true", default=False)
+    (options, args) = parser.parse_args()
+
+    if options.help or len(args) != 1:
+        printUsage()
+        return 1
+
+    try:
+        numUsers = int(options.users)
+        numGroups = int(options.groups)
+        numMembers = int(options.members)
+        changePct = float(options.changes)
+        seed = int(options.seed)
+    except ValueError:
+        printUsage()
+        return 1
+
+    (users, groups) = makeDirectory(numUsers, numGroups, numMembers, changePct, seed)
+
+    path = args[0]
+    if os.path.splitext(path)[1].lower() in (".ldf", ".ldif"):
+        writeLdif(path, users, groups, options.userGroup, options.groupGroup)
+    else:
+        writeJson(path, users, groups, options.userGroup, options.groupGroup)
+
+    print("Wrote %d user(s) and %d group(s) to %s" % (len(users), len(groups), path))
+    return 0
+
+
+# Entry point for the script
+if __name__ == "__main__":
+    sys.exit(main())
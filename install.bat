@@ -76,6 +76,56 @@ if not exist "%srcScript%" goto SCRIPTNOTFOUND
 %copycmd% "%srcScript%" "%sysScriptDir%"
 if %ERRORLEVEL% neq 0 goto COPYFAILED
 
+set srcScript=%~dp0\ArcToolbox\Scripts\JobJournal.py
+if not exist "%srcScript%" goto SCRIPTNOTFOUND
+%copycmd% "%srcScript%" "%sysScriptDir%"
+if %ERRORLEVEL% neq 0 goto COPYFAILED
+
+set srcScript=%~dp0\ArcToolbox\Scripts\AoiIndex.py
+if not exist "%srcScript%" goto SCRIPTNOTFOUND
+%copycmd% "%srcScript%" "%sysScriptDir%"
+if %ERRORLEVEL% neq 0 goto COPYFAILED
+
+set srcScript=%~dp0\ArcToolbox\Scripts\JobMirror.py
+if not exist "%srcScript%" goto SCRIPTNOTFOUND
+%copycmd% "%srcScript%" "%sysScriptDir%"
+if %ERRORLEVEL% neq 0 goto COPYFAILED
+
+set srcScript=%~dp0\ArcToolbox\Scripts\AdaptiveExecutor.py
+if not exist "%srcScript%" goto SCRIPTNOTFOUND
+%copycmd% "%srcScript%" "%sysScriptDir%"
+if %ERRORLEVEL% neq 0 goto COPYFAILED
+
+set srcScript=%~dp0\ArcToolbox\Scripts\ConfigSnapshot.py
+if not exist "%srcScript%" goto SCRIPTNOTFOUND
+%copycmd% "%srcScript%" "%sysScriptDir%"
+if %ERRORLEVEL% neq 0 goto COPYFAILED
+
+set srcScript=%~dp0\ArcToolbox\Scripts\JobIdSet.py
+if not exist "%srcScript%" goto SCRIPTNOTFOUND
+%copycmd% "%srcScript%" "%sysScriptDir%"
+if %ERRORLEVEL% neq 0 goto COPYFAILED
+
+set srcScript=%~dp0\ArcToolbox\Scripts\AdminDaemon.py
+if not exist "%srcScript%" goto SCRIPTNOTFOUND
+%copycmd% "%srcScript%" "%sysScriptDir%"
+if %ERRORLEVEL% neq 0 goto COPYFAILED
+
+set srcScript=%~dp0\ArcToolbox\Scripts\AdminClient.py
+if not exist "%srcScript%" goto SCRIPTNOTFOUND
+%copycmd% "%srcScript%" "%sysScriptDir%"
+if %ERRORLEVEL% neq 0 goto COPYFAILED
+
+set srcScript=%~dp0\ArcToolbox\Scripts\ExecuteJobsInParallel.py
+if not exist "%srcScript%" goto SCRIPTNOTFOUND
+%copycmd% "%srcScript%" "%sysScriptDir%"
+if %ERRORLEVEL% neq 0 goto COPYFAILED
+
+set srcScript=%~dp0\ArcToolbox\Scripts\RunForEachDatabase.py
+if not exist "%srcScript%" goto SCRIPTNOTFOUND
+%copycmd% "%srcScript%" "%sysScriptDir%"
+if %ERRORLEVEL% neq 0 goto COPYFAILED
+
 set srcScript=%~dp0\ArcToolbox\Scripts\DeleteJobsMatchingCriteria.py
 if not exist "%srcScript%" goto SCRIPTNOTFOUND
 %copycmd% "%srcScript%" "%sysScriptDir%"
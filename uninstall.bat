@@ -59,6 +59,56 @@ if not exist "%itemToDelete%" goto ITEMNOTFOUND
 del "%itemToDelete%"
 if %ERRORLEVEL% neq 0 call :DELFAILED
 
+set itemToDelete=%sysToolboxDir%Scripts\JobJournal.py
+if not exist "%itemToDelete%" goto ITEMNOTFOUND
+del "%itemToDelete%"
+if %ERRORLEVEL% neq 0 call :DELFAILED
+
+set itemToDelete=%sysToolboxDir%Scripts\AoiIndex.py
+if not exist "%itemToDelete%" goto ITEMNOTFOUND
+del "%itemToDelete%"
+if %ERRORLEVEL% neq 0 call :DELFAILED
+
+set itemToDelete=%sysToolboxDir%Scripts\JobMirror.py
+if not exist "%itemToDelete%" goto ITEMNOTFOUND
+del "%itemToDelete%"
+if %ERRORLEVEL% neq 0 call :DELFAILED
+
+set itemToDelete=%sysToolboxDir%Scripts\AdaptiveExecutor.py
+if not exist "%itemToDelete%" goto ITEMNOTFOUND
+del "%itemToDelete%"
+if %ERRORLEVEL% neq 0 call :DELFAILED
+
+set itemToDelete=%sysToolboxDir%Scripts\ConfigSnapshot.py
+if not exist "%itemToDelete%" goto ITEMNOTFOUND
+del "%itemToDelete%"
+if %ERRORLEVEL% neq 0 call :DELFAILED
+
+set itemToDelete=%sysToolboxDir%Scripts\JobIdSet.py
+if not exist "%itemToDelete%" goto ITEMNOTFOUND
+del "%itemToDelete%"
+if %ERRORLEVEL% neq 0 call :DELFAILED
+
+set itemToDelete=%sysToolboxDir%Scripts\AdminDaemon.py
+if not exist "%itemToDelete%" goto ITEMNOTFOUND
+del "%itemToDelete%"
+if %ERRORLEVEL% neq 0 call :DELFAILED
+
+set itemToDelete=%sysToolboxDir%Scripts\AdminClient.py
+if not exist "%itemToDelete%" goto ITEMNOTFOUND
+del "%itemToDelete%"
+if %ERRORLEVEL% neq 0 call :DELFAILED
+
+set itemToDelete=%sysToolboxDir%Scripts\ExecuteJobsInParallel.py
+if not exist "%itemToDelete%" goto ITEMNOTFOUND
+del "%itemToDelete%"
+if %ERRORLEVEL% neq 0 call :DELFAILED
+
+set itemToDelete=%sysToolboxDir%Scripts\RunForEachDatabase.py
+if not exist "%itemToDelete%" goto ITEMNOTFOUND
+del "%itemToDelete%"
+if %ERRORLEVEL% neq 0 call :DELFAILED
+
 set itemToDelete=%sysToolboxDir%Scripts\DeleteJobsMatchingCriteria.py
 if not exist "%itemToDelete%" goto ITEMNOTFOUND
 del "%itemToDelete%"